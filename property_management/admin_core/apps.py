@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AdminCoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'admin_core'
+
+    def ready(self):
+        from admin_core.services.stats import admin_dashboard_stats
+
+        admin_dashboard_stats.connect()
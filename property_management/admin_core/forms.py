@@ -12,6 +12,7 @@ from .models import (
     WorkerOfficeAssignment,
     HousingUnitAssignment,
 )
+from .services.identity import find_identity_candidates
 
 # =====================================================
 # 🏢 ADMIN BUILDINGS
@@ -86,6 +87,12 @@ class SectionForm(forms.ModelForm):
 # =====================================================
 
 class WorkerForm(forms.ModelForm):
+    confirm_not_duplicate = forms.BooleanField(
+        required=False,
+        label="Not a duplicate",
+        help_text="Tick to save even though similar workers already exist.",
+    )
+
     class Meta:
         model = Worker
         fields = [
@@ -123,8 +130,41 @@ class WorkerForm(forms.ModelForm):
         if mwa_type == "widow" and marital_status != "widowed":
             raise forms.ValidationError("Widow must be widowed.")
 
+        self._check_identity_candidates(cleaned)
+
         return cleaned
 
+    def _check_identity_candidates(self, cleaned):
+        """Block near-duplicate names unless explicitly confirmed"""
+        self.identity_candidates = []
+
+        name_fields = ("first_name", "middle_name", "last_name", "category")
+        if self.instance.pk and not any(f in self.changed_data for f in name_fields):
+            return
+
+        first_name = cleaned.get("first_name")
+        last_name = cleaned.get("last_name")
+        if not first_name or not last_name:
+            return
+
+        self.identity_candidates = find_identity_candidates(
+            first_name,
+            cleaned.get("middle_name", ""),
+            last_name,
+            category=cleaned.get("category"),
+            exclude_pk=self.instance.pk,
+        )
+
+        if self.identity_candidates and not cleaned.get("confirm_not_duplicate"):
+            names = ", ".join(
+                f"{w.last_name}, {w.first_name} {w.middle_name}".strip()
+                for w, _ in self.identity_candidates[:3]
+            )
+            raise forms.ValidationError(
+                f"Possible duplicate of existing worker(s): {names}. "
+                "Tick 'Not a duplicate' to save anyway."
+            )
+
 
 
 # =====================================================
@@ -1,10 +1,13 @@
 from django.db import transaction
+from django.db.models import Exists, OuterRef
 from django.utils import timezone
 
 from properties.models import (
     Pamayanan,
+    PamayananBuilding,
     HousingUnit as SourceHousingUnit,
 )
+from properties.streaming import stream_rows
 
 from admin_core.models import (
     HousingSite,
@@ -17,22 +20,24 @@ from admin_core.models import (
     SyncRun,
     SyncConflict,
 )
+from admin_core.services.identity import open_identity_conflict, resolve_identity
 
 
-def run_sync(triggered_by="properties_import"):
+def run_sync(triggered_by="properties_import", chunk_size=None):
     """
     Canonical admin_core sync service.
     Safe to call from:
     - signals
     - views / API
     - celery
+
+    Source tables are streamed as value tuples through server-side
+    cursors; only site / building / department lookups are kept in memory.
     """
 
     start_time = timezone.now()
 
     sync_run = SyncRun.objects.create(
-        source="properties_sync",
-        triggered_by=triggered_by,
         started_at=start_time,
         status="success",
     )
@@ -52,43 +57,65 @@ def run_sync(triggered_by="properties_import"):
             # =====================================================
             # 1. SYNC HOUSING SITES & BUILDINGS
             # =====================================================
-            pamayanans = Pamayanan.objects.prefetch_related("buildings")
+            sites = {}
+            buildings = {}
+            departments = {}
+
+            pamayanans = stream_rows(
+                Pamayanan.objects.annotate(
+                    has_buildings=Exists(
+                        PamayananBuilding.objects.filter(pamayanan=OuterRef("pk"))
+                    )
+                ).order_by("pk"),
+                "pk", "name", "address", "has_buildings",
+                chunk_size=chunk_size,
+            )
 
             for pam in pamayanans:
                 site, site_created = HousingSite.objects.get_or_create(
                     name=pam.name,
                     defaults={
                         "address": pam.address,
-                        "is_multi_building": pam.buildings.exists(),
+                        "is_multi_building": pam.has_buildings,
                     },
                 )
                 if site_created:
                     counters["housing_sites"] += 1
+                sites[pam.name] = site
 
-                for b in pam.buildings.all():
-                    building, b_created = HousingBuilding.objects.get_or_create(
-                        site=site,
-                        name=b.name,
-                    )
-                    if b_created:
-                        counters["housing_buildings"] += 1
+            pamayanan_buildings = stream_rows(
+                PamayananBuilding.objects.order_by("pk"),
+                "pamayanan__name", "name",
+                chunk_size=chunk_size,
+            )
+
+            for b in pamayanan_buildings:
+                site = sites[b.pamayanan__name]
+                building, b_created = HousingBuilding.objects.get_or_create(
+                    site=site,
+                    name=b.name,
+                )
+                if b_created:
+                    counters["housing_buildings"] += 1
+                buildings[(site.pk, b.name)] = building
 
             # =====================================================
             # 2. SYNC HOUSING UNITS + WORKERS
             # =====================================================
-            source_units = SourceHousingUnit.objects.select_related(
-                "pamayanan", "building"
+            source_units = stream_rows(
+                SourceHousingUnit.objects.order_by("pk"),
+                "pamayanan__name", "building__name", "housing_unit_name",
+                "unit_number", "floor", "occupant_name", "department",
+                "section", "date_reported",
+                chunk_size=chunk_size,
             )
 
             for src in source_units:
-                site = HousingSite.objects.get(name=src.pamayanan.name)
+                site = sites[src.pamayanan__name]
 
                 building = None
-                if src.building:
-                    building = HousingBuilding.objects.get(
-                        site=site,
-                        name=src.building.name,
-                    )
+                if src.building__name:
+                    building = buildings[(site.pk, src.building__name)]
 
                 unit_label = src.housing_unit_name or src.unit_number
 
@@ -123,8 +150,19 @@ def run_sync(triggered_by="properties_import"):
                 )
                 identity_hash = temp_worker.generate_identity_hash()
 
-                worker = Worker.objects.filter(identity_hash=identity_hash).first()
+                # Includes names merged into a worker by an earlier conflict
+                worker = resolve_identity(identity_hash)
                 if not worker:
+                    conflict = open_identity_conflict(
+                        first_name,
+                        middle_name,
+                        last_name,
+                        identity_hash=identity_hash,
+                    )
+                    if conflict:
+                        counters["conflicts"] += 1
+                        continue
+
                     temp_worker.identity_hash = identity_hash
                     temp_worker.save()
                     worker = temp_worker
@@ -135,9 +173,13 @@ def run_sync(triggered_by="properties_import"):
                 # ------------------------------
                 department = None
                 if src.department:
-                    department, _ = Department.objects.get_or_create(
-                        name=src.department.strip()
-                    )
+                    dept_name = src.department.strip()
+                    department = departments.get(dept_name)
+                    if department is None:
+                        department, _ = Department.objects.get_or_create(
+                            name=dept_name
+                        )
+                        departments[dept_name] = department
 
                 if src.section and department:
                     Section.objects.get_or_create(
@@ -168,11 +210,14 @@ def run_sync(triggered_by="properties_import"):
     # FINALIZE SYNC RUN
     # =====================================================
     sync_run.finished_at = timezone.now()
-    sync_run.duration_ms = int(
-        (sync_run.finished_at - start_time).total_seconds() * 1000
-    )
+    sync_run.housing_sites_created = counters["housing_sites"]
+    sync_run.housing_buildings_created = counters["housing_buildings"]
+    sync_run.housing_units_created = counters["housing_units"]
+    sync_run.workers_created = counters["workers"]
     sync_run.conflicts_detected = counters["conflicts"]
-    sync_run.notes = f"Synced: {counters}"
+    if counters["conflicts"]:
+        sync_run.status = "partial"
+    sync_run.notes = f"Triggered by: {triggered_by} | Synced: {counters}"
     sync_run.save()
 
     return sync_run
@@ -0,0 +1,73 @@
+# Generated by Django 4.2.8 on 2026-10-18 23:43
+
+from django.db import migrations, models
+
+from admin_core.services.identity import identity_keys
+
+
+def backfill_identity_keys(apps, schema_editor):
+    """Populate blocking keys for existing workers"""
+    Worker = apps.get_model('admin_core', 'Worker')
+
+    for worker in Worker.objects.only('id', 'first_name', 'middle_name', 'last_name').iterator(chunk_size=2000):
+        Worker.objects.filter(pk=worker.pk).update(
+            **identity_keys(worker.first_name, worker.middle_name, worker.last_name)
+        )
+
+
+# pg_trgm is a trusted extension on PostgreSQL 13+, but not every
+# install ships contrib. Only build the trigram index when available;
+# the candidate lookup falls back to the blocking keys otherwise.
+CREATE_TRIGRAM_INDEX = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS admin_core_worker_name_trgm
+            ON admin_core_worker USING gin (name_normalized gin_trgm_ops);
+    END IF;
+END
+$$;
+"""
+
+DROP_TRIGRAM_INDEX = "DROP INDEX IF EXISTS admin_core_worker_name_trgm;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_core', '0006_housingbuilding_housingsite_housingunit_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='worker',
+            name='first_phonetic',
+            field=models.CharField(blank=True, editable=False, max_length=4),
+        ),
+        migrations.AddField(
+            model_name='worker',
+            name='last_phonetic',
+            field=models.CharField(blank=True, editable=False, max_length=4),
+        ),
+        migrations.AddField(
+            model_name='worker',
+            name='name_key',
+            field=models.CharField(blank=True, editable=False, help_text='Normalized surname + first initial (e.g. cruz|j)', max_length=110),
+        ),
+        migrations.AddField(
+            model_name='worker',
+            name='name_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=300),
+        ),
+        migrations.AddIndex(
+            model_name='worker',
+            index=models.Index(fields=['name_key'], name='admin_core__name_ke_39672c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='worker',
+            index=models.Index(fields=['last_phonetic', 'first_phonetic'], name='admin_core__last_ph_b1a99e_idx'),
+        ),
+        migrations.RunPython(backfill_identity_keys, migrations.RunPython.noop),
+        migrations.RunSQL(CREATE_TRIGRAM_INDEX, DROP_TRIGRAM_INDEX),
+    ]
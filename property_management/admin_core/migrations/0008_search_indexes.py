@@ -0,0 +1,19 @@
+# Generated by Django 4.2.8 on 2026-10-19 00:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_core', '0007_worker_identity_blocking_keys'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='worker',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('first_name', 'middle_name', 'last_name', config='simple'), name='worker_search_idx'),
+        ),
+    ]
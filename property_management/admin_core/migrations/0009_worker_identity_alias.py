@@ -0,0 +1,41 @@
+# Generated by Django 4.2.8 on 2026-10-19 02:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def link_resolved_conflicts(apps, schema_editor):
+    """Aliases for the WORKER_IDENTITY conflicts already resolved"""
+    SyncConflict = apps.get_model("admin_core", "SyncConflict")
+    WorkerIdentityAlias = apps.get_model("admin_core", "WorkerIdentityAlias")
+
+    resolved = SyncConflict.objects.filter(
+        conflict_type="WORKER_IDENTITY", resolved=True, worker__isnull=False
+    ).order_by("resolved_at", "pk")
+    aliases = {conflict.identity_hash: conflict for conflict in resolved}
+    WorkerIdentityAlias.objects.bulk_create(
+        WorkerIdentityAlias(identity_hash=identity_hash, worker_id=conflict.worker_id, conflict=conflict)
+        for identity_hash, conflict in aliases.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_core', '0008_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkerIdentityAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('identity_hash', models.CharField(max_length=64, unique=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('conflict', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='admin_core.syncconflict')),
+                ('worker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='identity_aliases', to='admin_core.worker')),
+            ],
+        ),
+        migrations.RunPython(link_resolved_conflicts, migrations.RunPython.noop),
+    ]
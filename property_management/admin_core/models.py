@@ -2,6 +2,8 @@ import hashlib
 from django.db import models
 from django.utils import timezone
 
+from properties.search import WORKER_SEARCH_FIELDS, search_index
+
 
 # =====================================================
 # A. DEPARTMENTS & SECTIONS (WORK STRUCTURE)
@@ -160,6 +162,18 @@ class Worker(models.Model):
         editable=False
     )
 
+    # Blocking keys for near-duplicate detection
+    # (see admin_core.services.identity)
+    name_key = models.CharField(
+        max_length=110,
+        blank=True,
+        editable=False,
+        help_text="Normalized surname + first initial (e.g. cruz|j)"
+    )
+    last_phonetic = models.CharField(max_length=4, blank=True, editable=False)
+    first_phonetic = models.CharField(max_length=4, blank=True, editable=False)
+    name_normalized = models.CharField(max_length=300, blank=True, editable=False)
+
     remarks = models.TextField(blank=True)
 
     created_at = models.DateTimeField(default=timezone.now, editable=False)
@@ -167,6 +181,11 @@ class Worker(models.Model):
 
     class Meta:
         ordering = ["last_name", "first_name"]
+        indexes = [
+            models.Index(fields=["name_key"]),
+            models.Index(fields=["last_phonetic", "first_phonetic"]),
+            search_index(WORKER_SEARCH_FIELDS, "worker_search_idx"),
+        ]
 
     def __str__(self):
         return f"{self.last_name}, {self.first_name}"
@@ -175,9 +194,19 @@ class Worker(models.Model):
         raw = f"{self.first_name}|{self.middle_name}|{self.last_name}|{self.category}"
         return hashlib.sha256(raw.lower().encode()).hexdigest()
 
+    def refresh_identity_keys(self):
+        """Recompute the blocking keys from the current name fields"""
+        from admin_core.services.identity import identity_keys
+
+        for field, value in identity_keys(
+            self.first_name, self.middle_name, self.last_name
+        ).items():
+            setattr(self, field, value)
+
     def save(self, *args, **kwargs):
         if not self.identity_hash:
             self.identity_hash = self.generate_identity_hash()
+        self.refresh_identity_keys()
         super().save(*args, **kwargs)
 
 
@@ -389,6 +418,33 @@ class SyncConflict(models.Model):
         return f"{self.conflict_type} | {self.identity_hash[:8]} | {self.severity}"
 
 
+class WorkerIdentityAlias(models.Model):
+    """
+    An incoming identity_hash that a resolved WORKER_IDENTITY conflict
+    matched to an existing Worker. Later syncs map the name to that
+    worker instead of raising the same conflict again.
+    """
+
+    identity_hash = models.CharField(max_length=64, unique=True)
+    worker = models.ForeignKey(
+        Worker,
+        on_delete=models.CASCADE,
+        related_name="identity_aliases"
+    )
+    conflict = models.ForeignKey(
+        SyncConflict,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+"
+    )
+
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.identity_hash[:8]} → {self.worker}"
+
+
 class SyncRun(models.Model):
     """
     Immutable audit log for each sync execution.
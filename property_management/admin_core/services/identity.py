@@ -0,0 +1,314 @@
+"""
+Worker identity blocking keys + near-duplicate candidate lookup.
+
+The exact `identity_hash` only catches byte-identical names, so
+"Juan D. Cruz" and "Juan Dela Cruz" end up as two Worker rows.
+Comparing an incoming name against every worker is O(n²), so instead
+each Worker persists a few cheap, indexed blocking keys:
+
+- name_key        normalized surname + first initial   ("cruz|j")
+- last_phonetic   Soundex of the surname               ("C620")
+- first_phonetic  Soundex of the first name            ("J500")
+- name_normalized full normalized name, for trigram ("juan d cruz")
+
+A lookup only reads the rows sharing a block (plus pg_trgm `%` matches
+when the extension is installed) and ranks them with trigram similarity.
+"""
+
+import re
+import unicodedata
+
+from django.db import connections
+from django.db.models import Q
+
+
+# Surname particles dropped from the blocking key
+# ("Dela Cruz" and "Cruz" must land in the same block)
+SURNAME_PARTICLES = {"de", "del", "dela", "delos", "la", "las", "los", "y"}
+
+# Minimum similarity for a candidate. Stricter than pg_trgm's own 0.3
+# so "Juan Cruz" / "Jose Cruz" are not flagged as the same person.
+DEFAULT_THRESHOLD = 0.5
+DEFAULT_LIMIT = 10
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+_trigram_support = {}
+
+
+# ======================================================
+# NORMALIZATION
+# ======================================================
+
+def normalize_name(value):
+    """
+    Lowercase, strip accents / punctuation, collapse whitespace.
+    "  Peña, Ma. Luisa " -> "pena ma luisa"
+    """
+    if not value:
+        return ""
+    value = unicodedata.normalize("NFKD", str(value))
+    value = "".join(c for c in value if not unicodedata.combining(c))
+    value = re.sub(r"[^a-z0-9\s]", " ", value.lower())
+    return " ".join(value.split())
+
+
+def normalize_surname(value):
+    """
+    Normalized surname without leading particles.
+    "Dela Cruz" -> "cruz", "de los Santos" -> "santos"
+    """
+    tokens = normalize_name(value).split()
+    while len(tokens) > 1 and tokens[0] in SURNAME_PARTICLES:
+        tokens = tokens[1:]
+    return "".join(tokens)
+
+
+def soundex(value):
+    """
+    American Soundex of a single name ("Cruz" -> "C620").
+    Returns "" for empty input.
+    """
+    letters = [c for c in normalize_name(value) if c.isalpha()]
+    if not letters:
+        return ""
+
+    first = letters[0]
+    encoded = [first.upper()]
+    previous = _SOUNDEX_CODES.get(first, "")
+
+    for char in letters[1:]:
+        code = _SOUNDEX_CODES.get(char, "")
+        if code and code != previous:
+            encoded.append(code)
+            if len(encoded) == 4:
+                break
+        # h / w do not separate duplicate codes, vowels do
+        if char not in "hw":
+            previous = code
+
+    return "".join(encoded).ljust(4, "0")
+
+
+# ======================================================
+# BLOCKING KEYS
+# ======================================================
+
+def identity_keys(first_name, middle_name, last_name):
+    """
+    All persisted blocking keys for one name, as Worker field values.
+    """
+    surname = normalize_surname(last_name)
+    first = normalize_name(first_name)
+    return {
+        "name_key": f"{surname}|{first[:1]}" if surname else "",
+        "last_phonetic": soundex(surname),
+        "first_phonetic": soundex(first.split()[0] if first else ""),
+        "name_normalized": normalize_name(
+            " ".join(p for p in (first_name, middle_name, last_name) if p)
+        ),
+    }
+
+
+def trigrams(value):
+    """
+    Trigram set computed the same way as pg_trgm: each word is padded
+    with two leading spaces and one trailing space.
+    """
+    grams = set()
+    for word in normalize_name(value).split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def trigram_similarity(a, b):
+    """
+    Python equivalent of pg_trgm `similarity(a, b)`.
+    """
+    ta, tb = trigrams(a), trigrams(b)
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / len(ta | tb)
+
+
+def trigram_available(using="default"):
+    """
+    True when the pg_trgm extension is installed on the connection.
+    Checked once per connection alias.
+    """
+    if using not in _trigram_support:
+        connection = connections[using]
+        available = False
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"
+                )
+                available = cursor.fetchone() is not None
+        _trigram_support[using] = available
+    return _trigram_support[using]
+
+
+# ======================================================
+# CANDIDATE LOOKUP
+# ======================================================
+
+def find_identity_candidates(
+    first_name,
+    middle_name,
+    last_name,
+    *,
+    category=None,
+    exclude_pk=None,
+    threshold=DEFAULT_THRESHOLD,
+    limit=DEFAULT_LIMIT,
+):
+    """
+    Near-duplicate Workers for an incoming name.
+
+    Returns a list of (worker, similarity) sorted best-first.
+    Only rows sharing a blocking key (or a pg_trgm index match)
+    are read, so the cost does not grow with the Worker table.
+    """
+    from admin_core.models import Worker
+
+    keys = identity_keys(first_name, middle_name, last_name)
+    if not keys["name_normalized"]:
+        return []
+
+    block = Q()
+    if keys["name_key"]:
+        block |= Q(name_key=keys["name_key"])
+    if keys["last_phonetic"] and keys["first_phonetic"]:
+        block |= Q(
+            last_phonetic=keys["last_phonetic"],
+            first_phonetic=keys["first_phonetic"],
+        )
+    if trigram_available(Worker.objects.db):
+        block |= Q(name_normalized__trigram_similar=keys["name_normalized"])
+
+    if not block:
+        return []
+
+    qs = Worker.objects.filter(block)
+    if category:
+        qs = qs.filter(category=category)
+    if exclude_pk:
+        qs = qs.exclude(pk=exclude_pk)
+
+    scored = []
+    for worker in qs.only(
+        "id", "first_name", "middle_name", "last_name",
+        "category", "identity_hash", "name_normalized",
+    ):
+        score = trigram_similarity(keys["name_normalized"], worker.name_normalized)
+        if score >= threshold:
+            scored.append((worker, score))
+
+    scored.sort(key=lambda pair: pair[1], reverse=True)
+    return scored[:limit]
+
+
+def open_identity_conflict(
+    first_name,
+    middle_name,
+    last_name,
+    *,
+    identity_hash,
+    category="MWA",
+    source="properties_sync",
+):
+    """
+    Raise a WORKER_IDENTITY SyncConflict when the incoming name is a
+    near-duplicate of an existing Worker.
+
+    Returns the open conflict (new or already pending for this
+    identity_hash), or None when there is no candidate, or the
+    identity_hash was already resolved, and the caller may safely create
+    the Worker.
+    """
+    from admin_core.models import SyncConflict
+
+    earlier = SyncConflict.objects.filter(
+        conflict_type="WORKER_IDENTITY",
+        identity_hash=identity_hash,
+    ).order_by("resolved").first()
+    if earlier:
+        # A resolved conflict is not raised again; merges are found
+        # through resolve_identity() before getting here
+        return None if earlier.resolved else earlier
+
+    candidates = find_identity_candidates(
+        first_name, middle_name, last_name, category=category
+    )
+    if not candidates:
+        return None
+
+    existing, score = candidates[0]
+
+    # Stored as dict reprs: the merge view reads them back per field
+    return SyncConflict.objects.create(
+        conflict_type="WORKER_IDENTITY",
+        severity="high" if score >= 0.8 else "medium",
+        worker=existing,
+        identity_hash=identity_hash,
+        existing_value=str({
+            "first_name": existing.first_name,
+            "middle_name": existing.middle_name,
+            "last_name": existing.last_name,
+        }),
+        incoming_value=str({
+            "first_name": first_name,
+            "middle_name": middle_name,
+            "last_name": last_name,
+        }),
+        source=source,
+        resolution_notes=f"Similarity {score:.2f} to worker #{existing.pk}",
+    )
+
+
+# ======================================================
+# RESOLVED IDENTITIES
+# ======================================================
+
+def resolve_identity(identity_hash):
+    """
+    The Worker for an incoming identity_hash: the worker with that hash,
+    or the one a resolved conflict linked it to. None if neither.
+    """
+    from admin_core.models import Worker, WorkerIdentityAlias
+
+    worker = Worker.objects.filter(identity_hash=identity_hash).first()
+    if worker:
+        return worker
+    alias = (
+        WorkerIdentityAlias.objects.select_related("worker")
+        .filter(identity_hash=identity_hash)
+        .first()
+    )
+    return alias.worker if alias else None
+
+
+def link_identity(conflict):
+    """
+    Record a resolved WORKER_IDENTITY conflict's incoming identity_hash
+    as an alias of its worker. Returns the alias, or None for other
+    conflicts.
+    """
+    from admin_core.models import WorkerIdentityAlias
+
+    if conflict.conflict_type != "WORKER_IDENTITY" or not conflict.worker_id:
+        return None
+    alias, _ = WorkerIdentityAlias.objects.update_or_create(
+        identity_hash=conflict.identity_hash,
+        defaults={"worker_id": conflict.worker_id, "conflict": conflict},
+    )
+    return alias
@@ -0,0 +1,77 @@
+"""
+Cached counters for the admin_core dashboard.
+
+Replaces the dozen separate COUNT(*) queries of the dashboard view with
+one multi-count query, one grouped worker breakdown and the latest
+sync run. Invalidation and background refresh are handled by
+properties.stats.StatsSnapshot.
+"""
+
+from django.db.models import Count
+
+from properties.stats import StatsSnapshot, count_many
+
+
+def compute_admin_dashboard_stats():
+    from admin_core.models import (
+        Department,
+        HousingUnitAssignment,
+        Section,
+        SyncRun,
+        Worker,
+        WorkerOfficeAssignment,
+    )
+
+    stats = count_many(
+        department_count=Department.objects.all(),
+        section_count=Section.objects.all(),
+        worker_total=Worker.objects.all(),
+        worker_active=Worker.objects.filter(employment_status="active"),
+        office_assignments=WorkerOfficeAssignment.objects.filter(end_date__isnull=True),
+        housing_assigned=HousingUnitAssignment.objects.filter(is_current=True),
+        sync_total=SyncRun.objects.all(),
+        sync_failed=SyncRun.objects.filter(status="failed"),
+        sync_partial=SyncRun.objects.filter(status="partial"),
+        sync_success=SyncRun.objects.filter(status="success"),
+    )
+
+    # Category and MWA-type breakdowns from one grouped query
+    by_category = {}
+    by_mwa_type = {}
+    rows = (
+        Worker.objects
+        .values("category", "mwa_type")
+        .annotate(total=Count("id"))
+        .order_by("category", "mwa_type")
+    )
+    for row in rows:
+        by_category[row["category"]] = by_category.get(row["category"], 0) + row["total"]
+        if row["category"] == "MWA":
+            by_mwa_type[row["mwa_type"]] = row["total"]
+
+    stats["worker_by_category"] = [
+        {"category": category, "total": total}
+        for category, total in by_category.items()
+    ]
+    stats["mwa_breakdown"] = [
+        {"mwa_type": mwa_type, "total": total}
+        for mwa_type, total in by_mwa_type.items()
+    ]
+
+    stats["latest_sync"] = SyncRun.objects.order_by("-started_at").first()
+
+    return stats
+
+
+admin_dashboard_stats = StatsSnapshot(
+    "admin_core_dashboard",
+    compute_admin_dashboard_stats,
+    [
+        "admin_core.Department",
+        "admin_core.Section",
+        "admin_core.Worker",
+        "admin_core.WorkerOfficeAssignment",
+        "admin_core.HousingUnitAssignment",
+        "admin_core.SyncRun",
+    ],
+)
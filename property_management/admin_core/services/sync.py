@@ -14,7 +14,22 @@ from admin_core.models import (
     SyncConflict,
 )
 
+from admin_core.services.identity import open_identity_conflict, resolve_identity
 from properties.models import HousingUnit as SrcHousingUnit
+from properties.streaming import stream_rows
+
+
+# Source columns read per housing unit (values, not model instances)
+SOURCE_UNIT_FIELDS = (
+    "pamayanan__name",
+    "building__name",
+    "address",
+    "housing_unit_name",
+    "floor",
+    "occupant_name",
+    "department",
+    "section",
+)
 
 
 # ======================================================
@@ -25,41 +40,50 @@ from properties.models import HousingUnit as SrcHousingUnit
 def run_admin_core_sync(
     *,
     source="properties_sync",
-    triggered_by="system"
+    triggered_by="system",
+    chunk_size=None,
 ) -> SyncRun:
     """
     Synchronizes housing + worker data from properties app
     into admin_core (normalized domain).
 
+    Source units are streamed through a server-side cursor, so memory
+    stays flat regardless of table size.
+
     NEVER auto-resolves conflicts.
     """
 
     start_time = timezone.now()
 
     sync_run = SyncRun.objects.create(
-        source=source,
-        triggered_by=triggered_by,
         status="success",
         started_at=start_time,
     )
 
     counters = {
+        "sites_created": 0,
+        "buildings_created": 0,
+        "units_created": 0,
         "departments_created": 0,
-        "sections_created": 0,
         "workers_created": 0,
-        "buildings_created": 0,
         "assignments_created": 0,
         "conflicts": 0,
     }
 
+    # Small lookup caches (bounded by number of sites / buildings /
+    # departments, not by number of units)
+    sites = {}
+    buildings = {}
+    departments = {}
+
     # ==================================================
     # 1. READ SOURCE DATA (properties)
     # ==================================================
 
-    source_units = (
-        SrcHousingUnit.objects
-        .select_related("pamayanan", "building")
-        .all()
+    source_units = stream_rows(
+        SrcHousingUnit.objects.order_by("pk"),
+        *SOURCE_UNIT_FIELDS,
+        chunk_size=chunk_size,
     )
 
     for src in source_units:
@@ -68,28 +92,37 @@ def run_admin_core_sync(
         # A. HOUSING SITE (Pamayanan)
         # ----------------------------------------------
 
-        site_name = src.pamayanan.name.strip()
+        site_name = src.pamayanan__name.strip()
 
-        site, site_created = HousingSite.objects.get_or_create(
-            name=site_name,
-            defaults={
-                "address": src.address or "",
-                "is_multi_building": bool(src.building),
-            }
-        )
+        site = sites.get(site_name)
+        if site is None:
+            site, site_created = HousingSite.objects.get_or_create(
+                name=site_name,
+                defaults={
+                    "address": src.address or "",
+                    "is_multi_building": bool(src.building__name),
+                }
+            )
+            if site_created:
+                counters["sites_created"] += 1
+            sites[site_name] = site
 
         # ----------------------------------------------
         # B. HOUSING BUILDING (optional)
         # ----------------------------------------------
 
         building = None
-        if src.building:
-            building, b_created = HousingBuilding.objects.get_or_create(
-                site=site,
-                name=src.building.name.strip()
-            )
-            if b_created:
-                counters["buildings_created"] += 1
+        if src.building__name:
+            building_key = (site.pk, src.building__name.strip())
+            building = buildings.get(building_key)
+            if building is None:
+                building, b_created = HousingBuilding.objects.get_or_create(
+                    site=site,
+                    name=building_key[1]
+                )
+                if b_created:
+                    counters["buildings_created"] += 1
+                buildings[building_key] = building
 
         # ----------------------------------------------
         # C. HOUSING UNIT
@@ -97,7 +130,7 @@ def run_admin_core_sync(
 
         unit_label = src.housing_unit_name.strip()
 
-        unit, _ = HousingUnit.objects.get_or_create(
+        unit, unit_created = HousingUnit.objects.get_or_create(
             site=site,
             building=building,
             unit_label=unit_label,
@@ -105,6 +138,8 @@ def run_admin_core_sync(
                 "floor": str(src.floor or "").strip(),
             }
         )
+        if unit_created:
+            counters["units_created"] += 1
 
         # ----------------------------------------------
         # D. WORKER (from occupant_name)
@@ -128,9 +163,23 @@ def run_admin_core_sync(
             category="MWA"
         ).generate_identity_hash()
 
-        worker = Worker.objects.filter(identity_hash=identity_hash).first()
+        # Includes names merged into a worker by an earlier conflict
+        worker = resolve_identity(identity_hash)
 
         if not worker:
+            # Near-duplicate of an existing worker → conflict, not a new row
+            conflict = open_identity_conflict(
+                first_name,
+                middle_name,
+                last_name,
+                identity_hash=identity_hash,
+                source=source,
+            )
+            if conflict:
+                counters["conflicts"] += 1
+                sync_run.status = "partial"
+                continue
+
             worker = Worker.objects.create(
                 first_name=first_name,
                 middle_name=middle_name,
@@ -145,11 +194,15 @@ def run_admin_core_sync(
         # ----------------------------------------------
 
         if src.department:
-            dept, d_created = Department.objects.get_or_create(
-                name=src.department.strip()
-            )
-            if d_created:
-                counters["departments_created"] += 1
+            dept_name = src.department.strip()
+            dept = departments.get(dept_name)
+            if dept is None:
+                dept, d_created = Department.objects.get_or_create(
+                    name=dept_name
+                )
+                if d_created:
+                    counters["departments_created"] += 1
+                departments[dept_name] = dept
 
             if src.section:
                 Section.objects.get_or_create(
@@ -167,7 +220,7 @@ def run_admin_core_sync(
         ).first()
 
         if current_assignment:
-            if current_assignment.housing_unit != unit:
+            if current_assignment.housing_unit_id != unit.pk:
                 SyncConflict.objects.create(
                     conflict_type="HOUSING_ASSIGNMENT",
                     severity="medium",
@@ -192,16 +245,15 @@ def run_admin_core_sync(
     # ==================================================
 
     sync_run.finished_at = timezone.now()
-    sync_run.duration_ms = int(
-        (sync_run.finished_at - sync_run.started_at).total_seconds() * 1000
-    )
 
-    sync_run.departments_created = counters["departments_created"]
-    sync_run.sections_created = counters["sections_created"]
+    sync_run.housing_sites_created = counters["sites_created"]
+    sync_run.housing_buildings_created = counters["buildings_created"]
+    sync_run.housing_units_created = counters["units_created"]
     sync_run.workers_created = counters["workers_created"]
-    sync_run.buildings_created = counters["buildings_created"]
-    sync_run.assignments_created = counters["assignments_created"]
     sync_run.conflicts_detected = counters["conflicts"]
+    sync_run.notes = (
+        f"Source: {source} | Triggered by: {triggered_by} | Synced: {counters}"
+    )
 
     if counters["conflicts"] > 0:
         sync_run.status = "partial"
@@ -1,3 +1,350 @@
+import gc
+import tracemalloc
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
+
+from properties.models import HousingUnit as SrcHousingUnit, Pamayanan
+from properties.streaming import stream_rows
+
+from .models import (
+    AdminBuilding, HousingUnit, Office, SyncConflict, SyncRun, Worker, WorkerIdentityAlias, WorkerOfficeAssignment,
+)
+from .services.identity import (
+    find_identity_candidates,
+    identity_keys,
+    normalize_surname,
+    open_identity_conflict,
+    resolve_identity,
+    soundex,
+    trigram_available,
+    trigram_similarity,
+)
+
+
+class IdentityKeyTests(TestCase):
+    """Test blocking key helpers"""
+
+    def test_soundex(self):
+        self.assertEqual(soundex("Robert"), "R163")
+        self.assertEqual(soundex("Rupert"), "R163")
+        self.assertEqual(soundex("Ashcraft"), "A261")
+        self.assertEqual(soundex("Cruz"), "C620")
+        self.assertEqual(soundex(""), "")
+
+    def test_surname_particles_removed(self):
+        self.assertEqual(normalize_surname("Dela Cruz"), "cruz")
+        self.assertEqual(normalize_surname("de los Santos"), "santos")
+        self.assertEqual(normalize_surname("Peña"), "pena")
+
+    def test_identity_keys(self):
+        keys = identity_keys("Juan", "D.", "Cruz")
+        self.assertEqual(keys["name_key"], "cruz|j")
+        self.assertEqual(keys["last_phonetic"], "C620")
+        self.assertEqual(keys["first_phonetic"], "J500")
+        self.assertEqual(keys["name_normalized"], "juan d cruz")
+
+    def test_trigram_similarity(self):
+        self.assertEqual(trigram_similarity("juan cruz", "juan cruz"), 1.0)
+        self.assertGreater(trigram_similarity("juan d cruz", "juan dela cruz"), 0.5)
+        self.assertLess(trigram_similarity("juan cruz", "pedro santos"), 0.1)
+
+    def test_keys_persisted_on_save(self):
+        worker = Worker.objects.create(
+            first_name="Juan", middle_name="D.", last_name="Cruz", category="MWA"
+        )
+        worker.refresh_from_db()
+        self.assertEqual(worker.name_key, "cruz|j")
+        self.assertEqual(worker.name_normalized, "juan d cruz")
+
+        worker.last_name = "Santos"
+        worker.save()
+        worker.refresh_from_db()
+        self.assertEqual(worker.name_key, "santos|j")
+
+
+class IdentityCandidateTests(TestCase):
+    """Test near-duplicate worker lookup"""
+
+    def setUp(self):
+        self.juan = Worker.objects.create(
+            first_name="Juan", middle_name="D.", last_name="Cruz", category="MWA"
+        )
+        Worker.objects.create(first_name="Jose", last_name="Cruz", category="MWA")
+        Worker.objects.create(first_name="Pedro", last_name="Santos", category="MWA")
+
+    def test_finds_near_duplicate(self):
+        candidates = find_identity_candidates("Juan", "Dela", "Cruz", category="MWA")
+        self.assertEqual([w.pk for w, _ in candidates], [self.juan.pk])
+
+    def test_surname_with_particle(self):
+        candidates = find_identity_candidates("Juan", "", "Dela Cruz", category="MWA")
+        self.assertEqual(candidates[0][0].pk, self.juan.pk)
+
+    def test_unrelated_name_has_no_candidates(self):
+        self.assertEqual(find_identity_candidates("Maria", "", "Reyes"), [])
+
+    def test_exclude_self(self):
+        candidates = find_identity_candidates(
+            "Juan", "D.", "Cruz", exclude_pk=self.juan.pk
+        )
+        self.assertNotIn(self.juan.pk, [w.pk for w, _ in candidates])
+
+    def test_single_query(self):
+        trigram_available()
+        with self.assertNumQueries(1):
+            find_identity_candidates("Juan", "Dela", "Cruz")
+
+    def test_open_identity_conflict(self):
+        incoming_hash = Worker(
+            first_name="Juan", middle_name="Dela", last_name="Cruz", category="MWA"
+        ).generate_identity_hash()
+
+        conflict = open_identity_conflict(
+            "Juan", "Dela", "Cruz", identity_hash=incoming_hash
+        )
+        self.assertEqual(conflict.conflict_type, "WORKER_IDENTITY")
+        self.assertEqual(conflict.worker, self.juan)
+        self.assertEqual(eval(conflict.incoming_value)["middle_name"], "Dela")
+
+        # Re-running sync does not stack duplicate conflicts
+        again = open_identity_conflict(
+            "Juan", "Dela", "Cruz", identity_hash=incoming_hash
+        )
+        self.assertEqual(again.pk, conflict.pk)
+        self.assertEqual(SyncConflict.objects.count(), 1)
+
+    def test_no_conflict_without_candidate(self):
+        self.assertIsNone(
+            open_identity_conflict("Maria", "", "Reyes", identity_hash="x" * 64)
+        )
+
+
+class IdentityResolutionTests(TestCase):
+    """Test that a resolved identity conflict stays resolved across syncs"""
+
+    def setUp(self):
+        self.juan = Worker.objects.create(
+            first_name="Juan", middle_name="D.", last_name="Cruz", category="MWA"
+        )
+        pamayanan = Pamayanan.objects.create(name="Central", address="Quezon City")
+        SrcHousingUnit.objects.create(
+            pamayanan=pamayanan, unit_number="101", housing_unit_name="Unit 101",
+            occupant_name="Juan Dela Cruz", date_reported=date(2024, 1, 1),
+        )
+        self.staff = User.objects.create_user(username="staff", password="password", is_staff=True)
+        self.client.login(username="staff", password="password")
+
+    def sync(self):
+        from .services.sync import run_admin_core_sync
+
+        return run_admin_core_sync()
+
+    def test_merged_conflict_not_raised_again(self):
+        self.assertEqual(self.sync().conflicts_detected, 1)
+        conflict = SyncConflict.objects.get(conflict_type="WORKER_IDENTITY")
+
+        self.client.post(
+            reverse("admin_core:merge_conflict", args=[conflict.pk]),
+            {"first_name": "existing", "middle_name": "existing", "last_name": "existing"},
+        )
+
+        self.assertEqual(resolve_identity(conflict.identity_hash), self.juan)
+        self.assertEqual(WorkerIdentityAlias.objects.get().conflict, conflict)
+        sync_run = self.sync()
+        self.assertEqual(sync_run.conflicts_detected, 0)
+        self.assertEqual(SyncConflict.objects.filter(conflict_type="WORKER_IDENTITY").count(), 1)
+        self.assertEqual(Worker.objects.count(), 1)
+
+    def test_import_sync_uses_merged_identity(self):
+        from .management.commands.sync_admin_core import run_sync
+
+        self.assertEqual(run_sync().conflicts_detected, 1)
+        conflict = SyncConflict.objects.get(conflict_type="WORKER_IDENTITY")
+        self.client.post(
+            reverse("admin_core:merge_conflict", args=[conflict.pk]),
+            {"first_name": "existing", "middle_name": "existing", "last_name": "existing"},
+        )
+
+        for _ in range(2):
+            self.assertEqual(run_sync().workers_created, 0)
+        self.assertEqual(Worker.objects.count(), 1)
+        self.assertTrue(self.juan.housing_assignments.exists())
+
+    def test_resolved_conflict_without_alias_not_reopened(self):
+        self.sync()
+        SyncConflict.objects.filter(conflict_type="WORKER_IDENTITY").update(resolved=True)
+
+        self.assertIsNone(open_identity_conflict(
+            "Juan", "Dela", "Cruz", identity_hash=SyncConflict.objects.get().identity_hash
+        ))
+
+
+class WorkerCreateDuplicateTests(TestCase):
+    """Test worker_create near-duplicate guard"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="password")
+        self.client.login(username="testuser", password="password")
+        Worker.objects.create(
+            first_name="Juan", middle_name="D.", last_name="Cruz",
+            category="VW",
+        )
+        self.data = {
+            "first_name": "Juan",
+            "middle_name": "Dela",
+            "last_name": "Cruz",
+            "category": "VW",
+            "marital_status": "single",
+            "employment_status": "active",
+        }
+
+    def test_duplicate_blocked(self):
+        response = self.client.post(reverse("admin_core:worker_create"), self.data)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Possible duplicate")
+        self.assertEqual(Worker.objects.count(), 1)
+
+    def test_duplicate_confirmed(self):
+        self.data["confirm_not_duplicate"] = "on"
+        response = self.client.post(reverse("admin_core:worker_create"), self.data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Worker.objects.count(), 2)
+
+
+class StreamingSyncTests(TestCase):
+    """Test sync streams source rows with bounded memory"""
+
+    CHUNK_SIZE = 50
+
+    def setUp(self):
+        self.pamayanan = Pamayanan.objects.create(name="Central", address="Quezon City")
+
+    def add_units(self, count):
+        start = SrcHousingUnit.objects.count()
+        SrcHousingUnit.objects.bulk_create(
+            SrcHousingUnit(
+                pamayanan=self.pamayanan,
+                unit_number=str(i),
+                housing_unit_name=f"Unit {i}",
+                date_reported=date(2024, 1, 1),
+            )
+            for i in range(start, start + count)
+        )
+
+    def measure_sync_peak(self):
+        from .services.sync import run_admin_core_sync
+
+        def collected_chunks(*args, **kwargs):
+            # Collect cyclic garbage (the ORM's per-query objects) after
+            # every chunk, so the peak is what the sync holds, not how
+            # long the collector happened to wait
+            for count, row in enumerate(stream_rows(*args, **kwargs), 1):
+                yield row
+                if count % self.CHUNK_SIZE == 0:
+                    gc.collect()
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            with mock.patch("admin_core.services.sync.stream_rows", collected_chunks):
+                run_admin_core_sync(chunk_size=self.CHUNK_SIZE)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def test_stream_rows_returns_named_values(self):
+        self.add_units(3)
+        rows = list(stream_rows(
+            SrcHousingUnit.objects.order_by("pk"),
+            "pamayanan__name", "housing_unit_name",
+            chunk_size=2,
+        ))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0].pamayanan__name, "Central")
+        self.assertEqual(rows[0].housing_unit_name, "Unit 0")
+
+    def test_sync_records_counts(self):
+        self.add_units(5)
+        from .services.sync import run_admin_core_sync
+
+        sync_run = run_admin_core_sync(chunk_size=2)
+        self.assertEqual(sync_run.housing_sites_created, 1)
+        self.assertEqual(sync_run.housing_units_created, 5)
+        self.assertEqual(HousingUnit.objects.count(), 5)
+        self.assertEqual(SyncRun.objects.count(), 1)
+
+    def test_sync_peak_memory_bounded(self):
+        self.add_units(100)
+        small_peak = self.measure_sync_peak()
+
+        # 20x the rows: already-synced units are re-read, so the second
+        # pass covers the full 2,000-row table
+        self.add_units(1900)
+        large_peak = self.measure_sync_peak()
+
+        # Peak is bounded by chunk size, not by row count
+        self.assertLess(large_peak, small_peak * 2)
+
+
+class AdminDashboardStatsTests(TestCase):
+    """Test cached admin_core dashboard counters"""
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.user = User.objects.create_user(username="testuser", password="password")
+        self.client.login(username="testuser", password="password")
+        Worker.objects.create(first_name="Juan", last_name="Cruz", category="MWA", mwa_type="minister")
+        Worker.objects.create(first_name="Pedro", last_name="Santos", category="VW")
+        SyncRun.objects.create(status="failed")
+
+    def test_dashboard_counts(self):
+        response = self.client.get(reverse("admin_core:dashboard"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["worker_total"], 2)
+        self.assertEqual(response.context["sync_failed"], 1)
+        self.assertEqual(
+            {row["category"]: row["total"] for row in response.context["worker_by_category"]},
+            {"MWA": 1, "VW": 1},
+        )
+        self.assertEqual(response.context["mwa_breakdown"], [{"mwa_type": "minister", "total": 1}])
+
+    def test_worker_save_invalidates(self):
+        from .services.stats import admin_dashboard_stats
+
+        self.assertEqual(admin_dashboard_stats.get()["worker_total"], 2)
+        Worker.objects.create(first_name="Maria", last_name="Reyes", category="VW")
+        self.assertEqual(admin_dashboard_stats.get()["worker_total"], 3)
+
+
+class AssignmentListTests(TestCase):
+    """Test the keyset-paginated assignment lists"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="password")
+        self.client.login(username="testuser", password="password")
+
+    def test_worker_office_list_pages(self):
+        worker = Worker.objects.create(first_name="Juan", last_name="Cruz", category="VW")
+        office = Office.objects.create(building=AdminBuilding.objects.create(name="Central"), name="Registry")
+        WorkerOfficeAssignment.objects.bulk_create(
+            WorkerOfficeAssignment(worker=worker, office=office, start_date=date(2024, 1, 1)) for _ in range(51)
+        )
+
+        response = self.client.get(reverse("admin_core:worker_office_list"))
+        page = response.context["assignments"]
+        self.assertEqual(len(page), 50)
+        self.assertContains(response, "Next")
+
+        response = self.client.get(reverse("admin_core:worker_office_list") + "?" + page.next_query)
+        self.assertEqual(len(response.context["assignments"]), 1)
 
-# Create your tests here.
+    def test_housing_assignment_list(self):
+        response = self.client.get(reverse("admin_core:housing_assignment_list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context["assignments"].has_next)
@@ -35,6 +35,7 @@ urlpatterns = [
     
     # Workers
     path("workers/", views.worker_list, name="worker_list"),
+    path("workers/export/", views.worker_export, name="worker_export"),
     path("workers/add/", views.worker_create, name="worker_create"),
     path("workers/<int:pk>/edit/", views.worker_update, name="worker_update"),
     path("workers/<int:pk>/detail/", views.worker_detail, name="worker_detail"),
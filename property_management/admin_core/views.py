@@ -1,4 +1,4 @@
-from datetime import timezone
+from django.utils import timezone
 from django.forms import modelformset_factory
 from django.http import HttpResponseBadRequest, JsonResponse
 from django.shortcuts import get_object_or_404, render, redirect
@@ -7,6 +7,11 @@ from django.contrib.auth.decorators import login_required
 from django.db import transaction
 from django.db.models import Count, Q
 
+from admin_core.services.stats import admin_dashboard_stats
+from properties.exports import export_response
+from properties.pagination import keyset_paginate
+from properties.routers import replica_reads
+from properties.search import WORKER_SEARCH_FIELDS, search_filter
 from admin_core.services.sync import run_admin_core_sync
 
 from .forms import (
@@ -21,6 +26,7 @@ from .models import (
     ConflictFieldDecision
 )
 from .services.conflict_resolver import ConflictResolver
+from .services.identity import link_identity
 from django.contrib.admin.views.decorators import staff_member_required
 
 # ==========================
@@ -30,68 +36,10 @@ from django.contrib.admin.views.decorators import staff_member_required
 @login_required
 def dashboard(request):
     # -------------------------
-    # CORE COUNTS
+    # COUNTS, SYNC METRICS, WORKER BREAKDOWN
+    # (cached snapshot, see admin_core.services.stats)
     # -------------------------
-    department_count = Department.objects.count()
-    section_count = Section.objects.count()
-
-    worker_total = Worker.objects.count()
-    worker_active = Worker.objects.filter(employment_status="active").count()
-
-    office_assignments = WorkerOfficeAssignment.objects.filter(
-        end_date__isnull=True
-    ).count()
-
-    housing_assigned = HousingUnitAssignment.objects.filter(
-        is_current=True
-    ).count()
-
-    # -------------------------
-    # SYNC METRICS
-    # -------------------------
-    latest_sync = SyncRun.objects.order_by("-started_at").first()
-
-    sync_total = SyncRun.objects.count()
-    sync_failed = SyncRun.objects.filter(status="failed").count()
-    sync_partial = SyncRun.objects.filter(status="partial").count()
-    sync_success = SyncRun.objects.filter(status="success").count()
-
-    # -------------------------
-    # WORKER BREAKDOWN
-    # -------------------------
-    worker_by_category = (
-        Worker.objects
-        .values("category")
-        .annotate(total=Count("id"))
-    )
-
-    mwa_breakdown = (
-        Worker.objects
-        .filter(category="MWA")
-        .values("mwa_type")
-        .annotate(total=Count("id"))
-    )
-
-    context = {
-        # core
-        "department_count": department_count,
-        "section_count": section_count,
-        "worker_total": worker_total,
-        "worker_active": worker_active,
-        "office_assignments": office_assignments,
-        "housing_assigned": housing_assigned,
-
-        # sync
-        "latest_sync": latest_sync,
-        "sync_total": sync_total,
-        "sync_failed": sync_failed,
-        "sync_partial": sync_partial,
-        "sync_success": sync_success,
-
-        # breakdowns
-        "worker_by_category": worker_by_category,
-        "mwa_breakdown": mwa_breakdown,
-    }
+    context = admin_dashboard_stats.get()
 
     return render(request, "admin_core/dashboard.html", context)
 
@@ -440,12 +388,30 @@ def office_update(request, pk):
 # WORKERS
 # ==========================
 
-@login_required
-def worker_list(request):
+WORKER_EXPORT_COLUMNS = [
+    ("Employee No", "employee_no"),
+    ("Last Name", "last_name"),
+    ("First Name", "first_name"),
+    ("Middle Name", "middle_name"),
+    ("Category", "category"),
+    ("MWA Type", "mwa_type"),
+    ("Marital Status", "marital_status"),
+    ("Employment Status", "employment_status"),
+    ("Remarks", "remarks"),
+    ("Created", "created_at"),
+]
+
+
+def filter_workers(request):
+    """Worker queryset for the ?q=, ?category= and ?status= filters"""
     workers = Worker.objects.all()
 
     category = request.GET.get("category")
     status = request.GET.get("status")
+    query = request.GET.get("q", "").strip()
+
+    if query:
+        workers = search_filter(workers, WORKER_SEARCH_FIELDS, query)
 
     if category:
         workers = workers.filter(category=category)
@@ -453,7 +419,18 @@ def worker_list(request):
     if status:
         workers = workers.filter(employment_status=status)
 
-    workers = workers.order_by("last_name", "first_name")
+    return workers, category, status, query
+
+
+@login_required
+def worker_list(request):
+    workers, category, status, query = filter_workers(request)
+
+    workers = (
+        workers
+        .annotate(office_assignment_count=Count("office_assignments"))
+        .order_by("last_name", "first_name")
+    )
 
     # Get departments for filter dropdown
     departments = Department.objects.all()
@@ -462,14 +439,24 @@ def worker_list(request):
         request,
         "admin_core/worker_list.html",
         {
-            "workers": workers,
+            "workers": keyset_paginate(request, workers),
             "category": category,
             "status": status,
+            "query": query,
             "departments": departments,
         },
     )
 
 
+@login_required
+@replica_reads
+def worker_export(request):
+    """Stream the filtered worker list as CSV or XLSX"""
+    workers, *_ = filter_workers(request)
+    workers = workers.order_by("last_name", "first_name")
+    return export_response(request, workers, WORKER_EXPORT_COLUMNS, "workers")
+
+
 @login_required
 def worker_create(request):
     form = WorkerForm(request.POST or None)
@@ -485,6 +472,7 @@ def worker_create(request):
         {
             "form": form,
             "title": "Add Worker",
+            "identity_candidates": getattr(form, "identity_candidates", []),
         },
     )
 
@@ -572,7 +560,7 @@ def worker_office_list(request):
     return render(
         request,
         "admin_core/worker_office_list.html",
-        {"assignments": assignments},
+        {"assignments": keyset_paginate(request, assignments)},
     )
 
 
@@ -659,7 +647,7 @@ def housing_assignment_list(request):
     return render(
         request,
         "admin_core/housing_assignment_list.html",
-        {"assignments": assignments},
+        {"assignments": keyset_paginate(request, assignments)},
     )
 
 
@@ -816,18 +804,22 @@ def merge_conflict_view(request, conflict_id):
             if choice not in ("existing", "incoming"):
                 continue
 
-            ConflictFieldDecision.objects.update_or_create(
-                conflict=conflict,
-                field_name=field,
-                defaults={"decision": choice}
-            )
-
             decisions[field] = (
                 existing.get(field)
                 if choice == "existing"
                 else incoming.get(field)
             )
 
+            ConflictFieldDecision.objects.update_or_create(
+                conflict=conflict,
+                field_name=field,
+                defaults={
+                    "decision_type": "keep_existing" if choice == "existing" else "use_incoming",
+                    "chosen_value": decisions[field] or "",
+                    "resolved_by": request.user.username,
+                }
+            )
+
         # -------------------------
         # APPLY RESOLUTION
         # -------------------------
@@ -854,6 +846,8 @@ def merge_conflict_view(request, conflict_id):
         conflict.resolved = True
         conflict.resolved_at = timezone.now()
         conflict.save()
+        # The next sync maps the incoming name to this worker
+        link_identity(conflict)
 
         messages.success(request, "Conflict resolved successfully.")
         return redirect("/admin/admin_core/syncconflict/")
@@ -906,7 +900,7 @@ def conflict_list(request):
     conflicts = SyncConflict.objects.filter(resolved=False).order_by("-created_at")
 
     return render(request, "admin_core/conflict_list.html", {
-        "conflicts": conflicts
+        "conflicts": keyset_paginate(request, conflicts)
     })
 
 @login_required
@@ -934,13 +928,15 @@ def conflict_resolve(request, pk):
     ConflictFieldDecision.objects.create(
         conflict=conflict,
         field_name="__ALL__",
-        decision=decision,
+        decision_type="keep_existing" if decision == "existing" else "use_incoming",
+        resolved_by=request.user.username,
     )
 
     conflict.resolved = True
     conflict.resolved_at = timezone.now()
     conflict.resolution_notes = f"Resolved by {request.user.username}"
     conflict.save()
+    link_identity(conflict)
 
     messages.success(request, "Conflict resolved successfully.")
     return redirect("admin_core:conflict_list")
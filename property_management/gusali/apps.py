@@ -5,3 +5,10 @@ class GusaliConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'gusali'
     verbose_name = 'Gusali (Building) Management'
+
+    def ready(self):
+        from properties.rollups import connect_rollup
+
+        import gusali.signals
+
+        connect_rollup("building")
@@ -12,9 +12,12 @@ from datetime import datetime, date
 import openpyxl
 import hashlib
 import os
+import time
 from decimal import Decimal
 from gusali.models import Building, BuildingYearlyRecord
+from properties.metrics import record_import
 from properties.models import ImportedFile, Local
+from properties.rollups import deferred_rollups
 
 
 class Command(BaseCommand):
@@ -26,7 +29,9 @@ class Command(BaseCommand):
         parser.add_argument('--clear', action='store_true', help='Clear existing buildings before import')
         parser.add_argument('--local', type=str, help='Local code to associate buildings with')
 
+    @deferred_rollups()
     def handle(self, *args, **options):
+        started = time.monotonic()
         file_path = options['file_path']
         force_import = options.get('force', False)
         local_code = options.get('local')
@@ -225,6 +230,8 @@ class Command(BaseCommand):
         self.stdout.write(self.style.WARNING(f'Rows Skipped: {skipped_count}'))
         self.stdout.write(self.style.SUCCESS(f'{"="*80}\n'))
         
+        record_import('gusali', building_count, time.monotonic() - started)
+
         # Save import record
         status = 'partial' if skipped_count > 0 else 'success'
         ImportedFile.objects.update_or_create(
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from gusali.reports import rebuild_building_reports
+
+
+class Command(BaseCommand):
+    help = "Regenerate every building report snapshot (after writes that skip signals)"
+
+    def handle(self, *args, **options):
+        count = rebuild_building_reports()
+        self.stdout.write(self.style.SUCCESS(f"✓ Rebuilt building reports for {count} years"))
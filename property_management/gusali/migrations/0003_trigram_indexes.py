@@ -0,0 +1,22 @@
+# Generated by Django 4.2.8 on 2026-10-19 00:00
+
+from django.db import migrations
+
+from properties.filters import trigram_index_sql
+
+
+# Substring search indexes for the list filters (skipped without pg_trgm)
+CREATE_TRIGRAM_INDEXES, DROP_TRIGRAM_INDEXES = trigram_index_sql(
+    'gusali_building', ('name', 'lcode', 'dcode')
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gusali', '0002_building_dcode_building_lcode'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRIGRAM_INDEXES, DROP_TRIGRAM_INDEXES),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.8 on 2026-10-19 00:18
+
+from django.db import migrations, models
+
+
+def mark_years_stale(apps, schema_editor):
+    """Create a stale snapshot for every year; the report view fills them in"""
+    Building = apps.get_model('gusali', 'Building')
+    BuildingYearlyRecord = apps.get_model('gusali', 'BuildingYearlyRecord')
+    BuildingReportSnapshot = apps.get_model('gusali', 'BuildingReportSnapshot')
+
+    years = set(Building.objects.values_list('year_covered', flat=True).distinct())
+    years |= set(BuildingYearlyRecord.objects.values_list('year', flat=True).distinct())
+    BuildingReportSnapshot.objects.bulk_create(
+        BuildingReportSnapshot(year=year) for year in years
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gusali', '0003_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BuildingReportSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField(unique=True)),
+                ('data', models.JSONField(default=dict)),
+                ('is_stale', models.BooleanField(default=True)),
+                ('version', models.PositiveIntegerField(default=0, help_text='Bumped on every write; a regeneration only lands if unchanged')),
+                ('generated_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Building Report Snapshot',
+                'verbose_name_plural': 'Building Report Snapshots',
+                'ordering': ['-year'],
+            },
+        ),
+        migrations.RunPython(mark_years_stale, migrations.RunPython.noop),
+    ]
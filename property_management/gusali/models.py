@@ -252,3 +252,28 @@ class BuildingYearlyRecord(models.Model):
         self.total_added = self.calculate_total_added()
         self.year_end_total = self.calculate_year_end_total()
         super().save(*args, **kwargs)
+
+
+class BuildingReportSnapshot(models.Model):
+    """Persisted building report totals for one year_covered
+
+    Marked stale by signals on Building / BuildingYearlyRecord writes for
+    that year and regenerated on the next report view (see gusali.reports).
+    """
+
+    year = models.IntegerField(unique=True)
+    data = models.JSONField(default=dict)
+    is_stale = models.BooleanField(default=True)
+    version = models.PositiveIntegerField(
+        default=0,
+        help_text="Bumped on every write; a regeneration only lands if unchanged"
+    )
+    generated_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-year']
+        verbose_name = 'Building Report Snapshot'
+        verbose_name_plural = 'Building Report Snapshots'
+
+    def __str__(self):
+        return f"Building report {self.year}"
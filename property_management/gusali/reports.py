@@ -0,0 +1,202 @@
+"""
+Building (Gusali) summary report.
+
+The report is kept as one BuildingReportSnapshot row per year_covered.
+Writes to Building / BuildingYearlyRecord only bump that year's version
+(see gusali.signals); the next report view regenerates the stale years
+in two grouped queries and every other view is a single read of the
+snapshot table.
+
+Snapshots are written with update(), which sends no post_save, so both
+writers bump the "reports" cache namespace themselves; the report
+page's cached table fragment is keyed on it.
+"""
+
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from properties.cache import invalidate_namespace
+
+from .models import Building, BuildingReportSnapshot, BuildingYearlyRecord
+
+
+CODES = [code for code, _ in Building.BUILDING_CODE_CHOICES]
+CODE_LABELS = dict(Building.BUILDING_CODE_CHOICES)
+
+
+# ======================================================
+# INVALIDATION
+# ======================================================
+
+def mark_stale(year):
+    """Flag one year's snapshot for regeneration (creating the row if new)"""
+    if year is None:
+        return
+    updated = BuildingReportSnapshot.objects.filter(year=year).update(
+        is_stale=True, version=F("version") + 1
+    )
+    if not updated:
+        BuildingReportSnapshot.objects.get_or_create(year=year)
+    invalidate_namespace("reports")
+
+
+# ======================================================
+# GENERATION
+# ======================================================
+
+def compute_years(years):
+    """
+    Report data for several years: one GROUP BY year_covered with a
+    conditional count / sum per building code, and one GROUP BY year
+    over the yearly records.
+    """
+    per_code = {}
+    for code in CODES:
+        per_code[f"count_{code}"] = Count("id", filter=Q(code=code))
+        per_code[f"cost_{code}"] = Sum("current_total_cost", filter=Q(code=code))
+
+    data = {
+        year: {"codes": {}, "total_buildings": 0, "total_cost": "0", "yearly": None}
+        for year in years
+    }
+
+    buildings = (
+        Building.objects.filter(year_covered__in=years)
+        .order_by()
+        .values("year_covered")
+        .annotate(total_buildings=Count("id"), total_cost=Sum("current_total_cost"), **per_code)
+    )
+    for row in buildings:
+        report = data[row["year_covered"]]
+        report["total_buildings"] = row["total_buildings"]
+        report["total_cost"] = str(row["total_cost"] or 0)
+        report["codes"] = {
+            code: {"count": row[f"count_{code}"], "total_cost": str(row[f"cost_{code}"] or 0)}
+            for code in CODES
+        }
+
+    records = (
+        BuildingYearlyRecord.objects.filter(year__in=years)
+        .order_by()
+        .values("year")
+        .annotate(
+            buildings_count=Count("building", distinct=True),
+            total_added=Sum("total_added"),
+            total_removed=Sum("broken_removed_cost"),
+            year_end_total=Sum("year_end_total"),
+        )
+    )
+    for row in records:
+        data[row["year"]]["yearly"] = {
+            "buildings_count": row["buildings_count"],
+            "total_added": str(row["total_added"] or 0),
+            "total_removed": str(row["total_removed"] or 0),
+            "year_end_total": str(row["year_end_total"] or 0),
+        }
+
+    return data
+
+
+def regenerate(snapshots):
+    """
+    Recompute the given snapshots. A snapshot whose version moved while
+    computing stays stale, so a concurrent write is never lost.
+    """
+    if not snapshots:
+        return
+
+    data = compute_years([snapshot.year for snapshot in snapshots])
+    now = timezone.now()
+
+    with transaction.atomic():
+        for snapshot in snapshots:
+            report = data[snapshot.year]
+            if not report["total_buildings"] and report["yearly"] is None:
+                # Nothing left for this year
+                BuildingReportSnapshot.objects.filter(pk=snapshot.pk, version=snapshot.version).delete()
+                snapshot.data = {}
+                continue
+
+            BuildingReportSnapshot.objects.filter(pk=snapshot.pk, version=snapshot.version).update(
+                data=report, is_stale=False, generated_at=now
+            )
+            snapshot.data = report
+            snapshot.is_stale = False
+            snapshot.generated_at = now
+
+    invalidate_namespace("reports")
+
+
+def rebuild_building_reports():
+    """Mark every year stale and regenerate (after writes that skip signals)"""
+    years = set(Building.objects.values_list("year_covered", flat=True).distinct()) | set(
+        BuildingYearlyRecord.objects.values_list("year", flat=True).distinct()
+    )
+    for year in years:
+        mark_stale(year)
+    BuildingReportSnapshot.objects.exclude(year__in=years).delete()
+    regenerate(list(BuildingReportSnapshot.objects.all()))
+    return len(years)
+
+
+# ======================================================
+# READ
+# ======================================================
+
+def building_report(year=None):
+    """
+    Context for the building report, for one year or all years.
+    A cache hit is a single query.
+    """
+    snapshots = list(BuildingReportSnapshot.objects.order_by("-year"))
+    regenerate([snapshot for snapshot in snapshots if snapshot.is_stale])
+    snapshots = [snapshot for snapshot in snapshots if snapshot.data]
+    years = [snapshot.year for snapshot in snapshots]
+
+    if year is not None:
+        snapshots = [snapshot for snapshot in snapshots if snapshot.year == year]
+
+    code_summary = {
+        code: {"label": CODE_LABELS[code], "count": 0, "total_cost": Decimal("0")}
+        for code in CODES
+    }
+    total_buildings = 0
+    total_cost = Decimal("0")
+    yearly_records = []
+
+    for snapshot in snapshots:
+        report = snapshot.data
+        total_buildings += report["total_buildings"]
+        total_cost += Decimal(report["total_cost"])
+        for code, values in report["codes"].items():
+            code_summary[code]["count"] += values["count"]
+            code_summary[code]["total_cost"] += Decimal(values["total_cost"])
+
+        if report["yearly"]:
+            record = {key: Decimal(value) for key, value in report["yearly"].items() if key != "buildings_count"}
+            record["year"] = snapshot.year
+            record["buildings_count"] = report["yearly"]["buildings_count"]
+            record["net_change"] = record["total_added"] + record["total_removed"]
+            record["net_change_abs"] = abs(record["net_change"])
+            yearly_records.append(record)
+
+    # Trend against the previous row of the table
+    for previous, record in zip(yearly_records, yearly_records[1:]):
+        record["trend_up"] = record["year_end_total"] > previous["year_end_total"]
+        base = previous["year_end_total"]
+        record["trend_percent"] = (
+            abs(record["year_end_total"] - base) / base * 100 if base else Decimal("100")
+        )
+
+    return {
+        "code_summary": code_summary,
+        "total_buildings": total_buildings,
+        "total_cost": total_cost,
+        "average_cost": total_cost / total_buildings if total_buildings else Decimal("0"),
+        "yearly_records": yearly_records,
+        "years": years,
+        "generated_at": max((s.generated_at for s in snapshots if s.generated_at), default=None),
+    }
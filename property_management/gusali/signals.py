@@ -0,0 +1,47 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from gusali.models import Building, BuildingYearlyRecord
+from gusali.reports import mark_stale
+
+
+# Year field whose report snapshot a write invalidates
+REPORT_YEAR_FIELDS = {
+    Building: "year_covered",
+    BuildingYearlyRecord: "year",
+}
+
+
+@receiver(pre_save, sender=Building)
+@receiver(pre_save, sender=BuildingYearlyRecord)
+def remember_report_year(sender, instance, raw=False, **kwargs):
+    """
+    Keep the previous year so a row moved between years
+    invalidates both report snapshots.
+    """
+    instance._previous_report_year = None
+    if instance.pk and not raw:
+        instance._previous_report_year = (
+            sender.objects.filter(pk=instance.pk)
+            .values_list(REPORT_YEAR_FIELDS[sender], flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Building)
+@receiver(post_save, sender=BuildingYearlyRecord)
+@receiver(post_delete, sender=Building)
+@receiver(post_delete, sender=BuildingYearlyRecord)
+def invalidate_building_report(sender, instance, raw=False, **kwargs):
+    """
+    Mark the building report snapshot for the row's year stale.
+    """
+    if raw:
+        return
+
+    year = getattr(instance, REPORT_YEAR_FIELDS[sender])
+    mark_stale(year)
+
+    previous = getattr(instance, "_previous_report_year", None)
+    if previous is not None and previous != year:
+        mark_stale(previous)
@@ -3,7 +3,10 @@ from django.contrib.auth.models import User
 from decimal import Decimal
 from datetime import date
 
-from .models import Building, BuildingYearlyRecord
+from django.urls import reverse
+
+from .models import Building, BuildingReportSnapshot, BuildingYearlyRecord
+from .reports import building_report, mark_stale, regenerate
 
 
 class BuildingModelTests(TestCase):
@@ -101,3 +104,80 @@ class BuildingYearlyRecordTests(TestCase):
                 year=2024,
                 cost_last_year=Decimal('200000'),
             )
+
+
+class BuildingReportSnapshotTests(TestCase):
+    """Test the per-year building report snapshots"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.client.login(username='testuser', password='password123')
+
+        self.kapilya = Building.objects.create(code='A', name='KAPILYA', year_covered=2024,
+                                               current_total_cost=Decimal('1000'))
+        Building.objects.create(code='D', name='GUARD HOUSE', year_covered=2024,
+                                current_total_cost=Decimal('200'))
+        Building.objects.create(code='A', name='KAPILYA', year_covered=2023,
+                                current_total_cost=Decimal('900'))
+        BuildingYearlyRecord.objects.create(building=self.kapilya, year=2024,
+                                            cost_last_year=Decimal('900'), construction_cost=Decimal('100'))
+
+    def test_report_totals(self):
+        report = building_report()
+        self.assertEqual(report['total_buildings'], 3)
+        self.assertEqual(report['total_cost'], Decimal('2100'))
+        self.assertEqual(report['code_summary']['A']['count'], 2)
+        self.assertEqual(report['years'], [2024, 2023])
+
+        report = building_report(2024)
+        self.assertEqual(report['code_summary']['A']['total_cost'], Decimal('1000'))
+        self.assertEqual(report['code_summary']['D']['count'], 1)
+        self.assertEqual(report['yearly_records'][0]['year_end_total'], Decimal('1000'))
+
+    def test_cache_hit_is_one_query(self):
+        building_report()
+        with self.assertNumQueries(1):
+            building_report()
+
+    def test_write_regenerates_only_its_year(self):
+        building_report()
+        generated_2023 = BuildingReportSnapshot.objects.get(year=2023).generated_at
+
+        Building.objects.create(code='B', name='PASTORAL', year_covered=2024,
+                                current_total_cost=Decimal('50'))
+        self.assertTrue(BuildingReportSnapshot.objects.get(year=2024).is_stale)
+        self.assertFalse(BuildingReportSnapshot.objects.get(year=2023).is_stale)
+
+        self.assertEqual(building_report(2024)['total_cost'], Decimal('1250'))
+        self.assertEqual(BuildingReportSnapshot.objects.get(year=2023).generated_at, generated_2023)
+
+    def test_moved_building_invalidates_both_years(self):
+        building_report()
+        self.kapilya.year_covered = 2023
+        self.kapilya.save()
+
+        self.assertEqual(building_report(2023)['total_buildings'], 2)
+        self.assertEqual(building_report(2024)['total_buildings'], 1)
+
+    def test_concurrent_write_keeps_snapshot_stale(self):
+        snapshot = BuildingReportSnapshot.objects.get(year=2024)
+        mark_stale(2024)  # a write lands while `snapshot` is being regenerated
+        regenerate([snapshot])
+        self.assertTrue(BuildingReportSnapshot.objects.get(year=2024).is_stale)
+
+    def test_cached_report_table_follows_edits(self):
+        url = reverse('gusali:building_report')
+        self.assertNotContains(self.client.get(url), '₱99777')
+
+        record = BuildingYearlyRecord.objects.get()
+        record.construction_cost = Decimal('98877')
+        with self.captureOnCommitCallbacks(execute=True):
+            record.save()
+
+        self.assertContains(self.client.get(url), '₱99777')
+
+    def test_report_view(self):
+        response = self.client.get(reverse('gusali:building_report'), {'year': '2024'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_buildings'], 2)
+        self.assertEqual(response.context['current_year'], '2024')
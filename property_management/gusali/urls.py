@@ -6,6 +6,7 @@ app_name = 'gusali'
 urlpatterns = [
     path('', views.building_list, name='building_list'),
     path('<int:pk>/', views.building_detail, name='building_detail'),
+    path('export/', views.building_export, name='building_export'),
     path('upload/', views.building_upload, name='building_upload'),
     path('report/', views.building_report, name='building_report'),
     path('create/', views.building_create, name='building_create'),
@@ -1,131 +1,94 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Sum
+from django.db.models import Count, Max, Sum
 from django.core.management import call_command
 from io import StringIO
 import os
 import csv
 from django.http import HttpResponse, JsonResponse
 
-from .models import Building, BuildingYearlyRecord
+from .models import Building, BuildingReportSnapshot, BuildingYearlyRecord
+from .reports import building_report as building_report_context
+from properties.conditional import conditional_page, queryset_version
 from properties.models import District, Local
+from properties.exports import export_response
+from properties.filters import AssetFilter
+from properties.rollups import deferred_rollups
+from properties.pagination import keyset_paginate
+from properties.routers import replica_reads
 from .forms import BuildingForm, BuildingYearlyRecordForm
 
 
+BUILDING_EXPORT_COLUMNS = [
+    ('Code', 'code'),
+    ('Name', 'name'),
+    ('Classification', 'classification'),
+    ('District Code', 'dcode'),
+    ('Local Code', 'lcode'),
+    ('Local', 'local__name'),
+    ('Year Covered', 'year_covered'),
+    ('Donated', 'is_donated'),
+    ('Donation Date', 'donation_date'),
+    ('Ownership Date', 'ownership_date'),
+    ('Constructor', 'constructor'),
+    ('Capacity', 'capacity'),
+    ('Original Cost', 'original_cost'),
+    ('Current Total Cost', 'current_total_cost'),
+    ('Remarks', 'remarks'),
+]
+
+
+def building_filter(request):
+    """Filters shared by the building list and its export"""
+    return AssetFilter(
+        request.GET,
+        search_fields=('name', 'lcode', 'dcode'),
+        code_field='code',
+        year_field='year_covered',
+    )
+
+
+def building_list_version(request):
+    """Buildings plus the district / local names the filters match on"""
+    return [
+        queryset_version(Building.objects.all()),
+        queryset_version(District.objects.all()),
+        queryset_version(Local.objects.all()),
+    ]
+
+
 @login_required
+@conditional_page(building_list_version)
 def building_list(request):
     """Display list of all buildings with filtering by district, local, code, and year"""
-    buildings = Building.objects.select_related('local', 'local__district').all()
-    
-    # Search query (searches district code, district name, local code, local name)
-    search_query = request.GET.get('q', '').strip()
-    if search_query:
-        # Create separate querysets for each search field
-        search_results = Building.objects.none()  # Empty queryset to start
-        
-        # Search in local lcode
-        search_results = search_results | buildings.filter(local__lcode__icontains=search_query)
-        
-        # Search in building's own lcode
-        search_results = search_results | buildings.filter(lcode__icontains=search_query)
-        
-        # Search in local name
-        search_results = search_results | buildings.filter(local__name__icontains=search_query)
-        
-        # Search in district dcode
-        search_results = search_results | buildings.filter(local__district__dcode__icontains=search_query)
-        
-        # Search in building's own dcode
-        search_results = search_results | buildings.filter(dcode__icontains=search_query)
-        
-        # Search in district name
-        search_results = search_results | buildings.filter(local__district__name__icontains=search_query)
-        
-        # Search in building name
-        search_results = search_results | buildings.filter(name__icontains=search_query)
-        
-        # Remove duplicates
-        buildings = search_results.distinct()
-    
-    # Filter by district code or name
-    district_filter = request.GET.get('district', '').strip()
-    if district_filter:
-        # Try filtering by exact district code first
-        district_results = buildings.filter(local__district__dcode__iexact=district_filter)
-        
-        # If no results, try by district name
-        if not district_results.exists():
-            district_results = buildings.filter(local__district__name__icontains=district_filter)
-        
-        # Also check building's own dcode
-        district_results = district_results | buildings.filter(dcode__iexact=district_filter)
-        
-        buildings = district_results.distinct()
-    
-    # Filter by local code or name
-    local_filter = request.GET.get('local', '').strip()
-    if local_filter:
-        # Try filtering by exact local code first
-        local_results = buildings.filter(local__lcode__iexact=local_filter)
-        
-        # If no results, try by local name
-        if not local_results.exists():
-            local_results = buildings.filter(local__name__icontains=local_filter)
-        
-        # Also check building's own lcode
-        local_results = local_results | buildings.filter(lcode__iexact=local_filter)
-        
-        buildings = local_results.distinct()
-    
-    # Filter by building code
-    code_filter = request.GET.get('code')
-    if code_filter:
-        buildings = buildings.filter(code=code_filter)
-    
-    # Filter by year
-    year_filter = request.GET.get('year')
-    if year_filter:
-        buildings = buildings.filter(year_covered=year_filter)
-    
-    # Calculate totals
-    total_cost = buildings.aggregate(total=Sum('current_total_cost'))['total'] or 0
-    
+    asset_filter = building_filter(request)
+    buildings = asset_filter.apply(Building.objects.all())
+
+    # Calculate totals (count and cost in one aggregate)
+    totals = buildings.aggregate(count=Count('id'), cost=Sum('current_total_cost'))
+    total_cost = totals['cost'] or 0
+
     # Get unique years for filter dropdown
     years = Building.objects.values_list('year_covered', flat=True).distinct().order_by('-year_covered')
-    
-    # Get districts and locals for filter dropdowns
-    districts = District.objects.all().order_by('name')
-    locals_list = Local.objects.select_related('district').all().order_by('district__name', 'name')
-    
-    # Filter locals by district if selected (for dependent dropdown)
-    current_district_obj = None
-    if district_filter:
-        current_district_obj = District.objects.filter(dcode=district_filter).first()
-        locals_list = locals_list.filter(district__dcode=district_filter)
-    
-    current_local_obj = None
-    if local_filter:
-        current_local_obj = Local.objects.filter(lcode=local_filter).first()
-    
+
     context = {
-        'buildings': buildings,
+        'buildings': keyset_paginate(request, buildings),
+        'total_buildings': totals['count'],
         'total_cost': total_cost,
         'years': years,
-        'districts': districts,
-        'locals': locals_list,
-        'search_query': search_query,
-        'current_district': district_filter,
-        'current_district_name': current_district_obj.name if current_district_obj else '',
-        'current_local': local_filter,
-        'current_local_name': current_local_obj.name if current_local_obj else '',
-        'current_code': code_filter,
-        'current_year': year_filter,
         'code_choices': Building.BUILDING_CODE_CHOICES,
+        **asset_filter.context(),
     }
     return render(request, 'gusali/building_list.html', context)
 
 
+@login_required
+@replica_reads
+def building_export(request):
+    """Stream the filtered building list as CSV or XLSX"""
+    buildings = building_filter(request).apply(Building.objects.all())
+    return export_response(request, buildings, BUILDING_EXPORT_COLUMNS, 'buildings')
 
 
 @login_required
@@ -184,48 +147,21 @@ def building_upload(request):
     return render(request, 'gusali/building_upload.html', context)
 
 
-@login_required
-def building_report(request):
-    """Display building summary report"""
-    buildings = Building.objects.all()
-    
-    # Group by code
-    code_summary = {}
-    for code, label in Building.BUILDING_CODE_CHOICES:
-        code_buildings = buildings.filter(code=code)
-        code_summary[code] = {
-            'label': label,
-            'count': code_buildings.count(),
-            'total_cost': code_buildings.aggregate(total=Sum('current_total_cost'))['total'] or 0,
-        }
-    
-    # Overall totals
-    total_buildings = buildings.count()
-    total_cost = buildings.aggregate(total=Sum('current_total_cost'))['total'] or 0
-    
-    # Yearly totals (materialize as list)
-    yearly_records = list(
-        BuildingYearlyRecord.objects.values('year').annotate(
-            total_added=Sum('total_added'),
-            total_removed=Sum('broken_removed_cost'),
-            year_end_total=Sum('year_end_total'),
-        ).order_by('-year')
+def building_report_version(request):
+    """Snapshot versions move on every write (gusali.signals), before regeneration"""
+    version = BuildingReportSnapshot.objects.aggregate(
+        generated_at=Max('generated_at'), versions=Sum('version'), count=Count('pk')
     )
+    return [(version['generated_at'], version['versions'], version['count'])]
 
-    # ── Add computed financial values ──
-    for r in yearly_records:
-        added = r['total_added'] or 0
-        removed = r['total_removed'] or 0
-
-        r['net_change'] = added + removed
-        r['net_change_abs'] = abs(r['net_change'])
-
-    context = {
-        'code_summary': code_summary,
-        'total_buildings': total_buildings,
-        'total_cost': total_cost,
-        'yearly_records': yearly_records,
-    }
+@login_required
+@replica_reads
+@conditional_page(building_report_version)
+def building_report(request):
+    """Display building summary report (all years, or ?year=)"""
+    year = request.GET.get('year', '').strip()
+    context = building_report_context(int(year) if year.isdigit() else None)
+    context['current_year'] = year if year.isdigit() else ''
     return render(request, 'gusali/building_report.html', context)
 
 @login_required
@@ -312,9 +248,10 @@ def gusali_csv_upload(request):
             decoded_file = csv_file.read().decode('utf-8').splitlines()
             reader = csv.DictReader(decoded_file)
             
-            for row in reader:
-                # Assuming your CSV has headers that match model fields
-                Building.objects.create(**row)
+            with deferred_rollups():
+                for row in reader:
+                    # Assuming your CSV has headers that match model fields
+                    Building.objects.create(**row)
 
             messages.success(request, 'CSV file has been uploaded and processed successfully.')
         except Exception as e:
@@ -5,3 +5,8 @@ class KagamitanConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'kagamitan'
     verbose_name = 'Kagamitan (Equipment Inventory)'
+
+    def ready(self):
+        from properties.rollups import connect_rollup
+
+        connect_rollup("item")
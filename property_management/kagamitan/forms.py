@@ -1,7 +1,8 @@
 from django import forms
+from properties.forms import LocalChoicesMixin
 from .models import Item
 
-class ItemForm(forms.ModelForm):
+class ItemForm(LocalChoicesMixin, forms.ModelForm):
     class Meta:
         model = Item
         fields = '__all__'
@@ -12,9 +12,12 @@ import xlrd
 import hashlib
 import os
 import re
+import time
 from decimal import Decimal
 from kagamitan.models import Item
+from properties.metrics import record_import
 from properties.models import ImportedFile, Local, District
+from properties.rollups import deferred_rollups
 
 
 class Command(BaseCommand):
@@ -26,7 +29,9 @@ class Command(BaseCommand):
         parser.add_argument('--clear', action='store_true', help='Clear existing items before import')
         parser.add_argument('--local', type=str, help='Local code to associate items with')
 
+    @deferred_rollups()
     def handle(self, *args, **options):
+        started = time.monotonic()
         file_path = options['file_path']
         force_import = options.get('force', False)
         local_code = options.get('local')
@@ -165,6 +170,8 @@ class Command(BaseCommand):
                     pass
                     # self.stdout.write(self.style.WARNING(f'Row error: {e}'))
 
+        record_import('kagamitan', count, time.monotonic() - started)
+
         self.stdout.write(self.style.SUCCESS(f'Imported {count} items.'))
         
         ImportedFile.objects.update_or_create(
@@ -5,11 +5,13 @@ app_name = 'kagamitan'
 
 urlpatterns = [
     path('', views.item_list, name='item_list'),
+    path('export/', views.item_export, name='item_export'),
     path('<int:pk>/', views.item_detail, name='item_detail'),
     path('create/', views.item_create, name='item_create'),
     path('<int:pk>/update/', views.item_update, name='item_update'),
     path('<int:pk>/delete/', views.item_delete, name='item_delete'),
     path('upload-csv/', views.kagamitan_csv_upload, name='kagamitan_csv_upload'),
     path('upload/', views.item_upload, name='item_upload'),
+    path('report/', views.item_report, name='item_report'),
     path('category/<str:category>/', views.item_list_by_category, name='item_list_by_category'),
 ]
\ No newline at end of file
@@ -1,24 +1,60 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Sum
+from django.db.models import Count, Sum
 import csv
 from io import TextIOWrapper
+from properties.conditional import conditional_page, queryset_version
+from properties.exports import export_response
+from properties.pagination import keyset_paginate
+from properties.routers import replica_reads
+from properties.rollups import deferred_rollups
 from .models import Item
 from .forms import ItemForm
 
 @login_required
 def item_list(request):
-    items = Item.objects.all()
+    items = keyset_paginate(request, Item.objects.all())
     context = {'items': items}
     return render(request, 'kagamitan/item_list.html', context)
 
 @login_required
 def item_list_by_category(request, category):
-    items = Item.objects.filter(location=category)
+    items = keyset_paginate(request, Item.objects.filter(location=category))
     context = {'items': items, 'category': category}
     return render(request, 'kagamitan/item_list.html', context)
 
+ITEM_EXPORT_COLUMNS = [
+    ('District Code', 'dcode'),
+    ('Local Code', 'lcode'),
+    ('Local', 'local__name'),
+    ('Location', 'location'),
+    ('Property Number', 'property_number'),
+    ('Date Acquired', 'date_acquired'),
+    ('Quantity', 'quantity'),
+    ('Item Name', 'item_name'),
+    ('Brand', 'brand'),
+    ('Model', 'model'),
+    ('Material', 'material'),
+    ('Color', 'color'),
+    ('Size', 'size'),
+    ('Unit Price', 'unit_price'),
+    ('Total Price', 'total_price'),
+    ('Reference Number', 'reference_number'),
+    ('Year Reported', 'year_reported'),
+    ('Remarks', 'remarks'),
+]
+
+@login_required
+@replica_reads
+def item_export(request):
+    """Stream the item list (optionally one ?category=) as CSV or XLSX"""
+    items = Item.objects.all()
+    category = request.GET.get('category')
+    if category:
+        items = items.filter(location=category)
+    return export_response(request, items, ITEM_EXPORT_COLUMNS, 'items')
+
 @login_required
 def item_detail(request, pk):
     item = get_object_or_404(Item, pk=pk)
@@ -76,8 +112,9 @@ def kagamitan_csv_upload(request):
             decoded_file = TextIOWrapper(csv_file.file, 'utf-8')
             reader = csv.DictReader(decoded_file)
             
-            for row in reader:
-                Item.objects.create(**row)
+            with deferred_rollups():
+                for row in reader:
+                    Item.objects.create(**row)
 
             messages.success(request, 'CSV file has been uploaded and processed successfully.')
         except Exception as e:
@@ -94,15 +131,18 @@ def item_upload(request):
     messages.info(request, "Excel upload for Kagamitan is not yet implemented.")
     return redirect('kagamitan:item_list')
 
+def item_report_version(request):
+    return [queryset_version(Item.objects.all())]
+
 @login_required
+@replica_reads
+@conditional_page(item_report_version)
 def item_report(request):
     # This view is a placeholder for the summary report functionality
     # Similar to gusali's building_report
-    items = Item.objects.all()
-    total_value = items.aggregate(total=Sum('total_price'))['total'] or 0
+    totals = Item.objects.aggregate(count=Count('id'), total=Sum('total_price'))
     context = {
-        'items': items,
-        'total_items': items.count(),
-        'total_value': total_value,
+        'total_items': totals['count'],
+        'total_value': totals['total'] or 0,
     }
     return render(request, 'kagamitan/item_report.html', context)
\ No newline at end of file
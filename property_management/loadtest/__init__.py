@@ -0,0 +1,42 @@
+"""
+HTTP load tests for a running deployment (gunicorn or runserver).
+
+Virtual users are asyncio tasks, each with its own httpx client and
+session cookie. Each user logs in, then repeatedly runs a weighted
+random journey until the time is up:
+
+    dashboard   log in again and open the dashboard
+    buildings   building list filtered by district / year, then searched
+    inventory   inventory list, two more pages, one unit; kagamitan list
+    transfer    open the transfer form and move one item between units
+    upload      upload a P-7-H workbook (import + admin_core sync), then
+                open the sync dashboard
+
+Every request is timed and reported per step ("inventory: page 2") and
+per journey: count, errors, throughput and p50 / p95 / p99 latency. The
+results are written as JSON so releases can be compared:
+
+    cd property_management
+    pip install -r loadtest/requirements.txt
+
+    python manage.py seed_scale --size medium --clear
+    python manage.py createsuperuser --username loadtest
+    gunicorn --workers 4 --bind 127.0.0.1:8000 property_management.wsgi:application
+
+    LOADTEST_PASSWORD=... python -m loadtest http://127.0.0.1:8000 \\
+        --username loadtest --users 50 --duration 120 --ramp-up 20 \\
+        --upload-file "../P-7-H - Unit 22.xls" \\
+        --output loadtest-results/$(git rev-parse --short HEAD).json \\
+        --compare loadtest-results/baseline.json
+
+--scenario NAME[=WEIGHT] (repeatable) picks the mix; by default every
+journey runs with weight 1 except upload, which needs --upload-file.
+Each upload gets a unique nonce appended so the duplicate check does not
+short-circuit the import. The transfer and upload journeys write to the
+database: run them against a scratch copy.
+
+The test user must not have 2FA enabled. One Python process drives all
+users; if the report says the client was CPU bound, its numbers are a
+lower bound on what the server can do, so run several processes or use
+fewer users per process.
+"""
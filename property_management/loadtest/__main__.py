@@ -0,0 +1,114 @@
+"""
+python -m loadtest BASE_URL [options]; see the package docstring.
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+from . import report
+from .scenarios import SCENARIOS, StepFailed
+
+
+# Above this share of one core the client, not the server, may be the limit
+CLIENT_CPU_WARNING = 0.8
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_mix(parser, values, has_upload):
+    """{journey: weight} from --scenario NAME[=WEIGHT] options"""
+    if not values:
+        return {name: 1.0 for name in SCENARIOS if name != "upload" or has_upload}
+
+    mix = {}
+    for value in values:
+        name, _, weight = value.partition("=")
+        if name not in SCENARIOS:
+            parser.error(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        try:
+            mix[name] = float(weight) if weight else 1.0
+        except ValueError:
+            parser.error(f"Bad weight in {value!r}")
+    if "upload" in mix and not has_upload:
+        parser.error("The upload scenario needs --upload-file")
+    return mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="HTTP load test of key user journeys")
+    parser.add_argument("base_url", help="e.g. http://127.0.0.1:8000")
+    parser.add_argument("--username", default=os.getenv("LOADTEST_USERNAME", "loadtest"))
+    parser.add_argument("--password", default=os.getenv("LOADTEST_PASSWORD"), help="(default: $LOADTEST_PASSWORD)")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds to run")
+    parser.add_argument("--ramp-up", type=float, default=0, help="Seconds over which users start")
+    parser.add_argument("--think-time", type=float, default=0, help="Mean pause between journeys, in seconds")
+    parser.add_argument("--scenario", action="append", metavar="NAME[=WEIGHT]", help="Journey to run (repeatable)")
+    parser.add_argument("--upload-file", help="P-7-H .xls / .xlsx for the upload journey")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60, help="Per-request timeout in seconds")
+    parser.add_argument("--label", help="Name of this run in comparisons (default: git revision)")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Results JSON of an earlier run to compare with")
+    args = parser.parse_args(argv)
+
+    if not args.password:
+        parser.error("Pass --password or set LOADTEST_PASSWORD")
+    mix = parse_mix(parser, args.scenario, bool(args.upload_file))
+    upload = None
+    if args.upload_file:
+        with open(args.upload_file, "rb") as f:
+            upload = (os.path.basename(args.upload_file), f.read())
+    baseline = report.load(args.compare) if args.compare else None
+
+    from .runner import run
+
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    try:
+        samples, seconds, client_cpu = asyncio.run(run(
+            args.base_url.rstrip("/"), args.username, args.password, args.users, args.duration, mix,
+            ramp_up=args.ramp_up, think_time=args.think_time, upload=upload, seed=args.seed,
+            timeout=args.timeout,
+        ))
+    except StepFailed as exc:
+        sys.exit(f"Setup failed: {exc}")
+
+    revision = git_revision()
+    results = report.build_results(samples, seconds, {
+        "label": args.label or revision,
+        "revision": revision,
+        "started_at": started_at,
+        "base_url": args.base_url,
+        "users": args.users,
+        "duration": args.duration,
+        "ramp_up": args.ramp_up,
+        "think_time": args.think_time,
+        "mix": mix,
+        "seed": args.seed,
+        "client_cpu": round(client_cpu, 2),
+    })
+
+    print(report.format_results(results))
+    if client_cpu > CLIENT_CPU_WARNING:
+        print(f"\nWarning: the client used {client_cpu:.0%} of a core; use fewer users per process.")
+    if baseline:
+        print()
+        print(report.compare(baseline, results))
+    if args.output:
+        report.save(results, args.output)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Latency samples -> summary statistics, JSON results and comparisons.
+
+Standard library only, so saved results can be read without httpx.
+"""
+
+import json
+import os
+from collections import Counter, defaultdict
+
+
+RESULTS_VERSION = 1
+
+
+# ======================================================
+# SAMPLES
+# ======================================================
+
+class Samples:
+    """Timings collected during a run"""
+
+    def __init__(self):
+        # (journey, step) -> [ms, ...] of completed requests
+        self.requests = defaultdict(list)
+        # journey -> [ms, ...] of completed journeys
+        self.journeys = defaultdict(list)
+        self.errors = Counter()
+        self.failed_journeys = Counter()
+        self.bytes = Counter()
+
+    def request(self, journey, step, ms, size=0, error=None):
+        if ms is not None:
+            self.requests[(journey, step)].append(ms)
+            self.bytes[(journey, step)] += size
+        if error:
+            self.errors[(journey, step, error)] += 1
+
+    def journey(self, journey, ms, ok=True):
+        if ok:
+            self.journeys[journey].append(ms)
+        else:
+            self.failed_journeys[journey] += 1
+
+
+# ======================================================
+# STATISTICS
+# ======================================================
+
+def percentile(values, fraction):
+    """Linear-interpolated percentile of a sorted list (0 <= fraction <= 1)"""
+    if not values:
+        return None
+    position = (len(values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def latency_stats(values, errors, seconds):
+    values = sorted(values)
+    count = len(values)
+    return {
+        "count": count,
+        "errors": errors,
+        "per_second": round(count / seconds, 2) if seconds else 0.0,
+        "mean_ms": round(sum(values) / count, 1) if count else None,
+        "p50_ms": _round(percentile(values, 0.50)),
+        "p95_ms": _round(percentile(values, 0.95)),
+        "p99_ms": _round(percentile(values, 0.99)),
+        "max_ms": _round(values[-1] if values else None),
+    }
+
+
+def _round(value):
+    return round(value, 1) if value is not None else None
+
+
+def build_results(samples, seconds, meta):
+    """The JSON document for one run"""
+    step_errors = Counter()
+    for (journey, step, _), count in samples.errors.items():
+        step_errors[(journey, step)] += count
+
+    steps = {}
+    for key in sorted(set(samples.requests) | set(step_errors)):
+        stats = latency_stats(samples.requests.get(key, []), step_errors[key], seconds)
+        stats["bytes"] = samples.bytes[key]
+        steps[f"{key[0]}: {key[1]}"] = stats
+
+    journeys = {
+        name: latency_stats(samples.journeys.get(name, []), samples.failed_journeys[name], seconds)
+        for name in sorted(set(samples.journeys) | set(samples.failed_journeys))
+    }
+
+    every_request = [ms for values in samples.requests.values() for ms in values]
+    totals = latency_stats(every_request, sum(samples.errors.values()), seconds)
+    totals["seconds"] = round(seconds, 1)
+    totals["journeys"] = sum(len(values) for values in samples.journeys.values())
+    totals["journeys_per_second"] = round(totals["journeys"] / seconds, 2) if seconds else 0.0
+
+    return {
+        "version": RESULTS_VERSION,
+        "meta": meta,
+        "totals": totals,
+        "journeys": journeys,
+        "steps": steps,
+        "errors": {
+            f"{journey}: {step}: {error}": count
+            for (journey, step, error), count in samples.errors.most_common()
+        },
+    }
+
+
+# ======================================================
+# OUTPUT
+# ======================================================
+
+def save(results, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def _ms(value):
+    return f"{value:.1f}" if value is not None else "-"
+
+
+def format_results(results):
+    """Plain-text tables of journeys and steps"""
+    lines = []
+    totals = results["totals"]
+    lines.append(
+        f"{totals['count']} requests, {totals['errors']} errors in {totals['seconds']}s: "
+        f"{totals['per_second']} req/s, {totals['journeys_per_second']} journeys/s, "
+        f"p50 {_ms(totals['p50_ms'])} / p95 {_ms(totals['p95_ms'])} / p99 {_ms(totals['p99_ms'])} ms"
+    )
+    for title, rows in (("Journey", results["journeys"]), ("Step", results["steps"])):
+        lines.append("")
+        lines.append(
+            f"{title:<36} {'Count':>7} {'Errors':>7} {'/s':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'Max ms':>9}"
+        )
+        for name, stats in rows.items():
+            lines.append(
+                f"{name[:36]:<36} {stats['count']:>7} {stats['errors']:>7} {stats['per_second']:>7} "
+                f"{_ms(stats['p50_ms']):>9} {_ms(stats['p95_ms']):>9} {_ms(stats['p99_ms']):>9} {_ms(stats['max_ms']):>9}"
+            )
+    if results["errors"]:
+        lines.append("")
+        lines.append("Errors:")
+        lines.extend(f"  {count:>6}  {name}" for name, count in results["errors"].items())
+    return "\n".join(lines)
+
+
+def compare(baseline, current):
+    """p95 and throughput of each step against a baseline run"""
+    lines = [
+        f"Compared with {baseline['meta'].get('label') or baseline['meta'].get('started_at', 'baseline')}",
+        f"{'Step':<36} {'p95 before':>11} {'p95 now':>9} {'Change':>8} {'/s before':>10} {'/s now':>8}",
+    ]
+    rows = {**{f"[journey] {k}": v for k, v in current["journeys"].items()}, **current["steps"]}
+    before_rows = {**{f"[journey] {k}": v for k, v in baseline["journeys"].items()}, **baseline["steps"]}
+    for name, stats in rows.items():
+        before = before_rows.get(name)
+        if before is None:
+            lines.append(f"{name[:36]:<36} {'new':>11} {_ms(stats['p95_ms']):>9}")
+            continue
+        change = ""
+        if before["p95_ms"] and stats["p95_ms"] is not None:
+            change = f"{(stats['p95_ms'] - before['p95_ms']) / before['p95_ms']:+.0%}"
+        lines.append(
+            f"{name[:36]:<36} {_ms(before['p95_ms']):>11} {_ms(stats['p95_ms']):>9} {change:>8} "
+            f"{before['per_second']:>10} {stats['per_second']:>8}"
+        )
+    return "\n".join(lines)
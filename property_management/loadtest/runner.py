@@ -0,0 +1,131 @@
+"""
+Virtual users and the run loop.
+"""
+
+import asyncio
+import random
+import time
+
+try:
+    import httpx
+except ImportError as exc:
+    raise ImportError("The load tests require httpx (pip install -r loadtest/requirements.txt)") from exc
+
+from .report import Samples
+from .scenarios import SCENARIOS, StepFailed, load_fixtures
+
+
+LOGIN_URL = "/properties/login/"
+
+
+def http_client(base_url, timeout):
+    # One user makes one request at a time
+    return httpx.AsyncClient(
+        base_url=base_url,
+        timeout=timeout,
+        follow_redirects=False,
+        limits=httpx.Limits(max_connections=1),
+    )
+
+
+class VirtualUser:
+    """One logged-in session, recording the time of each request"""
+
+    def __init__(self, client, samples, username, password, rng, fixtures=None):
+        self.client = client
+        self.samples = samples
+        self.username = username
+        self.password = password
+        self.rng = rng
+        self.fixtures = fixtures
+        # Name the requests are recorded under
+        self.journey = "setup"
+
+    async def request(self, step, method, url, expect=(200,), check=None, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as exc:
+            self.samples.request(self.journey, step, None, error=type(exc).__name__)
+            raise StepFailed(f"{step}: {exc!r}") from exc
+        ms = (time.perf_counter() - started) * 1000
+
+        error = None
+        if response.status_code not in expect:
+            error = f"HTTP {response.status_code}"
+        elif check is not None and not self._passes(check, response):
+            error = "rejected"
+        self.samples.request(self.journey, step, ms, len(response.content), error)
+        if error:
+            raise StepFailed(f"{step}: {error}")
+        return response
+
+    @staticmethod
+    def _passes(check, response):
+        try:
+            return bool(check(response))
+        except (KeyError, ValueError):
+            return False
+
+    async def get(self, step, url, **kwargs):
+        return await self.request(step, "GET", url, **kwargs)
+
+    async def post(self, step, url, data=None, expect=(302,), **kwargs):
+        data = {**(data or {}), "csrfmiddlewaretoken": self.client.cookies.get("csrftoken", "")}
+        # Django checks the Referer of HTTPS form posts
+        headers = {"Referer": str(self.client.base_url.join(url))}
+        return await self.request(step, "POST", url, data=data, headers=headers, expect=expect, **kwargs)
+
+    async def login(self):
+        await self.get("login form", LOGIN_URL)
+        await self.post(
+            "login",
+            LOGIN_URL,
+            data={"username": self.username, "password": self.password},
+            # A failed login renders the form again
+            check=lambda response: LOGIN_URL not in response.headers["location"],
+        )
+
+
+async def run(base_url, username, password, users, duration, mix, ramp_up=0, think_time=0,
+              upload=None, seed=0, timeout=60):
+    """
+    Run `users` virtual users for `duration` seconds. `mix` maps journey
+    names to weights. Returns (samples, seconds, client CPU fraction).
+    """
+    async with http_client(base_url, timeout) as client:
+        setup = VirtualUser(client, Samples(), username, password, random.Random(seed))
+        await setup.login()
+        fixtures = await load_fixtures(setup, upload)
+
+    samples = Samples()
+    names, weights = zip(*mix.items())
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    deadline = started + duration
+
+    async def virtual_user(number):
+        await asyncio.sleep(ramp_up * number / users)
+        rng = random.Random(f"{seed}:{number}")
+        async with http_client(base_url, timeout) as client:
+            user = VirtualUser(client, samples, username, password, rng, fixtures)
+            try:
+                await user.login()
+            except StepFailed:
+                return
+
+            while time.perf_counter() < deadline:
+                user.journey = rng.choices(names, weights)[0]
+                journey_started = time.perf_counter()
+                try:
+                    await SCENARIOS[user.journey](user)
+                    ok = True
+                except StepFailed:
+                    ok = False
+                samples.journey(user.journey, (time.perf_counter() - journey_started) * 1000, ok)
+                if think_time:
+                    await asyncio.sleep(rng.expovariate(1 / think_time))
+
+    await asyncio.gather(*(virtual_user(number) for number in range(users)))
+    seconds = time.perf_counter() - started
+    return samples, seconds, (time.process_time() - cpu_started) / seconds
@@ -0,0 +1,168 @@
+"""
+The user journeys. Each is `async def journey(user)` using VirtualUser's
+get / post, which time and record every request under
+"<journey>: <step>" and raise StepFailed when a response is not the
+expected one.
+
+Ids and filter values come from the read-only API (Fixtures), loaded
+once before the run.
+"""
+
+import html
+import io
+import re
+import uuid
+import zipfile
+
+
+API_PAGE_SIZE = 500
+
+_NEXT_LINK = re.compile(r'href="\?([^"]*)"[^>]*>\s*Next')
+
+
+class StepFailed(Exception):
+    """A request failed; the rest of the journey is skipped"""
+
+
+# ======================================================
+# FIXTURES
+# ======================================================
+
+class Fixtures:
+    """Ids and filter values sampled from the server's data"""
+
+    def __init__(self, districts, locals, years, units, inventory, upload=None):
+        self.districts = districts
+        self.locals = locals
+        self.years = years
+        self.units = units
+        # [{"id", "quantity", "housing_unit_id"}] with stock left
+        self.inventory = inventory
+        # (filename, bytes) or None
+        self.upload = upload
+
+
+async def api_rows(user, resource, fields):
+    response = await user.get(
+        f"api {resource}", f"/api/v1/{resource}/", params={"fields": fields, "page_size": API_PAGE_SIZE}
+    )
+    return response.json()["results"]
+
+
+async def load_fixtures(user, upload=None):
+    districts = [row["dcode"] for row in await api_rows(user, "districts", "dcode")]
+    locals_ = [row["lcode"] for row in await api_rows(user, "locals", "lcode")]
+    years = sorted({row["year_covered"] for row in await api_rows(user, "buildings", "year_covered")} - {None})
+    units = [row["id"] for row in await api_rows(user, "housing-units", "id")]
+    inventory = [row for row in await api_rows(user, "inventory", "id,quantity,housing_unit_id") if row["quantity"]]
+    if not (districts and locals_ and years and units and inventory):
+        raise StepFailed("The server has no data to test with; run manage.py seed_scale first")
+    return Fixtures(districts, locals_, years, units, inventory, upload)
+
+
+def next_page(page_html):
+    """Query string of the keyset pagination "Next" link, if any"""
+    match = _NEXT_LINK.search(page_html)
+    return html.unescape(match.group(1)) if match else None
+
+
+def unique_upload(filename, data):
+    """The workbook with a random nonce, so its file hash is new"""
+    nonce = uuid.uuid4().bytes
+    if filename.lower().endswith(".xlsx"):
+        buffer = io.BytesIO(data)
+        with zipfile.ZipFile(buffer, "a") as archive:
+            archive.comment = nonce.hex().encode()
+        return buffer.getvalue()
+    # .xls (OLE2): an extra sector that no stream references
+    return data + nonce.ljust(512, b"\0")
+
+
+# ======================================================
+# JOURNEYS
+# ======================================================
+
+async def dashboard(user):
+    user.client.cookies.clear()
+    await user.login()
+    await user.get("dashboard", "/properties/dashboard/")
+
+
+async def buildings(user):
+    fixtures, rng = user.fixtures, user.rng
+    district = rng.choice(fixtures.districts)
+    await user.get("by district", "/gusali/", params={"district": district})
+    await user.get("by district + year", "/gusali/", params={"district": district, "year": rng.choice(fixtures.years)})
+    await user.get("search", "/gusali/", params={"q": rng.choice(fixtures.locals)})
+
+
+async def inventory(user):
+    fixtures, rng = user.fixtures, user.rng
+    response = await user.get("list", "/properties/inventory/")
+    for page in (2, 3):
+        query = next_page(response.text)
+        if not query:
+            break
+        response = await user.get(f"page {page}", f"/properties/inventory/?{query}")
+    await user.get("one unit", "/properties/inventory/", params={"housing_unit": rng.choice(fixtures.units)})
+    await user.get("kagamitan", "/kagamitan/", params={"district": rng.choice(fixtures.districts)})
+
+
+async def transfer(user):
+    fixtures, rng = user.fixtures, user.rng
+    if not fixtures.inventory:
+        raise StepFailed("No inventory left to transfer")
+
+    await user.get("form", "/properties/transfers/create/")
+    item = rng.choice(fixtures.inventory)
+    to_unit = rng.choice(fixtures.units)
+    if to_unit == item["housing_unit_id"]:
+        to_unit = fixtures.units[(fixtures.units.index(to_unit) + 1) % len(fixtures.units)]
+
+    response = await user.post(
+        "submit",
+        "/properties/transfers/create/",
+        data={
+            "inventory_item": item["id"],
+            "transfer_type": "unit_to_unit",
+            "from_unit": item["housing_unit_id"],
+            "to_unit": to_unit,
+            "transferred_by": "Load Test",
+            "receiver_name": "Load Test",
+            "status": "good",
+            "reason": "Load test",
+            "remarks": "",
+            "received_date": "",
+            "quantity": 1,
+        },
+        expect=(302,),
+        # Rejected transfers redirect back to the form
+        check=lambda response: not response.headers["location"].rstrip("/").endswith("create"),
+    )
+
+    item["quantity"] -= 1
+    if not item["quantity"] and item in fixtures.inventory:
+        fixtures.inventory.remove(item)
+    await user.get("detail", response.headers["location"])
+
+
+async def upload(user):
+    filename, data = user.fixtures.upload
+    await user.get("form", "/properties/upload/")
+    await user.post(
+        "import + sync",
+        "/properties/upload/",
+        files={"file": (filename, unique_upload(filename, data))},
+        expect=(200,),
+        check=lambda response: response.json().get("success"),
+    )
+    await user.get("sync dashboard", "/admin_core/sync/dashboard/")
+
+
+SCENARIOS = {
+    "dashboard": dashboard,
+    "buildings": buildings,
+    "inventory": inventory,
+    "transfer": transfer,
+    "upload": upload,
+}
@@ -1,7 +1,8 @@
 from django import forms
+from properties.forms import LocalChoicesMixin
 from .models import Land
 
-class LandForm(forms.ModelForm):
+class LandForm(LocalChoicesMixin, forms.ModelForm):
     class Meta:
         model = Land
         fields = '__all__'
@@ -1,9 +1,12 @@
 import os
+import time
 import pandas as pd
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from lupa.models import Land
+from properties.metrics import record_import
 from properties.models import Local
+from properties.rollups import deferred_rollups
 
 class Command(BaseCommand):
     help = 'Import Lupa (Land) data from Excel file'
@@ -11,8 +14,10 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('file_path', type=str, help='Path to the Excel file')
 
+    @deferred_rollups()
     def handle(self, *args, **options):
         file_path = options['file_path']
+        started = time.monotonic()
         self.stdout.write(f"Importing Lupa data from {file_path}...")
 
         try:
@@ -38,6 +43,8 @@ class Command(BaseCommand):
                 pass 
                 # (Actual extraction logic requires file analysis, skipping for now to focus on GUI)
 
+            record_import('lupa', records_created, time.monotonic() - started)
+
             self.stdout.write(self.style.SUCCESS(f"Successfully imported {records_created} land records."))
             
         except Exception as e:
@@ -5,6 +5,7 @@ app_name = 'lupa'
 
 urlpatterns = [
     path('', views.land_list, name='land_list'),
+    path('export/', views.land_export, name='land_export'),
     path('upload/', views.land_upload, name='land_upload'),
     path('create/', views.land_create, name='land_create'),
     path('<int:pk>/', views.land_detail, name='land_detail'),
@@ -1,25 +1,53 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Sum
+from django.db.models import Count, Sum
 import csv
 from io import TextIOWrapper
+from properties.exports import export_response
+from properties.pagination import keyset_paginate
+from properties.routers import replica_reads
 from .models import Land
 from .forms import LandForm
 
 @login_required
 def land_list(request):
     lands = Land.objects.all()
-    total_area = lands.aggregate(total=Sum('lot_area'))['total'] or 0
-    total_value = lands.aggregate(total=Sum('market_value'))['total'] or 0
+    totals = lands.aggregate(
+        count=Count('id'),
+        area=Sum('lot_area'),
+        value=Sum('market_value'),
+    )
     context = {
-        'lands': lands,
-        'total_lands': lands.count(),
-        'total_area': total_area,
-        'total_value': total_value,
+        'lands': keyset_paginate(request, lands),
+        'total_lands': totals['count'],
+        'total_area': totals['area'] or 0,
+        'total_value': totals['value'] or 0,
     }
     return render(request, 'lupa/land_list.html', context)
 
+LAND_EXPORT_COLUMNS = [
+    ('District Code', 'dcode'),
+    ('Local Code', 'lcode'),
+    ('Local', 'local__name'),
+    ('Location', 'location'),
+    ('Lot Area', 'lot_area'),
+    ('Lot Type', 'lot_type'),
+    ('Title Number', 'title_number'),
+    ('Owner', 'owner'),
+    ('Status', 'status'),
+    ('Market Value', 'market_value'),
+    ('Acquisition Cost', 'acquisition_cost'),
+    ('Use Classification', 'use_classification'),
+    ('Remarks', 'remarks'),
+]
+
+@login_required
+@replica_reads
+def land_export(request):
+    """Stream the land list as CSV or XLSX"""
+    return export_response(request, Land.objects.all(), LAND_EXPORT_COLUMNS, 'lands')
+
 @login_required
 def land_detail(request, pk):
     land = get_object_or_404(Land, pk=pk)
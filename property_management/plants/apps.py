@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class PlantsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'plants'
+
+    def ready(self):
+        from properties.rollups import connect_rollup
+
+        connect_rollup("plant")
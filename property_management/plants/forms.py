@@ -1,8 +1,9 @@
 
 from django import forms
+from properties.forms import LocalChoicesMixin
 from .models import Plant
 
-class PlantForm(forms.ModelForm):
+class PlantForm(LocalChoicesMixin, forms.ModelForm):
     class Meta:
         model = Plant
         fields = '__all__'
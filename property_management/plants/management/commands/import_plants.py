@@ -1,9 +1,12 @@
 import os
+import time
 import pandas as pd
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from plants.models import Plant
+from properties.metrics import record_import
 from properties.models import Local
+from properties.rollups import deferred_rollups
 
 class Command(BaseCommand):
     help = 'Import Plants (Pananim) data from Excel file'
@@ -11,8 +14,10 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('file_path', type=str, help='Path to the Excel file')
 
+    @deferred_rollups()
     def handle(self, *args, **options):
         file_path = options['file_path']
+        started = time.monotonic()
         self.stdout.write(f"Importing Plants data from {file_path}...")
 
         try:
@@ -20,6 +25,8 @@ class Command(BaseCommand):
             records_created = 0
             # Implementation pending analysis of "Page 5B"
             
+            record_import('plants', records_created, time.monotonic() - started)
+
             self.stdout.write(self.style.SUCCESS(f"Successfully imported {records_created} plant records."))
             
         except Exception as e:
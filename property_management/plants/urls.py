@@ -5,6 +5,7 @@ app_name = 'plants'
 
 urlpatterns = [
     path('', views.plant_list, name='plant_list'),
+    path('export/', views.plant_export, name='plant_export'),
     path('upload/', views.plant_upload, name='plant_upload'),
     path('create/', views.plant_create, name='plant_create'),
     path('<int:pk>/', views.plant_detail, name='plant_detail'),
@@ -3,70 +3,49 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from .models import Plant
 from .forms import PlantForm
-from properties.models import District, Local
+from properties.exports import export_response
+from properties.filters import AssetFilter
+from properties.pagination import keyset_paginate
+from properties.routers import replica_reads
+
+PLANT_EXPORT_COLUMNS = [
+    ('District Code', 'dcode'),
+    ('Local Code', 'lcode'),
+    ('Local', 'local__name'),
+    ('Name', 'name'),
+    ('Variety', 'variety'),
+    ('Fruit Bearing', 'fruit_bearing'),
+    ('Non-Fruit Bearing', 'non_fruit_bearing'),
+    ('Total Quantity', 'total_quantity'),
+    ('Unit Price', 'unit_price'),
+    ('Total Value', 'total_value'),
+    ('Location', 'location'),
+    ('Remarks', 'remarks'),
+]
+
+def plant_filter(request):
+    """Filters shared by the plant list and its export"""
+    return AssetFilter(request.GET, search_fields=('name', 'variety', 'lcode', 'dcode'))
 
 @login_required
 def plant_list(request):
     """Display list of plants with filtering"""
-    plants = Plant.objects.select_related('local', 'local__district').all()
-    
-    # Search query
-    search_query = request.GET.get('q', '').strip()
-    if search_query:
-        # Create separate querysets for each search field
-        search_results = Plant.objects.none()
-        search_results = search_results | plants.filter(local__name__icontains=search_query)
-        search_results = search_results | plants.filter(local__district__name__icontains=search_query)
-        search_results = search_results | plants.filter(name__icontains=search_query)
-        search_results = search_results | plants.filter(variety__icontains=search_query)
-        search_results = search_results | plants.filter(lcode__icontains=search_query)
-        search_results = search_results | plants.filter(dcode__icontains=search_query)
-        plants = search_results.distinct()
-    
-    # Filter by district
-    district_filter = request.GET.get('district', '').strip()
-    if district_filter:
-        district_results = plants.filter(local__district__dcode__iexact=district_filter)
-        if not district_results.exists():
-            district_results = plants.filter(local__district__name__icontains=district_filter)
-        district_results = district_results | plants.filter(dcode__iexact=district_filter)
-        plants = district_results.distinct()
-    
-    # Filter by local
-    local_filter = request.GET.get('local', '').strip()
-    if local_filter:
-        local_results = plants.filter(local__lcode__iexact=local_filter)
-        if not local_results.exists():
-            local_results = plants.filter(local__name__icontains=local_filter)
-        local_results = local_results | plants.filter(lcode__iexact=local_filter)
-        plants = local_results.distinct()
-        
-    # Get filter options
-    districts = District.objects.all().order_by('name')
-    locals_list = Local.objects.select_related('district').all().order_by('district__name', 'name')
-    
-    # Filter locals by district if selected (for dependent dropdown)
-    current_district_obj = None
-    if district_filter:
-        current_district_obj = District.objects.filter(dcode=district_filter).first()
-        locals_list = locals_list.filter(district__dcode=district_filter)
-        
-    current_local_obj = None
-    if local_filter:
-        current_local_obj = Local.objects.filter(lcode=local_filter).first()
-        
+    asset_filter = plant_filter(request)
+    plants = asset_filter.apply(Plant.objects.all())
+
     context = {
-        'plants': plants,
-        'districts': districts,
-        'locals': locals_list,
-        'search_query': search_query,
-        'current_district': district_filter,
-        'current_district_name': current_district_obj.name if current_district_obj else '',
-        'current_local': local_filter,
-        'current_local_name': current_local_obj.name if current_local_obj else '',
+        'plants': keyset_paginate(request, plants),
+        **asset_filter.context(),
     }
     return render(request, 'plants/plant_list.html', context)
 
+@login_required
+@replica_reads
+def plant_export(request):
+    """Stream the filtered plant list as CSV or XLSX"""
+    plants = plant_filter(request).apply(Plant.objects.all())
+    return export_response(request, plants, PLANT_EXPORT_COLUMNS, 'plants')
+
 @login_required
 def plant_detail(request, pk):
     plant = get_object_or_404(Plant, pk=pk)
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from .models import (Pamayanan, HousingUnit, HousingUnitInventory, ImportedFile, UserProfile, ItemTransfer, 
-                     District, Local, DistrictProperty, DistrictInventory, LocalProperty, LocalInventory)
+                     District, Local, DistrictProperty, DistrictInventory, LocalProperty, LocalInventory,
+                     SlowQuery, InventoryMovement, InventorySnapshot)
 
 
 @admin.register(UserProfile)
@@ -323,3 +324,34 @@ class HousingUnitAdmin(admin.ModelAdmin):
         if obj.building:
             parts.append(obj.building.name)
         return " → ".join(parts)
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ('sql', 'view', 'calls', 'total_ms', 'max_ms', 'last_seen')
+    list_filter = ('database', 'view')
+    search_fields = ('sql', 'view', 'site')
+    readonly_fields = ('fingerprint', 'first_seen', 'last_seen')
+
+
+@admin.register(InventoryMovement)
+class InventoryMovementAdmin(admin.ModelAdmin):
+    """The ledger is append-only: entries can be browsed, not edited"""
+    list_display = ('occurred_at', 'item_name', 'housing_unit_id', 'delta', 'kind', 'transfer_id')
+    list_filter = ('kind',)
+    search_fields = ('item_name',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(InventorySnapshot)
+class InventorySnapshotAdmin(admin.ModelAdmin):
+    list_display = ('taken_at', 'last_movement_id', 'line_count')
+    readonly_fields = ('taken_at', 'last_movement_id', 'line_count')
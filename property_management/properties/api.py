@@ -0,0 +1,269 @@
+"""
+Read-only JSON API (mounted at /api/v1/).
+
+    GET /api/v1/buildings/?district=BUL&year=2024&fields=id,name,current_total_cost
+    GET /api/v1/buildings/?after=<cursor>
+
+    {"count": 1234, "results": [{...}, ...], "next": "/api/v1/buildings/?...", "previous": null}
+
+Every resource is a RESOURCES entry with its exposed fields (name ->
+ORM lookup; all of them by default) and a filter function that reuses
+the list view's own filtering. It supports:
+
+- ?fields=a,b,c (sparse fieldsets): rows are read with .values() on
+  just those lookups, plus the ordering keys needed for the cursor.
+- cursor pagination (properties.pagination) via ?after= / ?before=,
+  with ?page_size= up to MAX_PAGE_SIZE.
+- strong ETags built from max(updated_at) and the row count of the
+  filtered queryset (properties.conditional). A matching
+  If-None-Match gets a 304 after that single aggregate query.
+"""
+
+from django.http import JsonResponse
+from django.urls import path
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.http import require_GET
+
+from admin_core.models import Worker
+from admin_core.views import filter_workers
+from gusali.models import Building
+from gusali.views import building_filter
+from kagamitan.models import Item
+from lupa.models import Land
+from plants.models import Plant
+from plants.views import plant_filter
+from vehicles.models import Vehicle
+from vehicles.views import vehicle_filter
+
+from .conditional import make_etag, queryset_version
+from .models import District, HousingUnit, HousingUnitInventory, Local
+from .pagination import get_ordering_keys, keyset_paginate
+from .search import (
+    DISTRICT_SEARCH_FIELDS,
+    HOUSING_UNIT_SEARCH_FIELDS,
+    LOCAL_SEARCH_FIELDS,
+    search_filter,
+)
+from .views import filter_inventory
+
+
+app_name = "api"
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+# ======================================================
+# FILTERS
+# ======================================================
+
+def filter_districts(request, queryset):
+    query = request.GET.get("q", "").strip()
+    return search_filter(queryset, DISTRICT_SEARCH_FIELDS, query) if query else queryset
+
+
+def filter_locals(request, queryset):
+    query = request.GET.get("q", "").strip()
+    if query:
+        queryset = search_filter(queryset, LOCAL_SEARCH_FIELDS, query)
+    district = request.GET.get("district", "").strip()
+    if district:
+        queryset = queryset.filter(district__dcode__iexact=district)
+    return queryset
+
+
+def filter_items(request, queryset):
+    category = request.GET.get("category")
+    return queryset.filter(location=category) if category else queryset
+
+
+def filter_housing_units(request, queryset):
+    query = request.GET.get("q", "").strip()
+    if query:
+        queryset = search_filter(queryset, HOUSING_UNIT_SEARCH_FIELDS, query)
+    pamayanan = request.GET.get("pamayanan", "")
+    return queryset.filter(pamayanan_id=pamayanan) if pamayanan.isdigit() else queryset
+
+
+def asset_filter(factory):
+    return lambda request, queryset: factory(request).apply(queryset)
+
+
+# ======================================================
+# RESOURCES
+# ======================================================
+
+def fields(*names, **lookups):
+    """Exposed field name -> ORM lookup"""
+    return {**{name: name for name in names}, **lookups}
+
+
+ASSET_LOCATION = dict(local_id="local_id", local="local__name", lcode="lcode", dcode="dcode")
+
+RESOURCES = {
+    "districts": {
+        "queryset": District.objects.all,
+        "fields": fields("id", "dcode", "name", "description", "created_at", "updated_at"),
+        "filter": filter_districts,
+    },
+    "locals": {
+        "queryset": Local.objects.all,
+        "fields": fields(
+            "id", "lcode", "name", "description", "created_at", "updated_at",
+            district_id="district_id", district="district__name", dcode="district__dcode",
+        ),
+        "filter": filter_locals,
+    },
+    "buildings": {
+        "queryset": Building.objects.all,
+        "fields": fields(
+            "id", "code", "name", "classification", "year_covered", "is_donated", "donation_date",
+            "ownership_date", "constructor", "capacity", "original_cost", "current_total_cost",
+            "remarks", "created_at", "updated_at", **ASSET_LOCATION,
+        ),
+        "filter": asset_filter(building_filter),
+    },
+    "items": {
+        "queryset": Item.objects.all,
+        "fields": fields(
+            "id", "location", "property_number", "date_acquired", "quantity", "item_name", "brand",
+            "model", "material", "color", "size", "unit_price", "total_price", "reference_number",
+            "year_reported", "is_new", "remarks", "created_at", "updated_at", **ASSET_LOCATION,
+        ),
+        "filter": filter_items,
+    },
+    "lands": {
+        "queryset": Land.objects.all,
+        "fields": fields(
+            "id", "location", "lot_area", "lot_type", "title_number", "owner", "status",
+            "market_value", "acquisition_cost", "use_classification", "remarks",
+            "created_at", "updated_at", **ASSET_LOCATION,
+        ),
+        "filter": None,
+    },
+    "plants": {
+        "queryset": Plant.objects.all,
+        "fields": fields(
+            "id", "name", "variety", "fruit_bearing", "non_fruit_bearing", "total_quantity",
+            "unit_price", "total_value", "location", "remarks", "created_at", "updated_at",
+            **ASSET_LOCATION,
+        ),
+        "filter": asset_filter(plant_filter),
+    },
+    "vehicles": {
+        "queryset": Vehicle.objects.all,
+        "fields": fields(
+            "id", "item_name", "brand", "model", "plate_number", "conduction_sticker",
+            "engine_number", "chassis_number", "year_model", "color", "acquisition_cost",
+            "date_acquired", "remarks", "created_at", "updated_at", **ASSET_LOCATION,
+        ),
+        "filter": asset_filter(vehicle_filter),
+    },
+    "housing-units": {
+        "queryset": HousingUnit.objects.all,
+        "fields": fields(
+            "id", "unit_number", "floor", "housing_unit_name", "address", "occupant_name",
+            "department", "section", "job_title", "date_reported", "created_at", "updated_at",
+            pamayanan_id="pamayanan_id", pamayanan="pamayanan__name", building_id="building_id",
+        ),
+        "filter": filter_housing_units,
+    },
+    "inventory": {
+        "queryset": HousingUnitInventory.objects.all,
+        "fields": fields(
+            "id", "item_code", "date_acquired", "quantity", "item_name", "brand", "model", "make",
+            "color", "size", "serial_number", "acquisition_cost", "useful_life", "net_book_value",
+            "amount", "remarks", "created_at", "updated_at",
+            housing_unit_id="housing_unit_id", housing_unit="housing_unit__housing_unit_name",
+        ),
+        "filter": lambda request, queryset: filter_inventory(request, queryset)[0],
+    },
+    "workers": {
+        "queryset": Worker.objects.all,
+        "fields": fields(
+            "id", "employee_no", "first_name", "middle_name", "last_name", "category", "mwa_type",
+            "marital_status", "employment_status", "remarks", "created_at", "updated_at",
+        ),
+        # filter_workers() builds its own queryset from the request
+        "filter": lambda request, queryset: filter_workers(request)[0],
+    },
+}
+
+
+# ======================================================
+# VIEWS
+# ======================================================
+
+def api_error(message, status):
+    return JsonResponse({"error": message}, status=status)
+
+
+def selected_fields(request, available):
+    """Exposed names from ?fields= (all by default); None if any is unknown"""
+    requested = [name.strip() for name in request.GET.get("fields", "").split(",") if name.strip()]
+    if not requested:
+        return list(available)
+    if any(name not in available for name in requested):
+        return None
+    return requested
+
+
+def page_size(request):
+    size = request.GET.get("page_size", "")
+    return min(int(size), MAX_PAGE_SIZE) if size.isdigit() and int(size) > 0 else DEFAULT_PAGE_SIZE
+
+
+@require_GET
+def resource_list(request, resource):
+    if not request.user.is_authenticated:
+        return api_error("Authentication required", 401)
+
+    config = RESOURCES[resource]
+    names = selected_fields(request, config["fields"])
+    if names is None:
+        return api_error(f"Unknown field; available: {', '.join(config['fields'])}", 400)
+
+    queryset = config["queryset"]()
+    if config["filter"]:
+        queryset = config["filter"](request, queryset)
+
+    last_modified, count = queryset_version(queryset)
+    etag = make_etag(resource, last_modified, count, request.get_full_path())
+    timestamp = last_modified.timestamp() if last_modified else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        # Only the requested columns, plus what the cursor needs
+        keys = [path for path, _, _ in get_ordering_keys(queryset)]
+        lookups = [config["fields"][name] for name in names]
+        page = keyset_paginate(
+            request,
+            queryset.values(*dict.fromkeys(lookups + keys)),
+            per_page=page_size(request),
+        )
+        response = JsonResponse({
+            "count": count,
+            "results": [{name: row[config["fields"][name]] for name in names} for row in page],
+            "next": f"{request.path}?{page.next_query}" if page.has_next else None,
+            "previous": f"{request.path}?{page.previous_query}" if page.has_previous else None,
+        })
+
+    response["ETag"] = etag
+    if timestamp:
+        response["Last-Modified"] = http_date(timestamp)
+    return response
+
+
+@require_GET
+def resource_index(request):
+    return JsonResponse({name: f"{request.path}{name}/" for name in RESOURCES})
+
+
+urlpatterns = [
+    path("", resource_index, name="index"),
+    *[
+        path(f"{name}/", resource_list, {"resource": name}, name=name)
+        for name in RESOURCES
+    ],
+]
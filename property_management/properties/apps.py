@@ -6,4 +6,5 @@ class PropertiesConfig(AppConfig):
     name = 'properties'
     
     def ready(self):
+        import properties.cache_backends  # system checks
         import properties.signals 
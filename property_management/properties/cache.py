@@ -0,0 +1,146 @@
+"""
+Versioned cache namespaces.
+
+Cached data is grouped into namespaces tied to the models it is built
+from (CACHE_NAMESPACES). Each namespace has a version number in the
+cache, and every key built with `cache_key()` embeds it:
+
+    cache_key("locations", "district_options")  -> "locations:v7:district_options"
+
+A save or delete of any of the namespace's models bumps the version.
+The old keys are never read again and simply expire. So invalidation
+is a single incr, however many keys or fragments the namespace holds.
+
+Templates use the same versions through the `cache_versions` context
+processor:
+
+    {% cache 3600 district_options cache_versions.locations current_district %}
+        ...
+    {% endcache %}
+
+`manage.py cache_stats` reports hit rates (see properties.cache_backends)
+and flushes namespaces by bumping their version.
+"""
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .cache_backends import NAMESPACES_KEY, STATS_PREFIX, VERSION_PREFIX
+
+
+# Namespace -> labels of the models whose writes invalidate it
+CACHE_NAMESPACES = {
+    # District / local filter dropdowns
+    "locations": ["properties.District", "properties.Local"],
+    # Housing unit grids (building_map)
+    "housing": ["properties.Pamayanan", "properties.HousingUnit"],
+    # Report tables
+    "reports": [
+        "gusali.BuildingReportSnapshot",
+        "properties.LocalAssetRollup",
+    ],
+}
+
+
+# ======================================================
+# VERSIONS
+# ======================================================
+
+def namespace_version(namespace):
+    """Current version of a namespace (1 until first bumped)"""
+    key = f"{VERSION_PREFIX}:{namespace}"
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, None)
+        version = cache.get(key, 1)
+    return version
+
+
+def bump_namespace(namespace):
+    """Invalidate every key in a namespace"""
+    key = f"{VERSION_PREFIX}:{namespace}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Never read yet (or evicted): any new number retires old keys
+        cache.set(key, 2, None)
+
+
+def invalidate_namespace(namespace):
+    """
+    Bump now, and again on commit: a request racing the open
+    transaction may cache old data under the first new version.
+    """
+    bump_namespace(namespace)
+    transaction.on_commit(lambda: bump_namespace(namespace))
+
+
+def cache_key(namespace, *parts):
+    return ":".join([namespace, f"v{namespace_version(namespace)}", *map(str, parts)])
+
+
+def cached(namespace, key, compute, timeout=None):
+    """Value for `key` in `namespace`, computed and stored on a miss"""
+    full_key = cache_key(namespace, key)
+    value = cache.get(full_key)
+    if value is None:
+        value = compute()
+        cache.set(full_key, value, timeout)
+    return value
+
+
+def connect_namespaces():
+    """Bump each namespace on post_save / post_delete of its models"""
+    for namespace, labels in CACHE_NAMESPACES.items():
+        def invalidate(namespace=namespace, **kwargs):
+            invalidate_namespace(namespace)
+
+        for label in labels:
+            model = apps.get_model(label)
+            uid = f"cache:{namespace}:{label}"
+            post_save.connect(invalidate, sender=model, weak=False, dispatch_uid=uid)
+            post_delete.connect(invalidate, sender=model, weak=False, dispatch_uid=uid)
+
+
+class CacheVersions:
+    """Template access to namespace versions, read only when used"""
+
+    def __getitem__(self, namespace):
+        if namespace not in CACHE_NAMESPACES:
+            raise KeyError(namespace)
+        return namespace_version(namespace)
+
+
+def cache_versions(request):
+    """Context processor: {{ cache_versions.<namespace> }}"""
+    return {"cache_versions": CacheVersions()}
+
+
+# ======================================================
+# STATS
+# ======================================================
+
+def cache_stats():
+    """[{namespace, hits, misses, hit_rate, version}] from the counters"""
+    rows = []
+    for namespace in sorted(cache.get(NAMESPACES_KEY) or ()):
+        hits = cache.get(f"{STATS_PREFIX}:{namespace}:hits", 0)
+        misses = cache.get(f"{STATS_PREFIX}:{namespace}:misses", 0)
+        total = hits + misses
+        rows.append({
+            "namespace": namespace,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else None,
+            "version": namespace_version(namespace) if namespace in CACHE_NAMESPACES else None,
+        })
+    return rows
+
+
+def reset_cache_stats():
+    namespaces = cache.get(NAMESPACES_KEY) or ()
+    cache.delete_many(
+        [f"{STATS_PREFIX}:{namespace}:{outcome}" for namespace in namespaces for outcome in ("hits", "misses")]
+    )
@@ -0,0 +1,109 @@
+"""
+Cache backends that count hits and misses per key namespace.
+
+Drop-in subclasses of Django's backends (see CACHES in settings). Every
+get() / get_many() increments "<namespace>:hits" or "<namespace>:misses"
+counters kept in the cache itself, so `manage.py cache_stats` sees the
+totals of every process sharing the backend. The namespace is the
+part of the key before the first ":"; {% cache %} fragments count
+under "fragment:<fragment name>".
+
+Counting is switched off with CACHE_STATS = False.
+
+LocMemCache is per process, so it only suits single-process development:
+`manage.py check --deploy` warns when it is the default cache.
+"""
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+from django.core.cache.backends.filebased import FileBasedCache as BaseFileBasedCache
+from django.core.cache.backends.locmem import LocMemCache as BaseLocMemCache
+from django.core.cache.backends.memcached import PyMemcacheCache as BasePyMemcacheCache
+from django.core.cache.backends.redis import RedisCache as BaseRedisCache
+from django.utils.module_loading import import_string
+
+
+STATS_PREFIX = "cachestats"
+VERSION_PREFIX = "cacheversion"
+NAMESPACES_KEY = f"{STATS_PREFIX}:namespaces"
+
+# Bookkeeping keys are not counted
+INTERNAL_NAMESPACES = {STATS_PREFIX, VERSION_PREFIX}
+FRAGMENT_PREFIX = "template.cache."
+
+_MISSING = object()
+
+
+def key_namespace(key):
+    if key.startswith(FRAGMENT_PREFIX):
+        return "fragment:" + key[len(FRAGMENT_PREFIX):].split(".", 1)[0]
+    return key.split(":", 1)[0]
+
+
+class StatsMixin:
+    """Hit / miss counting for a cache backend"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._seen_namespaces = set()
+
+    def _count(self, key, outcome):
+        namespace = key_namespace(key)
+        if namespace in INTERNAL_NAMESPACES or not getattr(settings, "CACHE_STATS", True):
+            return
+
+        if namespace not in self._seen_namespaces:
+            self._seen_namespaces.add(namespace)
+            namespaces = super().get(NAMESPACES_KEY) or set()
+            if namespace not in namespaces:
+                super().set(NAMESPACES_KEY, namespaces | {namespace}, None)
+
+        counter = f"{STATS_PREFIX}:{namespace}:{outcome}"
+        try:
+            super().incr(counter)
+        except ValueError:
+            # First count (or the counter was evicted)
+            super().add(counter, 0, None)
+            super().incr(counter)
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        self._count(key, "misses" if value is _MISSING else "hits")
+        return default if value is _MISSING else value
+
+    def get_many(self, keys, version=None):
+        found = super().get_many(keys, version)
+        for key in keys:
+            self._count(key, "hits" if key in found else "misses")
+        return found
+
+
+class LocMemCache(StatsMixin, BaseLocMemCache):
+    pass
+
+
+class FileBasedCache(StatsMixin, BaseFileBasedCache):
+    pass
+
+
+class RedisCache(StatsMixin, BaseRedisCache):
+    pass
+
+
+class PyMemcacheCache(StatsMixin, BasePyMemcacheCache):
+    pass
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    if not issubclass(import_string(settings.CACHES["default"]["BACKEND"]), BaseLocMemCache):
+        return []
+    return [Warning(
+        "The default cache is per process (locmem).",
+        hint=(
+            "Namespace bumps from management commands and other workers never reach the web "
+            "processes, so cached pages stay stale until they expire. Set CACHE_BACKEND to "
+            "file, redis or memcached."
+        ),
+        id="properties.W001",
+    )]
@@ -0,0 +1,124 @@
+"""
+Instrumented PostgreSQL connections (ENGINE "properties.dbpool").
+
+The stock postgresql backend plus connection reuse and counters. Each
+database picks one of three modes in settings (DB_CONNECTIONS):
+
+- "persistent": Django keeps a worker thread's connection open for
+  CONN_MAX_AGE seconds. CONN_HEALTH_CHECKS pings it before the first
+  query of each request, so a connection dropped by the server is
+  replaced instead of failing the request.
+- "pool": connections are borrowed from a psycopg_pool ConnectionPool
+  (settings_dict["POOL"]: min_size / max_size / timeout) and handed back
+  at the end of every request. One pool per gunicorn worker process,
+  so the server sees at most workers x max_size connections.
+- "off": a new connection per request (CONN_MAX_AGE = 0).
+
+Counters are kept per process and per database alias:
+
+    checkouts  requests (or tasks) that used the connection
+    reused     checkouts served by an already open connection
+    waits      checkouts that had to wait for a connection: a new
+               connect, or a queue for a free slot in "pool" mode
+    wait_ms    time spent in those waits
+    broken     connections that failed a health check and were dropped
+    opened / closed
+
+`connection_metrics()` returns them (with psycopg_pool's own stats in
+"pool" mode) for the staff-only /properties/internal/db-pool/ endpoint.
+Under gunicorn each response only covers the worker that served it.
+"""
+
+import os
+import threading
+from collections import Counter
+
+from django.core.exceptions import ImproperlyConfigured
+
+
+COUNTERS = ("checkouts", "reused", "waits", "wait_ms", "broken", "opened", "closed")
+
+_lock = threading.Lock()
+_counters = Counter()
+# alias -> (pid, target, ConnectionPool); a forked worker builds its own
+# pool, and so does a change of database (e.g. to the test database)
+_pools = {}
+
+
+def record(alias, name, amount=1):
+    with _lock:
+        _counters[alias, name] += amount
+
+
+def reset_metrics():
+    with _lock:
+        _counters.clear()
+
+
+def get_pool(alias, options, conn_params):
+    """The process' ConnectionPool for `alias`, opened on first use"""
+    target = tuple(conn_params.get(key) for key in ("dbname", "host", "port", "user"))
+    with _lock:
+        pid, pool_target, pool = _pools.get(alias, (None, None, None))
+        if pool is not None and pid == os.getpid():
+            if pool_target == target:
+                return pool
+            pool.close()
+
+        try:
+            from psycopg_pool import ConnectionPool
+        except ImportError as exc:
+            raise ImproperlyConfigured(
+                "DB_CONNECTIONS=pool requires psycopg_pool (pip install 'psycopg[pool]')"
+            ) from exc
+
+        pool = ConnectionPool(
+            kwargs=conn_params,
+            min_size=options.get("min_size", 1),
+            max_size=options.get("max_size"),
+            timeout=options.get("timeout", 30),
+            # Ping idle connections before handing them out
+            check=ConnectionPool.check_connection,
+            name=alias,
+            open=True,
+        )
+        _pools[alias] = (os.getpid(), target, pool)
+        return pool
+
+
+def pool_stats(alias):
+    pid, _, pool = _pools.get(alias, (None, None, None))
+    if pool is None or pid != os.getpid():
+        return None
+    return pool.get_stats()
+
+
+def connection_metrics():
+    """Counters (and pool stats) for every database using this backend"""
+    from django.db import connections
+
+    databases = {}
+    for alias in connections:
+        settings_dict = connections.settings[alias]
+        if settings_dict["ENGINE"] != __name__:
+            continue
+
+        with _lock:
+            metrics = {name: _counters[alias, name] for name in COUNTERS}
+        metrics["wait_ms"] = round(metrics["wait_ms"], 1)
+
+        stats = pool_stats(alias)
+        if stats:
+            # wait_ms already covers getconn(), queueing included
+            metrics["waits"] += stats.get("requests_queued", 0)
+            metrics["broken"] += stats.get("connections_lost", 0)
+
+        databases[alias] = {
+            "mode": "pool" if settings_dict.get("POOL") else "persistent" if settings_dict["CONN_MAX_AGE"] else "off",
+            "conn_max_age": settings_dict["CONN_MAX_AGE"],
+            "health_checks": settings_dict["CONN_HEALTH_CHECKS"],
+            **metrics,
+            "pool": stats,
+        }
+
+    return {"pid": os.getpid(), "databases": databases}
@@ -0,0 +1,69 @@
+import time
+
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrapper
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from . import get_pool, record
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+    """postgresql backend with pool checkouts and connection counters"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checked_out = False
+
+    @property
+    def pool_options(self):
+        # Database creation / teardown connections are never pooled
+        return None if self.alias == NO_DB_ALIAS else self.settings_dict.get("POOL")
+
+    def get_new_connection(self, conn_params):
+        started = time.monotonic()
+        options = self.pool_options
+
+        if not options:
+            connection = super().get_new_connection(conn_params)
+            record(self.alias, "waits")
+        else:
+            connection = get_pool(self.alias, options, conn_params).getconn()
+            isolation_level = self.settings_dict["OPTIONS"].get("isolation_level")
+            self.isolation_level = IsolationLevel(isolation_level or IsolationLevel.READ_COMMITTED)
+            if isolation_level is not None:
+                connection.isolation_level = self.isolation_level
+
+        record(self.alias, "wait_ms", (time.monotonic() - started) * 1000)
+        record(self.alias, "opened")
+        return connection
+
+    def ensure_connection(self):
+        # First query since the last request boundary
+        if not self.checked_out:
+            self.checked_out = True
+            record(self.alias, "checkouts")
+            if self.connection is not None:
+                record(self.alias, "reused")
+        super().ensure_connection()
+
+    def close_if_unusable_or_obsolete(self):
+        # Called by Django at the start and end of every request
+        self.checked_out = False
+        super().close_if_unusable_or_obsolete()
+
+    def is_usable(self):
+        usable = super().is_usable()
+        if not usable:
+            record(self.alias, "broken")
+        return usable
+
+    def _close(self):
+        if self.connection is None:
+            return
+        record(self.alias, "closed")
+        if self.pool_options:
+            with self.wrap_database_errors:
+                # Back to the pool it came from
+                self.connection._pool.putconn(self.connection)
+            return
+        return super()._close()
@@ -0,0 +1,158 @@
+"""
+Shared filter backend for the asset list views (gusali, plants, vehicles).
+
+The list pages all accept the same query parameters:
+
+- q         substring match on the asset's own columns and its local /
+            district name and code
+- district  district code, or part of a district name when no district
+            has that code
+- local     local code, or part of a local name when no local has that
+            code
+- code      exact asset code (buildings)
+- year      exact report year (buildings)
+
+`AssetFilter` compiles them into a single WHERE clause. The code-or-name
+decision is an uncorrelated NOT EXISTS that PostgreSQL evaluates once,
+so no `.exists()` probe and no UNION/DISTINCT is needed.
+
+The substring matches are served by pg_trgm GIN indexes on
+UPPER(column), which is what Django's `icontains` compiles to; see
+`trigram_index_sql`.
+"""
+
+from django.db.models import Exists, Q
+
+from .cache import cached
+from .models import District, Local
+
+
+# Columns of Local searched by ?q= (through the asset's local FK)
+LOCATION_SEARCH_FIELDS = ("name", "lcode", "district__name", "district__dcode")
+
+
+class AssetFilter:
+    """
+    Parse the list filters from a request and apply them to a queryset.
+
+        asset_filter = AssetFilter(request.GET, search_fields=("name", "lcode", "dcode"))
+        buildings = asset_filter.apply(Building.objects.all())
+        context.update(asset_filter.context())
+    """
+
+    def __init__(self, params, search_fields, code_field=None, year_field=None):
+        self.search_fields = search_fields
+        self.code_field = code_field
+        self.year_field = year_field
+
+        self.search_query = params.get("q", "").strip()
+        self.district = params.get("district", "").strip()
+        self.local = params.get("local", "").strip()
+        self.code = params.get("code", "").strip() if code_field else ""
+        self.year = params.get("year", "").strip() if year_field else ""
+
+    def apply(self, queryset):
+        condition = Q()
+        if self.search_query:
+            condition &= self.search_condition(self.search_query)
+        if self.district:
+            condition &= self.district_condition(self.district)
+        if self.local:
+            condition &= self.local_condition(self.local)
+        if self.code:
+            condition &= Q(**{self.code_field: self.code})
+        if self.year.isdigit():
+            condition &= Q(**{self.year_field: int(self.year)})
+        return queryset.select_related("local", "local__district").filter(condition)
+
+    def search_condition(self, text):
+        condition = Q()
+        for field in self.search_fields:
+            condition |= Q(**{f"{field}__icontains": text})
+
+        # Local / district matches are resolved against the (small) Local
+        # table in a subquery rather than OR-ed across the joins
+        location = Q()
+        for field in LOCATION_SEARCH_FIELDS:
+            location |= Q(**{f"{field}__icontains": text})
+        return condition | Q(local__in=Local.objects.filter(location).values("pk"))
+
+    def district_condition(self, value):
+        is_code = District.objects.filter(dcode__iexact=value)
+        return (
+            Q(local__district__dcode__iexact=value)
+            | Q(dcode__iexact=value)
+            | (Q(local__district__name__icontains=value) & ~Exists(is_code))
+        )
+
+    def local_condition(self, value):
+        is_code = Local.objects.filter(lcode__iexact=value)
+        return (
+            Q(local__lcode__iexact=value)
+            | Q(lcode__iexact=value)
+            | (Q(local__name__icontains=value) & ~Exists(is_code))
+        )
+
+    def context(self):
+        """Filter dropdown options and the current selection, for the template"""
+        districts = District.objects.all().order_by("name")
+        locals_list = Local.objects.select_related("district").order_by("district__name", "name")
+
+        current_district_name = ""
+        if self.district:
+            current_district_name = cached(
+                "locations",
+                f"district_name:{self.district}",
+                lambda: District.objects.filter(dcode=self.district).values_list("name", flat=True).first() or "",
+            )
+            locals_list = locals_list.filter(district__dcode=self.district)
+
+        current_local_name = ""
+        if self.local:
+            current_local_name = cached(
+                "locations",
+                f"local_name:{self.local}",
+                lambda: Local.objects.filter(lcode=self.local).values_list("name", flat=True).first() or "",
+            )
+
+        context = {
+            "districts": districts,
+            "locals": locals_list,
+            "search_query": self.search_query,
+            "current_district": self.district,
+            "current_district_name": current_district_name,
+            "current_local": self.local,
+            "current_local_name": current_local_name,
+        }
+        if self.code_field:
+            context["current_code"] = self.code
+        if self.year_field:
+            context["current_year"] = self.year
+        return context
+
+
+def trigram_index_sql(table, columns):
+    """
+    Forward / reverse SQL for `UPPER(column) gin_trgm_ops` indexes.
+
+    pg_trgm is a trusted extension on PostgreSQL 13+, but not every
+    install ships contrib, so the indexes are only built when the
+    extension is available (the queries work either way).
+    """
+    creates = "\n".join(
+        f"        CREATE INDEX IF NOT EXISTS {table}_{column}_trgm\n"
+        f"            ON {table} USING gin (UPPER({column}::text) gin_trgm_ops);"
+        for column in columns
+    )
+    forward = (
+        "DO $$\n"
+        "BEGIN\n"
+        "    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN\n"
+        "        CREATE EXTENSION IF NOT EXISTS pg_trgm;\n"
+        f"{creates}\n"
+        "    END IF;\n"
+        "END\n"
+        "$$;"
+    )
+    reverse = "\n".join(f"DROP INDEX IF EXISTS {table}_{column}_trgm;" for column in columns)
+    return forward, reverse
@@ -2,6 +2,14 @@
 from django import forms
 from .models import Pamayanan, HousingUnit, HousingUnitInventory, ItemTransfer, District, Local, DistrictProperty, DistrictInventory, LocalProperty, LocalInventory, UserProfile, BackupCode, ImportedFile
 
+class LocalChoicesMixin:
+    """Fetch each local's district with the `local` choices (Local.__str__ shows it)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if 'local' in self.fields:
+            self.fields['local'].queryset = self.fields['local'].queryset.select_related('district')
+
 class PropertyForm(forms.ModelForm):
     class Meta:
         model = Pamayanan
@@ -0,0 +1,274 @@
+"""
+Per-request query counts, DB time and response time, with query budgets.
+
+RequestMetricsMiddleware runs every request under an execute_wrapper
+on each database connection and records, per view (URL name):
+
+    queries    statements executed
+    db_ms      time spent in the database
+    render_ms  time spent rendering templates
+    total_ms   time through the view, template rendering included
+
+Each view has a query budget: QUERY_BUDGETS[url name], else
+QUERY_BUDGET_DEFAULT (None = no budget). A request over its budget is
+logged as a warning on the "properties.metrics" logger, so an N+1 that
+grows with the data shows up as soon as a page has enough rows.
+
+The last REQUEST_METRICS_WINDOW requests of each view are kept in
+memory (per process), along with running totals. Every
+REQUEST_METRICS_LOG_INTERVAL seconds, one summary line per view is
+logged. Staff users also get the numbers on every response, as
+X-Query-Count and a Server-Timing header that browser dev tools display.
+The same timings feed the /metrics histograms (properties.metrics).
+
+Render time is measured by the TimedDjangoTemplates backend (set as the
+TEMPLATES BACKEND), around each top-level template render — render()
+and TemplateResponse alike; includes and inclusion tags count towards
+the template that pulled them in. Queries run by lazy querysets inside
+a template count towards both db and render.
+
+Queries run while a streaming response is iterated happen after the
+middleware returns and are not counted.
+
+Tests assert budgets with QueryBudgetMixin:
+
+    class ListBudgetTests(QueryBudgetMixin, TestCase):
+        def test_building_list(self):
+            self.assertQueryBudget(reverse("gusali:building_list"))
+"""
+
+import logging
+import statistics
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connection, connections
+from django.template.backends.django import DjangoTemplates, Template
+from django.test.utils import CaptureQueriesContext
+
+from .metrics import observe_request
+
+
+logger = logging.getLogger("properties.metrics")
+
+UNRESOLVED = "<unresolved>"
+
+
+def query_budget(view_name):
+    budgets = getattr(settings, "QUERY_BUDGETS", {})
+    if view_name in budgets:
+        return budgets[view_name]
+    return getattr(settings, "QUERY_BUDGET_DEFAULT", None)
+
+
+class QueryCounter:
+    """execute_wrapper counting statements and their time"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+# ======================================================
+# TEMPLATE RENDER TIME
+# ======================================================
+
+class RenderTimer:
+    """Time spent rendering templates during one request"""
+
+    def __init__(self):
+        self.duration = 0.0
+        self.depth = 0
+
+
+render_timer = ContextVar("render_timer", default=None)
+
+
+class TimedTemplate(Template):
+    """Template adding its render time to the current request's RenderTimer"""
+
+    def render(self, context=None, request=None):
+        timer = render_timer.get()
+        # A template rendered from inside another is already being timed
+        if timer is None or timer.depth:
+            return super().render(context, request)
+
+        timer.depth += 1
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timer.duration += time.perf_counter() - started
+            timer.depth -= 1
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates backend whose templates report their render time"""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+# ======================================================
+# ROLLING STATS
+# ======================================================
+
+class RequestStats:
+    """Recent samples and running totals per view, for one process"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.recent = defaultdict(deque)
+        self.totals = defaultdict(lambda: defaultdict(float))
+        self.last_logged = time.monotonic()
+
+    def add(self, view, queries, db_ms, render_ms, total_ms, over_budget):
+        window = getattr(settings, "REQUEST_METRICS_WINDOW", 200)
+        with self.lock:
+            recent = self.recent[view]
+            recent.append((queries, db_ms, render_ms, total_ms))
+            while len(recent) > window:
+                recent.popleft()
+
+            totals = self.totals[view]
+            totals["requests"] += 1
+            totals["queries"] += queries
+            totals["db_ms"] += db_ms
+            totals["render_ms"] += render_ms
+            totals["total_ms"] += total_ms
+            totals["over_budget"] += over_budget
+
+    def summary(self):
+        """{view: {requests, queries_p50, queries_max, db_ms_p50, render_ms_p50, total_ms_p50, total_ms_p95, over_budget}}"""
+        with self.lock:
+            recent = {view: list(samples) for view, samples in self.recent.items()}
+            over_budget = {view: totals["over_budget"] for view, totals in self.totals.items()}
+
+        summary = {}
+        for view, samples in sorted(recent.items()):
+            queries, db_ms, render_ms, total_ms = zip(*samples)
+            summary[view] = {
+                "requests": len(samples),
+                "queries_p50": statistics.median(queries),
+                "queries_max": max(queries),
+                "db_ms_p50": round(statistics.median(db_ms), 1),
+                "render_ms_p50": round(statistics.median(render_ms), 1),
+                "total_ms_p50": round(statistics.median(total_ms), 1),
+                "total_ms_p95": round(percentile(total_ms, 95), 1),
+                "over_budget": int(over_budget[view]),
+            }
+        return summary
+
+    def log_if_due(self):
+        interval = getattr(settings, "REQUEST_METRICS_LOG_INTERVAL", 300)
+        with self.lock:
+            if time.monotonic() - self.last_logged < interval:
+                return
+            self.last_logged = time.monotonic()
+
+        for view, row in self.summary().items():
+            logger.info(
+                "%s: %d requests, %s queries (max %d), db %.1f ms, render %.1f ms, total %.1f ms (p95 %.1f ms), "
+                "%d over budget",
+                view, row["requests"], row["queries_p50"], row["queries_max"], row["db_ms_p50"],
+                row["render_ms_p50"], row["total_ms_p50"], row["total_ms_p95"], row["over_budget"],
+            )
+
+    def reset(self):
+        with self.lock:
+            self.recent.clear()
+            self.totals.clear()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+request_stats = RequestStats()
+
+
+# ======================================================
+# MIDDLEWARE
+# ======================================================
+
+class RequestMetricsMiddleware:
+    """Count queries and time every request; enforce per-view query budgets"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        timer = RenderTimer()
+        token = render_timer.set(timer)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(counter))
+                response = self.get_response(request)
+        finally:
+            render_timer.reset(token)
+        total_ms = (time.perf_counter() - started) * 1000
+        db_ms = counter.duration * 1000
+        render_ms = timer.duration * 1000
+
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else UNRESOLVED
+        budget = query_budget(view)
+        over_budget = budget is not None and counter.count > budget
+        if over_budget:
+            logger.warning(
+                "%s ran %d queries (budget %d) in %.1f ms: %s",
+                view, counter.count, budget, db_ms, request.get_full_path(),
+            )
+
+        request_stats.add(view, counter.count, db_ms, render_ms, total_ms, over_budget)
+        request_stats.log_if_due()
+        observe_request(view, total_ms / 1000, counter.count)
+
+        user = getattr(request, "user", None)
+        if user is not None and user.is_staff:
+            response["X-Query-Count"] = str(counter.count)
+            response["Server-Timing"] = (
+                f'db;dur={db_ms:.1f};desc="{counter.count} queries", render;dur={render_ms:.1f}, '
+                f'total;dur={total_ms:.1f}'
+            )
+        return response
+
+
+# ======================================================
+# TEST HELPER
+# ======================================================
+
+class QueryBudgetMixin:
+    """TestCase mixin: fail when a page runs more queries than its budget"""
+
+    def assertQueryBudget(self, url, budget=None, **extra):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url, **extra)
+        self.assertLess(response.status_code, 400, f"{url} answered {response.status_code}")
+
+        view = response.resolver_match.view_name
+        if budget is None:
+            budget = query_budget(view)
+        if budget is not None and len(captured) > budget:
+            queries = "\n".join(f"{i}. {query['sql']}" for i, query in enumerate(captured, 1))
+            self.fail(f"{view} ran {len(captured)} queries, budget {budget}:\n{queries}")
+        return response
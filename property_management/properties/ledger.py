@@ -0,0 +1,236 @@
+"""
+Append-only inventory ledger and its periodic snapshots.
+
+Every change to a HousingUnitInventory quantity is recorded as an
+InventoryMovement holding a signed delta:
+
+    - save() / delete() of a row (forms, admin, the Excel import) via the
+      signals in properties.signals: "added", "edit", "removed", or the
+      kind set with `recording(...)`, e.g. "import"
+    - transfers (properties.transfers), which change quantities with
+      update() and write their "transfer_out" / "transfer_in" entries
+      themselves
+    - bulk loads (seed_scale, the ledger migration): "opening" balances
+
+A row moved to another unit or renamed in an edit is booked out of its
+old (unit, name) and into the new one, so the entries of one unit always
+add up to what is in it.
+
+The quantity of a row at any moment is the sum of its entries up to
+then. So that point-in-time queries need not replay the whole history,
+`manage.py snapshot_inventory` (run periodically, e.g. nightly from
+cron) stores every row's quantity as of the latest entry, building it
+from the previous snapshot plus the entries since. unit_contents() then
+reads one snapshot plus the short tail of entries after it.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.models import Max, Q, Sum
+from django.utils import timezone
+
+from .models import HousingUnitInventory, InventoryMovement, InventorySnapshot, InventorySnapshotLine
+
+
+_kind = ContextVar("inventory_movement_kind", default=None)
+
+
+# ======================================================
+# RECORDING
+# ======================================================
+
+@contextmanager
+def recording(kind):
+    """Book the inventory saves and deletes inside the block as `kind`"""
+    token = _kind.set(kind)
+    try:
+        yield
+    finally:
+        _kind.reset(token)
+
+
+def record(entries):
+    """Append unsaved InventoryMovement instances in one INSERT"""
+    return InventoryMovement.objects.bulk_create(entries)
+
+
+def entry(item_id, housing_unit_id, item_name, delta, kind, transfer_id=None, occurred_at=None):
+    return InventoryMovement(
+        inventory_item_id=item_id,
+        housing_unit_id=housing_unit_id,
+        item_name=item_name,
+        delta=delta,
+        kind=kind,
+        transfer_id=transfer_id,
+        occurred_at=occurred_at or timezone.now(),
+    )
+
+
+def previous_state(row):
+    """(housing_unit_id, item_name, quantity) of a saved row as stored, or None"""
+    if not row.pk:
+        return None
+    return (
+        type(row).objects.filter(pk=row.pk)
+        .values_list("housing_unit_id", "item_name", "quantity")
+        .first()
+    )
+
+
+def record_save(row, previous, created):
+    """Ledger entries for saving `row`, which was `previous` (previous_state) before"""
+    kind = _kind.get()
+    entries = []
+    if previous and previous[:2] != (row.housing_unit_id, row.item_name):
+        unit_id, name, quantity = previous
+        if quantity:
+            entries.append(entry(row.pk, unit_id, name, -quantity, kind or "edit"))
+        previous = None
+
+    delta = row.quantity - (previous[2] if previous else 0)
+    if delta:
+        entries.append(entry(row.pk, row.housing_unit_id, row.item_name, delta,
+                             kind or ("added" if created else "edit")))
+    return record(entries)
+
+
+def record_delete(row):
+    if row.quantity:
+        return record([entry(row.pk, row.housing_unit_id, row.item_name, -row.quantity, _kind.get() or "removed")])
+    return []
+
+
+def record_opening(after_id=0, using=DEFAULT_DB_ALIAS):
+    """
+    "opening" entries for the quantities of the rows with id > after_id,
+    for rows loaded without save() (seed_scale's COPY). Returns the count.
+    """
+    quote = connections[using].ops.quote_name
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"""
+            INSERT INTO {quote(InventoryMovement._meta.db_table)}
+                   (inventory_item_id, housing_unit_id, item_name, delta, kind, occurred_at)
+            SELECT id, housing_unit_id, item_name, quantity, 'opening', created_at
+              FROM {quote(HousingUnitInventory._meta.db_table)}
+             WHERE id > %s AND quantity <> 0
+             ORDER BY id
+        """, [after_id])
+        return cursor.rowcount
+
+
+# ======================================================
+# SNAPSHOTS
+# ======================================================
+
+def take_snapshot():
+    """
+    Snapshot every row's quantity as of the latest ledger entry. Returns
+    (snapshot, created); nothing is written if there are no new entries.
+
+    The ledger is locked against inserts (SHARE mode) meanwhile, so no
+    entry below the snapshot's last_movement_id can commit after it.
+    """
+    quote = connection.ops.quote_name
+    movements = quote(InventoryMovement._meta.db_table)
+    lines = quote(InventorySnapshotLine._meta.db_table)
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {movements} IN SHARE MODE")
+
+        previous = InventorySnapshot.objects.order_by("-last_movement_id", "-id").first()
+        last_id = InventoryMovement.objects.aggregate(last=Max("id"))["last"] or 0
+        if previous and previous.last_movement_id == last_id:
+            return previous, False
+
+        snapshot = InventorySnapshot.objects.create(taken_at=timezone.now(), last_movement_id=last_id)
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                INSERT INTO {lines} (snapshot_id, inventory_item_id, housing_unit_id, item_name, quantity)
+                SELECT %s, inventory_item_id, housing_unit_id, item_name, SUM(quantity)
+                  FROM (
+                        SELECT inventory_item_id, housing_unit_id, item_name, quantity
+                          FROM {lines} WHERE snapshot_id = %s
+                        UNION ALL
+                        SELECT inventory_item_id, housing_unit_id, item_name, delta
+                          FROM {movements} WHERE id > %s AND id <= %s
+                       ) AS changes
+                 GROUP BY inventory_item_id, housing_unit_id, item_name
+                HAVING SUM(quantity) <> 0
+            """, [
+                snapshot.pk,
+                previous.pk if previous else 0,
+                previous.last_movement_id if previous else 0,
+                last_id,
+            ])
+            snapshot.line_count = cursor.rowcount
+        snapshot.save(update_fields=["line_count"])
+    return snapshot, True
+
+
+def prune_snapshots(keep):
+    """Delete all but the newest `keep` snapshots; the ledger itself is kept"""
+    keep_ids = InventorySnapshot.objects.order_by("-last_movement_id", "-id").values_list("pk", flat=True)[:keep]
+    _, deleted = InventorySnapshot.objects.exclude(pk__in=list(keep_ids)).delete()
+    return deleted.get(InventorySnapshot._meta.label, 0)
+
+
+# ======================================================
+# QUERIES
+# ======================================================
+
+def unit_contents(unit_id, at=None):
+    """
+    [(inventory item id, item name, quantity)] in the unit at `at`
+    (default: now): the latest snapshot taken by then plus the ledger
+    entries after it.
+    """
+    at = at or timezone.now()
+    snapshot = InventorySnapshot.objects.filter(taken_at__lte=at).order_by("-taken_at", "-id").first()
+
+    totals = {}
+    if snapshot:
+        for item_id, name, quantity in snapshot.lines.filter(housing_unit_id=unit_id).values_list(
+            "inventory_item_id", "item_name", "quantity"
+        ):
+            totals[item_id, name] = quantity
+
+    tail = (
+        InventoryMovement.objects
+        .filter(housing_unit_id=unit_id, id__gt=snapshot.last_movement_id if snapshot else 0, occurred_at__lte=at)
+        .values_list("inventory_item_id", "item_name")
+        .annotate(total=Sum("delta"))
+        .order_by()
+    )
+    for item_id, name, delta in tail:
+        totals[item_id, name] = totals.get((item_id, name), 0) + delta
+
+    return sorted(
+        ((item_id, name, quantity) for (item_id, name), quantity in totals.items() if quantity),
+        key=lambda line: (line[1], line[0]),
+    )
+
+
+def unit_history(unit_id):
+    """Ledger entries of a unit, for keyset pagination (newest first)"""
+    return (
+        InventoryMovement.objects.filter(housing_unit_id=unit_id)
+        .select_related("transfer")
+        .order_by("-id")
+    )
+
+
+def item_trail(item_id):
+    """
+    Where an inventory row's stock has been: its own entries, plus the
+    "transfer_in" entries its transfers wrote on the receiving rows.
+    """
+    transfers = InventoryMovement.objects.filter(inventory_item_id=item_id, transfer__isnull=False)
+    return (
+        InventoryMovement.objects
+        .filter(Q(inventory_item_id=item_id) | Q(transfer_id__in=transfers.values("transfer_id"), kind="transfer_in"))
+        .select_related("transfer")
+        .order_by("id")
+    )
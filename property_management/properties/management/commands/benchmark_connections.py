@@ -0,0 +1,84 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections
+from django.test import Client
+from django.urls import reverse
+
+from properties.dbpool import connection_metrics, reset_metrics
+
+
+DASHBOARD_VIEWS = ["properties:dashboard", "properties:national_summary", "gusali:building_report"]
+
+
+class Command(BaseCommand):
+    help = "Compare dashboard latency with a new connection per request vs the configured connection reuse"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50, help="Requests per view and mode")
+        parser.add_argument("--view", action="append", help="URL name to request (repeatable)")
+        parser.add_argument("--username", help="User to request as (default: first superuser)")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        users = User.objects.filter(username=options["username"]) if options["username"] else \
+            User.objects.filter(is_superuser=True).order_by("pk")
+        user = users.first()
+        if user is None:
+            raise CommandError("No such user; pass --username")
+
+        host = next((host for host in settings.ALLOWED_HOSTS if host not in ("*", "")), "localhost")
+        client = Client(HTTP_HOST=host.lstrip("."))
+        client.force_login(user)
+
+        settings_dict = connections[DEFAULT_DB_ALIAS].settings_dict
+        configured = settings_dict["CONN_MAX_AGE"]
+        if settings_dict.get("POOL"):
+            modes = [("off", 0), ("pool", 0)]
+        else:
+            modes = [("off", 0), ("persistent", configured or 60)]
+
+        self.stdout.write(f"{'View':<32} {'Mode':<11} {'Median ms':>10} {'p95 ms':>8} {'Connects':>9}")
+        try:
+            for name in options["view"] or DASHBOARD_VIEWS:
+                url = reverse(name)
+                for mode, max_age in modes:
+                    self.stdout.write(self.row(client, url, name, mode, max_age, options["requests"]))
+        finally:
+            settings_dict["CONN_MAX_AGE"] = configured
+            connections[DEFAULT_DB_ALIAS].close()
+
+        self.stdout.write(self.style.SUCCESS("✓ Benchmark complete"))
+
+    def row(self, client, url, name, mode, max_age, requests):
+        connection = connections[DEFAULT_DB_ALIAS]
+        connection.settings_dict["CONN_MAX_AGE"] = max_age
+        pool = connection.settings_dict.get("POOL")
+        if mode == "off":
+            # Bypass the pool for the baseline
+            connection.settings_dict["POOL"] = None
+        connection.close()
+
+        # Warm up caches and the connection, then measure
+        client.get(url)
+        reset_metrics()
+        timings = []
+        for _ in range(requests):
+            # The test client skips the request-boundary cleanup a WSGI
+            # server runs, which is where connections are reused or closed
+            close_old_connections()
+            started = time.perf_counter()
+            response = client.get(url)
+            timings.append((time.perf_counter() - started) * 1000)
+            close_old_connections()
+            if response.status_code != 200:
+                raise CommandError(f"{url} answered {response.status_code}")
+
+        connection.settings_dict["POOL"] = pool
+        connection.close()
+        opened = connection_metrics()["databases"][DEFAULT_DB_ALIAS]["opened"]
+        p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+        return f"{name:<32} {mode:<11} {statistics.median(timings):>10.1f} {p95:>8.1f} {opened:>9}"
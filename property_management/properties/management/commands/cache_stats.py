@@ -0,0 +1,55 @@
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+
+from properties.cache import CACHE_NAMESPACES, bump_namespace, cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Show cache hit rates per key namespace; flush namespaces by bumping their version"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--flush",
+            action="append",
+            default=[],
+            metavar="NAMESPACE",
+            help=f"Invalidate a namespace (repeatable): {', '.join(CACHE_NAMESPACES)}",
+        )
+        parser.add_argument("--flush-all", action="store_true", help="Clear the whole cache")
+        parser.add_argument("--reset", action="store_true", help="Zero the hit / miss counters")
+
+    def handle(self, *args, **options):
+        unknown = [namespace for namespace in options["flush"] if namespace not in CACHE_NAMESPACES]
+        if unknown:
+            raise CommandError(f"Unknown namespace(s): {', '.join(unknown)}")
+
+        for namespace in options["flush"]:
+            bump_namespace(namespace)
+            self.stdout.write(self.style.SUCCESS(f"✓ Flushed {namespace}"))
+
+        if options["flush_all"]:
+            cache.clear()
+            self.stdout.write(self.style.SUCCESS("✓ Cleared the cache"))
+            return
+
+        if options["reset"]:
+            reset_cache_stats()
+            self.stdout.write(self.style.SUCCESS("✓ Reset hit / miss counters"))
+            return
+
+        if isinstance(cache, LocMemCache):
+            self.stderr.write("The cache is per process (locmem): these are this command's own counts")
+
+        rows = cache_stats()
+        if not rows:
+            self.stdout.write("No cache reads recorded yet")
+            return
+
+        self.stdout.write(f"{'Namespace':<32} {'Hits':>10} {'Misses':>10} {'Hit rate':>9} {'Version':>8}")
+        for row in rows:
+            hit_rate = f"{row['hit_rate']:.1%}" if row["hit_rate"] is not None else "-"
+            version = row["version"] if row["version"] is not None else "-"
+            self.stdout.write(
+                f"{row['namespace']:<32} {row['hits']:>10} {row['misses']:>10} {hit_rate:>9} {version:>8}"
+            )
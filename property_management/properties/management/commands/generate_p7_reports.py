@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from properties.p7 import select_locals, stream_p7_zip
+from properties.routers import replica_reads
+
+
+class Command(BaseCommand):
+    help = "Generate filled P7 annual report workbooks (Page 1-5) for a set of locals into one ZIP"
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", type=str, help="Path of the ZIP file to write")
+        parser.add_argument("--year", type=int, default=timezone.now().year, help="Report year")
+        parser.add_argument("--district", action="append", default=[], help="District code (repeatable)")
+        parser.add_argument("--local", action="append", default=[], help="Local code (repeatable)")
+        parser.add_argument("--all", action="store_true", help="Every local in the country")
+        parser.add_argument("--workers", type=int, help="Process pool size (0 renders in-process)")
+        parser.add_argument("--batch-size", type=int, help="Locals fetched per batch")
+
+    @replica_reads()
+    def handle(self, *args, **options):
+        if not (options["district"] or options["local"] or options["all"]):
+            raise CommandError("Pass --district, --local or --all")
+
+        if options["all"]:
+            local_ids = select_locals()
+        else:
+            local_ids = select_locals(options["district"], options["local"])
+        if not local_ids:
+            raise CommandError("No locals match")
+
+        with open(options["output"], "wb") as output:
+            for chunk in stream_p7_zip(
+                local_ids, options["year"], workers=options["workers"], batch_size=options["batch_size"]
+            ):
+                output.write(chunk)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Wrote {len(local_ids)} P7 workbook(s) for {options['year']} to {options['output']}"
+        ))
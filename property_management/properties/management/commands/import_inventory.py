@@ -3,7 +3,10 @@ from datetime import datetime, date
 import xlrd
 import hashlib
 import os
+import time
 
+from properties.ledger import recording
+from properties.metrics import record_import
 from properties.models import (
     Pamayanan,
     PamayananBuilding,
@@ -24,6 +27,7 @@ class Command(BaseCommand):
     # MAIN
     # =====================================================
     def handle(self, *args, **options):
+        started = time.monotonic()
         file_path = options["file_path"]
         force = options["force"]
 
@@ -113,28 +117,31 @@ class Command(BaseCommand):
         created = 0
         skipped = 0
 
-        for row in range(9, sheet.nrows):
-            item_name = self._cell(sheet, row, 9)
-            if not item_name:
-                continue
-
-            try:
-                date_acquired = self._parse_date(self._cell(sheet, row, 3)) or date(2024, 1, 1)
-                quantity = int(self._cell(sheet, row, 7) or 1)
-
-                HousingUnitInventory.objects.create(
-                    housing_unit=housing_unit,
-                    item_name=item_name,
-                    quantity=quantity,
-                    date_acquired=date_acquired,
-                    make=self._cell(sheet, row, 32),
-                    color=self._cell(sheet, row, 37),
-                    size=self._cell(sheet, row, 42),
-                    remarks=self._cell(sheet, row, 52),
-                )
-                created += 1
-            except Exception:
-                skipped += 1
+        with recording("import"):
+            for row in range(9, sheet.nrows):
+                item_name = self._cell(sheet, row, 9)
+                if not item_name:
+                    continue
+
+                try:
+                    date_acquired = self._parse_date(self._cell(sheet, row, 3)) or date(2024, 1, 1)
+                    quantity = int(self._cell(sheet, row, 7) or 1)
+
+                    HousingUnitInventory.objects.create(
+                        housing_unit=housing_unit,
+                        item_name=item_name,
+                        quantity=quantity,
+                        date_acquired=date_acquired,
+                        make=self._cell(sheet, row, 32),
+                        color=self._cell(sheet, row, 37),
+                        size=self._cell(sheet, row, 42),
+                        remarks=self._cell(sheet, row, 52),
+                    )
+                    created += 1
+                except Exception:
+                    skipped += 1
+
+        record_import("inventory", created, time.monotonic() - started)
 
         # =====================================================
         # IMPORT RECORD (FIXED NULL file_size)
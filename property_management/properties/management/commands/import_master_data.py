@@ -1,7 +1,10 @@
+import time
+
 import pymysql
 import pymysql.cursors
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from properties.metrics import record_import
 from properties.models import District, Local
 
 class Command(BaseCommand):
@@ -15,6 +18,7 @@ class Command(BaseCommand):
         parser.add_argument('--database', type=str, default='purchasing')
 
     def handle(self, *args, **options):
+        started = time.monotonic()
         self.stdout.write("Connecting to MariaDB...")
         
         try:
@@ -85,6 +89,7 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.SUCCESS(f"Imported/Updated {l_count} Locals."))
 
             conn.close()
+            record_import('master_data', d_count + l_count, time.monotonic() - started)
 
         except pymysql.MySQLError as err:
             self.stdout.write(self.style.ERROR(f"MariaDB Error: {err}"))
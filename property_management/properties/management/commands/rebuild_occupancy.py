@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from properties.occupancy import rebuild_occupancy
+
+
+class Command(BaseCommand):
+    help = "Rebuild cached Pamayanan occupancy rollups"
+
+    def handle(self, *args, **options):
+        count = rebuild_occupancy()
+        self.stdout.write(self.style.SUCCESS(f"✓ Rebuilt occupancy for {count} Pamayanan"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from properties.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild cached per-Local asset valuation rollups"
+
+    def handle(self, *args, **options):
+        count = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f"✓ Rebuilt {count} Local asset rollup rows"))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from properties.stats import SNAPSHOTS
+
+
+class Command(BaseCommand):
+    help = "Recompute cached dashboard statistics (run from cron as a safety net)"
+
+    def handle(self, *args, **options):
+        for key, snapshot in SNAPSHOTS.items():
+            snapshot.refresh()
+            self.stdout.write(self.style.SUCCESS(f"✓ Refreshed {key}"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from properties.summaries import SUMMARY_VIEWS, refresh_summaries
+
+
+class Command(BaseCommand):
+    help = "Refresh the district / national asset summary materialized views (run from cron)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--blocking",
+            action="store_true",
+            help="Plain REFRESH (locks readers out; faster on an idle database)",
+        )
+
+    def handle(self, *args, **options):
+        refresh_summaries(concurrently=not options["blocking"])
+        self.stdout.write(self.style.SUCCESS(f"✓ Refreshed {', '.join(SUMMARY_VIEWS)}"))
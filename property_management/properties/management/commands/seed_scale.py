@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from properties.models import District
+from properties.seeding import PRESETS, Seeder, clear, rebuild_derived
+
+
+class Command(BaseCommand):
+    help = "Generate deterministic synthetic data at scale across every app (for load tests)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", choices=sorted(PRESETS), default="small", help="Preset volumes (default: small)")
+        for name in PRESETS["small"]:
+            parser.add_argument(f"--{name.replace('_', '-')}", type=int, dest=name, help=f"Override the preset number of {name.replace('_', ' ')}")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed; the same seed gives the same data")
+        parser.add_argument("--clear", action="store_true", help="TRUNCATE the seeded tables first")
+        parser.add_argument(
+            "--unsynced",
+            action="store_true",
+            help="Leave admin_core housing empty so the next admin_core sync does the full work",
+        )
+        parser.add_argument("--skip-derived", action="store_true", help="Do not rebuild rollups, summaries and caches")
+
+    def handle(self, *args, **options):
+        counts = {name: options[name] if options[name] is not None else value
+                  for name, value in PRESETS[options["size"]].items()}
+
+        if options["clear"]:
+            clear()
+        elif District.objects.exists():
+            raise CommandError("The database already has districts; use --clear to replace them")
+
+        started = time.monotonic()
+        seeder = Seeder(**counts, seed=options["seed"], unsynced=options["unsynced"], log=self.log)
+        written = seeder.run()
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Seeded {sum(written.values())} rows in {time.monotonic() - started:.1f}s"
+        ))
+
+        if not options["skip_derived"]:
+            started = time.monotonic()
+            rebuild_derived(log=self.log)
+            self.stdout.write(self.style.SUCCESS(f"✓ Rebuilt derived tables in {time.monotonic() - started:.1f}s"))
+
+    def log(self, message):
+        self.stdout.write(f"  {message}")
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from properties.ledger import prune_snapshots, take_snapshot
+
+
+class Command(BaseCommand):
+    help = "Snapshot inventory quantities from the movement ledger (run from cron, e.g. nightly)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep",
+            type=int,
+            default=0,
+            help="Delete all but the newest KEEP snapshots (default: keep all)",
+        )
+
+    def handle(self, *args, **options):
+        snapshot, created = take_snapshot()
+        if created:
+            self.stdout.write(self.style.SUCCESS(
+                f"✓ Snapshot of {snapshot.line_count} inventory rows through movement #{snapshot.last_movement_id}"
+            ))
+        else:
+            self.stdout.write(f"No movements since the last snapshot ({snapshot.taken_at:%Y-%m-%d %H:%M})")
+
+        if options["keep"] > 0:
+            self.stdout.write(self.style.SUCCESS(f"✓ Deleted {prune_snapshots(options['keep'])} old snapshots"))
@@ -0,0 +1,480 @@
+"""
+Prometheus metrics, served in text format at /metrics.
+
+Two kinds of metrics:
+
+- Process metrics are recorded in memory by the code paths they
+  measure: request latency and query counts per view (from
+  properties.instrumentation), import rows and seconds per importer,
+  and background refresh jobs in flight. Recording is a dict update
+  under a lock.
+
+- Database metrics are read when /metrics is scraped: ImportedFile
+  status counts, SyncRun counts and durations, the open SyncConflict
+  backlog and the cache hit / miss counters of properties.cache_backends
+  (already shared by every process through the cache).
+
+Gunicorn runs several worker processes and a scrape reaches only one
+of them. With METRICS_DIR set, each process writes its values to its
+own file there at most every METRICS_FLUSH_SECONDS (and at exit), by
+an atomic rename. A scrape adds up every file: counters and histograms
+from all processes, live or dead, so totals never go backwards when a
+worker is recycled; gauges from live processes only. Files of dead
+processes are folded into one archive file under a lock so the
+directory does not grow with every restart. Without METRICS_DIR,
+/metrics shows the values of the process that answers.
+
+Processes must share a host (liveness is checked by pid). Use a fresh
+directory per deployment, as with prometheus_client's multiprocess mode.
+
+Access: staff users, requests with `Authorization: Bearer
+<METRICS_TOKEN>`, or addresses in METRICS_ALLOWED_IPS.
+"""
+
+import atexit
+import fcntl
+import json
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum
+
+
+logger = logging.getLogger("properties.metrics")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+ARCHIVE_FILE = "archive.json"
+LOCK_FILE = ".lock"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+SYNC_BUCKETS = (1, 5, 15, 60, 300, 900, 3600)
+
+
+# ======================================================
+# REGISTRY
+# ======================================================
+
+class Registry:
+    """Metric values of this process, flushed to METRICS_DIR"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = {}
+        self.values = {}
+        self.process_collectors = []
+        self.last_flush = 0.0
+        self._forked()
+
+    def _forked(self):
+        # Workers forked from a preloading master start from zero
+        self.pid = os.getpid()
+        self.filename = f"{self.pid}-{uuid.uuid4().hex[:8]}.json"
+        self.values = {name: {} for name in self.metrics}
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        self.values.setdefault(metric.name, {})
+
+    def update(self, metric, labels, apply):
+        with self.lock:
+            if os.getpid() != self.pid:
+                self._forked()
+            series = self.values[metric.name]
+            series[labels] = apply(series.get(labels))
+        self.flush_if_due()
+
+    def snapshot(self):
+        for collect in self.process_collectors:
+            collect()
+        with self.lock:
+            return {
+                name: [[list(labels), value] for labels, value in series.items()]
+                for name, series in self.values.items()
+            }
+
+    # ----------------------------------------------
+    # Files
+    # ----------------------------------------------
+
+    def directory(self):
+        return getattr(settings, "METRICS_DIR", None)
+
+    def flush_if_due(self):
+        if not self.directory():
+            return
+        if time.monotonic() - self.last_flush >= getattr(settings, "METRICS_FLUSH_SECONDS", 5):
+            self.flush()
+
+    def flush(self):
+        directory = self.directory()
+        if not directory:
+            return
+        self.last_flush = time.monotonic()
+        try:
+            os.makedirs(directory, exist_ok=True)
+            write_json(os.path.join(directory, self.filename), self.snapshot())
+        except OSError:
+            logger.warning("Could not write metrics to %s", directory, exc_info=True)
+
+    def collect(self):
+        """{metric name: {labels: value}} summed over every process"""
+        directory = self.directory()
+        if not directory:
+            return merge([self.snapshot()], self.metrics)
+
+        self.flush()
+        with directory_lock(directory):
+            fold_dead_processes(directory, self.metrics)
+            live = []
+            for name in os.listdir(directory):
+                if name.endswith(".json") and name != ARCHIVE_FILE:
+                    snapshot = read_json(os.path.join(directory, name))
+                    if snapshot is not None:
+                        live.append(snapshot)
+            archive = read_json(os.path.join(directory, ARCHIVE_FILE)) or {}
+        return merge(live, self.metrics, archive=archive)
+
+
+REGISTRY = Registry()
+atexit.register(REGISTRY.flush)
+
+
+def write_json(path, data):
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w") as f:
+        json.dump(data, f)
+    os.replace(temporary, path)
+
+
+def read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class directory_lock:
+    def __init__(self, directory):
+        self.path = os.path.join(directory, LOCK_FILE)
+
+    def __enter__(self):
+        self.file = open(self.path, "a")
+        fcntl.flock(self.file, fcntl.LOCK_EX)
+
+    def __exit__(self, *exc_info):
+        fcntl.flock(self.file, fcntl.LOCK_UN)
+        self.file.close()
+
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def fold_dead_processes(directory, metrics):
+    """Add the counters of exited processes to the archive, drop their files"""
+    dead = []
+    for name in os.listdir(directory):
+        if not name.endswith(".json") or name == ARCHIVE_FILE:
+            continue
+        pid = name.split("-", 1)[0]
+        if pid.isdigit() and not process_alive(int(pid)):
+            dead.append(name)
+    if not dead:
+        return
+
+    archive_path = os.path.join(directory, ARCHIVE_FILE)
+    snapshots = [read_json(os.path.join(directory, name)) or {} for name in dead]
+    archive = merge(snapshots, metrics, archive=read_json(archive_path) or {})
+    write_json(archive_path, {
+        name: [[list(labels), value] for labels, value in series.items()]
+        for name, series in archive.items()
+        if metrics[name].kind != "gauge"
+    })
+    for name in dead:
+        os.remove(os.path.join(directory, name))
+
+
+def merge(live, metrics, archive=None):
+    """Sum snapshots; gauges only from `live`"""
+    merged = {name: {} for name in metrics}
+    for snapshot, is_live in [(archive or {}, False)] + [(s, True) for s in live]:
+        for name, series in snapshot.items():
+            metric = metrics.get(name)
+            if metric is None or (metric.kind == "gauge" and not is_live):
+                continue
+            for labels, value in series:
+                labels = tuple(labels)
+                merged[name][labels] = metric.add(merged[name].get(labels), value)
+    return merged
+
+
+# ======================================================
+# METRIC TYPES
+# ======================================================
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.registry = registry
+        registry.register(self)
+
+    def label_values(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self, labels, value):
+        yield self.name, labels, value
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        self.registry.update(self, self.label_values(labels), lambda value: (value or 0) + amount)
+
+    def add(self, total, value):
+        return (total or 0) + value
+
+
+class Gauge(Metric):
+    """Summed over live processes"""
+
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        self.registry.update(self, self.label_values(labels), lambda _: value)
+
+    def add(self, total, value):
+        return (total or 0) + value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS, registry=REGISTRY):
+        self.buckets = tuple(buckets)
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, amount, **labels):
+        # [count per bucket..., +Inf bucket, sum]; the count is the bucket total
+        index = next((i for i, bound in enumerate(self.buckets) if amount <= bound), len(self.buckets))
+
+        def apply(value):
+            value = value or [0] * (len(self.buckets) + 2)
+            value[index] += 1
+            value[-1] += amount
+            return value
+
+        self.registry.update(self, self.label_values(labels), apply)
+
+    def add(self, total, value):
+        if total is None:
+            return list(value)
+        return [a + b for a, b in zip(total, value)]
+
+    def samples(self, labels, value):
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), value):
+            cumulative += count
+            yield f"{self.name}_bucket", labels + (("le", format_bound(bound)),), cumulative
+        yield f"{self.name}_sum", labels, value[-1]
+        yield f"{self.name}_count", labels, cumulative
+
+
+def format_bound(bound):
+    return "+Inf" if bound == math.inf else repr(float(bound))
+
+
+# ======================================================
+# PROCESS METRICS
+# ======================================================
+
+REQUEST_LATENCY = Histogram(
+    "pm_http_request_duration_seconds", "Response time per view.", ["view"],
+)
+REQUEST_QUERIES = Histogram(
+    "pm_http_request_queries", "Database queries per request, per view.", ["view"], buckets=QUERY_BUCKETS,
+)
+IMPORTS = Counter("pm_imports_total", "Import runs per importer.", ["importer"])
+IMPORT_ROWS = Counter("pm_import_rows_total", "Rows imported per importer.", ["importer"])
+IMPORT_SECONDS = Counter("pm_import_seconds_total", "Time spent importing per importer.", ["importer"])
+BACKGROUND_JOBS = Gauge(
+    "pm_background_jobs_running", "Background refresh jobs in flight.", ["job"],
+)
+
+
+def observe_request(view, seconds, queries):
+    REQUEST_LATENCY.observe(seconds, view=view)
+    REQUEST_QUERIES.observe(queries, view=view)
+
+
+def record_import(importer, rows, seconds):
+    """Count one import run of `rows` rows taking `seconds`"""
+    IMPORTS.inc(importer=importer)
+    IMPORT_ROWS.inc(rows, importer=importer)
+    IMPORT_SECONDS.inc(seconds, importer=importer)
+    # Command-line imports exit right after
+    REGISTRY.flush()
+
+
+def collect_background_jobs():
+    from .stats import SNAPSHOTS
+    from .summaries import _refreshing
+
+    # Runs while a snapshot is taken; flush() resets its timer first, so
+    # these updates do not trigger another flush
+    BACKGROUND_JOBS.set(int(_refreshing.locked()), job="summaries")
+    for key, snapshot in SNAPSHOTS.items():
+        BACKGROUND_JOBS.set(int(snapshot._refreshing.locked()), job=f"stats:{key}")
+
+
+REGISTRY.process_collectors.append(collect_background_jobs)
+
+
+# ======================================================
+# DATABASE METRICS (read per scrape)
+# ======================================================
+
+def database_families():
+    """[(name, kind, documentation, [(sample name, labels, value)])]"""
+    from admin_core.models import SyncConflict, SyncRun
+
+    from .cache import cache_stats
+    from .models import ImportedFile
+
+    families = []
+
+    rows = ImportedFile.objects.values_list("status").annotate(count=Count("id")).order_by()
+    families.append((
+        "pm_imported_files", "gauge", "ImportedFile rows per status.",
+        [("pm_imported_files", (("status", status),), count) for status, count in rows],
+    ))
+
+    rows = SyncRun.objects.values_list("status").annotate(count=Count("id")).order_by()
+    families.append((
+        "pm_sync_runs_total", "counter", "Sync runs per status.",
+        [("pm_sync_runs_total", (("status", status),), count) for status, count in rows],
+    ))
+
+    duration = ExpressionWrapper(F("finished_at") - F("started_at"), output_field=DurationField())
+    finished = SyncRun.objects.filter(finished_at__isnull=False).annotate(duration=duration)
+    totals = finished.aggregate(
+        count=Count("id"),
+        total=Sum("duration"),
+        **{f"le_{i}": Count("id", filter=Q(duration__lte=timedelta(seconds=bound)))
+           for i, bound in enumerate(SYNC_BUCKETS)},
+    )
+    samples = [
+        ("pm_sync_run_duration_seconds_bucket", (("le", format_bound(bound)),), totals[f"le_{i}"])
+        for i, bound in enumerate(SYNC_BUCKETS)
+    ]
+    samples += [
+        ("pm_sync_run_duration_seconds_bucket", (("le", "+Inf"),), totals["count"]),
+        ("pm_sync_run_duration_seconds_sum", (), (totals["total"] or timedelta()).total_seconds()),
+        ("pm_sync_run_duration_seconds_count", (), totals["count"]),
+    ]
+    families.append(("pm_sync_run_duration_seconds", "histogram", "Duration of finished sync runs.", samples))
+
+    last = finished.order_by("-started_at").first()
+    families.append((
+        "pm_sync_last_run_duration_seconds", "gauge", "Duration of the latest finished sync run.",
+        [("pm_sync_last_run_duration_seconds", (), last.duration.total_seconds())] if last else [],
+    ))
+
+    rows = (
+        SyncConflict.objects.filter(resolved=False)
+        .values_list("conflict_type", "severity").annotate(count=Count("id")).order_by()
+    )
+    families.append((
+        "pm_sync_conflicts_open", "gauge", "Unresolved sync conflicts.",
+        [("pm_sync_conflicts_open", (("conflict_type", kind), ("severity", severity)), count)
+         for kind, severity, count in rows],
+    ))
+
+    stats = cache_stats()
+    for outcome in ("hits", "misses"):
+        families.append((
+            f"pm_cache_{outcome}_total", "counter", f"Cache {outcome} per key namespace.",
+            [(f"pm_cache_{outcome}_total", (("namespace", row["namespace"]),), row[outcome]) for row in stats],
+        ))
+    families.append((
+        "pm_cache_hit_ratio", "gauge", "Cache hit ratio per key namespace.",
+        [("pm_cache_hit_ratio", (("namespace", row["namespace"]),), row["hit_rate"])
+         for row in stats if row["hit_rate"] is not None],
+    ))
+    return families
+
+
+# ======================================================
+# EXPOSITION
+# ======================================================
+
+def process_families(registry=REGISTRY):
+    merged = registry.collect()
+    families = []
+    for name, metric in sorted(registry.metrics.items()):
+        samples = []
+        for labels, value in sorted(merged[name].items()):
+            samples.extend(metric.samples(tuple(zip(metric.labelnames, labels)), value))
+        families.append((name, metric.kind, metric.documentation, samples))
+
+    # Throughput from the merged totals
+    rows, seconds = merged[IMPORT_ROWS.name], merged[IMPORT_SECONDS.name]
+    families.append((
+        "pm_import_rows_per_second", "gauge", "Average import throughput per importer.",
+        [("pm_import_rows_per_second", (("importer", labels[0]),), rows[labels] / seconds[labels])
+         for labels in sorted(rows) if seconds.get(labels)],
+    ))
+    return families
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+def render(families):
+    lines = []
+    for name, kind, documentation, samples in families:
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} {kind}")
+        for sample, labels, value in samples:
+            if labels:
+                label_text = ",".join(f'{key}="{escape(val)}"' for key, val in labels)
+                lines.append(f"{sample}{{{label_text}}} {format_value(value)}")
+            else:
+                lines.append(f"{sample} {format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def exposition():
+    families = process_families()
+    try:
+        families += database_families()
+    except DatabaseError:
+        logger.warning("Database metrics unavailable", exc_info=True)
+    return render(families)
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.8 on 2026-10-18 23:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, Q, Value
+from django.db.models.functions import NullIf
+
+
+def backfill_occupancy(apps, schema_editor):
+    Pamayanan = apps.get_model('properties', 'Pamayanan')
+    PamayananOccupancy = apps.get_model('properties', 'PamayananOccupancy')
+
+    rows = Pamayanan.objects.order_by().annotate(
+        unit_count=Count('housing_units', distinct=True),
+        occupant_count=Count(
+            'housing_units',
+            filter=Q(housing_units__occupant_name__gt=''),
+            distinct=True,
+        ),
+        department_count=Count(
+            NullIf('housing_units__department', Value('')), distinct=True
+        ),
+    ).values('pk', 'unit_count', 'occupant_count', 'department_count')
+
+    PamayananOccupancy.objects.bulk_create(
+        PamayananOccupancy(
+            pamayanan_id=row['pk'],
+            unit_count=row['unit_count'],
+            occupant_count=row['occupant_count'],
+            department_count=row['department_count'],
+        )
+        for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0020_remove_housingunit_property_housingunit_pamayanan_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PamayananOccupancy',
+            fields=[
+                ('pamayanan', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='occupancy', serialize=False, to='properties.pamayanan')),
+                ('unit_count', models.PositiveIntegerField(default=0)),
+                ('occupant_count', models.PositiveIntegerField(default=0)),
+                ('department_count', models.PositiveIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Pamayanan Occupancy',
+                'verbose_name_plural': 'Pamayanan Occupancy',
+            },
+        ),
+        migrations.RunPython(backfill_occupancy, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.8 on 2026-10-19 00:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0021_pamayanan_occupancy'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='district',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('name', 'dcode', config='simple'), name='district_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='housingunit',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('occupant_name', 'housing_unit_name', 'unit_number', 'department', 'section', config='simple'), name='housingunit_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='local',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('name', 'lcode', config='simple'), name='local_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pamayanan',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('name', 'address', 'city', 'province', config='simple'), name='pamayanan_search_idx'),
+        ),
+    ]
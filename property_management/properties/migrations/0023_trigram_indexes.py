@@ -0,0 +1,26 @@
+# Generated by Django 4.2.8 on 2026-10-19 00:00
+
+from django.db import migrations
+
+from properties.filters import trigram_index_sql
+
+
+# Substring search indexes for the list filters (skipped without pg_trgm)
+CREATE_DISTRICT_INDEXES, DROP_DISTRICT_INDEXES = trigram_index_sql(
+    'district', ('name', 'dcode')
+)
+CREATE_LOCAL_INDEXES, DROP_LOCAL_INDEXES = trigram_index_sql(
+    'lokal', ('name', 'lcode')
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0022_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_DISTRICT_INDEXES, DROP_DISTRICT_INDEXES),
+        migrations.RunSQL(CREATE_LOCAL_INDEXES, DROP_LOCAL_INDEXES),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.8 on 2026-10-19 00:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from properties.rollups import rebuild_rollups
+
+
+def backfill_rollups(apps, schema_editor):
+    rebuild_rollups(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0023_trigram_indexes'),
+        ('gusali', '0003_trigram_indexes'),
+        ('kagamitan', '0002_item_dcode_item_lcode'),
+        ('lupa', '0002_land_dcode_land_lcode'),
+        ('plants', '0003_trigram_indexes'),
+        ('vehicles', '0002_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LocalAssetRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('building_count', models.PositiveIntegerField(default=0)),
+                ('building_total', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('item_count', models.PositiveIntegerField(default=0)),
+                ('item_total', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('land_count', models.PositiveIntegerField(default=0)),
+                ('land_total', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('plant_count', models.PositiveIntegerField(default=0)),
+                ('plant_total', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('vehicle_count', models.PositiveIntegerField(default=0)),
+                ('vehicle_total', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('property_count', models.PositiveIntegerField(default=0)),
+                ('property_total', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('local', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='asset_rollups', to='properties.local')),
+            ],
+            options={
+                'verbose_name': 'Local Asset Rollup',
+                'verbose_name_plural': 'Local Asset Rollups',
+                'ordering': ['local', '-year'],
+                'indexes': [models.Index(fields=['year'], name='properties__year_6e796e_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='localassetrollup',
+            constraint=models.UniqueConstraint(fields=('local', 'year'), name='unique_local_asset_rollup'),
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,120 @@
+# Generated by Django 4.2.8 on 2026-10-19 00:12
+
+from django.db import migrations, models
+
+
+# One row per asset across the six national asset tables. Standing
+# inventory without a report year is bucketed by the year it was
+# recorded, as in properties.rollups.
+CREATE_ASSET_VALUE_ROWS = """
+CREATE VIEW asset_value_rows AS
+    SELECT 'building'::varchar(20) AS asset_type, local_id, year_covered AS year,
+           current_total_cost AS value
+      FROM gusali_building
+    UNION ALL
+    SELECT 'item', local_id, year_reported, total_price
+      FROM kagamitan_item
+    UNION ALL
+    SELECT 'land', local_id, EXTRACT(YEAR FROM created_at AT TIME ZONE 'UTC')::integer, market_value
+      FROM lupa_land
+    UNION ALL
+    SELECT 'plant', local_id, EXTRACT(YEAR FROM created_at AT TIME ZONE 'UTC')::integer, total_value
+      FROM plants_plant
+    UNION ALL
+    SELECT 'vehicle', local_id, EXTRACT(YEAR FROM created_at AT TIME ZONE 'UTC')::integer, acquisition_cost
+      FROM vehicles_vehicle
+    UNION ALL
+    SELECT 'property', local_id, EXTRACT(YEAR FROM created_at AT TIME ZONE 'UTC')::integer, current_value
+      FROM properties_localproperty;
+"""
+
+# REFRESH ... CONCURRENTLY needs a unique index on each view
+CREATE_DISTRICT_SUMMARY = """
+CREATE MATERIALIZED VIEW district_asset_summary AS
+    SELECT l.district_id || ':' || a.year || ':' || a.asset_type AS id,
+           l.district_id,
+           a.year,
+           a.asset_type,
+           COUNT(DISTINCT a.local_id)::integer AS local_count,
+           COUNT(*)::integer AS asset_count,
+           COALESCE(SUM(a.value), 0)::numeric(18, 2) AS total_value
+      FROM asset_value_rows a
+      JOIN lokal l ON l.id = a.local_id
+     GROUP BY l.district_id, a.year, a.asset_type
+WITH DATA;
+CREATE UNIQUE INDEX district_asset_summary_id ON district_asset_summary (id);
+CREATE INDEX district_asset_summary_year ON district_asset_summary (year, asset_type);
+"""
+
+# Includes assets not yet linked to a local
+CREATE_NATIONAL_SUMMARY = """
+CREATE MATERIALIZED VIEW national_asset_summary AS
+    SELECT a.year || ':' || a.asset_type AS id,
+           a.year,
+           a.asset_type,
+           COUNT(DISTINCT l.district_id)::integer AS district_count,
+           COUNT(DISTINCT a.local_id)::integer AS local_count,
+           COUNT(*)::integer AS asset_count,
+           COALESCE(SUM(a.value), 0)::numeric(18, 2) AS total_value
+      FROM asset_value_rows a
+      LEFT JOIN lokal l ON l.id = a.local_id
+     GROUP BY a.year, a.asset_type
+WITH DATA;
+CREATE UNIQUE INDEX national_asset_summary_id ON national_asset_summary (id);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0024_local_asset_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DistrictAssetSummary',
+            fields=[
+                ('id', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('year', models.IntegerField()),
+                ('asset_type', models.CharField(max_length=20)),
+                ('local_count', models.IntegerField()),
+                ('asset_count', models.IntegerField()),
+                ('total_value', models.DecimalField(decimal_places=2, max_digits=18)),
+            ],
+            options={
+                'verbose_name': 'District Asset Summary',
+                'verbose_name_plural': 'District Asset Summaries',
+                'db_table': 'district_asset_summary',
+                'ordering': ['district', '-year', 'asset_type'],
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='NationalAssetSummary',
+            fields=[
+                ('id', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('year', models.IntegerField()),
+                ('asset_type', models.CharField(max_length=20)),
+                ('district_count', models.IntegerField()),
+                ('local_count', models.IntegerField()),
+                ('asset_count', models.IntegerField()),
+                ('total_value', models.DecimalField(decimal_places=2, max_digits=18)),
+            ],
+            options={
+                'verbose_name': 'National Asset Summary',
+                'verbose_name_plural': 'National Asset Summaries',
+                'db_table': 'national_asset_summary',
+                'ordering': ['-year', 'asset_type'],
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(CREATE_ASSET_VALUE_ROWS, "DROP VIEW IF EXISTS asset_value_rows;"),
+        migrations.RunSQL(
+            CREATE_DISTRICT_SUMMARY,
+            "DROP MATERIALIZED VIEW IF EXISTS district_asset_summary;",
+        ),
+        migrations.RunSQL(
+            CREATE_NATIONAL_SUMMARY,
+            "DROP MATERIALIZED VIEW IF EXISTS national_asset_summary;",
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.8 on 2026-10-19 01:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0025_asset_summary_views'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(help_text='SHA1 of the normalized SQL', max_length=40, unique=True)),
+                ('sql', models.TextField(help_text='Normalized SQL, literals replaced by ?')),
+                ('database', models.CharField(default='default', max_length=50)),
+                ('view', models.CharField(blank=True, max_length=200)),
+                ('site', models.CharField(blank=True, help_text='file:line in function that ran the query', max_length=300)),
+                ('params', models.TextField(blank=True, help_text='Parameters of the slowest run (truncated)')),
+                ('plan', models.TextField(blank=True)),
+                ('calls', models.IntegerField(default=1)),
+                ('total_ms', models.FloatField(default=0)),
+                ('max_ms', models.FloatField(default=0)),
+                ('first_seen', models.DateTimeField(auto_now_add=True)),
+                ('last_seen', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Slow Query',
+                'verbose_name_plural': 'Slow Queries',
+                'ordering': ['-total_ms'],
+            },
+        ),
+    ]
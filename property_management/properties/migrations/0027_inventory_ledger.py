@@ -0,0 +1,92 @@
+# Generated by Django 4.2.8 on 2026-10-19 02:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+# The ledger is append-only; TRUNCATE (test flush, seed_scale --clear) is still allowed
+CREATE_APPEND_ONLY_TRIGGER = """
+CREATE FUNCTION inventory_movement_append_only() RETURNS trigger AS $$
+BEGIN
+    RAISE EXCEPTION 'properties_inventorymovement is append-only';
+END;
+$$ LANGUAGE plpgsql;
+CREATE TRIGGER inventory_movement_append_only
+    BEFORE UPDATE OR DELETE ON properties_inventorymovement
+    FOR EACH ROW EXECUTE FUNCTION inventory_movement_append_only();
+"""
+
+DROP_APPEND_ONLY_TRIGGER = """
+DROP TRIGGER IF EXISTS inventory_movement_append_only ON properties_inventorymovement;
+DROP FUNCTION IF EXISTS inventory_movement_append_only();
+"""
+
+# Today's quantities become the opening balances, dated when each row was recorded
+RECORD_OPENING_BALANCES = """
+INSERT INTO properties_inventorymovement
+       (inventory_item_id, housing_unit_id, item_name, delta, kind, occurred_at)
+SELECT id, housing_unit_id, item_name, quantity, 'opening', created_at
+  FROM properties_housingunitinventory
+ WHERE quantity <> 0
+ ORDER BY id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0026_slowquery'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventorySnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('taken_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('last_movement_id', models.BigIntegerField(default=0)),
+                ('line_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Inventory Snapshot',
+                'verbose_name_plural': 'Inventory Snapshots',
+                'ordering': ['-taken_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='InventorySnapshotLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('item_name', models.CharField(max_length=255)),
+                ('quantity', models.IntegerField()),
+                ('housing_unit', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='properties.housingunit')),
+                ('inventory_item', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='properties.housingunitinventory')),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='properties.inventorysnapshot')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['snapshot', 'housing_unit'], name='snapshot_line_unit_idx'), models.Index(fields=['snapshot', 'inventory_item'], name='snapshot_line_item_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='InventoryMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('item_name', models.CharField(max_length=255)),
+                ('delta', models.IntegerField(help_text='Signed change in quantity')),
+                ('kind', models.CharField(choices=[('opening', 'Opening balance'), ('import', 'Import'), ('added', 'Added'), ('edit', 'Edit'), ('removed', 'Removed'), ('transfer_out', 'Transfer out'), ('transfer_in', 'Transfer in')], max_length=20)),
+                ('occurred_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('housing_unit', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='inventory_movements', to='properties.housingunit')),
+                ('inventory_item', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='movements', to='properties.housingunitinventory')),
+                ('transfer', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='movements', to='properties.itemtransfer')),
+            ],
+            options={
+                'verbose_name': 'Inventory Movement',
+                'verbose_name_plural': 'Inventory Movements',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['housing_unit', 'id'], name='movement_unit_idx'), models.Index(fields=['inventory_item', 'id'], name='movement_item_idx'), models.Index(fields=['occurred_at'], name='movement_occurred_idx')],
+            },
+        ),
+        migrations.RunSQL(CREATE_APPEND_ONLY_TRIGGER, DROP_APPEND_ONLY_TRIGGER),
+        migrations.RunSQL(RECORD_OPENING_BALANCES, migrations.RunSQL.noop),
+    ]
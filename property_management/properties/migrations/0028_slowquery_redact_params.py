@@ -0,0 +1,25 @@
+# Generated by Django 4.2.8 on 2026-10-19 02:58
+
+from django.db import migrations, models
+
+
+def clear_params(apps, schema_editor):
+    # Samples recorded so far hold parameter values
+    SlowQuery = apps.get_model('properties', 'SlowQuery')
+    SlowQuery.objects.exclude(params='').update(params='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0027_inventory_ledger'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='slowquery',
+            name='params',
+            field=models.TextField(blank=True, help_text='Parameter types of the slowest run, not their values'),
+        ),
+        migrations.RunPython(clear_params, migrations.RunPython.noop),
+    ]
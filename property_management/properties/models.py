@@ -5,6 +5,14 @@ import hashlib
 import pyotp
 import secrets
 
+from .search import (
+    DISTRICT_SEARCH_FIELDS,
+    HOUSING_UNIT_SEARCH_FIELDS,
+    LOCAL_SEARCH_FIELDS,
+    PAMAYANAN_SEARCH_FIELDS,
+    search_index,
+)
+
 
 class UserProfile(models.Model):
     """Extended user profile for 2FA and additional settings"""
@@ -308,6 +316,9 @@ class Pamayanan(models.Model):
         ordering = ['-created_at']
         verbose_name = "Pamayanan"
         verbose_name_plural = "Pamayanan"
+        indexes = [
+            search_index(PAMAYANAN_SEARCH_FIELDS, 'pamayanan_search_idx'),
+        ]
     def __str__(self):
         return f"{self.name} ({self.owner})"
     
@@ -416,6 +427,9 @@ class HousingUnit(models.Model):
         ordering = ['-date_reported']
         verbose_name = "Housing Unit (Pamayanan)"
         verbose_name_plural = "Housing Units (Pamayanan)"
+        indexes = [
+            search_index(HOUSING_UNIT_SEARCH_FIELDS, 'housingunit_search_idx'),
+        ]
 
     def __str__(self):
         parts = []
@@ -440,6 +454,34 @@ class HousingUnit(models.Model):
         
         super().save(*args, **kwargs)
 
+
+class PamayananOccupancy(models.Model):
+    """
+    Cached occupancy rollup for one Pamayanan.
+
+    Refreshed by signals on HousingUnit writes (see properties.occupancy);
+    bulk imports rebuild it with `manage.py rebuild_occupancy`.
+    """
+
+    pamayanan = models.OneToOneField(
+        Pamayanan,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="occupancy"
+    )
+    unit_count = models.PositiveIntegerField(default=0)
+    occupant_count = models.PositiveIntegerField(default=0)
+    department_count = models.PositiveIntegerField(default=0)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Pamayanan Occupancy"
+        verbose_name_plural = "Pamayanan Occupancy"
+
+    def __str__(self):
+        return f"{self.pamayanan_id}: {self.occupant_count}/{self.unit_count} occupied"
+
+
 class HousingUnitInventory(models.Model):
     """
     Inventory items assigned to a specific housing unit (Pamayanan).
@@ -636,6 +678,9 @@ class District(models.Model):
         ordering = ['name']
         verbose_name = 'District'
         verbose_name_plural = 'Districts'
+        indexes = [
+            search_index(DISTRICT_SEARCH_FIELDS, 'district_search_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.dcode})"
@@ -674,6 +719,9 @@ class Local(models.Model):
         unique_together = ['lcode', 'district']
         verbose_name = 'Local'
         verbose_name_plural = 'Locals'
+        indexes = [
+            search_index(LOCAL_SEARCH_FIELDS, 'local_search_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.lcode}) - {self.district.name}"
@@ -973,3 +1021,237 @@ class LocalInventory(models.Model):
     
     def __str__(self):
         return f"{self.item_name} ({self.quantity}x) - {self.property.name}"
+
+
+class LocalAssetRollup(models.Model):
+    """
+    Cached asset counts and values for one Local and year.
+
+    Maintained by write hooks in each asset app (see properties.rollups);
+    rebuild from scratch with `manage.py rebuild_rollups`.
+    """
+
+    local = models.ForeignKey(
+        Local,
+        on_delete=models.CASCADE,
+        related_name="asset_rollups"
+    )
+    year = models.IntegerField()
+
+    building_count = models.PositiveIntegerField(default=0)
+    building_total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    item_count = models.PositiveIntegerField(default=0)
+    item_total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    land_count = models.PositiveIntegerField(default=0)
+    land_total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    plant_count = models.PositiveIntegerField(default=0)
+    plant_total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    vehicle_count = models.PositiveIntegerField(default=0)
+    vehicle_total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    property_count = models.PositiveIntegerField(default=0)
+    property_total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["local", "-year"]
+        verbose_name = "Local Asset Rollup"
+        verbose_name_plural = "Local Asset Rollups"
+        constraints = [
+            models.UniqueConstraint(fields=["local", "year"], name="unique_local_asset_rollup"),
+        ]
+        indexes = [
+            models.Index(fields=["year"]),
+        ]
+
+    def __str__(self):
+        return f"{self.local_id} / {self.year}"
+
+
+class DistrictAssetSummary(models.Model):
+    """
+    Asset count and value per district, year and asset type.
+
+    Read-only view of the `district_asset_summary` materialized view
+    (see properties.summaries); refreshed after imports and by
+    `manage.py refresh_summaries`.
+    """
+
+    id = models.CharField(max_length=100, primary_key=True)
+    district = models.ForeignKey(
+        District,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="asset_summaries"
+    )
+    year = models.IntegerField()
+    asset_type = models.CharField(max_length=20)
+    local_count = models.IntegerField()
+    asset_count = models.IntegerField()
+    total_value = models.DecimalField(max_digits=18, decimal_places=2)
+
+    class Meta:
+        managed = False
+        db_table = "district_asset_summary"
+        ordering = ["district", "-year", "asset_type"]
+        verbose_name = "District Asset Summary"
+        verbose_name_plural = "District Asset Summaries"
+
+    def __str__(self):
+        return f"{self.district_id} / {self.year} / {self.asset_type}"
+
+
+class NationalAssetSummary(models.Model):
+    """
+    Asset count and value per year and asset type, across all districts.
+
+    Read-only view of the `national_asset_summary` materialized view.
+    """
+
+    id = models.CharField(max_length=100, primary_key=True)
+    year = models.IntegerField()
+    asset_type = models.CharField(max_length=20)
+    district_count = models.IntegerField()
+    local_count = models.IntegerField()
+    asset_count = models.IntegerField()
+    total_value = models.DecimalField(max_digits=18, decimal_places=2)
+
+    class Meta:
+        managed = False
+        db_table = "national_asset_summary"
+        ordering = ["-year", "asset_type"]
+        verbose_name = "National Asset Summary"
+        verbose_name_plural = "National Asset Summaries"
+
+    def __str__(self):
+        return f"{self.year} / {self.asset_type}"
+
+
+class SlowQuery(models.Model):
+    """
+    A statement that ran over SLOW_QUERY_MS, grouped by normalized SQL.
+
+    Recorded by properties.slowqueries. The sample (view, call site,
+    parameter types and EXPLAIN plan) is that of the slowest run so far.
+    """
+
+    fingerprint = models.CharField(max_length=40, unique=True, help_text="SHA1 of the normalized SQL")
+    sql = models.TextField(help_text="Normalized SQL, literals replaced by ?")
+    database = models.CharField(max_length=50, default='default')
+    view = models.CharField(max_length=200, blank=True)
+    site = models.CharField(max_length=300, blank=True, help_text="file:line in function that ran the query")
+    params = models.TextField(blank=True, help_text="Parameter types of the slowest run, not their values")
+    plan = models.TextField(blank=True)
+    calls = models.IntegerField(default=1)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+    first_seen = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-total_ms']
+        verbose_name = 'Slow Query'
+        verbose_name_plural = 'Slow Queries'
+
+    def __str__(self):
+        return f"{self.sql[:80]} ({self.calls} calls, {self.total_ms:.0f} ms)"
+
+    @property
+    def avg_ms(self):
+        return self.total_ms / self.calls if self.calls else 0
+
+
+class InventoryMovement(models.Model):
+    """
+    Append-only ledger of inventory quantity changes: one signed delta
+    per HousingUnitInventory row per change, written by transfers,
+    imports and edits (see properties.ledger).
+
+    Rows are never updated or deleted (a database trigger refuses it),
+    so the item, unit and transfer references carry no foreign key
+    constraint and outlive the rows they point to.
+    """
+
+    KIND_CHOICES = [
+        ('opening', 'Opening balance'),
+        ('import', 'Import'),
+        ('added', 'Added'),
+        ('edit', 'Edit'),
+        ('removed', 'Removed'),
+        ('transfer_out', 'Transfer out'),
+        ('transfer_in', 'Transfer in'),
+    ]
+
+    inventory_item = models.ForeignKey(
+        HousingUnitInventory, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False,
+        related_name='movements'
+    )
+    housing_unit = models.ForeignKey(
+        HousingUnit, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False,
+        related_name='inventory_movements'
+    )
+    item_name = models.CharField(max_length=255)
+    delta = models.IntegerField(help_text="Signed change in quantity")
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    transfer = models.ForeignKey(
+        ItemTransfer, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True,
+        related_name='movements'
+    )
+    occurred_at = models.DateTimeField(default=now)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['housing_unit', 'id'], name='movement_unit_idx'),
+            models.Index(fields=['inventory_item', 'id'], name='movement_item_idx'),
+            models.Index(fields=['occurred_at'], name='movement_occurred_idx'),
+        ]
+        verbose_name = 'Inventory Movement'
+        verbose_name_plural = 'Inventory Movements'
+
+    def __str__(self):
+        return f"{self.item_name} {self.delta:+d} ({self.get_kind_display()})"
+
+
+class InventorySnapshot(models.Model):
+    """
+    Quantity of every inventory row as of ledger entry
+    `last_movement_id`, taken periodically by `manage.py
+    snapshot_inventory`. Point-in-time queries start from the latest
+    snapshot and replay only the ledger entries after it.
+    """
+
+    taken_at = models.DateTimeField(default=now, db_index=True)
+    last_movement_id = models.BigIntegerField(default=0)
+    line_count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['-taken_at']
+        verbose_name = 'Inventory Snapshot'
+        verbose_name_plural = 'Inventory Snapshots'
+
+    def __str__(self):
+        return f"Snapshot {self.taken_at:%Y-%m-%d %H:%M} (through #{self.last_movement_id})"
+
+
+class InventorySnapshotLine(models.Model):
+    """One inventory row's quantity in an InventorySnapshot; zero rows are left out"""
+
+    snapshot = models.ForeignKey(InventorySnapshot, on_delete=models.CASCADE, related_name='lines')
+    inventory_item = models.ForeignKey(
+        HousingUnitInventory, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, related_name='+'
+    )
+    housing_unit = models.ForeignKey(
+        HousingUnit, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, related_name='+'
+    )
+    item_name = models.CharField(max_length=255)
+    quantity = models.IntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['snapshot', 'housing_unit'], name='snapshot_line_unit_idx'),
+            models.Index(fields=['snapshot', 'inventory_item'], name='snapshot_line_item_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.item_name}: {self.quantity}"
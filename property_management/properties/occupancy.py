@@ -0,0 +1,122 @@
+"""
+Occupancy rollups for Pamayanan / HousingUnit pages.
+
+All counts come from SQL aggregates (one query per page section),
+never from `.count()` calls inside a loop. When OCCUPANCY_ROLLUPS is
+enabled the per-Pamayanan counts are read from the cached
+PamayananOccupancy rows instead, which signals keep current on every
+HousingUnit write.
+"""
+
+from django.conf import settings
+from django.db.models import Count, F, Q, Value
+from django.db.models.functions import Coalesce, NullIf
+
+
+# Units with an occupant (occupant_name is required but may be blank)
+OCCUPIED = Q(occupant_name__gt="")
+
+
+def rollups_enabled():
+    """Read per-Pamayanan counts from PamayananOccupancy (OCCUPANCY_ROLLUPS setting)"""
+    return getattr(settings, "OCCUPANCY_ROLLUPS", True)
+
+
+# ======================================================
+# LIVE AGGREGATES
+# ======================================================
+
+def annotate_occupancy(queryset):
+    """
+    Annotate a Pamayanan queryset with unit_count / occupant_count /
+    department_count, computed in a single grouped query.
+    """
+    return queryset.annotate(
+        unit_count=Count("housing_units", distinct=True),
+        occupant_count=Count(
+            "housing_units",
+            filter=Q(housing_units__occupant_name__gt=""),
+            distinct=True,
+        ),
+        department_count=Count(
+            NullIf("housing_units__department", Value("")),
+            distinct=True,
+        ),
+    )
+
+
+def unit_stats(units):
+    """
+    Totals for a HousingUnit queryset in one aggregate query.
+    """
+    return units.aggregate(
+        unit_count=Count("id"),
+        occupant_count=Count("id", filter=OCCUPIED),
+        department_count=Count(NullIf("department", Value("")), distinct=True),
+    )
+
+
+# ======================================================
+# CACHED ROLLUPS
+# ======================================================
+
+def with_occupancy(queryset):
+    """
+    Pamayanan queryset carrying unit_count / occupant_count /
+    department_count, from the rollup table when enabled.
+    """
+    if not rollups_enabled():
+        return annotate_occupancy(queryset)
+
+    return queryset.annotate(
+        unit_count=Coalesce(F("occupancy__unit_count"), 0),
+        occupant_count=Coalesce(F("occupancy__occupant_count"), 0),
+        department_count=Coalesce(F("occupancy__department_count"), 0),
+    )
+
+
+def refresh_occupancy(pamayanan_id):
+    """
+    Recompute the rollup row for one Pamayanan.
+    """
+    from properties.models import HousingUnit, Pamayanan, PamayananOccupancy
+
+    if not Pamayanan.objects.filter(pk=pamayanan_id).exists():
+        return None
+
+    stats = unit_stats(HousingUnit.objects.filter(pamayanan_id=pamayanan_id))
+    rollup, _ = PamayananOccupancy.objects.update_or_create(
+        pamayanan_id=pamayanan_id,
+        defaults=stats,
+    )
+    return rollup
+
+
+def rebuild_occupancy():
+    """
+    Recompute every rollup row (after bulk imports, which skip signals).
+    Returns the number of rows written.
+    """
+    from properties.models import Pamayanan, PamayananOccupancy
+
+    rows = [
+        PamayananOccupancy(
+            pamayanan_id=pam["pk"],
+            unit_count=pam["unit_count"],
+            occupant_count=pam["occupant_count"],
+            department_count=pam["department_count"],
+        )
+        for pam in annotate_occupancy(Pamayanan.objects.order_by()).values(
+            "pk", "unit_count", "occupant_count", "department_count"
+        )
+    ]
+
+    PamayananOccupancy.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["pamayanan"],
+        update_fields=[
+            "unit_count", "occupant_count", "department_count", "refreshed_at",
+        ],
+    )
+    return len(rows)
@@ -0,0 +1,215 @@
+"""
+Bulk P7 annual report generation.
+
+    for path, content in generate_p7_reports(local_ids, 2024):
+        ...
+    stream_p7_zip(local_ids, 2024)   # generator of ZIP bytes
+
+Locals are processed in batches of P7_BATCH_SIZE. Each batch is fetched
+with a fixed number of queries (one per table, filtered by local__in)
+however many locals it holds. The batch is handed to a process pool as
+plain dicts, and properties.p7_workbook renders one workbook per local
+in the pool.
+
+The next batch is fetched while the pool renders the current one.
+Workbooks come back in local order and are written straight into a
+ZIP on a non-seekable stream. The caller receives each file as soon
+as it is rendered, and memory is bounded by two batches.
+"""
+
+import zipfile
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from itertools import islice
+
+from django.conf import settings
+from django.utils import timezone
+
+from gusali.models import Building, BuildingYearlyRecord
+from kagamitan.models import Item
+from lupa.models import Land
+from plants.models import Plant
+from vehicles.models import Vehicle
+
+from .models import Local
+from .p7_workbook import render_workbook
+
+
+DEFAULT_BATCH_SIZE = 25
+
+BUILDING_FIELDS = (
+    "id", "local_id", "code", "name", "original_cost", "classification", "is_donated",
+    "donation_date", "ownership_date", "constructor", "capacity", "current_total_cost", "remarks",
+)
+YEARLY_FIELDS = (
+    "cost_last_year", "construction_cost", "renovation_cost", "general_repair_cost",
+    "other_additions_cost", "total_added", "broken_removed_part", "broken_removed_cost",
+    "year_end_total",
+)
+ITEM_FIELDS = (
+    "local_id", "location", "property_number", "date_acquired", "quantity", "item_name",
+    "brand", "model", "material", "color", "size", "unit_price", "total_price",
+    "reference_number", "remarks", "is_new",
+)
+LAND_FIELDS = ("local_id", "location", "lot_area", "market_value", "acquisition_cost", "status")
+PLANT_FIELDS = ("local_id", "name", "variety", "fruit_bearing", "total_quantity", "total_value")
+VEHICLE_FIELDS = (
+    "local_id", "item_name", "brand", "model", "plate_number", "year_model",
+    "date_acquired", "acquisition_cost",
+)
+
+
+def get_workers(workers=None):
+    """Process pool size (P7_REPORT_WORKERS setting; 0 renders in-process)"""
+    if workers is not None:
+        return workers
+    return getattr(settings, "P7_REPORT_WORKERS", None)
+
+
+def get_batch_size(batch_size=None):
+    return batch_size or getattr(settings, "P7_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+
+
+# ======================================================
+# DATA
+# ======================================================
+
+def group_by_local(queryset, fields):
+    grouped = defaultdict(list)
+    for row in queryset.values(*fields):
+        grouped[row.pop("local_id")].append(row)
+    return grouped
+
+
+def fetch_payloads(local_ids, year):
+    """
+    Report payloads for a batch of locals, in 7 queries whatever the
+    batch size. Returns plain dicts so they can be pickled to workers.
+    """
+    locals_ = Local.objects.filter(pk__in=local_ids).select_related("district").order_by(
+        "district__name", "name", "pk"
+    )
+
+    buildings = defaultdict(list)
+    building_rows = list(
+        Building.objects.filter(local_id__in=local_ids, year_covered=year)
+        .order_by("code", "name", "pk")
+        .values(*BUILDING_FIELDS)
+    )
+    yearly = {
+        row.pop("building_id"): row
+        for row in BuildingYearlyRecord.objects.filter(
+            building__local_id__in=local_ids, building__year_covered=year, year=year
+        ).values("building_id", *YEARLY_FIELDS)
+    }
+    for row in building_rows:
+        record = yearly.get(row.pop("id")) or dict.fromkeys(YEARLY_FIELDS, Decimal("0"))
+        row.update(record)
+        if not record["year_end_total"]:
+            # No yearly record for this year: report the current cost
+            row["year_end_total"] = row["current_total_cost"]
+            row["cost_last_year"] = row["cost_last_year"] or row["current_total_cost"]
+        buildings[row.pop("local_id")].append(row)
+
+    items = group_by_local(
+        Item.objects.filter(local_id__in=local_ids, year_reported=year).order_by("location", "item_name", "pk"),
+        ITEM_FIELDS,
+    )
+    lands = group_by_local(Land.objects.filter(local_id__in=local_ids).order_by("pk"), LAND_FIELDS)
+    plants = group_by_local(Plant.objects.filter(local_id__in=local_ids).order_by("name", "pk"), PLANT_FIELDS)
+    vehicles = group_by_local(Vehicle.objects.filter(local_id__in=local_ids).order_by("pk"), VEHICLE_FIELDS)
+
+    reported_on = timezone.localdate()
+    return [
+        {
+            "year": year,
+            "reported_on": reported_on,
+            "local": {
+                "name": local.name,
+                "lcode": local.lcode,
+                "district": local.district.name,
+                "dcode": local.district.dcode,
+            },
+            "buildings": buildings[local.pk],
+            "items": items[local.pk],
+            "lands": lands[local.pk],
+            "plants": plants[local.pk],
+            "vehicles": vehicles[local.pk],
+        }
+        for local in locals_
+    ]
+
+
+def batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+# ======================================================
+# GENERATION
+# ======================================================
+
+def generate_p7_reports(local_ids, year, workers=None, batch_size=None):
+    """
+    Yield (zip path, xlsx bytes) for every local in `local_ids`,
+    batch by batch (sorted by district and local name within a batch).
+    """
+    workers = get_workers(workers)
+    batch_size = get_batch_size(batch_size)
+
+    if workers == 0:
+        for batch in batches(local_ids, batch_size):
+            yield from map(render_workbook, fetch_payloads(batch, year))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for batch in batches(local_ids, batch_size):
+            pending.append([pool.submit(render_workbook, payload) for payload in fetch_payloads(batch, year)])
+            # Keep one batch rendering while the next one is fetched
+            if len(pending) > 1:
+                for future in pending.popleft():
+                    yield future.result()
+        while pending:
+            for future in pending.popleft():
+                yield future.result()
+
+
+class ZipBuffer:
+    """Non-seekable sink for zipfile; drained after every file"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def stream_p7_zip(local_ids, year, workers=None, batch_size=None):
+    """Yield a ZIP of the P7 workbooks chunk by chunk as they are rendered"""
+    buffer = ZipBuffer()
+    # Stored, not deflated: xlsx files are already zip-compressed
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+        for path, content in generate_p7_reports(local_ids, year, workers, batch_size):
+            archive.writestr(path, content)
+            yield buffer.drain()
+    yield buffer.drain()
+
+
+def select_locals(dcodes=(), lcodes=()):
+    """Local ids for the given district / local codes (every local if neither)"""
+    locals_ = Local.objects.all()
+    if dcodes or lcodes:
+        locals_ = locals_.filter(district__dcode__in=dcodes) | locals_.filter(lcode__in=lcodes)
+    return list(locals_.order_by("district__name", "name", "pk").values_list("pk", flat=True))
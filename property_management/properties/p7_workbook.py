@@ -0,0 +1,307 @@
+"""
+P7 annual report workbook rendering.
+
+Lays out one local's data on the same cells as the official templates
+(`P7 Annual Report Format.xls`, `P7 Annual Page 2 to 3.xls`,
+`P7 2024 Page 4 to 5 New Format.xlsx` and `GUSALI REPORT.xlsx`):
+
+    Page1               Gusali (buildings and this year's changes)
+    Page 2 / Page 3     II-A carried-over / II-B added Kagamitan
+    Page 4              II-C removed Kagamitan and the II totals
+    Page 5A - Lupa, Page 5B - Pananim, Page 5C - Sasakyan
+
+This module deliberately imports nothing from Django: it runs in
+process-pool workers (see properties.p7) on plain dict payloads, so
+each worker only needs openpyxl.
+"""
+
+from decimal import Decimal
+from io import BytesIO
+
+from openpyxl import Workbook
+from openpyxl.styles import Font
+
+
+BOLD = Font(bold=True)
+
+BUILDING_NOTE = (
+    "NOTE: BUILDING CODE (A FOR KAPILYA, B FOR PASTORAL AND CARETAKER HOUSE, "
+    "C FOR MINISTERIAL, FINANCE, SECRETARIAT OFFICES, D FOR OTHER BUILDINGS"
+)
+BUILDING_HEADERS = [
+    "CODE", "BLDG", "ORIGINAL COST", "CLASS", "INIHANDOG O HINDI", "PETSA INIHANDOG",
+    "PETSA MAYARI", "PAGAWA ", "CAPACITY", "COST LAST YEAR", "CONSTRUCTION", "RENOVATION",
+    "GENERAL REPAIR", "OTHER", "TOTAL ADDED", "REMARKS", "PART", "COST", "TOTAL",
+]
+
+CARRIED_OVER_NOTE = (
+    " Mga kagamitan ng lokal ayon sa ulat ng nakaraang taon:  (Tiyakin na ang lahat ng "
+    "dati ng kagamitan na nasa ulat ng nakaraang taon ay nakatala sa bahaging ito ng ayon "
+    "sa bawat dakong kinaroroonan ng mga ito.  Huwag itala  sa bahaging ito ang mga "
+    "kagamitang hindi naisama sa ulat ng nakaraang taon at ang mga nadagdag sa taong ito.)"
+)
+ADDED_NOTE = (
+    "Nadagdag na mga kagamitan sa taong ito: (Tiyakin na ang lahat ng kagamitan na nakatala "
+    "dito ay may pinagtibay na P-10 o P-10-2 at naiulat na sa P-7-E.)"
+)
+REMOVED_NOTE = (
+    " Nabawas na mga kagamitan sa taong ito: (Tiyakin na ang lahat ng kagamitan na nakatala "
+    "dito ay may sulat-kahilingang pinagtibay ng Central at iniulat sa P-7-E.)"
+)
+ITEM_HEADERS = [
+    "Kaukulan", "IIN", "Date Received", "Qty", "Items", "Brand", "Model", "Make",
+    "Color", "Size", "Serial Number", "Unit Price", "Amount",
+]
+REMOVED_HEADERS = [
+    "Dakong Pinagmulan o Gumamit", "IIN", "Date Received", "Qty", "Items", "Unit Price",
+    "Amount", "Dahilan (Ipinagbili,ipinamigay,itinapon,nawala, atbp)", "Approved #",
+]
+
+LAND_HEADERS = [
+    "Lupa Blg", "Complete Address", "Area (SQM)", "Date Acquired", "Halaga",
+    "Gusali na nasa Lupa", "Pansin(Titulado/Free Patent)",
+]
+PLANT_HEADERS = [
+    "Pangalan ng Pananim", "Uri", "Blg sa Nakaraan", "Halaga", "Blg ng Nadagdag",
+    "Halaga", "Kabuuang Blg", "Kabuuang Halaga",
+]
+VEHICLE_HEADERS = [
+    "Blg", "Make & type", "Plate #", "Year Model", "Date Purchased",
+    "Assigned User (Name)", "Designation", "Halaga",
+]
+
+
+def money(value):
+    """Decimal -> float so Excel treats the cell as a number"""
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def write_row(sheet, row, values, column=1, font=None):
+    for offset, value in enumerate(values):
+        cell = sheet.cell(row=row, column=column + offset, value=money(value))
+        if font:
+            cell.font = font
+
+
+def write_local_block(sheet, payload):
+    """Rows 2-6 of the Page 4 / Page 5 sheets"""
+    local = payload["local"]
+    for row, (label, value) in enumerate(
+        [
+            ("Lokal", local["name"]),
+            ("Distrito", local["district"]),
+            ("Dcode", local["dcode"]),
+            ("Lcode", local["lcode"]),
+            ("Year", payload["year"]),
+        ],
+        start=2,
+    ):
+        write_row(sheet, row, [label, value])
+
+
+# ======================================================
+# PAGES
+# ======================================================
+
+def page_1(workbook, payload):
+    sheet = workbook.create_sheet("Page1")
+    local = payload["local"]
+    buildings = payload["buildings"]
+
+    sheet["A1"] = BUILDING_NOTE
+    write_row(sheet, 3, ["LOKAL", local["name"], "DISTRITO", local["district"],
+                         "DATE REPORTED", payload["reported_on"]], column=2)
+    write_row(sheet, 3, ["TOTAL", sum((b["year_end_total"] for b in buildings), Decimal("0"))], column=9)
+    write_row(sheet, 4, ["LCODE", local["lcode"], "DCODE", local["dcode"],
+                         "YEAR COVERED", payload["year"]], column=2)
+    sheet["K5"] = "ADDED"
+    sheet["Q5"] = "BROKEN OR REMOVED"
+    write_row(sheet, 6, BUILDING_HEADERS, font=BOLD)
+
+    for row, building in enumerate(buildings, start=7):
+        write_row(sheet, row, [
+            building["code"],
+            building["name"],
+            building["original_cost"],
+            building["classification"],
+            "HANDOG" if building["is_donated"] else "HINDI",
+            building["donation_date"],
+            building["ownership_date"],
+            building["constructor"],
+            building["capacity"],
+            building["cost_last_year"],
+            building["construction_cost"],
+            building["renovation_cost"],
+            building["general_repair_cost"],
+            building["other_additions_cost"],
+            building["total_added"],
+            building["remarks"],
+            building["broken_removed_part"],
+            building["broken_removed_cost"],
+            building["year_end_total"],
+        ])
+
+
+def item_page(workbook, title, payload, items, section, last_column, rows):
+    """
+    Page 2 (II-A) and Page 3 (II-B) share one layout. `last_column` is
+    (header, field) for column N; `rows` gives the note, local block and
+    header rows, which differ between the two templates.
+    """
+    sheet = workbook.create_sheet(title)
+    local = payload["local"]
+    note_row, block_row, header_row = rows
+    last_header, last_field = last_column
+
+    write_row(sheet, note_row, section)
+    write_row(sheet, block_row, [
+        "Distrito", local["district"], "Lokal", local["name"], "Dcode", local["dcode"],
+        "Lcode", local["lcode"], "Year", payload["year"],
+    ])
+    write_row(sheet, header_row, ITEM_HEADERS + [last_header], font=BOLD)
+
+    for row, item in enumerate(items, start=header_row + 1):
+        write_row(sheet, row, [
+            item["location"],
+            item["property_number"],
+            item["date_acquired"],
+            item["quantity"],
+            item["item_name"],
+            item["brand"],
+            item["model"],
+            item["material"],
+            item["color"],
+            item["size"],
+            "",
+            item["unit_price"],
+            item["total_price"],
+            item[last_field],
+        ])
+
+
+def page_4(workbook, payload, carried_total, added_total):
+    sheet = workbook.create_sheet("Page 4")
+    write_local_block(sheet, payload)
+    write_row(sheet, 8, ["II-C", REMOVED_NOTE])
+    # No removal register exists yet, so II-C is always empty
+    write_row(sheet, 12, ["II-A Total", carried_total, None, "II-B Total", added_total,
+                          None, "II-C Total", 0])
+    write_row(sheet, 14, ["Total (II-A + II-B + II-C )", carried_total + added_total])
+    write_row(sheet, 16, REMOVED_HEADERS, font=BOLD)
+
+
+def page_5a(workbook, payload):
+    sheet = workbook.create_sheet("Page 5A - Lupa")
+    write_local_block(sheet, payload)
+    write_row(sheet, 8, ["III", "Ukol sa Lupa", "Note:", "Ang itala lamang dito ay ang pag-aaral ng Iglesia"])
+    sheet["A10"] = "Ukol sa Lupa"
+    sheet["I10"] = "Nadagdag:  Lupang Nabili sa Taong ito"
+    sheet["Q10"] = "Nabawas:  Lupang Ibinawas sa Taong ito ( Maglakip ng Paliwanag )"
+    for column in (1, 9, 17):
+        write_row(sheet, 11, LAND_HEADERS, column=column, font=BOLD)
+
+    building_names = ", ".join(building["name"] for building in payload["buildings"])
+    for number, land in enumerate(payload["lands"], start=1):
+        write_row(sheet, 11 + number, [
+            number,
+            land["location"],
+            land["lot_area"],
+            None,
+            land["market_value"] or land["acquisition_cost"],
+            building_names if number == 1 else "",
+            land["status"],
+        ])
+
+
+def page_5b(workbook, payload):
+    sheet = workbook.create_sheet("Page 5B - Pananim")
+    write_local_block(sheet, payload)
+    write_row(sheet, 9, ["IV", "Ukol sa Pananim", None,
+                         '(Sa "Uri" ay ilagay kung ang pananim ay (a) Nagbubunga (b) Hindi Nagbubunga)'])
+    write_row(sheet, 11, PLANT_HEADERS, font=BOLD)
+
+    for row, plant in enumerate(payload["plants"], start=12):
+        write_row(sheet, row, [
+            plant["name"] + (f" ({plant['variety']})" if plant["variety"] else ""),
+            "a" if plant["fruit_bearing"] else "b",
+            plant["total_quantity"],
+            plant["total_value"],
+            0,
+            0,
+            plant["total_quantity"],
+            plant["total_value"],
+        ])
+
+
+def page_5c(workbook, payload):
+    sheet = workbook.create_sheet("Page 5C - Sasakyan")
+    write_local_block(sheet, payload)
+    year = payload["year"]
+
+    # Vehicles bought this year go in the "Nadagdag" block
+    added = [v for v in payload["vehicles"] if v["date_acquired"] and v["date_acquired"].year == year]
+    carried = [v for v in payload["vehicles"] if v not in added]
+
+    write_row(sheet, 8, ["V", "Ukol sa Sasakyan"])
+    write_row(sheet, 10, ["A. Mga Sasakyan ng Distrito Ayon sa Ulat sa Nakaraang Taon:", len(carried)])
+    write_row(sheet, 11, ["B. Nadagdag sa Taong ito:", len(added)])
+    write_row(sheet, 12, ["C. Nabawas sa Taong ito:", 0])
+
+    for column, label, vehicles in (
+        (3, "Mga Sasakyan ng Distrito Ayon sa Ulat sa Nakaraang Taon", carried),
+        (12, "Nadagdag sa Taong ito", added),
+        (21, "Nabawas sa Taong ito", []),
+    ):
+        sheet.cell(row=16, column=column + 1, value=label)
+        sheet.cell(row=17, column=column + 1, value="Description")
+        write_row(sheet, 18, VEHICLE_HEADERS, column=column, font=BOLD)
+        for number, vehicle in enumerate(vehicles, start=1):
+            make = " ".join(filter(None, [vehicle["brand"], vehicle["model"]])) or vehicle["item_name"]
+            write_row(sheet, 18 + number, [
+                number,
+                make,
+                vehicle["plate_number"],
+                vehicle["year_model"],
+                vehicle["date_acquired"],
+                "",
+                "",
+                vehicle["acquisition_cost"],
+            ], column=column)
+
+
+# ======================================================
+# WORKBOOK
+# ======================================================
+
+def report_filename(payload):
+    local = payload["local"]
+    name = "".join(c if c.isalnum() or c in " -" else "_" for c in local["name"]).strip()
+    return f"{local['district']}/P7 {payload['year']} {local['lcode']} {name}.xlsx"
+
+
+def render_workbook(payload):
+    """Render one local's P7 workbook; returns (zip path, xlsx bytes)"""
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+
+    carried = [item for item in payload["items"] if not item["is_new"]]
+    added = [item for item in payload["items"] if item["is_new"]]
+
+    page_1(workbook, payload)
+    item_page(workbook, "Page 2", payload, carried, ["II-A", CARRIED_OVER_NOTE],
+              ("Remarks", "remarks"), rows=(1, 3, 5))
+    item_page(workbook, "Page 3", payload, added, ["II-B", ADDED_NOTE],
+              ("P10# / P10-2#", "reference_number"), rows=(2, 4, 7))
+    page_4(
+        workbook,
+        payload,
+        sum((item["total_price"] for item in carried), Decimal("0")),
+        sum((item["total_price"] for item in added), Decimal("0")),
+    )
+    page_5a(workbook, payload)
+    page_5b(workbook, payload)
+    page_5c(workbook, payload)
+
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return report_filename(payload), buffer.getvalue()
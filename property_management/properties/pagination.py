@@ -0,0 +1,262 @@
+"""
+Keyset (cursor) pagination for list views.
+
+Django's Paginator pages with OFFSET (the database still scans every
+skipped row) and runs an extra COUNT(*). Keyset pagination instead
+remembers the sort key of the last row shown and asks for rows strictly
+after it, which an index can answer directly no matter how deep the page.
+
+    page = keyset_paginate(request, Item.objects.all(), per_page=50)
+
+    {% for item in page %} ... {% endfor %}
+    {% include "keyset_pagination.html" with page=items %}
+
+The ordering is the queryset's (or the model's Meta.ordering) plus pk
+as a tie-breaker. Cursors travel as ?after= / ?before= and every other
+query parameter (filters, search) is preserved in the next/prev links.
+"""
+
+import base64
+import datetime
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+DEFAULT_PER_PAGE = 50
+
+AFTER_PARAM = "after"
+BEFORE_PARAM = "before"
+
+
+# ======================================================
+# CURSORS
+# ======================================================
+
+class CursorEncoder(DjangoJSONEncoder):
+    """Keeps full microsecond precision (DjangoJSONEncoder rounds to ms)"""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values):
+    data = json.dumps(values, cls=CursorEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size):
+    """Cursor values, or None when the cursor is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(values, list) or len(values) != size:
+        return None
+    return values
+
+
+# ======================================================
+# ORDERING
+# ======================================================
+
+def _resolve_key(model, name):
+    """
+    (path, descending, nullable) for one ordering entry.
+
+    Relations are ordered by their id column, so the SQL ordering is
+    exactly the key the cursor records.
+    """
+    descending = name.startswith("-")
+    path = name.lstrip("-")
+    if path == "pk":
+        return "pk", descending, False
+
+    nullable = False
+    current = model
+    parts = path.split("__")
+    for index, part in enumerate(parts):
+        try:
+            field = current._meta.get_field(part)
+        except (FieldDoesNotExist, AttributeError):
+            # Annotation or transform: assume it may be NULL
+            return path, descending, True
+
+        nullable = nullable or field.null
+        if field.is_relation:
+            if index == len(parts) - 1:
+                parts[index] = field.attname
+                break
+            current = field.related_model
+
+    return "__".join(parts), descending, nullable
+
+
+def get_ordering_keys(queryset, ordering=None):
+    """Ordering keys for a queryset, always ending in pk"""
+    names = list(ordering or queryset.query.order_by or queryset.model._meta.ordering)
+    names = [name for name in names if isinstance(name, str) and name != "?"]
+
+    keys = [_resolve_key(queryset.model, name) for name in names]
+    if not any(path in ("pk", queryset.model._meta.pk.attname) for path, _, _ in keys):
+        last_descending = keys[-1][1] if keys else False
+        keys.append(("pk", last_descending, False))
+    return keys
+
+
+def _order_by(keys, reverse=False):
+    return [f"{'-' if desc != reverse else ''}{path}" for path, desc, _ in keys]
+
+
+def _key_value(obj, path):
+    if isinstance(obj, dict):
+        # .values() row: keys are the full lookup paths
+        return obj[path]
+    value = obj
+    for part in path.split("__"):
+        if value is None:
+            return None
+        value = getattr(value, part)
+    return value
+
+
+def _after(keys, values, reverse=False):
+    """
+    Q for rows strictly after `values` in the key ordering.
+
+    (a, b, pk) > (x, y, z) expands to
+    a > x  OR  (a = x AND (b > y OR (b = y AND pk > z)))
+    honouring each key's direction and Postgres NULL placement
+    (NULLS LAST ascending, NULLS FIRST descending).
+    """
+    (path, desc, nullable), value = keys[0], values[0]
+    desc = desc != reverse
+    nulls_last = not desc
+
+    if value is None:
+        same = Q(**{f"{path}__isnull": True})
+        beyond = Q(pk__in=[]) if nulls_last else Q(**{f"{path}__isnull": False})
+    else:
+        same = Q(**{path: value})
+        beyond = Q(**{f"{path}__{'lt' if desc else 'gt'}": value})
+        if nullable and nulls_last:
+            beyond |= Q(**{f"{path}__isnull": True})
+
+    if len(keys) == 1:
+        return beyond
+    return beyond | (same & _after(keys[1:], values[1:], reverse))
+
+
+# ======================================================
+# PAGE
+# ======================================================
+
+class KeysetPage:
+    """
+    One page of results plus cursors to the neighbouring pages.
+    Iterates like the object list.
+    """
+
+    def __init__(self, object_list, keys, params, has_next, has_previous):
+        self.object_list = object_list
+        self.keys = keys
+        self.params = params
+        self.has_next = has_next
+        self.has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def _cursor(self, obj):
+        return encode_cursor([_key_value(obj, path) for path, _, _ in self.keys])
+
+    def _query(self, param, obj):
+        params = self.params.copy()
+        params.pop(AFTER_PARAM, None)
+        params.pop(BEFORE_PARAM, None)
+        params[param] = self._cursor(obj)
+        return params.urlencode()
+
+    @property
+    def next_query(self):
+        """Querystring (without '?') for the next page"""
+        if not self.has_next:
+            return ""
+        return self._query(AFTER_PARAM, self.object_list[-1])
+
+    @property
+    def previous_query(self):
+        """Querystring (without '?') for the previous page"""
+        if not self.has_previous:
+            return ""
+        return self._query(BEFORE_PARAM, self.object_list[0])
+
+    @property
+    def first_query(self):
+        """Querystring (without '?') for the first page, filters kept"""
+        params = self.params.copy()
+        params.pop(AFTER_PARAM, None)
+        params.pop(BEFORE_PARAM, None)
+        return params.urlencode()
+
+
+def keyset_paginate(request, queryset, per_page=DEFAULT_PER_PAGE, ordering=None):
+    """
+    Page `queryset` by the ?after= / ?before= cursor in the request.
+
+    Runs a single query of per_page + 1 rows: no OFFSET, no COUNT(*).
+    """
+    return _paginate(request.GET.copy(), queryset, per_page, ordering)
+
+
+def _paginate(params, queryset, per_page, ordering):
+    keys = get_ordering_keys(queryset, ordering)
+
+    after = decode_cursor(params.get(AFTER_PARAM, ""), len(keys))
+    before = decode_cursor(params.get(BEFORE_PARAM, ""), len(keys))
+
+    try:
+        if before is not None:
+            rows = list(
+                queryset.filter(_after(keys, before, reverse=True))
+                .order_by(*_order_by(keys, reverse=True))[:per_page + 1]
+            )
+        else:
+            if after is not None:
+                queryset = queryset.filter(_after(keys, after))
+            rows = list(queryset.order_by(*_order_by(keys))[:per_page + 1])
+    except (ValueError, ValidationError):
+        # Tampered cursor (values of the wrong type): start over
+        params.pop(AFTER_PARAM, None)
+        params.pop(BEFORE_PARAM, None)
+        return _paginate(params, queryset, per_page, ordering)
+
+    if before is not None:
+        has_previous = len(rows) > per_page
+        object_list = rows[:per_page][::-1]
+        has_next = True
+    else:
+        has_next = len(rows) > per_page
+        object_list = rows[:per_page]
+        has_previous = after is not None
+
+    return KeysetPage(object_list, keys, params, has_next, has_previous)
+
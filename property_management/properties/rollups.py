@@ -0,0 +1,275 @@
+"""
+Per-Local asset valuation rollups.
+
+LocalAssetRollup holds one row per (local, year) with the count and
+total value of each national asset type, so local / district / national
+summaries are a single-row or single-GROUP BY read instead of one SUM
+per asset table.
+
+Rows are kept current by write hooks: each asset app calls
+`connect_rollup()` from its AppConfig.ready(), and every save / delete
+recomputes only the (asset type, local, year) cell it touched. Imports
+wrap their work in `deferred_rollups()` so each touched cell is
+recomputed once at the end instead of once per row (and the summary
+materialized views are refreshed, see properties.summaries).
+`manage.py rebuild_rollups` recomputes the whole table.
+
+Buildings and items carry a report year. The other asset types are
+standing inventory and are bucketed by the year they were recorded.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, QuerySet, Sum, Value
+from django.db.models.functions import Coalesce, ExtractYear
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+
+from .summaries import refresh_summaries_on_commit
+
+
+# asset type -> (model label, value field, report year field or None)
+ASSET_SOURCES = {
+    "building": ("gusali.Building", "current_total_cost", "year_covered"),
+    "item": ("kagamitan.Item", "total_price", "year_reported"),
+    "land": ("lupa.Land", "market_value", None),
+    "plant": ("plants.Plant", "total_value", None),
+    "vehicle": ("vehicles.Vehicle", "acquisition_cost", None),
+    "property": ("properties.LocalProperty", "current_value", None),
+}
+
+_pending = threading.local()
+
+
+def count_field(asset_type):
+    return f"{asset_type}_count"
+
+
+def total_field(asset_type):
+    return f"{asset_type}_total"
+
+
+# ======================================================
+# SOURCE AGGREGATES
+# ======================================================
+
+def _source(asset_type, registry=apps):
+    label, value_field, year_field = ASSET_SOURCES[asset_type]
+    return registry.get_model(label), value_field, year_field
+
+
+def _year_expression(year_field):
+    return F(year_field) if year_field else ExtractYear("created_at")
+
+
+def _instance_key(instance, year_field):
+    """(local_id, year) cell of a saved or deleted asset row"""
+    if year_field:
+        year = getattr(instance, year_field)
+    else:
+        created = instance.created_at
+        if settings.USE_TZ and timezone.is_aware(created):
+            created = timezone.localtime(created)
+        year = created.year
+    return instance.local_id, year
+
+
+def _aggregate(asset_type, queryset):
+    _, value_field, _ = _source(asset_type)
+    return queryset.aggregate(
+        count=Count("pk"),
+        total=Coalesce(Sum(value_field), Value(0), output_field=DecimalField()),
+    )
+
+
+# ======================================================
+# MAINTENANCE
+# ======================================================
+
+def refresh_rollup(asset_type, local_id, year):
+    """
+    Recompute one asset type's count / total for a (local, year) cell.
+    """
+    from properties.models import LocalAssetRollup
+
+    if local_id is None or year is None:
+        return None
+
+    model, _, year_field = _source(asset_type)
+    year_lookup = {year_field: year} if year_field else {"created_at__year": year}
+    stats = _aggregate(asset_type, model.objects.filter(local_id=local_id, **year_lookup))
+
+    rollup, _ = LocalAssetRollup.objects.update_or_create(
+        local_id=local_id,
+        year=year,
+        defaults={
+            count_field(asset_type): stats["count"],
+            total_field(asset_type): stats["total"],
+        },
+    )
+    return rollup
+
+
+def mark_dirty(asset_type, local_id, year):
+    """Refresh a cell now, or at the end of the enclosing deferred_rollups()"""
+    pending = getattr(_pending, "cells", None)
+    if pending is not None:
+        pending.add((asset_type, local_id, year))
+    else:
+        refresh_rollup(asset_type, local_id, year)
+
+
+@contextmanager
+def deferred_rollups():
+    """
+    Collect the cells touched by bulk writes and refresh each once on
+    exit, then refresh the district / national summary views. Nested
+    use joins the outermost block. Usable as a decorator on management
+    command handlers.
+    """
+    if getattr(_pending, "cells", None) is not None:
+        yield
+        return
+
+    _pending.cells = set()
+    try:
+        yield
+        cells = _pending.cells
+    finally:
+        _pending.cells = None
+
+    for cell in cells:
+        refresh_rollup(*cell)
+    if cells:
+        refresh_summaries_on_commit()
+
+
+def rebuild_rollups(registry=apps):
+    """
+    Recompute every rollup row from the asset tables (one GROUP BY per
+    asset type). Returns the number of rows written.
+
+    `registry` lets the migration backfill run against historical models.
+    """
+    LocalAssetRollup = registry.get_model("properties.LocalAssetRollup")
+
+    cells = {}
+    for asset_type in ASSET_SOURCES:
+        model, value_field, year_field = _source(asset_type, registry)
+        grouped = (
+            model.objects.filter(local__isnull=False)
+            .annotate(rollup_year=_year_expression(year_field))
+            .order_by()
+            .values("local_id", "rollup_year")
+            .annotate(count=Count("pk"), total=Sum(value_field))
+        )
+        for row in grouped:
+            cell = cells.setdefault(
+                (row["local_id"], row["rollup_year"]),
+                LocalAssetRollup(local_id=row["local_id"], year=row["rollup_year"]),
+            )
+            setattr(cell, count_field(asset_type), row["count"])
+            setattr(cell, total_field(asset_type), row["total"] or 0)
+
+    with transaction.atomic():
+        LocalAssetRollup.objects.all().delete()
+        LocalAssetRollup.objects.bulk_create(cells.values(), batch_size=1000)
+    return len(cells)
+
+
+# ======================================================
+# WRITE HOOKS
+# ======================================================
+
+def cascaded(sender, origin):
+    """
+    True when a post_delete of `sender` rows comes from deleting a parent
+    (the signal's `origin`), e.g. a Local and everything under it. A
+    rollup refreshed then would be recreated for the parent being
+    deleted and fail its foreign key; refresh on commit instead.
+    """
+    if origin is None:
+        return False
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return not issubclass(model, sender)
+
+
+def refresh_rollup_on_commit(asset_type, local_id, year):
+    """refresh_rollup() after commit, if the Local survived"""
+    def refresh():
+        Local = apps.get_model("properties.Local")
+        if Local.objects.filter(pk=local_id).exists():
+            refresh_rollup(asset_type, local_id, year)
+
+    transaction.on_commit(refresh)
+
+
+def connect_rollup(asset_type):
+    """
+    Keep the rollup current on writes to one asset type. Called from
+    the owning app's AppConfig.ready().
+    """
+    model, _, year_field = _source(asset_type)
+    uid = f"local_asset_rollup:{asset_type}"
+
+    def remember_cell(sender, instance, raw=False, **kwargs):
+        # A row moved to another local / year must refresh its old cell too
+        instance._previous_rollup_cell = None
+        if instance.pk and not raw:
+            instance._previous_rollup_cell = (
+                sender.objects.filter(pk=instance.pk)
+                .annotate(rollup_year=_year_expression(year_field))
+                .values_list("local_id", "rollup_year")
+                .first()
+            )
+
+    def refresh_cells(sender, instance, raw=False, origin=None, **kwargs):
+        if raw:
+            return
+        cell = _instance_key(instance, year_field)
+        if cascaded(sender, origin):
+            refresh_rollup_on_commit(asset_type, *cell)
+            return
+        mark_dirty(asset_type, *cell)
+
+        previous = getattr(instance, "_previous_rollup_cell", None)
+        if previous and previous != cell:
+            mark_dirty(asset_type, *previous)
+
+    pre_save.connect(remember_cell, sender=model, weak=False, dispatch_uid=uid)
+    post_save.connect(refresh_cells, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(refresh_cells, sender=model, weak=False, dispatch_uid=uid)
+
+
+# ======================================================
+# READS
+# ======================================================
+
+def rollup_totals(queryset):
+    """
+    Sum a LocalAssetRollup queryset into one dict of <type>_count /
+    <type>_total plus grand_total, in a single aggregate query.
+    """
+    aggregates = {}
+    for asset_type in ASSET_SOURCES:
+        aggregates[count_field(asset_type)] = Coalesce(Sum(count_field(asset_type)), 0)
+        aggregates[total_field(asset_type)] = Coalesce(
+            Sum(total_field(asset_type)), Value(0), output_field=DecimalField()
+        )
+    totals = queryset.aggregate(**aggregates)
+    totals["grand_total"] = sum(totals[total_field(t)] for t in ASSET_SOURCES)
+    return totals
+
+
+def grand_total_expression(prefix=""):
+    """Sum of the six value columns, for annotating through a relation"""
+    expression = Value(0, output_field=DecimalField())
+    for asset_type in ASSET_SOURCES:
+        expression = expression + Coalesce(
+            Sum(f"{prefix}{total_field(asset_type)}"), Value(0), output_field=DecimalField()
+        )
+    return expression
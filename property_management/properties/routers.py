@@ -0,0 +1,207 @@
+"""
+Read-replica routing for reports and exports.
+
+With a DATABASES["replica"] configured (DB_REPLICA_HOST), reads made
+inside `replica_reads` go to the replica; everything else, and every
+write, stays on the primary:
+
+    @login_required
+    @replica_reads
+    def building_report(request):
+        ...
+
+    with replica_reads():
+        fetch_payloads(local_ids, year)
+
+Read-your-writes is kept three ways:
+
+- reads inside a transaction opened by the code stay on the primary,
+  next to the writes they follow;
+- `primary_reads` pins a block (or view) back to the primary;
+- ReplicaPinMiddleware marks a browser for REPLICA_PIN_SECONDS after
+  any successful POST, so the page shown after an import or a transfer
+  is read from the primary even if it is a report.
+
+Streaming responses keep the routing while their body is iterated,
+since that is when export querysets are actually read.
+
+Without a replica, the router sends everything to the primary. In test
+runs the replica mirrors the test database; inside a TestCase, whose
+rows sit in a transaction only the primary's connection can see, reads
+stay on the primary. Tests check the routing with `record_routing()`,
+which logs the alias each read was meant for.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+REPLICA_ALIAS = "replica"
+PIN_COOKIE = "primary_pin"
+
+# Alias reads should go to (None = primary)
+_read_alias = ContextVar("read_alias", default=None)
+# Open record_routing() logs
+_routing_logs = []
+
+_DONE = object()
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def in_transaction(using=DEFAULT_DB_ALIAS):
+    """True inside an atomic block opened by the code (not a TestCase's)"""
+    # Same test as Django's durable atomic blocks
+    return any(not block._from_testcase for block in connections[using].atomic_blocks)
+
+
+def in_testcase(using=DEFAULT_DB_ALIAS):
+    """True inside a TestCase's transaction, which a mirror connection cannot see"""
+    return any(block._from_testcase for block in connections[using].atomic_blocks)
+
+
+# ======================================================
+# ROUTER
+# ======================================================
+
+class ReplicaRouter:
+    """Reads to the replica inside replica_reads; writes and migrations to the primary"""
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or in_transaction():
+            alias = DEFAULT_DB_ALIAS
+
+        for log in _routing_logs:
+            log.append((model._meta.label, alias))
+
+        if alias == REPLICA_ALIAS and replica_configured() and not in_testcase():
+            return REPLICA_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Same data on both sides
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+# ======================================================
+# OVERRIDES
+# ======================================================
+
+def routed_stream(content, alias):
+    """Iterate a streaming body with reads routed to `alias`"""
+    iterator = iter(content)
+    while True:
+        token = _read_alias.set(alias)
+        try:
+            chunk = next(iterator, _DONE)
+        finally:
+            _read_alias.reset(token)
+        if chunk is _DONE:
+            return
+        yield chunk
+
+
+class route_reads:
+    """Route reads to `alias` in a block, a function or a view"""
+
+    def __init__(self, alias):
+        self.alias = alias
+        self.tokens = []
+
+    def __enter__(self):
+        self.tokens.append(_read_alias.set(self.alias))
+        return self
+
+    def __exit__(self, *exc_info):
+        _read_alias.reset(self.tokens.pop())
+
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            request = args[0] if args else None
+            alias = self.alias
+            # A browser that just wrote reads its own writes
+            if alias == REPLICA_ALIAS and request is not None and PIN_COOKIE in getattr(request, "COOKIES", {}):
+                alias = None
+
+            token = _read_alias.set(alias)
+            try:
+                response = func(*args, **kwargs)
+            finally:
+                _read_alias.reset(token)
+
+            if getattr(response, "streaming", False):
+                response.streaming_content = routed_stream(response.streaming_content, alias)
+            return response
+
+        return wrapper
+
+
+def replica_reads(func=None):
+    """Reads from the replica; `@replica_reads` or `with replica_reads():`"""
+    decorator = route_reads(REPLICA_ALIAS)
+    return decorator(func) if func else decorator
+
+
+def primary_reads(func=None):
+    """Reads from the primary, overriding an enclosing replica_reads"""
+    decorator = route_reads(None)
+    return decorator(func) if func else decorator
+
+
+class ReplicaPinMiddleware:
+    """Pin a browser to the primary for a few seconds after it writes"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method == "POST" and response.status_code < 400 and replica_configured():
+            response.set_cookie(
+                PIN_COOKIE, "1",
+                max_age=getattr(settings, "REPLICA_PIN_SECONDS", 10),
+                httponly=True, samesite="Lax",
+            )
+        return response
+
+
+# ======================================================
+# TEST HARNESS
+# ======================================================
+
+class RoutingLog(list):
+    """(model label, alias) for every routed read"""
+
+    def aliases(self, label=None):
+        return {alias for model, alias in self if label is None or model == label}
+
+
+@contextmanager
+def record_routing():
+    """
+    Log where each read was routed, with or without a real replica:
+
+        with record_routing() as log:
+            self.client.get(url)
+        self.assertEqual(log.aliases(), {"replica"})
+    """
+    log = RoutingLog()
+    _routing_logs.append(log)
+    try:
+        yield log
+    finally:
+        _routing_logs.remove(log)
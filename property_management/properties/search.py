@@ -0,0 +1,84 @@
+"""
+Postgres full-text search for names and codes.
+
+`icontains` compiles to `ILIKE '%term%'`, which no B-tree index can
+serve, so every search was a sequential scan. Each searchable model
+instead declares a GIN expression index over
+
+    to_tsvector('simple', coalesce(field1, '') || ' ' || coalesce(field2, '') ...)
+
+built by `search_vector()`. Because it is an expression index it is
+always current (no column, trigger or save hook to maintain) and
+queries that filter on the same `search_vector()` expression use it.
+
+The 'simple' configuration lowercases but does not stem, which suits
+Filipino/Spanish personal and place names. Every search term is
+matched as a prefix ("cru" finds "Cruz").
+"""
+
+import re
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F
+
+
+SEARCH_CONFIG = "simple"
+
+# Searchable text per model (index and query must use the same list)
+PAMAYANAN_SEARCH_FIELDS = ("name", "address", "city", "province")
+HOUSING_UNIT_SEARCH_FIELDS = (
+    "occupant_name", "housing_unit_name", "unit_number", "department", "section",
+)
+WORKER_SEARCH_FIELDS = ("first_name", "middle_name", "last_name")
+DISTRICT_SEARCH_FIELDS = ("name", "dcode")
+LOCAL_SEARCH_FIELDS = ("name", "lcode")
+
+
+def search_vector(*fields):
+    return SearchVector(*fields, config=SEARCH_CONFIG)
+
+
+def search_index(fields, name):
+    """GIN expression index matching search_vector(*fields)"""
+    return GinIndex(search_vector(*fields), name=name)
+
+
+def prefix_query(text):
+    """
+    SearchQuery matching every word of `text` as a prefix
+    ("juan cru" -> 'juan:* & cru:*'), or None if there are no words.
+    """
+    terms = re.findall(r"\w+", text.lower())
+    if not terms:
+        return None
+    return SearchQuery(
+        " & ".join(f"{term}:*" for term in terms),
+        search_type="raw",
+        config=SEARCH_CONFIG,
+    )
+
+
+def search_filter(queryset, fields, text):
+    """
+    Filter `queryset` to full-text matches, keeping its ordering.
+    Returns queryset.none() for a query without words.
+    """
+    query = prefix_query(text)
+    if query is None:
+        return queryset.none()
+    return queryset.annotate(search=search_vector(*fields)).filter(search=query)
+
+
+def ranked_search(queryset, fields, text):
+    """
+    Full-text matches ordered best-first (ts_rank), ties by pk.
+    """
+    query = prefix_query(text)
+    if query is None:
+        return queryset.none()
+    return (
+        search_filter(queryset, fields, text)
+        .annotate(rank=SearchRank(F("search"), query))
+        .order_by("-rank", "pk")
+    )
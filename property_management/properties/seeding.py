@@ -0,0 +1,652 @@
+"""
+Synthetic data at production-like volume, for load and capacity tests.
+
+`manage.py seed_scale` fills every app (properties, gusali, kagamitan,
+lupa, plants, vehicles and admin_core) with referentially consistent
+rows:
+
+    districts -> locals -> buildings (+ yearly records), items, land,
+                           plants, vehicles, local properties
+    pamayanan -> buildings -> housing units -> inventory -> transfers
+    departments / sections / offices -> workers -> office assignments
+    housing sites / buildings / units -> housing assignments
+
+Occupied housing units are named after MWA workers the way the
+admin_core sync reads them ("First Middle Last"), and the admin_core
+housing tables mirror what the sync would create. A sync over seeded
+data is therefore a steady-state run; `unsynced=True` leaves the
+admin_core housing side empty so the first sync does all the work.
+
+The output depends only on the seed and the counts: one
+random.Random(seed) drives every choice, in a fixed order. Timestamps
+are the time of the run.
+
+Parent tables go through bulk_create (their ids are needed for
+foreign keys); the large leaf tables are streamed with COPY from model
+instances, so field defaults and auto_now still apply and memory stays
+flat. Bulk writes skip signals, so the derived tables (rollups,
+occupancy, summaries, building reports, dashboard stats, cache
+versions) are rebuilt at the end. Transfers go through
+properties.transfers, as the views do, so the stock, the ledger and
+the ItemTransfer rows agree (on the default database, which is the
+one transfer_items writes to).
+"""
+
+import math
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import AutoField
+
+
+PRESETS = {
+    "small": {"districts": 10, "locals": 100, "items": 10_000, "housing_units": 1_000, "workers": 800},
+    "medium": {"districts": 100, "locals": 2_000, "items": 200_000, "housing_units": 20_000, "workers": 10_000},
+    "large": {"districts": 500, "locals": 10_000, "items": 1_000_000, "housing_units": 100_000, "workers": 50_000},
+}
+
+BATCH_SIZE = 5_000
+
+# Per-Local averages of the smaller asset tables
+BUILDINGS_PER_LOCAL = 2
+PLANTS_PER_LOCAL = 2
+LANDS_PER_LOCAL = 1
+VEHICLES_PER_LOCAL = 1
+
+UNITS_PER_PAMAYANAN = 40
+INVENTORY_PER_UNIT = 3
+TRANSFER_RATE = 0.02
+OCCUPANCY_RATE = 0.85
+YEARS = (2022, 2023, 2024)
+
+PROVINCES = [
+    "Abra", "Albay", "Antique", "Aurora", "Bataan", "Batangas", "Benguet", "Bohol", "Bulacan", "Cagayan",
+    "Camarines", "Capiz", "Cavite", "Cebu", "Davao", "Ilocos", "Iloilo", "Isabela", "Laguna", "Leyte",
+    "Marinduque", "Masbate", "Metro Manila", "Mindoro", "Negros", "Nueva Ecija", "Palawan", "Pampanga",
+    "Pangasinan", "Quezon", "Rizal", "Samar", "Sorsogon", "Tarlac", "Zambales", "Zamboanga",
+]
+CITIES = [
+    "Angeles", "Antipolo", "Bacolod", "Baguio", "Balanga", "Batangas", "Butuan", "Cabanatuan", "Cainta",
+    "Calamba", "Caloocan", "Cavite", "Dagupan", "Dasmarinas", "Dumaguete", "General Santos", "Iligan",
+    "Imus", "Laoag", "Las Pinas", "Legazpi", "Lipa", "Lucena", "Makati", "Malabon", "Malolos", "Mandaluyong",
+    "Marikina", "Meycauayan", "Naga", "Olongapo", "Ormoc", "Pasig", "Puerto Princesa", "Quezon City",
+    "Roxas", "San Fernando", "San Jose", "San Pablo", "Santa Rosa", "Tacloban", "Tagaytay", "Taguig",
+    "Tarlac", "Tuguegarao", "Valenzuela", "Vigan",
+]
+FIRST_NAMES = [
+    "Juan", "Jose", "Pedro", "Maria", "Ana", "Rosa", "Carlos", "Miguel", "Antonio", "Ramon", "Luis",
+    "Teresa", "Carmen", "Elena", "Isabel", "Ricardo", "Fernando", "Eduardo", "Roberto", "Manuel", "Rafael",
+    "Andres", "Emilio", "Gloria", "Lourdes", "Cristina", "Patricia", "Angelica", "Mark", "John", "Paul",
+    "Michael", "Joseph", "Daniel", "Gabriel", "Joshua", "Angela", "Nicole", "Jasmine", "Kimberly",
+    "Rodel", "Arnel", "Jerome", "Noel", "Rowena", "Marites", "Lorna", "Editha", "Danilo", "Ernesto",
+]
+SURNAMES = [
+    "Santos", "Reyes", "Cruz", "Bautista", "Ocampo", "Garcia", "Mendoza", "Torres", "Tomas", "Andrada",
+    "Castillo", "Flores", "Villanueva", "Ramos", "Castro", "Rivera", "Aquino", "Navarro", "Salazar",
+    "Mercado", "Aguilar", "Pascual", "Manalo", "Gonzales", "Lopez", "Hernandez", "Dizon", "Domingo",
+    "Fernandez", "Soriano", "Valdez", "Vergara", "Marquez", "Padilla", "Robles", "Santiago", "Serrano",
+    "Tolentino", "Velasco", "Zamora", "Agustin", "Alvarez", "Aranda", "Bernardo", "Cabrera", "Corpuz",
+    "Espiritu", "Galang", "Ignacio", "Lacson", "Macaraeg", "Nepomuceno", "Panganiban", "Quiambao",
+    "Rosales", "Sison", "Tan", "Umali", "Yap", "Zulueta",
+]
+DEPARTMENTS = [
+    "Administration", "Finance", "Operations", "Maintenance", "Engineering", "Construction", "Security",
+    "Transport", "Housing", "Education", "Music", "Media", "Legal", "Medical", "Records", "Supply",
+    "Audit", "Personnel", "Evangelism", "Publications", "Information Technology", "Kitchen", "Grounds",
+    "Archives",
+]
+SECTIONS = ["Planning", "Accounting", "Logistics", "Records", "Support"]
+ITEM_NAMES = [
+    "Chair", "Table", "Electric Fan", "Cabinet", "Bed", "Mattress", "Refrigerator", "Television",
+    "Air Conditioner", "Rice Cooker", "Stove", "Sofa", "Desk", "Bookshelf", "Water Dispenser", "Washing Machine",
+    "Microwave Oven", "Wardrobe", "Dining Set", "Computer", "Printer", "Projector", "Speaker", "Microphone",
+]
+BRANDS = ["Generic", "Samsung", "LG", "Panasonic", "Sharp", "Hanabishi", "Kolin", "Uratex", "Mandaue Foam"]
+COLORS = ["White", "Black", "Brown", "Gray", "Blue", "Beige"]
+PLANT_NAMES = ["Mango", "Coconut", "Banana", "Narra", "Mahogany", "Calamansi", "Guava", "Acacia"]
+VEHICLE_NAMES = ["Van", "Pickup", "Sedan", "Motorcycle", "Bus", "Truck", "SUV"]
+BUILDING_NAMES = {
+    "A": "KAPILYA", "B": "PASTORAL HOUSE", "C": "MINISTERIAL OFFICE", "D": "GUARD HOUSE",
+}
+
+
+# Every table the seeder writes, parents first
+SEEDED_MODELS = [
+    "properties.District", "properties.Local", "properties.DistrictProperty", "properties.DistrictInventory",
+    "gusali.Building", "gusali.BuildingYearlyRecord", "kagamitan.Item", "lupa.Land", "plants.Plant",
+    "vehicles.Vehicle", "properties.LocalProperty", "properties.LocalInventory",
+    "admin_core.Department", "admin_core.Section", "admin_core.AdminBuilding", "admin_core.Office",
+    "admin_core.Worker", "admin_core.WorkerOfficeAssignment",
+    "properties.Pamayanan", "properties.PamayananBuilding", "properties.HousingUnit",
+    "properties.HousingUnitInventory", "properties.ItemTransfer", "properties.InventoryMovement",
+    "properties.InventorySnapshot", "properties.InventorySnapshotLine",
+    "admin_core.HousingSite", "admin_core.HousingBuilding", "admin_core.HousingUnit",
+    "admin_core.HousingUnitAssignment",
+]
+
+
+# ======================================================
+# BULK WRITES
+# ======================================================
+
+def clear(using=DEFAULT_DB_ALIAS):
+    """TRUNCATE the seeded tables and everything that references them"""
+    connection = connections[using]
+    tables = ", ".join(connection.ops.quote_name(apps.get_model(label)._meta.db_table) for label in SEEDED_MODELS)
+    with connection.cursor() as cursor:
+        cursor.execute(f"TRUNCATE {tables} RESTART IDENTITY CASCADE")
+
+
+def analyze(using=DEFAULT_DB_ALIAS):
+    """
+    Fresh planner statistics for the seeded tables. Without them the
+    summary view refresh plans nested loops over a million rows.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        for label in SEEDED_MODELS:
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(apps.get_model(label)._meta.db_table)}")
+
+
+def copy_objects(model, objects, using=DEFAULT_DB_ALIAS):
+    """
+    COPY unsaved instances of `model` into its table; returns the count.
+    Values go through the fields' pre_save / get_db_prep_save, as in save().
+    """
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    fields = [field for field in model._meta.concrete_fields if not isinstance(field, AutoField)]
+    columns = ", ".join(quote(field.column) for field in fields)
+
+    count = 0
+    with connection.cursor() as cursor:
+        with cursor.cursor.copy(f"COPY {quote(model._meta.db_table)} ({columns}) FROM STDIN") as copy:
+            for obj in objects:
+                copy.write_row([field.get_db_prep_save(field.pre_save(obj, True), connection) for field in fields])
+                count += 1
+    return count
+
+
+def bulk_create(model, objects, using=DEFAULT_DB_ALIAS):
+    """bulk_create in batches; returns the saved instances (with ids)"""
+    return model.objects.using(using).bulk_create(objects, batch_size=BATCH_SIZE)
+
+
+def spread(rng, total, buckets):
+    """Split `total` into `buckets` random counts averaging total / buckets"""
+    if not buckets:
+        return []
+    weights = [rng.random() + 0.5 for _ in range(buckets)]
+    scale = total / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+    for i in range(total - sum(counts)):
+        counts[i % buckets] += 1
+    return counts
+
+
+def money(rng, low, high):
+    return Decimal(rng.randrange(low * 100, high * 100)) / 100
+
+
+def past_date(rng, years=15):
+    return date(2024, 12, 31) - timedelta(days=rng.randrange(365 * years))
+
+
+# ======================================================
+# NAMES
+# ======================================================
+
+class WorkerNames:
+    """
+    Distinct (first, middle, last) names for worker number 0, 1, 2, ...:
+    a seeded walk through every combination of the name pools, with one-
+    or two-word middle names.
+    """
+
+    def __init__(self, rng):
+        self.middles = SURNAMES + [f"{a} {b}" for a in SURNAMES for b in SURNAMES if a != b]
+        self.total = len(FIRST_NAMES) * len(SURNAMES) * len(self.middles)
+        self.offset = rng.randrange(self.total)
+        self.stride = 7919
+        while math.gcd(self.stride, self.total) != 1:
+            self.stride += 2
+
+    def __getitem__(self, number):
+        if number >= self.total:
+            raise IndexError("Not enough distinct worker names")
+        index = (self.offset + number * self.stride) % self.total
+        index, first = divmod(index, len(FIRST_NAMES))
+        middle, last = divmod(index, len(SURNAMES))
+        return FIRST_NAMES[first], self.middles[middle], SURNAMES[last]
+
+
+# ======================================================
+# SEEDER
+# ======================================================
+
+class Seeder:
+    """Generate one data set; `run()` returns {table label: rows written}"""
+
+    def __init__(self, districts, locals, items, housing_units, workers, seed=0, unsynced=False,
+                 using=DEFAULT_DB_ALIAS, log=None):
+        self.counts = {
+            "districts": districts, "locals": max(locals, districts), "items": items,
+            "housing_units": housing_units, "workers": workers,
+        }
+        self.rng = random.Random(seed)
+        self.unsynced = unsynced
+        self.using = using
+        self.log = log or (lambda message: None)
+        self.written = {}
+
+    def record(self, model, count):
+        label = model._meta.label
+        self.written[label] = self.written.get(label, 0) + count
+        self.log(f"{label}: {count}")
+
+    def run(self):
+        with transaction.atomic(using=self.using):
+            local_rows = self.seed_locations()
+            self.seed_local_assets(local_rows)
+            departments, offices = self.seed_organization()
+            occupants = self.seed_workers(offices)
+            self.seed_housing(occupants, departments)
+        return self.written
+
+    # ----------------------------------------------
+    # Districts and locals
+    # ----------------------------------------------
+
+    def seed_locations(self):
+        from properties.models import District, DistrictInventory, DistrictProperty, Local
+
+        rng = self.rng
+        districts = bulk_create(District, [
+            District(dcode=f"D{n:04d}", name=f"{PROVINCES[n % len(PROVINCES)]} {n // len(PROVINCES) + 1}")
+            for n in range(self.counts["districts"])
+        ], self.using)
+        self.record(District, len(districts))
+
+        locals_ = []
+        number = 0
+        for district, count in zip(districts, spread(rng, self.counts["locals"], len(districts))):
+            for _ in range(max(count, 1)):
+                locals_.append(Local(
+                    lcode=f"L{number:05d}", district=district,
+                    name=f"{CITIES[number % len(CITIES)]} {number // len(CITIES) + 1}",
+                ))
+                number += 1
+        locals_ = bulk_create(Local, locals_, self.using)
+        self.record(Local, len(locals_))
+
+        properties = bulk_create(DistrictProperty, [
+            DistrictProperty(
+                district=district, name=f"{district.name} District Office", city=district.name,
+                property_type="Office", acquisition_cost=money(rng, 500_000, 5_000_000),
+                current_value=money(rng, 500_000, 8_000_000),
+            )
+            for district in districts
+        ], self.using)
+        self.record(DistrictProperty, len(properties))
+        self.record(DistrictInventory, copy_objects(DistrictInventory, (
+            DistrictInventory(
+                property=prop, item_name=rng.choice(ITEM_NAMES), quantity=rng.randint(1, 10),
+                date_acquired=past_date(rng), brand=rng.choice(BRANDS), color=rng.choice(COLORS),
+            )
+            for prop in properties for _ in range(INVENTORY_PER_UNIT)
+        ), self.using))
+
+        return [(local.pk, local.district_id, local.lcode) for local in locals_]
+
+    def seed_local_assets(self, local_rows):
+        from gusali.models import Building, BuildingYearlyRecord
+        from kagamitan.models import Item
+        from lupa.models import Land
+        from plants.models import Plant
+        from properties.models import LocalInventory, LocalProperty
+        from vehicles.models import Vehicle
+
+        rng = self.rng
+
+        buildings = []
+        for local_id, dcode, lcode in local_rows:
+            for _ in range(rng.randint(1, BUILDINGS_PER_LOCAL * 2 - 1)):
+                code = rng.choice("AABCD")
+                buildings.append(Building(
+                    code=code, name=BUILDING_NAMES[code], local_id=local_id, dcode=dcode, lcode=lcode,
+                    classification=f"{code}-{rng.randint(1, 3)}", capacity=rng.randrange(50, 1500, 50),
+                    is_donated=rng.random() < 0.1, ownership_date=past_date(rng, 40),
+                    original_cost=money(rng, 200_000, 5_000_000), current_total_cost=money(rng, 500_000, 20_000_000),
+                    year_covered=rng.choice(YEARS),
+                ))
+        buildings = bulk_create(Building, buildings, self.using)
+        self.record(Building, len(buildings))
+        self.record(BuildingYearlyRecord, copy_objects(BuildingYearlyRecord, (
+            BuildingYearlyRecord(
+                building=building, year=year, cost_last_year=building.current_total_cost,
+                renovation_cost=money(rng, 0, 200_000), general_repair_cost=money(rng, 0, 50_000),
+                year_end_total=building.current_total_cost,
+            )
+            for building in buildings for year in YEARS if year <= building.year_covered
+        ), self.using))
+
+        item_counts = spread(rng, self.counts["items"], len(local_rows))
+        self.record(Item, copy_objects(Item, (
+            self.item(local_id, dcode, lcode)
+            for (local_id, dcode, lcode), count in zip(local_rows, item_counts) for _ in range(count)
+        ), self.using))
+
+        self.record(Land, copy_objects(Land, (
+            Land(
+                local_id=local_id, dcode=dcode, lcode=lcode, location=f"Lot {rng.randint(1, 999)}, {lcode}",
+                lot_area=Decimal(rng.randint(100, 20_000)), lot_type=rng.choice(["Res", "Com", "Agri", "Inst"]),
+                status=rng.choice(["TITULADO", "TITULADO", "TAX_DEC", "OTHER"]),
+                market_value=money(rng, 100_000, 30_000_000), acquisition_cost=money(rng, 50_000, 10_000_000),
+            )
+            for local_id, dcode, lcode in local_rows for _ in range(rng.randint(0, LANDS_PER_LOCAL * 2))
+        ), self.using))
+
+        self.record(Plant, copy_objects(Plant, (
+            self.plant(local_id, dcode, lcode)
+            for local_id, dcode, lcode in local_rows for _ in range(rng.randint(0, PLANTS_PER_LOCAL * 2))
+        ), self.using))
+
+        self.record(Vehicle, copy_objects(Vehicle, (
+            Vehicle(
+                local_id=local_id, dcode=dcode, lcode=lcode, item_name=rng.choice(VEHICLE_NAMES),
+                brand=rng.choice(["Toyota", "Mitsubishi", "Nissan", "Isuzu", "Honda"]),
+                plate_number=f"{rng.choice('ABCDNPTUVWXZ')}{rng.choice('ABCDEFGHIJ')}{rng.choice('ABCDEFGHIJ')} {rng.randint(1000, 9999)}",
+                year_model=rng.randint(2000, 2024), color=rng.choice(COLORS),
+                acquisition_cost=money(rng, 80_000, 3_000_000), date_acquired=past_date(rng),
+            )
+            for local_id, dcode, lcode in local_rows for _ in range(rng.randint(0, VEHICLES_PER_LOCAL * 2))
+        ), self.using))
+
+        properties = bulk_create(LocalProperty, [
+            LocalProperty(
+                local_id=local_id, name=f"{lcode} Chapel Grounds", property_type="Chapel",
+                acquisition_cost=money(rng, 100_000, 2_000_000), current_value=money(rng, 100_000, 5_000_000),
+            )
+            for local_id, dcode, lcode in local_rows if rng.random() < 0.2
+        ], self.using)
+        self.record(LocalProperty, len(properties))
+        self.record(LocalInventory, copy_objects(LocalInventory, (
+            LocalInventory(
+                property=prop, item_name=rng.choice(ITEM_NAMES), quantity=rng.randint(1, 20),
+                date_acquired=past_date(rng), brand=rng.choice(BRANDS),
+            )
+            for prop in properties for _ in range(INVENTORY_PER_UNIT)
+        ), self.using))
+
+    def item(self, local_id, dcode, lcode):
+        from kagamitan.models import Item
+
+        rng = self.rng
+        quantity = rng.randint(1, 20)
+        unit_price = money(rng, 100, 50_000)
+        return Item(
+            local_id=local_id, dcode=dcode, lcode=lcode, item_name=rng.choice(ITEM_NAMES),
+            brand=rng.choice(BRANDS), color=rng.choice(COLORS), quantity=quantity, unit_price=unit_price,
+            total_price=unit_price * quantity, date_acquired=past_date(rng), year_reported=rng.choice(YEARS),
+            is_new=rng.random() < 0.2, location=f"{lcode} Chapel",
+        )
+
+    def plant(self, local_id, dcode, lcode):
+        from plants.models import Plant
+
+        rng = self.rng
+        bearing, non_bearing = rng.randint(0, 30), rng.randint(0, 30)
+        unit_price = money(rng, 50, 5_000)
+        return Plant(
+            local_id=local_id, dcode=dcode, lcode=lcode, name=rng.choice(PLANT_NAMES),
+            fruit_bearing=bearing, non_fruit_bearing=non_bearing, total_quantity=bearing + non_bearing,
+            unit_price=unit_price, total_value=unit_price * (bearing + non_bearing),
+        )
+
+    # ----------------------------------------------
+    # admin_core organization and workers
+    # ----------------------------------------------
+
+    def seed_organization(self):
+        from admin_core.models import AdminBuilding, Department, Office, Section
+
+        rng = self.rng
+        departments = bulk_create(Department, [Department(name=name) for name in DEPARTMENTS], self.using)
+        self.record(Department, len(departments))
+        sections = bulk_create(Section, [
+            Section(department=department, name=name) for department in departments for name in SECTIONS
+        ], self.using)
+        self.record(Section, len(sections))
+
+        admin_buildings = bulk_create(AdminBuilding, [
+            AdminBuilding(name=f"Administration Building {n + 1}", address=f"{CITIES[n % len(CITIES)]}")
+            for n in range(max(1, self.counts["workers"] // 5_000))
+        ], self.using)
+        self.record(AdminBuilding, len(admin_buildings))
+        offices = bulk_create(Office, [
+            Office(building=building, department=department, name=f"{department.name} Office")
+            for building in admin_buildings for department in departments
+        ], self.using)
+        self.record(Office, len(offices))
+        return [department.name for department in departments], offices
+
+    def seed_workers(self, offices):
+        """Workers with an office each; returns the names of the MWA occupants"""
+        from admin_core.models import Worker, WorkerOfficeAssignment
+
+        rng = self.rng
+        names = WorkerNames(rng)
+        occupants = min(self.counts["workers"], round(self.counts["housing_units"] * OCCUPANCY_RATE))
+
+        workers = []
+        for number in range(self.counts["workers"]):
+            first, middle, last = names[number]
+            # Occupants are MWA, as the sync creates them
+            category = "MWA" if number < occupants else rng.choice(["MWA", "VW", "CW"])
+            worker = Worker(
+                employee_no=f"E{number:07d}", first_name=first, middle_name=middle, last_name=last,
+                category=category, mwa_type=rng.choice(["minister", "regular", "student"]) if category == "MWA" else None,
+                marital_status=rng.choice(["single", "married", "married", "widowed"]),
+            )
+            # What save() would set
+            worker.identity_hash = worker.generate_identity_hash()
+            worker.refresh_identity_keys()
+            workers.append(worker)
+        workers = bulk_create(Worker, workers, self.using)
+        self.record(Worker, len(workers))
+
+        self.record(WorkerOfficeAssignment, copy_objects(WorkerOfficeAssignment, (
+            WorkerOfficeAssignment(
+                worker_id=worker.pk, office=rng.choice(offices), start_date=past_date(rng, 20), is_primary=True,
+            )
+            for worker in workers
+        ), self.using))
+
+        return [(worker.pk, f"{worker.first_name} {worker.middle_name} {worker.last_name}")
+                for worker in workers[:occupants]]
+
+    # ----------------------------------------------
+    # Housing (properties side, mirrored into admin_core)
+    # ----------------------------------------------
+
+    def seed_housing(self, occupants, departments):
+        from properties.models import HousingUnit, Pamayanan, PamayananBuilding
+
+        rng = self.rng
+        pamayanan_count = max(1, math.ceil(self.counts["housing_units"] / UNITS_PER_PAMAYANAN))
+        pamayanans = bulk_create(Pamayanan, [
+            Pamayanan(
+                name=f"Pamayanan {CITIES[n % len(CITIES)]} {n // len(CITIES) + 1}",
+                address=f"{rng.randint(1, 999)} Main Road", city=CITIES[n % len(CITIES)],
+                province=rng.choice(PROVINCES), property_type="Housing", owner="The Church",
+                acquisition_cost=money(rng, 1_000_000, 50_000_000), current_value=money(rng, 1_000_000, 80_000_000),
+            )
+            for n in range(pamayanan_count)
+        ], self.using)
+        self.record(Pamayanan, len(pamayanans))
+
+        buildings = bulk_create(PamayananBuilding, [
+            PamayananBuilding(pamayanan=pamayanan, name=f"Building {chr(65 + b)}")
+            for pamayanan in pamayanans for b in range(rng.randint(1, 3))
+        ], self.using)
+        self.record(PamayananBuilding, len(buildings))
+        buildings_by_pamayanan = {}
+        for building in buildings:
+            buildings_by_pamayanan.setdefault(building.pamayanan_id, []).append(building)
+
+        occupied = set(rng.sample(range(self.counts["housing_units"]), len(occupants)))
+        occupant_names = iter(occupants)
+        units = []
+        assignments = []
+        number = 0
+        for pamayanan, count in zip(pamayanans, spread(rng, self.counts["housing_units"], len(pamayanans))):
+            pamayanan_buildings = buildings_by_pamayanan[pamayanan.pk]
+            for n in range(count):
+                building = pamayanan_buildings[n % len(pamayanan_buildings)]
+                floor = n // (len(pamayanan_buildings) * 10) + 1
+                unit = HousingUnit(
+                    pamayanan=pamayanan, building=building, unit_number=f"{floor}{n % 10:02d}{n // 10:03d}",
+                    floor=str(floor), housing_unit_name=f"{building.name} Unit {n + 1}",
+                    address=pamayanan.address, occupant_name="", date_reported=past_date(rng, 2),
+                )
+                if number in occupied:
+                    worker_id, unit.occupant_name = next(occupant_names)
+                    unit.department = rng.choice(departments)
+                    unit.section = rng.choice(SECTIONS)
+                    unit.job_title = rng.choice(["Minister", "Worker", "Staff", "Supervisor"])
+                    assignments.append((len(units), worker_id))
+                units.append(unit)
+                number += 1
+        units = bulk_create(HousingUnit, units, self.using)
+        self.record(HousingUnit, len(units))
+
+        self.seed_inventory(units)
+        if not self.unsynced:
+            self.mirror_housing(pamayanans, buildings, units, assignments)
+
+    def seed_inventory(self, units):
+        from properties.ledger import record_opening
+        from properties.models import HousingUnitInventory, InventoryMovement, ItemTransfer
+
+        rng = self.rng
+        connection = connections[self.using]
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {connection.ops.quote_name(HousingUnitInventory._meta.db_table)}")
+            last_id = cursor.fetchone()[0]
+
+        self.record(HousingUnitInventory, copy_objects(HousingUnitInventory, (
+            self.inventory_item(unit)
+            for unit in units for _ in range(rng.randint(1, INVENTORY_PER_UNIT * 2 - 1))
+        ), self.using))
+        # COPY skips the ledger signals; the seeded stock is its opening balance
+        self.record(InventoryMovement, record_opening(last_id, self.using))
+
+        # A few items have moved to another unit of the same pamayanan
+        inventory = list(
+            HousingUnitInventory.objects.using(self.using).filter(id__gt=last_id)
+            .order_by("id").values_list("id", "housing_unit_id")
+        )
+        units_by_pamayanan = {}
+        pamayanan_of = {}
+        for unit in units:
+            units_by_pamayanan.setdefault(unit.pamayanan_id, []).append(unit.pk)
+            pamayanan_of[unit.pk] = unit.pamayanan_id
+        transfers = 0
+        for item_id, unit_id in sorted(rng.sample(inventory, int(len(inventory) * TRANSFER_RATE))):
+            destinations = [pk for pk in units_by_pamayanan[pamayanan_of[unit_id]] if pk != unit_id]
+            if destinations:
+                transfers += len(self.transfer(item_id, unit_id, rng.choice(destinations)))
+        self.record(ItemTransfer, transfers)
+        # transfer_out + transfer_in
+        self.record(InventoryMovement, transfers * 2)
+
+    def inventory_item(self, unit):
+        from properties.models import HousingUnitInventory
+
+        rng = self.rng
+        cost = money(rng, 500, 80_000)
+        return HousingUnitInventory(
+            housing_unit=unit, item_name=rng.choice(ITEM_NAMES), quantity=rng.randint(1, 4),
+            date_acquired=past_date(rng), brand=rng.choice(BRANDS), color=rng.choice(COLORS),
+            acquisition_cost=cost, useful_life=rng.choice([3, 5, 10]), net_book_value=cost / 2, amount=cost,
+        )
+
+    def transfer(self, item_id, from_unit_id, to_unit_id):
+        """Move one of the item to another unit, stock and ledger entries included"""
+        from properties.transfers import transfer_items
+
+        rng = self.rng
+        return transfer_items(
+            [(item_id, 1)], from_unit_id=from_unit_id, to_unit_id=to_unit_id,
+            transferred_by=rng.choice(FIRST_NAMES), receiver_name=rng.choice(FIRST_NAMES),
+            reason="Reassignment", status=rng.choice(["good", "good", "damaged"]),
+        )
+
+    def mirror_housing(self, pamayanans, buildings, units, assignments):
+        """admin_core housing rows as the sync would create them"""
+        from admin_core.models import HousingBuilding, HousingSite, HousingUnit, HousingUnitAssignment
+
+        rng = self.rng
+        sites = bulk_create(HousingSite, [
+            HousingSite(name=pamayanan.name.strip(), address=pamayanan.address, is_multi_building=True)
+            for pamayanan in pamayanans
+        ], self.using)
+        self.record(HousingSite, len(sites))
+        site_of = {pamayanan.pk: site for pamayanan, site in zip(pamayanans, sites)}
+
+        housing_buildings = bulk_create(HousingBuilding, [
+            HousingBuilding(site=site_of[building.pamayanan_id], name=building.name.strip())
+            for building in buildings
+        ], self.using)
+        self.record(HousingBuilding, len(housing_buildings))
+        building_of = {building.pk: mirror for building, mirror in zip(buildings, housing_buildings)}
+
+        mirrored = bulk_create(HousingUnit, [
+            HousingUnit(
+                site=site_of[unit.pamayanan_id], building=building_of[unit.building_id],
+                unit_label=unit.housing_unit_name.strip(), floor=unit.floor,
+            )
+            for unit in units
+        ], self.using)
+        self.record(HousingUnit, len(mirrored))
+
+        self.record(HousingUnitAssignment, copy_objects(HousingUnitAssignment, (
+            HousingUnitAssignment(
+                worker_id=worker_id, housing_unit_id=mirrored[index].pk, is_current=True,
+                start_date=past_date(rng, 10),
+            )
+            for index, worker_id in assignments
+        ), self.using))
+
+
+# ======================================================
+# DERIVED TABLES
+# ======================================================
+
+def rebuild_derived(log=None):
+    """Rebuild what the bulk writes skipped signals for, on fresh statistics"""
+    from gusali.reports import rebuild_building_reports
+
+    from .cache import CACHE_NAMESPACES, bump_namespace
+    from .ledger import take_snapshot
+    from .occupancy import rebuild_occupancy
+    from .rollups import rebuild_rollups
+    from .stats import SNAPSHOTS
+    from .summaries import refresh_summaries
+
+    log = log or (lambda message: None)
+    analyze()
+    log(f"Local asset rollups: {rebuild_rollups()}")
+    log(f"Pamayanan occupancy: {rebuild_occupancy()}")
+    refresh_summaries(concurrently=False)
+    log("Summary views refreshed")
+    log(f"Building report years: {rebuild_building_reports()}")
+    log(f"Inventory snapshot lines: {take_snapshot()[0].line_count}")
+    for snapshot in SNAPSHOTS.values():
+        snapshot.refresh()
+    for namespace in CACHE_NAMESPACES:
+        bump_namespace(namespace)
+    log("Dashboard stats and cache versions refreshed")
@@ -1,10 +1,20 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 from admin_core.management.commands.sync_admin_core import run_sync
-from properties.models import ImportedFile
+from properties.cache import connect_namespaces
+from properties import ledger
+from properties.models import HousingUnit, HousingUnitInventory, ImportedFile
+from properties.occupancy import rebuild_occupancy, refresh_occupancy
+from properties.rollups import cascaded, connect_rollup
+from properties.stats import dashboard_stats
 
 
+dashboard_stats.connect()
+connect_namespaces()
+connect_rollup("property")
+
 
 @receiver(post_save, sender=ImportedFile)
 def trigger_admin_core_sync(sender, instance, created, **kwargs):
@@ -24,3 +34,75 @@ def trigger_admin_core_sync(sender, instance, created, **kwargs):
 
     # Run sync
     run_sync(triggered_by="import_inventory")
+
+
+@receiver(pre_save, sender=HousingUnit)
+def remember_unit_pamayanan(sender, instance, **kwargs):
+    """
+    Keep the previous Pamayanan so a unit moved between
+    Pamayanan refreshes both rollups.
+    """
+    instance._previous_pamayanan_id = None
+    if instance.pk:
+        instance._previous_pamayanan_id = (
+            HousingUnit.objects.filter(pk=instance.pk)
+            .values_list("pamayanan_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=HousingUnit)
+@receiver(post_delete, sender=HousingUnit)
+def refresh_unit_occupancy(sender, instance, origin=None, **kwargs):
+    """
+    Keep PamayananOccupancy rollups current on every unit write.
+    """
+    if cascaded(sender, origin):
+        # Deleting the Pamayanan itself: refresh_occupancy skips it once gone
+        pamayanan_id = instance.pamayanan_id
+        transaction.on_commit(lambda: refresh_occupancy(pamayanan_id))
+        return
+    refresh_occupancy(instance.pamayanan_id)
+
+    previous = getattr(instance, "_previous_pamayanan_id", None)
+    if previous and previous != instance.pamayanan_id:
+        refresh_occupancy(previous)
+
+
+@receiver(post_save, sender=ImportedFile)
+def rebuild_import_occupancy(sender, instance, **kwargs):
+    """
+    Bulk imports bypass HousingUnit signals; rebuild all rollups instead.
+    """
+    if instance.status in ("success", "partial"):
+        rebuild_occupancy()
+
+
+@receiver(pre_save, sender=HousingUnitInventory)
+def remember_inventory_state(sender, instance, raw=False, **kwargs):
+    """
+    Keep the stored unit, name and quantity so the ledger entry is
+    the change, not the new total.
+    """
+    if raw:
+        return
+    instance._ledger_previous = ledger.previous_state(instance)
+
+
+@receiver(post_save, sender=HousingUnitInventory)
+def record_inventory_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Append the quantity change to the inventory ledger. Fixture loads
+    (raw) are skipped: a fixture's ledger rows come with it.
+    """
+    if raw:
+        return
+    ledger.record_save(instance, getattr(instance, "_ledger_previous", None), created)
+
+
+@receiver(post_delete, sender=HousingUnitInventory)
+def record_inventory_delete(sender, instance, **kwargs):
+    """
+    Book a deleted row's remaining quantity out of the ledger.
+    """
+    ledger.record_delete(instance)
@@ -0,0 +1,238 @@
+"""
+Slow-query capture with EXPLAIN plans.
+
+SlowQueryMiddleware runs every request under an execute_wrapper that
+notes each statement taking SLOW_QUERY_MS or longer, with the project
+code that issued it (file:line in function). When the response is ready,
+each slow statement is stored as a SlowQuery row keyed by its normalized
+SQL, so the same query with different parameters adds up in one row:
+
+    calls, total_ms, max_ms       over every slow run
+    view, site, params, plan      of the slowest run so far
+
+Parameter values are never stored (they may hold names, addresses or
+passwords): `params` only lists their types, e.g. "str, int".
+
+The plan is a plain EXPLAIN of the statement on the database it was
+sent to, inside a read-only transaction that is rolled back; it does
+not run the statement. SLOW_QUERY_EXPLAIN_ANALYZE = True asks for
+`EXPLAIN (ANALYZE, BUFFERS)` of SELECTs instead, with actual row counts
+and timings, at the cost of running the slow query again in the
+request once per new worst run. SLOW_QUERY_EXPLAIN = False skips plans.
+
+Recording happens after the view has returned, outside its
+transactions, and a failure to record is logged, never raised. Staff
+see the top offenders by total time at properties:slow_queries.
+
+SLOW_QUERY_MS = None turns the recorder off.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import time
+import traceback
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connections, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from . import instrumentation
+from .instrumentation import UNRESOLVED
+from .models import SlowQuery
+
+
+logger = logging.getLogger("properties.metrics")
+
+PARAMS_SAMPLE_LENGTH = 500
+
+# Frames in these files are the recorders, not the code that ran the query
+_RECORDER_FILES = {
+    os.path.splitext(path)[0] for path in (__file__, instrumentation.__file__)
+}
+
+
+# ======================================================
+# NORMALIZING
+# ======================================================
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|%\(\w+\)s")
+_SPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\bIN \(\?(?:, \?)*\)")
+_VALUES_ROWS = re.compile(r"\bVALUES \([^()]*\)(?:, \([^()]*\))*")
+
+
+def normalize(sql):
+    """SQL with literals and placeholders as ?, IN lists and VALUES rows collapsed"""
+    sql = _SPACE.sub(" ", sql).strip()
+    sql = _STRING.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _VALUES_ROWS.sub("VALUES (...)", sql)
+
+
+def fingerprint(normalized_sql):
+    return hashlib.sha1(normalized_sql.encode()).hexdigest()
+
+
+def call_site():
+    """'app/module.py:line in function' of the innermost project frame"""
+    base = os.path.join(str(settings.BASE_DIR), "")
+    for frame in reversed(traceback.extract_stack()):
+        path = frame.filename
+        if (
+            path.startswith(base)
+            and "site-packages" not in path
+            and os.path.splitext(path)[0] not in _RECORDER_FILES
+        ):
+            return f"{os.path.relpath(path, base)}:{frame.lineno} in {frame.name}"[:300]
+    return ""
+
+
+# ======================================================
+# RECORDING
+# ======================================================
+
+class SlowStatement:
+    """One statement that ran over the threshold"""
+
+    def __init__(self, alias, sql, params, duration_ms, site):
+        self.alias = alias
+        self.sql = sql
+        self.params = params
+        self.duration_ms = duration_ms
+        self.site = site
+
+
+class SlowQueryRecorder:
+    """execute_wrapper noting statements slower than `threshold_ms`"""
+
+    def __init__(self, threshold_ms):
+        self.threshold_ms = threshold_ms
+        self.slow = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if duration_ms >= self.threshold_ms:
+                self.slow.append(SlowStatement(
+                    context["connection"].alias, sql,
+                    # executemany parameter lists may be one-shot iterators
+                    None if many else params,
+                    duration_ms, call_site(),
+                ))
+
+    def save(self, view):
+        for statement in self.slow:
+            try:
+                record(statement, view)
+            except DatabaseError:
+                logger.warning("Could not record slow query from %s", view, exc_info=True)
+        self.slow = []
+
+
+def redact(params):
+    """Types of the parameters, without their values"""
+    if params is None:
+        return ""
+    if isinstance(params, dict):
+        return ", ".join(f"{name}: {type(value).__name__}" for name, value in params.items())
+    return ", ".join(type(value).__name__ for value in params)
+
+
+def explain(statement):
+    """EXPLAIN a statement on its database, in a read-only transaction"""
+    if not getattr(settings, "SLOW_QUERY_EXPLAIN", True):
+        return ""
+
+    analyze = getattr(settings, "SLOW_QUERY_EXPLAIN_ANALYZE", False)
+    if analyze and statement.sql.lstrip().upper().startswith(("SELECT", "WITH")):
+        command = "EXPLAIN (ANALYZE, BUFFERS) "
+    else:
+        command = "EXPLAIN "
+
+    alias = statement.alias
+    try:
+        with transaction.atomic(using=alias):
+            with connections[alias].cursor() as cursor:
+                cursor.execute("SET TRANSACTION READ ONLY")
+                cursor.execute(command + statement.sql, statement.params)
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+            transaction.set_rollback(True, using=alias)
+    except DatabaseError as exc:
+        return f"EXPLAIN failed: {exc}"
+    return plan
+
+
+def record(statement, view):
+    """Add a slow statement to its SlowQuery row"""
+    sql = normalize(statement.sql)
+    key = fingerprint(sql)
+    duration_ms = statement.duration_ms
+
+    # Sample (and EXPLAIN) only a new worst run
+    sample = {}
+    worst = SlowQuery.objects.filter(fingerprint=key).values_list("max_ms", flat=True).first()
+    if worst is None or duration_ms > worst:
+        sample = {
+            "database": statement.alias,
+            "view": view[:200],
+            "site": statement.site,
+            "params": redact(statement.params)[:PARAMS_SAMPLE_LENGTH],
+            "plan": explain(statement),
+        }
+
+    totals = {
+        "calls": F("calls") + 1,
+        "total_ms": F("total_ms") + duration_ms,
+        "max_ms": Greatest("max_ms", Value(duration_ms)),
+        "last_seen": timezone.now(),
+    }
+    if SlowQuery.objects.filter(fingerprint=key).update(**totals, **sample):
+        return
+
+    try:
+        with transaction.atomic():
+            SlowQuery.objects.create(
+                fingerprint=key, sql=sql, calls=1, total_ms=duration_ms, max_ms=duration_ms, **sample
+            )
+    except IntegrityError:
+        # Another worker recorded it first
+        SlowQuery.objects.filter(fingerprint=key).update(**totals)
+
+
+# ======================================================
+# MIDDLEWARE
+# ======================================================
+
+class SlowQueryMiddleware:
+    """Record statements slower than SLOW_QUERY_MS, with the view that ran them"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        threshold = getattr(settings, "SLOW_QUERY_MS", None)
+        if threshold is None:
+            return self.get_response(request)
+
+        recorder = SlowQueryRecorder(threshold)
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        if recorder.slow:
+            match = getattr(request, "resolver_match", None)
+            recorder.save(match.view_name if match else UNRESOLVED)
+        return response
@@ -0,0 +1,151 @@
+"""
+Cached statistics snapshots for dashboards.
+
+A snapshot computes all of a page's counters in a couple of aggregate
+queries and keeps the result in the cache. Saving or deleting any of
+the counted models drops the cached copy, so the next request
+recomputes it. As a safety net for writes that skip signals
+(bulk_create, queryset.update), a snapshot older than
+STATS_REFRESH_INTERVAL is served once more while a background thread
+recomputes it. `manage.py refresh_dashboard_stats` does the same from cron.
+"""
+
+import threading
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections, transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+
+DEFAULT_TIMEOUT = 60 * 15
+DEFAULT_REFRESH_INTERVAL = 60
+
+# Every snapshot by key (refreshed together by refresh_dashboard_stats)
+SNAPSHOTS = {}
+
+
+def count_many(using="default", **querysets):
+    """
+    Count several (optionally filtered) querysets in ONE query.
+
+    count_many(units=HousingUnit.objects.all(),
+               active=Worker.objects.filter(employment_status="active"))
+    -> {"units": 120, "active": 45}
+    """
+    parts = []
+    params = []
+    for name, queryset in querysets.items():
+        sql, query_params = queryset.order_by().values("pk").query.sql_with_params()
+        parts.append(f"(SELECT COUNT(*) FROM ({sql}) AS {name}_rows)")
+        params.extend(query_params)
+
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT " + ", ".join(parts), params)
+        row = cursor.fetchone()
+
+    return dict(zip(querysets, row))
+
+
+class StatsSnapshot:
+    """
+    A cached dict of dashboard counters.
+
+    `compute` returns the dict; `models` are the labels
+    ("app.Model") of the models whose writes invalidate it.
+    """
+
+    def __init__(self, key, compute, models):
+        self.key = f"stats:{key}"
+        self.compute = compute
+        self.models = models
+        self._refreshing = threading.Lock()
+        SNAPSHOTS[key] = self
+
+    # ----------------------------------------------
+    # Read
+    # ----------------------------------------------
+
+    def get(self):
+        """Cached counters, recomputed on a miss"""
+        snapshot = cache.get(self.key)
+        if snapshot is None:
+            return self.refresh()
+
+        age = (timezone.now() - snapshot["computed_at"]).total_seconds()
+        if age > getattr(settings, "STATS_REFRESH_INTERVAL", DEFAULT_REFRESH_INTERVAL):
+            self.refresh_in_background()
+
+        return snapshot
+
+    # ----------------------------------------------
+    # Write
+    # ----------------------------------------------
+
+    def refresh(self):
+        snapshot = self.compute()
+        snapshot["computed_at"] = timezone.now()
+        cache.set(
+            self.key,
+            snapshot,
+            getattr(settings, "STATS_CACHE_TIMEOUT", DEFAULT_TIMEOUT),
+        )
+        return snapshot
+
+    def refresh_in_background(self):
+        """Recompute in a daemon thread; at most one refresh at a time"""
+        if not self._refreshing.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                self.refresh()
+            finally:
+                connection.close()
+                self._refreshing.release()
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def invalidate(self, **kwargs):
+        cache.delete(self.key)
+        # A request racing the open transaction may re-cache old counts
+        transaction.on_commit(lambda: cache.delete(self.key))
+
+    def connect(self):
+        """Invalidate on post_save / post_delete of every counted model"""
+        for label in self.models:
+            model = apps.get_model(label)
+            uid = f"{self.key}:{label}"
+            post_save.connect(self.invalidate, sender=model, weak=False, dispatch_uid=uid)
+            post_delete.connect(self.invalidate, sender=model, weak=False, dispatch_uid=uid)
+
+
+# ======================================================
+# PROPERTIES DASHBOARD
+# ======================================================
+
+def compute_dashboard_stats():
+    from .models import HousingUnit, HousingUnitInventory, ImportedFile, ItemTransfer, Pamayanan
+
+    return count_many(
+        housing_units=HousingUnit.objects.all(),
+        inventory_items=HousingUnitInventory.objects.all(),
+        imported_files=ImportedFile.objects.all(),
+        properties=Pamayanan.objects.all(),
+        transfers=ItemTransfer.objects.all(),
+    )
+
+
+dashboard_stats = StatsSnapshot(
+    "properties_dashboard",
+    compute_dashboard_stats,
+    [
+        "properties.HousingUnit",
+        "properties.HousingUnitInventory",
+        "properties.ImportedFile",
+        "properties.ItemTransfer",
+        "properties.Pamayanan",
+    ],
+)
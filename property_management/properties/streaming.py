@@ -0,0 +1,31 @@
+"""
+Streaming helpers for full-table passes (sync, exports).
+
+Iterating a normal queryset loads every row and builds every model
+instance before the first one is processed. These helpers read plain
+value tuples through a server-side cursor instead, so memory stays
+bounded by the chunk size no matter how large the table is.
+"""
+
+from django.conf import settings
+
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def get_chunk_size(chunk_size=None):
+    """Chunk size for server-side cursors (STREAM_CHUNK_SIZE setting)"""
+    return chunk_size or getattr(settings, "STREAM_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+
+
+def stream_rows(queryset, *fields, chunk_size=None):
+    """
+    Yield named tuples for `fields` from a server-side cursor.
+
+    Usage:
+        for row in stream_rows(HousingUnit.objects.all(), "id", "pamayanan__name"):
+            row.pamayanan__name
+    """
+    return queryset.values_list(*fields, named=True).iterator(
+        chunk_size=get_chunk_size(chunk_size)
+    )
@@ -0,0 +1,114 @@
+"""
+District / national asset summaries backed by PostgreSQL materialized views.
+
+`district_asset_summary` and `national_asset_summary` (migration 0025)
+aggregate every national asset table by year and asset type, so
+questions like "total building cost per district for 2024" read a few
+pre-grouped rows. DistrictAssetSummary and NationalAssetSummary expose
+them as read-only models.
+
+The views are refreshed with REFRESH MATERIALIZED VIEW CONCURRENTLY,
+which keeps them readable during the refresh:
+
+- after imports (deferred_rollups() schedules a refresh on commit)
+- on a schedule: `manage.py refresh_summaries` from cron, and a
+  background refresh when a report reads views older than
+  SUMMARY_REFRESH_INTERVAL
+"""
+
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+
+# Refresh order: district first, national second
+SUMMARY_VIEWS = ("district_asset_summary", "national_asset_summary")
+
+# asset_type values in report column order
+ASSET_TYPES = {
+    "building": "Gusali",
+    "item": "Kagamitan",
+    "land": "Lupa",
+    "plant": "Pananim",
+    "vehicle": "Sasakyan",
+    "property": "Local Properties",
+}
+
+DEFAULT_REFRESH_INTERVAL = 60 * 15
+REFRESHED_AT_KEY = "summaries:refreshed_at"
+
+_refreshing = threading.Lock()
+
+
+# ======================================================
+# REFRESH
+# ======================================================
+
+def refresh_summaries(concurrently=True, using="default"):
+    """Refresh every summary view; returns the refresh time"""
+    keyword = "CONCURRENTLY " if concurrently else ""
+    with connections[using].cursor() as cursor:
+        for view in SUMMARY_VIEWS:
+            cursor.execute(f"REFRESH MATERIALIZED VIEW {keyword}{view}")
+
+    refreshed_at = timezone.now()
+    cache.set(REFRESHED_AT_KEY, refreshed_at, None)
+    return refreshed_at
+
+
+def refresh_summaries_on_commit():
+    """Refresh once the surrounding import transaction has committed"""
+    transaction.on_commit(refresh_summaries)
+
+
+def refresh_summaries_in_background():
+    """Refresh in a daemon thread; at most one refresh at a time"""
+    if not _refreshing.acquire(blocking=False):
+        return
+
+    def run():
+        try:
+            refresh_summaries()
+        finally:
+            connection.close()
+            _refreshing.release()
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def refresh_if_stale():
+    """Start a background refresh when the views are older than the interval"""
+    refreshed_at = cache.get(REFRESHED_AT_KEY)
+    interval = getattr(settings, "SUMMARY_REFRESH_INTERVAL", DEFAULT_REFRESH_INTERVAL)
+    if refreshed_at is None or (timezone.now() - refreshed_at).total_seconds() > interval:
+        refresh_summaries_in_background()
+    return refreshed_at
+
+
+# ======================================================
+# READS
+# ======================================================
+
+def summary_table(queryset, row_field):
+    """
+    Pivot summary rows into [{"key", "values", "total"}], one per
+    `row_field` value, with `values` in ASSET_TYPES order.
+    """
+    rows = {}
+    grouped = (
+        queryset.values(row_field, "asset_type")
+        .annotate(value=Sum("total_value"))
+        .order_by(row_field)
+    )
+    for row in grouped:
+        cells = rows.setdefault(row[row_field], dict.fromkeys(ASSET_TYPES, 0))
+        cells[row["asset_type"]] = row["value"]
+
+    return [
+        {"key": key, "values": list(cells.values()), "total": sum(cells.values())}
+        for key, cells in rows.items()
+    ]
@@ -0,0 +1,75 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from admin_core.models import Worker
+from gusali.models import Building
+
+from .models import District, Local
+
+
+class ReadOnlyApiTests(TestCase):
+    """Test the JSON API: sparse fieldsets, cursors, filters, ETags"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.client.login(username='testuser', password='password123')
+
+        metro = District.objects.create(dcode='MNL', name='Metro Manila')
+        bulacan = District.objects.create(dcode='BUL', name='Bulacan')
+        self.quezon = Local.objects.create(lcode='QC01', name='Quezon City', district=metro)
+        malolos = Local.objects.create(lcode='MAL01', name='Malolos', district=bulacan)
+
+        for index in range(5):
+            Building.objects.create(code='A', name=f'KAPILYA {index}', local=self.quezon, year_covered=2024,
+                                    current_total_cost=Decimal('100.00'))
+        Building.objects.create(code='B', name='PASTORAL', local=malolos, year_covered=2023)
+
+    def test_sparse_fields_and_filters(self):
+        response = self.client.get('/api/v1/buildings/', {'district': 'BUL', 'fields': 'name,local,lcode'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['results'], [{'name': 'PASTORAL', 'local': 'Malolos', 'lcode': ''}])
+
+    def test_unknown_field(self):
+        response = self.client.get('/api/v1/buildings/', {'fields': 'name,password'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_pagination(self):
+        seen = []
+        url, params = '/api/v1/buildings/', {'page_size': '4', 'fields': 'id'}
+        while url:
+            data = self.client.get(url, params).json()
+            seen += [row['id'] for row in data['results']]
+            url, params = data['next'], None
+        self.assertEqual(sorted(seen), sorted(Building.objects.values_list('pk', flat=True)))
+        self.assertEqual(len(seen), 6)
+
+    def test_etag_not_modified(self):
+        response = self.client.get('/api/v1/locals/')
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('"'))
+
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get('/api/v1/locals/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        # Session / user lookups plus the single version aggregate
+        self.assertEqual(sum('COUNT(' in q['sql'] for q in queries.captured_queries), 1)
+
+        self.quezon.name = 'Lungsod Quezon'
+        self.quezon.save()
+        self.assertEqual(self.client.get('/api/v1/locals/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_worker_search(self):
+        Worker.objects.create(first_name='Juan', last_name='Cruz', category='VW')
+        Worker.objects.create(first_name='Pedro', last_name='Santos', category='VW')
+        data = self.client.get('/api/v1/workers/', {'q': 'cruz', 'fields': 'last_name'}).json()
+        self.assertEqual(data['results'], [{'last_name': 'Cruz'}])
+
+    def test_authentication_required(self):
+        self.client.logout()
+        self.assertEqual(self.client.get('/api/v1/districts/').status_code, 401)
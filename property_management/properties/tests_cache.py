@@ -0,0 +1,85 @@
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .cache import bump_namespace, cache_stats, cached, namespace_version
+from .cache_backends import check_shared_cache
+from .models import District, HousingUnit, Local, Pamayanan
+
+
+class CacheNamespaceTests(TestCase):
+    """Test versioned namespaces, fragment caching and the cache_stats command"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.client.login(username='testuser', password='password123')
+
+        self.metro = District.objects.create(dcode='MNL', name='Metro Manila')
+        Local.objects.create(lcode='QC01', name='Quezon City', district=self.metro)
+
+    def stats(self, namespace):
+        return next((row for row in cache_stats() if row['namespace'] == namespace), None)
+
+    def test_model_save_bumps_version(self):
+        version = namespace_version('locations')
+        self.assertEqual(cached('locations', 'name', lambda: self.metro.name), 'Metro Manila')
+
+        self.metro.name = 'NCR'
+        self.metro.save()
+        self.assertGreater(namespace_version('locations'), version)
+        self.assertEqual(cached('locations', 'name', lambda: self.metro.name), 'NCR')
+
+    def test_dropdown_fragment_hits_until_location_changes(self):
+        url = reverse('plants:plant_list')
+        self.client.get(url)
+        self.client.get(url)
+        stats = self.stats('fragment:district_options')
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+        District.objects.create(dcode='BUL', name='Bulacan')
+        response = self.client.get(url)
+        self.assertContains(response, 'Bulacan')
+        self.assertEqual(self.stats('fragment:district_options')['misses'], 2)
+
+    def test_building_grid_cached(self):
+        pamayanan = Pamayanan.objects.create(name='Abra Building')
+        HousingUnit.objects.create(pamayanan=pamayanan, housing_unit_name='101', floor='1',
+                                   occupant_name='Juan', date_reported=date(2024, 1, 1))
+        url = reverse('properties:building_map', args=[pamayanan.pk])
+        self.client.get(url)
+
+        # Grid units are not queried on a fragment hit
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertContains(response, 'Juan')
+
+        HousingUnit.objects.filter(pamayanan=pamayanan).update(occupant_name='Pedro')
+        bump_namespace('housing')
+        self.assertContains(self.client.get(url), 'Pedro')
+
+    def test_command_reports_and_flushes(self):
+        cached('locations', 'name', lambda: 'x')
+        cached('locations', 'name', lambda: 'x')
+        version = namespace_version('locations')
+
+        out = StringIO()
+        call_command('cache_stats', stdout=out)
+        self.assertRegex(out.getvalue(), r'locations\s+1\s+1\s+50\.0%')
+
+        call_command('cache_stats', '--flush', 'locations', stdout=StringIO())
+        self.assertEqual(namespace_version('locations'), version + 1)
+
+        call_command('cache_stats', '--reset', stdout=StringIO())
+        self.assertEqual(self.stats('locations')['hits'], 0)
+
+    def test_deploy_check_flags_per_process_cache(self):
+        with override_settings(CACHES={'default': {'BACKEND': 'properties.cache_backends.LocMemCache'}}):
+            self.assertEqual([w.id for w in check_shared_cache(None)], ['properties.W001'])
+        with override_settings(CACHES={'default': {'BACKEND': 'properties.cache_backends.FileBasedCache'}}):
+            self.assertEqual(check_shared_cache(None), [])
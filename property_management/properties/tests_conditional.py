@@ -0,0 +1,80 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from gusali.models import Building
+from kagamitan.models import Item
+
+from .models import District, Local
+
+
+class ConditionalPageTests(TestCase):
+    """Test ETag / Last-Modified revalidation of the heavy pages"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.client.login(username='testuser', password='password123')
+
+        self.metro = District.objects.create(dcode='MNL', name='Metro Manila')
+        self.quezon = Local.objects.create(lcode='QC01', name='Quezon City', district=self.metro)
+        self.kapilya = Building.objects.create(code='A', name='KAPILYA', local=self.quezon, year_covered=2024,
+                                               current_total_cost=Decimal('1000.00'))
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_not_modified_skips_view(self):
+        url = reverse('properties:district_detail', args=['MNL'])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        cached = self.revalidate(url, response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached['ETag'], response['ETag'])
+        # Template never rendered
+        self.assertEqual(cached.templates, [])
+
+    def test_asset_write_invalidates_summary(self):
+        url = reverse('properties:local_summary', args=['QC01'])
+        etag = self.client.get(url)['ETag']
+
+        Building.objects.create(code='B', name='PASTORAL', local=self.quezon, year_covered=2024,
+                                current_total_cost=Decimal('50.00'))
+        response = self.revalidate(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '1050')
+
+    def test_query_string_and_user_vary_the_etag(self):
+        url = reverse('gusali:building_list')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url + '?q=kap', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        User.objects.create_user(username='other', password='password123')
+        self.client.login(username='other', password='password123')
+        self.assertEqual(self.revalidate(url, etag).status_code, 200)
+
+    def test_building_report_stale_snapshot(self):
+        url = reverse('gusali:building_report')
+        # The first view regenerates the stale snapshot, which changes its version
+        self.client.get(url)
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.revalidate(url, etag).status_code, 304)
+
+        # Marks the 2024 snapshot stale without touching generated_at
+        self.kapilya.current_total_cost = Decimal('2000.00')
+        self.kapilya.save()
+        self.assertEqual(self.revalidate(url, etag).status_code, 200)
+
+    def test_item_report_and_deletes(self):
+        Item.objects.create(item_name='Chair', year_reported=2024, total_price=Decimal('30.00'))
+        chair = Item.objects.create(item_name='Chair', year_reported=2024, total_price=Decimal('30.00'))
+        url = reverse('kagamitan:item_report')
+        response = self.client.get(url)
+        self.assertContains(response, '60.00')
+
+        chair.delete()
+        self.assertEqual(self.revalidate(url, response['ETag']).status_code, 200)
@@ -0,0 +1,56 @@
+import importlib.util
+import unittest
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrapper
+from django.test import TestCase
+from django.urls import reverse
+
+from .dbpool import connection_metrics, get_pool, reset_metrics
+
+
+class ConnectionMetricsTests(TestCase):
+    """Test the connection counters and the metrics endpoint"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        reset_metrics()
+
+    def metrics(self):
+        return connection_metrics()['databases']['default']
+
+    def test_checkout_reuses_open_connection(self):
+        # As at the start of a request
+        connection.checked_out = False
+        User.objects.count()
+        User.objects.count()
+
+        metrics = self.metrics()
+        self.assertEqual(metrics['checkouts'], 1)
+        self.assertEqual(metrics['reused'], 1)
+        self.assertEqual(metrics['opened'], 0)
+
+    def test_failed_health_check_counts_broken(self):
+        with mock.patch.object(PostgresDatabaseWrapper, 'is_usable', return_value=False):
+            self.assertFalse(connection.is_usable())
+        self.assertEqual(self.metrics()['broken'], 1)
+
+    def test_endpoint_is_staff_only(self):
+        url = reverse('properties:db_pool_metrics')
+        self.client.login(username='testuser', password='password123')
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.user.is_staff = True
+        self.user.save()
+        data = self.client.get(url).json()
+        self.assertIn('pid', data)
+        self.assertEqual(data['databases']['default']['mode'], 'persistent')
+        self.assertTrue(data['databases']['default']['health_checks'])
+
+    @unittest.skipIf(importlib.util.find_spec('psycopg_pool'), 'psycopg_pool is installed')
+    def test_pool_mode_needs_psycopg_pool(self):
+        with self.assertRaises(ImproperlyConfigured):
+            get_pool('pooled', {'max_size': 2}, {'dbname': 'x'})
@@ -0,0 +1,82 @@
+import csv
+import io
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from openpyxl import load_workbook
+
+from admin_core.models import Worker
+from gusali.models import Building
+from kagamitan.models import Item
+
+from .exports import clean_value
+from .models import District, Local
+
+
+class ExportTests(TestCase):
+    """Test the streaming CSV / XLSX list exports"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.client.login(username='testuser', password='password123')
+
+        metro = District.objects.create(dcode='MNL', name='Metro Manila')
+        bulacan = District.objects.create(dcode='BUL', name='Bulacan')
+        quezon = Local.objects.create(lcode='QC01', name='Quezon City', district=metro)
+        malolos = Local.objects.create(lcode='MAL01', name='Malolos', district=bulacan)
+
+        Building.objects.create(code='A', name='KAPILYA', local=quezon, year_covered=2024,
+                                current_total_cost=Decimal('1000.00'))
+        Building.objects.create(code='B', name='PASTORAL', local=malolos, year_covered=2023,
+                                current_total_cost=Decimal('500.00'))
+
+    def read_csv(self, response):
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content).decode()
+        return list(csv.reader(io.StringIO(content)))
+
+    def test_csv_streams_all_rows(self):
+        response = self.client.get(reverse('gusali:building_export'))
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('buildings.csv', response['Content-Disposition'])
+
+        rows = self.read_csv(response)
+        self.assertEqual(rows[0][:2], ['Code', 'Name'])
+        self.assertEqual(sorted(row[1] for row in rows[1:]), ['KAPILYA', 'PASTORAL'])
+
+    def test_csv_honours_list_filters(self):
+        response = self.client.get(reverse('gusali:building_export'), {'district': 'BUL', 'year': '2023'})
+        rows = self.read_csv(response)
+        self.assertEqual([row[1] for row in rows[1:]], ['PASTORAL'])
+
+    def test_xlsx(self):
+        response = self.client.get(reverse('gusali:building_export'), {'q': 'kapilya', 'format': 'xlsx'})
+        self.assertIn('buildings.xlsx', response['Content-Disposition'])
+
+        workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+        rows = list(workbook.active.values)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][1], 'KAPILYA')
+        self.assertEqual(rows[1][-2], 1000)
+
+    def test_item_category_and_worker_filters(self):
+        Item.objects.create(item_name='Chair', location='Kapilya', year_reported=2024)
+        Item.objects.create(item_name='Desk', location='Opisina', year_reported=2024)
+        rows = self.read_csv(self.client.get(reverse('kagamitan:item_export'), {'category': 'Kapilya'}))
+        self.assertEqual([row[7] for row in rows[1:]], ['Chair'])
+
+        Worker.objects.create(first_name='Juan', last_name='Cruz', category='VW')
+        Worker.objects.create(first_name='Pedro', last_name='Santos', category='VW')
+        rows = self.read_csv(self.client.get(reverse('admin_core:worker_export'), {'q': 'santos'}))
+        self.assertEqual([row[1] for row in rows[1:]], ['Santos'])
+
+    def test_formula_cells_are_escaped(self):
+        self.assertEqual(clean_value('=HYPERLINK("x")'), '\'=HYPERLINK("x")')
+        self.assertEqual(clean_value('KAPILYA'), 'KAPILYA')
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(reverse('lupa:land_export'))
+        self.assertEqual(response.status_code, 302)
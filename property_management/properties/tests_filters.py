@@ -0,0 +1,76 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from gusali.models import Building
+from vehicles.models import Vehicle
+
+from .filters import AssetFilter
+from .models import District, Local
+
+
+BUILDING_FIELDS = ('name', 'lcode', 'dcode')
+
+
+class AssetFilterTests(TestCase):
+    """Test the shared list filter backend"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.client.login(username='testuser', password='password123')
+
+        metro = District.objects.create(dcode='MNL', name='Metro Manila')
+        bulacan = District.objects.create(dcode='BUL', name='Bulacan')
+        self.quezon = Local.objects.create(lcode='QC01', name='Quezon City', district=metro)
+        self.malolos = Local.objects.create(lcode='MAL01', name='Malolos', district=bulacan)
+
+        self.kapilya = Building.objects.create(code='A', name='KAPILYA', local=self.quezon, year_covered=2024)
+        self.pastoral = Building.objects.create(code='B', name='PASTORAL', local=self.malolos, year_covered=2023)
+        # Imported row with codes but no linked local
+        self.orphan = Building.objects.create(code='D', name='GUARD HOUSE', dcode='BUL', lcode='MAL02')
+
+    def filtered(self, query, **kwargs):
+        asset_filter = AssetFilter(
+            QueryDict(query), BUILDING_FIELDS, code_field='code', year_field='year_covered', **kwargs
+        )
+        return set(asset_filter.apply(Building.objects.all()))
+
+    def test_search_matches_location(self):
+        self.assertEqual(self.filtered('q=quezon'), {self.kapilya})
+        self.assertEqual(self.filtered('q=bul'), {self.pastoral, self.orphan})
+        self.assertEqual(self.filtered('q=guard'), {self.orphan})
+
+    def test_district_code_or_name(self):
+        # "BUL" is a district code, so names containing "bul" are not matched
+        self.assertEqual(self.filtered('district=bul'), {self.pastoral, self.orphan})
+        self.assertEqual(self.filtered('district=manila'), {self.kapilya})
+
+    def test_local_code_or_name(self):
+        self.assertEqual(self.filtered('local=mal02'), {self.orphan})
+        self.assertEqual(self.filtered('local=malol'), {self.pastoral})
+
+    def test_code_and_year(self):
+        self.assertEqual(self.filtered('code=A'), {self.kapilya})
+        self.assertEqual(self.filtered('year=2023'), {self.pastoral})
+        self.assertEqual(self.filtered('year=abc'), {self.kapilya, self.pastoral, self.orphan})
+
+    def test_single_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.filtered('q=a&district=bul&local=malol&code=B&year=2023')
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_list_views(self):
+        Vehicle.objects.create(item_name='Service Van', plate_number='ABC 123', local=self.quezon)
+
+        response = self.client.get(reverse('gusali:building_list'), {'district': 'MNL'})
+        self.assertEqual(response.context['total_buildings'], 1)
+        self.assertEqual(response.context['current_district_name'], 'Metro Manila')
+
+        response = self.client.get(reverse('vehicles:vehicle_list'), {'q': 'abc'})
+        self.assertEqual([v.item_name for v in response.context['vehicles']], ['Service Van'])
+
+        response = self.client.get(reverse('plants:plant_list'), {'local': 'QC01'})
+        self.assertEqual(list(response.context['plants']), [])
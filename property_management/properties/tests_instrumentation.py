@@ -0,0 +1,108 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from gusali.models import Building
+from kagamitan.models import Item
+from plants.models import Plant
+from vehicles.models import Vehicle
+
+from .instrumentation import QueryBudgetMixin, request_stats
+from .models import District, HousingUnit, HousingUnitInventory, ItemTransfer, Local, Pamayanan
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Test the busiest pages stay within their query budgets"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.client.login(username='testuser', password='password123')
+
+        # Several rows of everything, so a per-row query breaks the budget
+        for i in range(5):
+            district = District.objects.create(dcode=f'D{i}', name=f'District {i}')
+            local = Local.objects.create(lcode=f'L{i}', name=f'Local {i}', district=district)
+            Building.objects.create(code='A', name=f'KAPILYA {i}', local=local, year_covered=2024,
+                                    current_total_cost=Decimal('1000.00'))
+            Item.objects.create(item_name=f'Chair {i}', local=local, year_reported=2024)
+            Plant.objects.create(name=f'Mango {i}', local=local)
+            Vehicle.objects.create(item_name=f'Van {i}', local=local)
+
+            pamayanan = Pamayanan.objects.create(name=f'Pamayanan {i}')
+            unit = HousingUnit.objects.create(pamayanan=pamayanan, housing_unit_name=f'Unit {i}',
+                                              occupant_name='Juan', date_reported=date(2024, 1, 1))
+            other = HousingUnit.objects.create(pamayanan=pamayanan, housing_unit_name=f'Unit {i}B',
+                                               date_reported=date(2024, 1, 1))
+            item = HousingUnitInventory.objects.create(housing_unit=unit, item_name=f'Table {i}',
+                                                       date_acquired=date(2024, 1, 1))
+            ItemTransfer.objects.create(inventory_item=item, from_unit=unit, to_unit=other,
+                                        transferred_by='Juan', receiver_name='Pedro')
+
+    def test_list_pages(self):
+        for name in [
+            'properties:dashboard', 'properties:property_list', 'properties:inventory_list',
+            'properties:transfer_list', 'properties:transfer_history', 'properties:district_list',
+            'properties:local_list', 'properties:national_summary', 'gusali:building_list',
+            'gusali:building_report', 'kagamitan:item_list', 'kagamitan:item_create',
+            'plants:plant_list', 'vehicles:vehicle_list',
+        ]:
+            with self.subTest(name):
+                self.assertQueryBudget(reverse(name))
+
+    def test_detail_pages(self):
+        self.assertQueryBudget(reverse('properties:district_detail', args=['D0']))
+        self.assertQueryBudget(reverse('properties:local_summary', args=['L0']))
+        self.assertQueryBudget(reverse('properties:building_map', args=[Pamayanan.objects.first().pk]))
+
+    def test_helper_fails_over_budget(self):
+        with self.assertRaises(AssertionError):
+            self.assertQueryBudget(reverse('gusali:building_list'), budget=1)
+
+
+class RequestMetricsMiddlewareTests(TestCase):
+    """Test per-request query / timing instrumentation"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.client.login(username='testuser', password='password123')
+        request_stats.reset()
+
+    def test_staff_get_timing_headers(self):
+        url = reverse('gusali:building_list')
+        self.assertNotIn('X-Query-Count', self.client.get(url))
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(url)
+        self.assertGreater(int(response['X-Query-Count']), 0)
+        self.assertIn('db;dur=', response['Server-Timing'])
+
+    def test_render_time_reported_separately(self):
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(reverse('gusali:building_list'))
+
+        timings = dict(entry.split(';')[:2] for entry in response['Server-Timing'].split(', '))
+        render_ms = float(timings['render'].removeprefix('dur='))
+        self.assertGreater(render_ms, 0)
+        self.assertLess(render_ms, float(timings['total'].removeprefix('dur=')))
+        self.assertGreater(request_stats.summary()['gusali:building_list']['render_ms_p50'], 0)
+
+    def test_requests_summarised_per_view(self):
+        self.client.get(reverse('gusali:building_list'))
+        self.client.get(reverse('gusali:building_list'))
+
+        summary = request_stats.summary()['gusali:building_list']
+        self.assertEqual(summary['requests'], 2)
+        self.assertGreater(summary['queries_max'], 0)
+        self.assertEqual(summary['over_budget'], 0)
+
+    @override_settings(QUERY_BUDGETS={'gusali:building_list': 1})
+    def test_over_budget_logged(self):
+        with self.assertLogs('properties.metrics', 'WARNING') as logs:
+            self.client.get(reverse('gusali:building_list'))
+        self.assertIn('gusali:building_list ran', logs.output[0])
+        self.assertEqual(request_stats.summary()['gusali:building_list']['over_budget'], 1)
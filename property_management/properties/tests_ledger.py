@@ -0,0 +1,123 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core import serializers
+from django.db import DatabaseError, transaction
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from . import ledger
+from .models import HousingUnit, HousingUnitInventory, InventoryMovement, InventorySnapshotLine, Pamayanan
+from .transfers import transfer_items
+
+
+def add_unit(pamayanan, number):
+    return HousingUnit.objects.create(pamayanan=pamayanan, unit_number=number, housing_unit_name=f'Unit {number}',
+                                      occupant_name='Juan Cruz', date_reported=date(2024, 1, 1))
+
+
+def entries(**filters):
+    return list(InventoryMovement.objects.filter(**filters).values_list('housing_unit_id', 'item_name', 'delta', 'kind'))
+
+
+class InventoryLedgerTests(TestCase):
+    """Test the inventory movement ledger and its snapshots"""
+
+    def setUp(self):
+        pamayanan = Pamayanan.objects.create(name='Central', address='Quezon City')
+        self.unit1 = add_unit(pamayanan, '101')
+        self.unit2 = add_unit(pamayanan, '102')
+
+    def add_item(self, unit, name, quantity):
+        return HousingUnitInventory.objects.create(housing_unit=unit, item_name=name, quantity=quantity,
+                                                   date_acquired=date(2024, 1, 1))
+
+    def test_saves_and_deletes_are_booked(self):
+        chairs = self.add_item(self.unit1, 'Chair', 5)
+        chairs.quantity = 3
+        chairs.save()
+        chairs.housing_unit = self.unit2
+        chairs.save()
+        chairs.delete()
+        with ledger.recording('import'):
+            self.add_item(self.unit1, 'Bed', 1)
+
+        u1, u2 = self.unit1.pk, self.unit2.pk
+        self.assertEqual(entries(), [
+            (u1, 'Chair', 5, 'added'),
+            (u1, 'Chair', -2, 'edit'),
+            (u1, 'Chair', -3, 'edit'),
+            (u2, 'Chair', 3, 'edit'),
+            (u2, 'Chair', -3, 'removed'),
+            (u1, 'Bed', 1, 'import'),
+        ])
+
+    def test_fixture_loads_are_not_booked(self):
+        chairs = HousingUnitInventory(pk=9001, housing_unit=self.unit1, item_name='Chair', quantity=5,
+                                      date_acquired=date(2024, 1, 1), created_at=timezone.now(),
+                                      updated_at=timezone.now())
+        for obj in serializers.deserialize('json', serializers.serialize('json', [chairs])):
+            obj.save()
+
+        self.assertTrue(HousingUnitInventory.objects.filter(pk=9001).exists())
+        self.assertEqual(entries(), [])
+
+    def test_transfers_are_booked(self):
+        chairs = self.add_item(self.unit1, 'Chair', 5)
+        transfer, = transfer_items([(chairs.pk, 2)], to_unit_id=self.unit2.pk, transferred_by='Juan',
+                                   receiver_name='Pedro', reason='Reassignment')
+
+        received = HousingUnitInventory.objects.get(housing_unit=self.unit2)
+        self.assertEqual(entries(transfer=transfer), [
+            (self.unit1.pk, 'Chair', -2, 'transfer_out'),
+            (self.unit2.pk, 'Chair', 2, 'transfer_in'),
+        ])
+        self.assertEqual([m.inventory_item_id for m in ledger.item_trail(chairs.pk)], [chairs.pk, chairs.pk, received.pk])
+
+    def test_point_in_time_from_snapshots(self):
+        now = timezone.now()
+        chairs = self.add_item(self.unit1, 'Chair', 0)
+        ledger.record([
+            ledger.entry(chairs.pk, self.unit1.pk, 'Chair', 5, 'opening', occurred_at=now - timedelta(days=3)),
+            ledger.entry(chairs.pk, self.unit1.pk, 'Chair', -2, 'edit', occurred_at=now - timedelta(days=2)),
+        ])
+        first, created = ledger.take_snapshot()
+        self.assertTrue(created)
+        ledger.record([ledger.entry(chairs.pk, self.unit1.pk, 'Chair', 1, 'edit')])
+
+        self.assertEqual(ledger.unit_contents(self.unit1.pk, now - timedelta(days=4)), [])
+        self.assertEqual(ledger.unit_contents(self.unit1.pk, now - timedelta(days=2, hours=12)), [(chairs.pk, 'Chair', 5)])
+        # Snapshot (3) plus the entry after it
+        self.assertEqual(ledger.unit_contents(self.unit1.pk), [(chairs.pk, 'Chair', 4)])
+        self.assertEqual(ledger.unit_contents(self.unit2.pk), [])
+
+        # Each snapshot builds on the previous one
+        second, created = ledger.take_snapshot()
+        self.assertTrue(created)
+        self.assertEqual(list(second.lines.values_list('item_name', 'quantity')), [('Chair', 4)])
+        self.assertEqual(ledger.take_snapshot(), (second, False))
+        self.assertEqual(ledger.prune_snapshots(1), 1)
+        self.assertFalse(InventorySnapshotLine.objects.filter(snapshot=first).exists())
+
+    def test_ledger_is_append_only(self):
+        self.add_item(self.unit1, 'Chair', 5)
+        movement = InventoryMovement.objects.get()
+        movement.delta = 50
+        with self.assertRaises(DatabaseError), transaction.atomic():
+            movement.save()
+        with self.assertRaises(DatabaseError), transaction.atomic():
+            movement.delete()
+
+    def test_ledger_page(self):
+        User.objects.create_user(username='testuser', password='password123')
+        self.client.login(username='testuser', password='password123')
+        chairs = self.add_item(self.unit1, 'Chair', 5)
+
+        url = reverse('properties:unit_inventory_ledger', args=[self.unit1.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.context['contents'], [(chairs.pk, 'Chair', 5)])
+        self.assertEqual(len(response.context['movements']), 1)
+
+        response = self.client.get(url, {'date': '2020-01-01'})
+        self.assertEqual(response.context['contents'], [])
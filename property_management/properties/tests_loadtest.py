@@ -0,0 +1,56 @@
+import io
+import zipfile
+
+from django.test import SimpleTestCase
+
+from loadtest import report
+from loadtest.scenarios import next_page, unique_upload
+
+
+class LoadTestReportTests(SimpleTestCase):
+    """Test the load-test statistics and the helpers the journeys use"""
+
+    def test_percentiles_and_results(self):
+        self.assertEqual(report.percentile([10, 20, 30, 40, 50], 0.5), 30)
+        self.assertEqual(report.percentile([10, 20], 0.95), 19.5)
+        self.assertIsNone(report.percentile([], 0.5))
+
+        samples = report.Samples()
+        for ms in range(1, 101):
+            samples.request('buildings', 'search', float(ms), size=10)
+        samples.request('transfer', 'submit', 40.0, error='rejected')
+        samples.journey('buildings', 300.0)
+        samples.journey('transfer', 50.0, ok=False)
+
+        results = report.build_results(samples, 10.0, {'label': 'test'})
+        search = results['steps']['buildings: search']
+        self.assertEqual((search['count'], search['per_second'], search['bytes']), (100, 10.0, 1000))
+        self.assertEqual((search['p50_ms'], search['p99_ms']), (50.5, 99.0))
+        self.assertAlmostEqual(search['p95_ms'], 95.05, delta=0.1)
+        self.assertEqual(results['steps']['transfer: submit']['errors'], 1)
+        self.assertEqual(results['journeys']['transfer']['errors'], 1)
+        self.assertEqual(results['errors'], {'transfer: submit: rejected': 1})
+        self.assertEqual(results['totals']['count'], 101)
+
+        slower = report.build_results(samples, 20.0, {'label': 'slower'})
+        slower['steps']['buildings: search']['p95_ms'] = 190.2
+        self.assertIn('+100%', report.compare(results, slower))
+
+    def test_next_page_link(self):
+        page = '<a href="?first=1" class="btn">« First</a> <a href="?q=x&amp;after=abc" class="btn">Next ›</a>'
+        self.assertEqual(next_page(page), 'q=x&after=abc')
+        self.assertIsNone(next_page('<p>No more</p>'))
+
+    def test_unique_uploads(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr('xl/workbook.xml', '<workbook/>')
+        workbook = buffer.getvalue()
+
+        first, second = unique_upload('p7.xlsx', workbook), unique_upload('p7.xlsx', workbook)
+        self.assertNotEqual(first, second)
+        with zipfile.ZipFile(io.BytesIO(first)) as archive:
+            self.assertEqual(archive.read('xl/workbook.xml'), b'<workbook/>')
+
+        legacy = b'\xd0\xcf' * 1024
+        self.assertEqual(len(unique_upload('p7.xls', legacy)), len(legacy) + 512)
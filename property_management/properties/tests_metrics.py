@@ -0,0 +1,113 @@
+import json
+import os
+import subprocess
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from admin_core.models import SyncConflict, SyncRun
+from gusali.models import Building
+
+from .metrics import ARCHIVE_FILE, Counter, Gauge, Histogram, Registry, record_import
+from .models import District, ImportedFile, Local
+
+
+class MetricsEndpointTests(TestCase):
+    """Test the Prometheus /metrics endpoint"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password123')
+
+        metro = District.objects.create(dcode='MNL', name='Metro Manila')
+        quezon = Local.objects.create(lcode='QC01', name='Quezon City', district=metro)
+        Building.objects.create(code='A', name='KAPILYA', local=quezon, year_covered=2024,
+                                current_total_cost=Decimal('1000.00'))
+
+    def scrape(self, **extra):
+        response = self.client.get(reverse('metrics'), **extra)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        return response.content.decode()
+
+    @override_settings(METRICS_ALLOWED_IPS=[], METRICS_TOKEN='s3cret')
+    def test_access(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        self.scrape(HTTP_AUTHORIZATION='Bearer s3cret')
+
+        self.user.is_staff = True
+        self.user.save()
+        self.client.login(username='testuser', password='password123')
+        self.scrape()
+
+    def test_request_metrics_per_view(self):
+        self.client.login(username='testuser', password='password123')
+        self.client.get(reverse('gusali:building_list'))
+
+        text = self.scrape()
+        self.assertIn('# TYPE pm_http_request_duration_seconds histogram', text)
+        self.assertIn('pm_http_request_duration_seconds_bucket{view="gusali:building_list",le="+Inf"}', text)
+        self.assertIn('pm_http_request_queries_count{view="gusali:building_list"}', text)
+
+    def test_database_metrics(self):
+        ImportedFile.objects.create(filename='a.xls', file_hash='a', file_size=1, status='partial')
+        # Drop the sync run the import triggered
+        SyncRun.objects.all().delete()
+        started = timezone.now() - timedelta(minutes=5)
+        SyncRun.objects.create(started_at=started, finished_at=started + timedelta(seconds=30))
+        SyncConflict.objects.create(conflict_type='WORKER_IDENTITY', identity_hash='x',
+                                    existing_value='a', incoming_value='b')
+        record_import('gusali', 100, 2.0)
+
+        text = self.scrape()
+        self.assertIn('pm_imported_files{status="partial"} 1.0', text)
+        self.assertIn('pm_sync_run_duration_seconds_bucket{le="15.0"} 0.0', text)
+        self.assertIn('pm_sync_run_duration_seconds_bucket{le="60.0"} 1.0', text)
+        self.assertIn('pm_sync_last_run_duration_seconds 30.0', text)
+        self.assertIn('pm_sync_conflicts_open{conflict_type="WORKER_IDENTITY",severity="medium"} 1.0', text)
+        self.assertIn('pm_import_rows_per_second{importer="gusali"}', text)
+        self.assertIn('pm_background_jobs_running{job="summaries"} 0.0', text)
+
+
+class MultiProcessRegistryTests(TestCase):
+    """Test aggregation of metric files across worker processes"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.registry = Registry()
+        self.requests = Counter('requests_total', 'Requests.', ['view'], registry=self.registry)
+        self.busy = Gauge('busy', 'Busy workers.', registry=self.registry)
+        self.latency = Histogram('latency_seconds', 'Latency.', buckets=(0.1, 1), registry=self.registry)
+
+    def write_process_file(self, pid, values):
+        with open(os.path.join(self.directory.name, f'{pid}-other.json'), 'w') as f:
+            json.dump(values, f)
+
+    def dead_pid(self):
+        process = subprocess.Popen(['true'])
+        process.wait()
+        return process.pid
+
+    def test_counters_summed_gauges_from_live_processes(self):
+        with override_settings(METRICS_DIR=self.directory.name):
+            self.requests.inc(view='a')
+            self.busy.set(1)
+            self.latency.observe(0.5)
+            self.write_process_file(os.getppid(), {'requests_total': [[['a'], 2]], 'busy': [[[], 1]]})
+            self.write_process_file(self.dead_pid(), {
+                'requests_total': [[['a'], 4]], 'busy': [[[], 1]], 'latency_seconds': [[[], [1, 0, 0, 0.05]]],
+            })
+
+            merged = self.registry.collect()
+            self.assertEqual(merged['requests_total'][('a',)], 7)
+            self.assertEqual(merged['busy'][()], 2)
+            self.assertEqual(merged['latency_seconds'][()], [1, 1, 0, 0.55])
+
+            # The dead process was folded into the archive; totals are unchanged
+            self.assertIn(ARCHIVE_FILE, os.listdir(self.directory.name))
+            self.assertEqual(self.registry.collect()['requests_total'][('a',)], 7)
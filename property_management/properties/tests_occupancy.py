@@ -0,0 +1,129 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .models import HousingUnit, Pamayanan, PamayananOccupancy
+from .occupancy import rebuild_occupancy, with_occupancy
+
+
+class OccupancyTestMixin:
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.client.login(username='testuser', password='password123')
+
+        self.central = Pamayanan.objects.create(name='Central', address='Quezon City')
+        self.north = Pamayanan.objects.create(name='North', address='Bulacan')
+
+    def add_unit(self, pamayanan, number, occupant='', department='', floor=''):
+        return HousingUnit.objects.create(
+            pamayanan=pamayanan,
+            unit_number=number,
+            occupant_name=occupant,
+            department=department,
+            floor=floor,
+            date_reported=date(2024, 1, 1),
+        )
+
+
+class OccupancyRollupTests(OccupancyTestMixin, TestCase):
+    """Test PamayananOccupancy rollups stay in sync with unit writes"""
+
+    def test_rollup_refreshed_on_save_and_delete(self):
+        self.add_unit(self.central, '101', 'Juan Cruz', 'Finance')
+        unit = self.add_unit(self.central, '102', 'Pedro Santos', 'Finance')
+        self.add_unit(self.central, '103')
+
+        rollup = PamayananOccupancy.objects.get(pamayanan=self.central)
+        self.assertEqual(rollup.unit_count, 3)
+        self.assertEqual(rollup.occupant_count, 2)
+        self.assertEqual(rollup.department_count, 1)
+
+        unit.delete()
+        rollup.refresh_from_db()
+        self.assertEqual(rollup.unit_count, 2)
+        self.assertEqual(rollup.occupant_count, 1)
+
+    def test_deleting_pamayanan_with_units(self):
+        self.add_unit(self.central, '101', 'Juan Cruz')
+        self.add_unit(self.central, '102')
+        self.add_unit(self.north, '201', 'Pedro Santos')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.central.delete()
+
+        self.assertFalse(Pamayanan.objects.filter(name='Central').exists())
+        self.assertEqual(list(PamayananOccupancy.objects.values_list('pamayanan__name', 'unit_count')), [('North', 1)])
+
+    def test_unit_moved_refreshes_both(self):
+        unit = self.add_unit(self.central, '101', 'Juan Cruz')
+        unit.pamayanan = self.north
+        unit.save()
+
+        self.assertEqual(PamayananOccupancy.objects.get(pamayanan=self.central).unit_count, 0)
+        self.assertEqual(PamayananOccupancy.objects.get(pamayanan=self.north).unit_count, 1)
+
+    def test_rebuild_matches_live_annotation(self):
+        self.add_unit(self.central, '101', 'Juan Cruz', 'Finance')
+        self.add_unit(self.north, '201', 'Pedro Santos', 'Admin')
+        PamayananOccupancy.objects.all().delete()
+
+        self.assertEqual(rebuild_occupancy(), 2)
+
+        with override_settings(OCCUPANCY_ROLLUPS=False):
+            live = {p.pk: (p.unit_count, p.occupant_count, p.department_count)
+                    for p in with_occupancy(Pamayanan.objects.all())}
+        cached = {p.pk: (p.unit_count, p.occupant_count, p.department_count)
+                  for p in with_occupancy(Pamayanan.objects.all())}
+        self.assertEqual(live, cached)
+
+
+class OccupancyViewTests(OccupancyTestMixin, TestCase):
+    """Test occupancy pages render in constant query count"""
+
+    def query_count(self, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx)
+
+    def test_property_list_constant_queries(self):
+        url = reverse('properties:property_list')
+        self.add_unit(self.central, '101', 'Juan Cruz', 'Finance')
+        baseline = self.query_count(url)
+
+        for i in range(5):
+            pam = Pamayanan.objects.create(name=f'Site {i}', address='Manila')
+            self.add_unit(pam, '1', 'Jose Reyes', 'Admin')
+        self.assertEqual(self.query_count(url), baseline)
+
+    def test_building_occupants(self):
+        self.add_unit(self.central, '101', 'Juan Cruz', 'Finance')
+        self.add_unit(self.central, '102', 'Pedro Santos', 'Admin')
+        self.add_unit(self.central, '103', 'Maria Reyes', 'Admin')
+
+        url = reverse('properties:building_occupants', args=[self.central.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.context['total_occupants'], 3)
+        self.assertEqual(response.context['total_departments'], 2)
+        self.assertEqual(list(response.context['departments']), ['Admin', 'Finance'])
+
+        response = self.client.get(url, {'dept': 'Admin'})
+        self.assertEqual(len(response.context['housing_units']), 2)
+
+    def test_building_map_groups_floors(self):
+        self.add_unit(self.central, '101', 'Juan Cruz', floor='1')
+        self.add_unit(self.central, '201', 'Pedro Santos', floor='2')
+        self.add_unit(self.central, '202', floor='2')
+        self.add_unit(self.central, 'G1')
+
+        url = reverse('properties:building_map', args=[self.central.pk])
+        floor_data = self.client.get(url).context['floor_data']
+        self.assertEqual(
+            [(floor, len(units)) for floor, units in floor_data],
+            [('Other', 1), ('2', 2), ('1', 1)],
+        )
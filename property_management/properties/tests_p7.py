@@ -0,0 +1,104 @@
+import io
+import os
+import tempfile
+import zipfile
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from openpyxl import load_workbook
+
+from gusali.models import Building, BuildingYearlyRecord
+from kagamitan.models import Item
+from lupa.models import Land
+from plants.models import Plant
+from vehicles.models import Vehicle
+
+from .models import District, Local
+from .p7 import fetch_payloads, generate_p7_reports, select_locals
+
+
+@override_settings(P7_REPORT_WORKERS=0)
+class P7ReportTests(TestCase):
+    """Test bulk P7 workbook generation"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password123', is_staff=True)
+        self.client.login(username='testuser', password='password123')
+
+        batangas = District.objects.create(dcode='1009', name='Batangas')
+        bulacan = District.objects.create(dcode='BUL', name='Bulacan')
+        self.balayan = Local.objects.create(lcode='003', name='Balayan', district=batangas)
+        self.lemery = Local.objects.create(lcode='004', name='Lemery', district=batangas)
+        self.malolos = Local.objects.create(lcode='MAL01', name='Malolos', district=bulacan)
+
+        kapilya = Building.objects.create(code='A', name='KAPILYA', local=self.balayan, year_covered=2024,
+                                          original_cost=Decimal('1000.00'), current_total_cost=Decimal('1000.00'))
+        BuildingYearlyRecord.objects.create(building=kapilya, year=2024, cost_last_year=Decimal('1000.00'),
+                                            renovation_cost=Decimal('200.00'))
+        Item.objects.create(item_name='Benches', location='Kapilya', local=self.balayan, year_reported=2024,
+                            quantity=2, total_price=Decimal('3210.60'))
+        Item.objects.create(item_name='Printer', location='Kalihiman', local=self.balayan, year_reported=2024,
+                            is_new=True, total_price=Decimal('15000.00'), reference_number='42180')
+        Land.objects.create(location='Calzada, Balayan, Batangas', local=self.balayan, lot_area=Decimal('2000'),
+                            market_value=Decimal('16000'))
+        Plant.objects.create(name='Mangga', variety='Indian', local=self.balayan, fruit_bearing=1,
+                             total_quantity=1, total_value=Decimal('150'))
+        Vehicle.objects.create(item_name='Van', brand='Mitsubishi', model='L300', plate_number='MBT 7323',
+                               local=self.balayan, date_acquired=date(2024, 12, 25),
+                               acquisition_cost=Decimal('1200000'))
+
+    def test_fixed_query_count(self):
+        with self.assertNumQueries(7):
+            fetch_payloads([self.balayan.pk], 2024)
+        with self.assertNumQueries(7):
+            payloads = fetch_payloads([self.balayan.pk, self.lemery.pk, self.malolos.pk], 2024)
+        self.assertEqual([p['local']['name'] for p in payloads], ['Balayan', 'Lemery', 'Malolos'])
+
+    def test_workbook_layout(self):
+        [(path, content)] = generate_p7_reports([self.balayan.pk], 2024)
+        self.assertEqual(path, 'Batangas/P7 2024 003 Balayan.xlsx')
+
+        workbook = load_workbook(io.BytesIO(content))
+        self.assertEqual(workbook.sheetnames, [
+            'Page1', 'Page 2', 'Page 3', 'Page 4', 'Page 5A - Lupa', 'Page 5B - Pananim', 'Page 5C - Sasakyan',
+        ])
+        page1 = workbook['Page1']
+        self.assertEqual((page1['G4'].value, page1['B7'].value, page1['L7'].value), (2024, 'KAPILYA', 200))
+        self.assertEqual(page1['S7'].value, 1200)
+        self.assertEqual(workbook['Page 2']['E6'].value, 'Benches')
+        self.assertEqual(workbook['Page 3']['N8'].value, '42180')
+        self.assertEqual(workbook['Page 4']['B14'].value, 18210.6)
+        self.assertEqual(workbook['Page 5A - Lupa']['B12'].value, 'Calzada, Balayan, Batangas')
+        self.assertEqual(workbook['Page 5B - Pananim']['A12'].value, 'Mangga (Indian)')
+        # Bought this year: "Nadagdag" block
+        self.assertEqual(workbook['Page 5C - Sasakyan']['N19'].value, 'MBT 7323')
+
+    def test_view_streams_zip_per_district(self):
+        response = self.client.get(reverse('properties:p7_reports'), {'district': '1009', 'year': '2024'})
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(archive.namelist(), [
+            'Batangas/P7 2024 003 Balayan.xlsx', 'Batangas/P7 2024 004 Lemery.xlsx',
+        ])
+
+    def test_view_form(self):
+        response = self.client.get(reverse('properties:p7_reports'))
+        self.assertContains(response, 'Bulacan')
+        # Staff only
+        self.user.is_staff = False
+        self.user.save()
+        response = self.client.get(reverse('properties:p7_reports'), {'all': '1', 'year': '2024'})
+        self.assertEqual(response.status_code, 302)
+
+    def test_command_with_process_pool(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'p7.zip')
+            call_command('generate_p7_reports', output, year=2024, all=True, workers=2, batch_size=2,
+                         stdout=io.StringIO())
+            names = zipfile.ZipFile(output).namelist()
+        self.assertEqual(len(names), len(select_locals()))
+        self.assertIn('Bulacan/P7 2024 MAL01 Malolos.xlsx', names)
@@ -0,0 +1,132 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from lupa.models import Land
+
+from .models import District, HousingUnit, HousingUnitInventory, Local, Pamayanan
+from .pagination import encode_cursor, get_ordering_keys, keyset_paginate
+from .stats import dashboard_stats
+
+
+class KeysetPaginationTests(TestCase):
+    """Test keyset paginator over a nullable, duplicated ordering"""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        district = District.objects.create(dcode='D01', name='Metro')
+        self.locals = [
+            Local.objects.create(lcode=f'L0{i}', name=f'Local {i}', district=district)
+            for i in range(2)
+        ]
+        # Ordering is (local, location, pk): duplicate locations and NULL locals
+        for i in range(7):
+            local = self.locals[i % 2] if i < 5 else None
+            Land.objects.create(local=local, location=f'Lot {i // 3}')
+
+        self.expected = list(
+            Land.objects.order_by('local_id', 'location', 'pk').values_list('pk', flat=True)
+        )
+
+    def page(self, **params):
+        return keyset_paginate(self.factory.get('/', params), Land.objects.all(), per_page=3)
+
+    def test_ordering_keys(self):
+        keys = get_ordering_keys(Land.objects.all())
+        self.assertEqual(
+            keys,
+            [('local_id', False, True), ('location', False, False), ('pk', False, False)],
+        )
+
+    def test_walk_forward_and_back(self):
+        seen = []
+        pages = []
+        page = self.page()
+        while True:
+            pages.append(page)
+            seen.extend(land.pk for land in page)
+            if not page.has_next:
+                break
+            page = self.page(**dict(pair.split('=') for pair in page.next_query.split('&')))
+
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(len(pages), 3)
+        self.assertFalse(pages[0].has_previous)
+
+        previous = self.page(before=pages[-1].previous_query.split('=', 1)[1])
+        self.assertEqual([land.pk for land in previous], [land.pk for land in pages[1]])
+
+    def test_single_query_without_offset_or_count(self):
+        cursor = encode_cursor([self.locals[0].pk, 'Lot 0', self.expected[0]])
+        with CaptureQueriesContext(connection) as ctx:
+            list(self.page(after=cursor))
+        self.assertEqual(len(ctx), 1)
+        sql = ctx[0]['sql'].upper()
+        self.assertNotIn('OFFSET', sql)
+        self.assertNotIn('COUNT(', sql)
+
+    def test_filters_preserved(self):
+        page = keyset_paginate(
+            self.factory.get('/', {'q': 'lot', 'district': 'D01'}),
+            Land.objects.all(),
+            per_page=3,
+        )
+        self.assertIn('q=lot', page.next_query)
+        self.assertIn('district=D01', page.next_query)
+        self.assertIn('after=', page.next_query)
+
+    def test_malformed_cursor_starts_over(self):
+        self.assertEqual(
+            [land.pk for land in self.page(after='not-a-cursor')],
+            self.expected[:3],
+        )
+        bad_types = encode_cursor(['x', 'Lot 0', 'y'])
+        self.assertEqual(
+            [land.pk for land in self.page(after=bad_types)],
+            self.expected[:3],
+        )
+
+
+class KeysetListViewTests(TestCase):
+    """Test list views render keyset pages"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.client.login(username='testuser', password='password123')
+
+    def test_list_views_load(self):
+        for name in (
+            'properties:inventory_list',
+            'properties:transfer_list',
+            'properties:transfer_history',
+            'gusali:building_list',
+            'plants:plant_list',
+            'vehicles:vehicle_list',
+            'admin_core:worker_list',
+            'admin_core:housing_assignment_list',
+            'admin_core:conflict_list',
+        ):
+            with self.subTest(name=name):
+                response = self.client.get(reverse(name))
+                self.assertEqual(response.status_code, 200)
+
+    def test_inventory_list_skips_full_count(self):
+        pamayanan = Pamayanan.objects.create(name='Central', address='Quezon City')
+        for number in ('101', '102'):
+            unit = HousingUnit.objects.create(pamayanan=pamayanan, unit_number=number, housing_unit_name=number,
+                                              date_reported=date(2024, 1, 1))
+            HousingUnitInventory.objects.create(housing_unit=unit, item_name='Chair', quantity=1,
+                                                date_acquired=date(2024, 1, 1))
+        dashboard_stats.get()
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('properties:inventory_list'))
+        self.assertEqual(response.context['total_items'], 2)
+        self.assertFalse([q for q in ctx if 'COUNT(' in q['sql'].upper() and 'housingunitinventory' in q['sql']])
+
+        response = self.client.get(reverse('properties:inventory_list'), {'housing_unit': unit.pk})
+        self.assertEqual(response.context['total_items'], 1)
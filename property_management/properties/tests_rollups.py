@@ -0,0 +1,127 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from gusali.models import Building
+from kagamitan.models import Item
+from vehicles.models import Vehicle
+
+from .models import District, Local, LocalAssetRollup, LocalProperty
+from .rollups import deferred_rollups, rebuild_rollups, rollup_totals
+
+
+class LocalAssetRollupTests(TestCase):
+    """Test LocalAssetRollup rows stay in sync with asset writes"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.client.login(username='testuser', password='password123')
+
+        self.district = District.objects.create(dcode='MNL', name='Metro Manila')
+        self.quezon = Local.objects.create(lcode='QC01', name='Quezon City', district=self.district)
+        self.pasig = Local.objects.create(lcode='PSG01', name='Pasig', district=self.district)
+        self.this_year = timezone.localtime().year
+
+    def rollup(self, local, year):
+        return LocalAssetRollup.objects.get(local=local, year=year)
+
+    def test_refreshed_on_save_and_delete(self):
+        Building.objects.create(code='A', name='KAPILYA', local=self.quezon, year_covered=2024,
+                                current_total_cost=Decimal('1000.00'))
+        building = Building.objects.create(code='B', name='PASTORAL', local=self.quezon, year_covered=2024,
+                                           current_total_cost=Decimal('500.00'))
+        Item.objects.create(item_name='Chair', local=self.quezon, year_reported=2024, total_price=Decimal('25.00'))
+
+        rollup = self.rollup(self.quezon, 2024)
+        self.assertEqual(rollup.building_count, 2)
+        self.assertEqual(rollup.building_total, Decimal('1500.00'))
+        self.assertEqual(rollup.item_total, Decimal('25.00'))
+
+        building.delete()
+        rollup.refresh_from_db()
+        self.assertEqual(rollup.building_count, 1)
+        self.assertEqual(rollup.building_total, Decimal('1000.00'))
+
+    def test_deleting_district_or_local_with_assets(self):
+        Building.objects.create(code='A', name='KAPILYA', local=self.quezon, year_covered=2024,
+                                current_total_cost=Decimal('1000.00'))
+        Item.objects.create(item_name='Chair', local=self.pasig, year_reported=2024, total_price=Decimal('25.00'))
+        other = District.objects.create(dcode='CEB', name='Cebu')
+        cebu = Local.objects.create(lcode='CEB01', name='Cebu City', district=other)
+        Item.objects.create(item_name='Table', local=cebu, year_reported=2024, total_price=Decimal('40.00'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.quezon.delete()
+        self.assertFalse(LocalAssetRollup.objects.filter(local_id=self.quezon.pk).exists())
+        self.assertEqual(self.rollup(self.pasig, 2024).item_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.district.delete()
+        self.assertFalse(Local.objects.filter(pk=self.pasig.pk).exists())
+        self.assertEqual(list(LocalAssetRollup.objects.values_list('local_id', flat=True)), [cebu.pk])
+
+    def test_moved_asset_refreshes_both_cells(self):
+        building = Building.objects.create(code='A', name='KAPILYA', local=self.quezon, year_covered=2023,
+                                           current_total_cost=Decimal('1000.00'))
+        building.local = self.pasig
+        building.year_covered = 2024
+        building.save()
+
+        self.assertEqual(self.rollup(self.quezon, 2023).building_count, 0)
+        self.assertEqual(self.rollup(self.pasig, 2024).building_count, 1)
+
+    def test_undated_assets_use_recorded_year(self):
+        Vehicle.objects.create(item_name='Van', local=self.quezon, acquisition_cost=Decimal('900.00'))
+        LocalProperty.objects.create(local=self.quezon, name='Hall', current_value=Decimal('100.00'))
+
+        rollup = self.rollup(self.quezon, self.this_year)
+        self.assertEqual(rollup.vehicle_total, Decimal('900.00'))
+        self.assertEqual(rollup.property_count, 1)
+
+    def test_deferred_refreshes_each_cell_once(self):
+        with CaptureQueriesContext(connection) as ctx:
+            with deferred_rollups():
+                for i in range(5):
+                    Item.objects.create(item_name=f'Chair {i}', local=self.quezon, year_reported=2024,
+                                        total_price=Decimal('10.00'))
+                self.assertFalse(LocalAssetRollup.objects.exists())
+
+        rollup_queries = [q for q in ctx.captured_queries if 'properties_localassetrollup' in q['sql']]
+        self.assertLessEqual(len(rollup_queries), 4)
+        self.assertEqual(self.rollup(self.quezon, 2024).item_total, Decimal('50.00'))
+
+    def test_rebuild_matches_hooks(self):
+        Building.objects.create(code='A', name='KAPILYA', local=self.quezon, year_covered=2024,
+                                current_total_cost=Decimal('1000.00'))
+        Item.objects.create(item_name='Chair', local=self.pasig, year_reported=2023, total_price=Decimal('25.00'))
+        Vehicle.objects.create(item_name='Van', local=self.pasig, acquisition_cost=Decimal('900.00'))
+        expected = rollup_totals(LocalAssetRollup.objects.all())
+
+        LocalAssetRollup.objects.all().delete()
+        self.assertEqual(rebuild_rollups(), 3)
+        self.assertEqual(rollup_totals(LocalAssetRollup.objects.all()), expected)
+        self.assertEqual(expected['grand_total'], Decimal('1925.00'))
+
+    def test_summary_views(self):
+        Building.objects.create(code='A', name='KAPILYA', local=self.quezon, year_covered=2024,
+                                current_total_cost=Decimal('1000.00'))
+        Item.objects.create(item_name='Chair', local=self.quezon, year_reported=2023, total_price=Decimal('25.00'))
+        Item.objects.create(item_name='Table', local=self.pasig, year_reported=2023, total_price=Decimal('75.00'))
+
+        response = self.client.get(reverse('properties:local_summary', args=['QC01']))
+        self.assertEqual(response.context['total_local_cost'], Decimal('1025.00'))
+        self.assertEqual(response.context['years'], [2024, 2023])
+
+        response = self.client.get(reverse('properties:local_summary', args=['QC01']), {'year': '2023'})
+        self.assertEqual(response.context['gusali_cost'], 0)
+        self.assertEqual(response.context['kagamitan_cost'], Decimal('25.00'))
+
+        response = self.client.get(reverse('properties:district_detail', args=['MNL']))
+        self.assertEqual(response.context['district_total'], Decimal('1100.00'))
+        totals = {local.lcode: local.asset_total for local in response.context['locals']}
+        self.assertEqual(totals, {'QC01': Decimal('1025.00'), 'PSG01': Decimal('75.00')})
@@ -0,0 +1,88 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from gusali.models import Building
+
+from .models import District, Local
+from .routers import (
+    PIN_COOKIE,
+    ReplicaPinMiddleware,
+    ReplicaRouter,
+    primary_reads,
+    record_routing,
+    replica_reads,
+)
+
+
+class ReplicaRoutingTests(TestCase):
+    """Test read-replica routing of reports and exports"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.client.login(username='testuser', password='password123')
+
+        metro = District.objects.create(dcode='MNL', name='Metro Manila')
+        quezon = Local.objects.create(lcode='QC01', name='Quezon City', district=metro)
+        Building.objects.create(code='A', name='KAPILYA', local=quezon, year_covered=2024,
+                                current_total_cost=Decimal('1000.00'))
+
+    def test_report_reads_from_replica(self):
+        with record_routing() as log:
+            response = self.client.get(reverse('properties:local_summary', args=['QC01']))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(log.aliases('properties.Local'), {'replica'})
+        # Session and user lookups happen before the view
+        self.assertEqual(log.aliases('auth.User'), {'default'})
+
+    def test_export_stream_reads_from_replica(self):
+        response = self.client.get(reverse('gusali:building_export'), {'format': 'csv'})
+        with record_routing() as log:
+            content = b''.join(response.streaming_content).decode()
+        self.assertIn('KAPILYA', content)
+        self.assertEqual(log.aliases('gusali.Building'), {'replica'})
+
+    def test_other_views_read_from_primary(self):
+        with record_routing() as log:
+            self.client.get(reverse('gusali:building_list'))
+        self.assertEqual(log.aliases(), {'default'})
+
+    def test_pinned_browser_reads_from_primary(self):
+        self.client.cookies[PIN_COOKIE] = '1'
+        with record_routing() as log:
+            self.client.get(reverse('properties:local_summary', args=['QC01']))
+        self.assertEqual(log.aliases(), {'default'})
+
+    def test_transactions_and_overrides_stay_on_primary(self):
+        with record_routing() as log, replica_reads():
+            District.objects.count()
+            with transaction.atomic():
+                District.objects.count()
+            with primary_reads():
+                District.objects.count()
+        self.assertEqual([alias for _, alias in log], ['replica', 'default', 'default'])
+
+    def test_writes_and_migrations_use_primary(self):
+        router = ReplicaRouter()
+        with replica_reads():
+            self.assertEqual(router.db_for_write(District), 'default')
+        self.assertFalse(router.allow_migrate('replica', 'properties'))
+        # No replica configured: reads are served by the primary
+        with replica_reads():
+            self.assertEqual(router.db_for_read(District), 'default')
+        # The test replica mirrors the database but not this test's transaction
+        with mock.patch('properties.routers.replica_configured', return_value=True), replica_reads():
+            self.assertEqual(router.db_for_read(District), 'default')
+
+    def test_post_pins_browser(self):
+        middleware = ReplicaPinMiddleware(lambda request: HttpResponse())
+        factory = RequestFactory()
+
+        with mock.patch('properties.routers.replica_configured', return_value=True):
+            self.assertIn(PIN_COOKIE, middleware(factory.post('/')).cookies)
+            self.assertNotIn(PIN_COOKIE, middleware(factory.get('/')).cookies)
@@ -0,0 +1,90 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from admin_core.models import Worker
+
+from .models import District, HousingUnit, Local, Pamayanan
+from .search import (
+    DISTRICT_SEARCH_FIELDS,
+    HOUSING_UNIT_SEARCH_FIELDS,
+    prefix_query,
+    ranked_search,
+    search_filter,
+)
+
+
+class FullTextSearchTests(TestCase):
+    """Test ranked prefix search over the GIN expression indexes"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.client.login(username='testuser', password='password123')
+
+        self.metro = District.objects.create(dcode='MNL', name='Metro Manila')
+        District.objects.create(dcode='BUL', name='Bulacan')
+        Local.objects.create(lcode='QC01', name='Quezon City', district=self.metro)
+
+        self.central = Pamayanan.objects.create(name='Central Pamayanan', address='Quezon City')
+        self.unit = HousingUnit.objects.create(
+            pamayanan=self.central,
+            unit_number='101',
+            occupant_name='Juan Dela Cruz',
+            department='Finance',
+            date_reported=date(2024, 1, 1),
+        )
+        HousingUnit.objects.create(
+            pamayanan=self.central,
+            unit_number='102',
+            occupant_name='Pedro Santos',
+            department='Cruz Logistics',
+            date_reported=date(2024, 1, 1),
+        )
+
+    def test_prefix_query(self):
+        self.assertIsNone(prefix_query('  -- '))
+        matches = search_filter(District.objects.all(), DISTRICT_SEARCH_FIELDS, 'metr man')
+        self.assertEqual(list(matches), [self.metro])
+
+    def test_code_search(self):
+        matches = search_filter(District.objects.all(), DISTRICT_SEARCH_FIELDS, 'mnl')
+        self.assertEqual(list(matches), [self.metro])
+
+    def test_ranked_best_first(self):
+        # Both units mention "cruz"; the occupant with the full name ranks first
+        results = list(ranked_search(HousingUnit.objects.all(), HOUSING_UNIT_SEARCH_FIELDS, 'juan cruz'))
+        self.assertEqual(results, [self.unit])
+
+        results = list(ranked_search(HousingUnit.objects.all(), HOUSING_UNIT_SEARCH_FIELDS, 'cruz'))
+        self.assertEqual(len(results), 2)
+        self.assertGreaterEqual(results[0].rank, results[1].rank)
+
+    def test_gin_index_used(self):
+        queryset = search_filter(District.objects.all(), DISTRICT_SEARCH_FIELDS, 'metro')
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = queryset.explain()
+        self.assertIn('district_search_idx', plan)
+
+    def test_housing_search_view(self):
+        response = self.client.get(reverse('properties:housing_search'), {'q': 'centr'})
+        self.assertEqual(list(response.context['buildings']), [self.central])
+
+        response = self.client.get(reverse('properties:housing_search'), {'q': 'juan'})
+        self.assertEqual(list(response.context['units']), [self.unit])
+        self.assertContains(response, 'Central Pamayanan')
+
+    def test_district_search_view(self):
+        response = self.client.get(reverse('properties:district_search'), {'q': 'quezon'})
+        self.assertEqual(list(response.context['districts']), [])
+        self.assertEqual([l.lcode for l in response.context['locals']], ['QC01'])
+
+    def test_worker_list_search(self):
+        Worker.objects.create(first_name='Maria', last_name='Reyes', category='VW')
+        Worker.objects.create(first_name='Jose', last_name='Rizal', category='VW')
+
+        response = self.client.get(reverse('admin_core:worker_list'), {'q': 'rey'})
+        self.assertEqual([w.last_name for w in response.context['workers']], ['Reyes'])
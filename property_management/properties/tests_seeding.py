@@ -0,0 +1,92 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.db.models import F
+from django.test import TestCase
+
+from admin_core.models import HousingUnitAssignment, SyncConflict, Worker, WorkerOfficeAssignment
+from admin_core.services.sync import run_admin_core_sync
+from kagamitan.models import Item
+
+from .ledger import unit_contents
+from .models import (
+    District, HousingUnit, HousingUnitInventory, InventoryMovement, ItemTransfer, Local, LocalAssetRollup,
+)
+from .seeding import Seeder
+
+
+SIZES = {'districts': 3, 'locals': 12, 'items': 300, 'housing_units': 60, 'workers': 70}
+
+
+class SeedScaleTests(TestCase):
+    """Test the synthetic data seeder"""
+
+    def seed(self, *args):
+        options = [f'--{name.replace("_", "-")}={count}' for name, count in SIZES.items()]
+        call_command('seed_scale', *options, *args, stdout=StringIO())
+
+    def test_counts_and_references(self):
+        self.seed()
+
+        self.assertEqual(District.objects.count(), 3)
+        self.assertEqual(Local.objects.count(), 12)
+        self.assertEqual(Item.objects.count(), 300)
+        self.assertEqual(HousingUnit.objects.count(), 60)
+        self.assertEqual(Worker.objects.count(), 70)
+        self.assertEqual(WorkerOfficeAssignment.objects.count(), 70)
+
+        # Codes follow the local each item belongs to
+        self.assertFalse(Item.objects.exclude(lcode=F('local__lcode')).exists())
+        # Transfers stay within a pamayanan, and the ledger agrees with the stock
+        transfers = ItemTransfer.objects.select_related('from_unit', 'to_unit')
+        self.assertTrue(transfers)
+        for transfer in transfers:
+            self.assertEqual(transfer.from_unit.pamayanan_id, transfer.to_unit.pamayanan_id)
+            self.assertNotEqual(transfer.from_unit_id, transfer.to_unit_id)
+            self.assertEqual(InventoryMovement.objects.filter(transfer=transfer).count(), 2)
+            for unit_id in (transfer.from_unit_id, transfer.to_unit_id):
+                self.assertEqual(unit_contents(unit_id), list(
+                    HousingUnitInventory.objects.filter(housing_unit_id=unit_id, quantity__gt=0)
+                    .order_by('item_name', 'id').values_list('id', 'item_name', 'quantity')
+                ))
+        # Every occupant is a current resident of the mirrored unit
+        occupied = HousingUnit.objects.exclude(occupant_name='').count()
+        self.assertEqual(occupied, round(60 * 0.85))
+        self.assertEqual(HousingUnitAssignment.objects.filter(is_current=True).count(), occupied)
+        # Derived tables were rebuilt
+        self.assertTrue(LocalAssetRollup.objects.exists())
+
+    def test_sync_after_seeding_is_steady(self):
+        self.seed()
+        run = run_admin_core_sync()
+
+        self.assertEqual(run.status, 'success')
+        self.assertEqual((run.workers_created, run.housing_units_created, run.conflicts_detected), (0, 0, 0))
+        self.assertFalse(SyncConflict.objects.exists())
+
+    def test_unsynced_leaves_sync_work(self):
+        self.seed('--unsynced')
+        run = run_admin_core_sync()
+
+        self.assertEqual(run.housing_units_created, 60)
+        # Occupants already exist as workers
+        self.assertEqual(run.workers_created, 0)
+        self.assertEqual(run.conflicts_detected, 0)
+
+    def test_deterministic(self):
+        def names(seed):
+            with transaction.atomic():
+                Seeder(**SIZES, seed=seed).run()
+                result = list(Worker.objects.order_by('pk').values_list('first_name', 'middle_name', 'last_name'))
+                result += list(Item.objects.order_by('pk').values_list('item_name', 'total_price'))
+                transaction.set_rollback(True)
+            return result
+
+        self.assertEqual(names(7), names(7))
+        self.assertNotEqual(names(7), names(8))
+
+    def test_refuses_existing_data(self):
+        District.objects.create(dcode='MNL', name='Metro Manila')
+        with self.assertRaises(CommandError):
+            self.seed()
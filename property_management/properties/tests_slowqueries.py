@@ -0,0 +1,86 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from gusali.models import Building
+
+from .models import District, Local, SlowQuery
+from .slowqueries import SlowStatement, fingerprint, normalize, record
+
+
+class SlowQueryTests(TestCase):
+    """Test slow-query capture and the staff page"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.client.login(username='testuser', password='password123')
+
+        metro = District.objects.create(dcode='MNL', name='Metro Manila')
+        quezon = Local.objects.create(lcode='QC01', name='Quezon City', district=metro)
+        Building.objects.create(code='A', name='KAPILYA', local=quezon, year_covered=2024,
+                                current_total_cost=Decimal('1000.00'))
+
+    def building_query(self):
+        return SlowQuery.objects.get(view='gusali:building_list', sql__startswith='SELECT "gusali_building"')
+
+    def test_normalize_groups_parameters(self):
+        self.assertEqual(
+            normalize("SELECT * FROM t WHERE a = 'x'  AND b IN (%s, %s, %s) LIMIT 21"),
+            "SELECT * FROM t WHERE a = ? AND b IN (...) LIMIT ?",
+        )
+        self.assertEqual(
+            fingerprint(normalize("INSERT INTO t VALUES (%s, %s), (%s, %s)")),
+            fingerprint(normalize("INSERT INTO t VALUES (%s, %s)")),
+        )
+
+    @override_settings(SLOW_QUERY_MS=0)
+    def test_slow_statements_recorded_with_plan(self):
+        self.client.get(reverse('gusali:building_list'))
+        self.client.get(reverse('gusali:building_list'))
+
+        query = self.building_query()
+        self.assertEqual(query.calls, 2)
+        # Innermost project frame, e.g. the paginator the view calls
+        self.assertRegex(query.site, r'^\w+/\w+\.py:\d+ in \w+$')
+        # Plain EXPLAIN: the query is not run again
+        self.assertIn('cost=', query.plan)
+        self.assertNotIn('actual time', query.plan)
+        self.assertGreaterEqual(query.total_ms, query.max_ms)
+
+    @override_settings(SLOW_QUERY_EXPLAIN_ANALYZE=True)
+    def test_analyze_when_enabled(self):
+        record(SlowStatement('default', 'SELECT "name" FROM "district" WHERE "dcode" = %s', ['MNL'], 5.0, ''), 'test')
+        self.assertIn('actual time', SlowQuery.objects.get().plan)
+
+    def test_parameter_values_not_stored(self):
+        record(SlowStatement('default', 'SELECT "name" FROM "district" WHERE "dcode" = %s AND "id" > %s',
+                             ['secret', 1], 5.0, ''), 'test')
+        self.assertEqual(SlowQuery.objects.get().params, 'str, int')
+
+    @override_settings(SLOW_QUERY_MS=None)
+    def test_recorder_off(self):
+        self.client.get(reverse('gusali:building_list'))
+        self.assertFalse(SlowQuery.objects.exists())
+
+    def test_writes_explained_without_running(self):
+        record(SlowStatement('default', 'UPDATE "district" SET "name" = %s', ['Changed'], 5.0, ''), 'test')
+
+        query = SlowQuery.objects.get()
+        self.assertIn('Update on', query.plan)
+        self.assertNotIn('actual time', query.plan)
+        self.assertEqual(District.objects.get().name, 'Metro Manila')
+
+    @override_settings(SLOW_QUERY_MS=0)
+    def test_staff_page(self):
+        url = reverse('properties:slow_queries')
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.user.is_staff = True
+        self.user.save()
+        self.client.get(reverse('gusali:building_list'))
+        self.assertContains(self.client.get(url), 'gusali_building')
+
+        self.client.post(url)
+        self.assertFalse(SlowQuery.objects.filter(view='gusali:building_list').exists())
@@ -0,0 +1,61 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from .models import HousingUnit, Pamayanan
+from .stats import count_many, dashboard_stats
+
+
+class DashboardStatsTests(TestCase):
+    """Test cached dashboard statistics snapshot"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.client.login(username='testuser', password='password123')
+        self.pamayanan = Pamayanan.objects.create(name='Central', address='Quezon City')
+
+    def add_unit(self, number):
+        return HousingUnit.objects.create(
+            pamayanan=self.pamayanan,
+            unit_number=number,
+            occupant_name='Juan Cruz',
+            date_reported=date(2024, 1, 1),
+        )
+
+    def test_count_many_single_query(self):
+        self.add_unit('101')
+        self.add_unit('102')
+
+        with self.assertNumQueries(1):
+            counts = count_many(
+                units=HousingUnit.objects.all(),
+                unit_101=HousingUnit.objects.filter(unit_number='101'),
+                properties=Pamayanan.objects.all(),
+            )
+        self.assertEqual(counts, {'units': 2, 'unit_101': 1, 'properties': 1})
+
+    def test_snapshot_cached(self):
+        dashboard_stats.get()
+        with self.assertNumQueries(0):
+            stats = dashboard_stats.get()
+        self.assertEqual(stats['properties'], 1)
+
+    def test_snapshot_invalidated_on_write(self):
+        self.assertEqual(dashboard_stats.get()['housing_units'], 0)
+
+        unit = self.add_unit('101')
+        self.assertEqual(dashboard_stats.get()['housing_units'], 1)
+
+        unit.delete()
+        self.assertEqual(dashboard_stats.get()['housing_units'], 0)
+
+    def test_dashboard_view(self):
+        self.add_unit('101')
+        response = self.client.get(reverse('properties:dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['housing_units'], 1)
+        self.assertEqual(response.context['properties'], 1)
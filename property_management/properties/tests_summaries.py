@@ -0,0 +1,77 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from gusali.models import Building
+from kagamitan.models import Item
+from vehicles.models import Vehicle
+
+from .models import District, DistrictAssetSummary, Local, NationalAssetSummary
+from .summaries import refresh_summaries, summary_table
+
+
+class AssetSummaryViewTests(TestCase):
+    """Test the district / national materialized views"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.client.login(username='testuser', password='password123')
+
+        self.metro = District.objects.create(dcode='MNL', name='Metro Manila')
+        self.bulacan = District.objects.create(dcode='BUL', name='Bulacan')
+        quezon = Local.objects.create(lcode='QC01', name='Quezon City', district=self.metro)
+        pasig = Local.objects.create(lcode='PSG01', name='Pasig', district=self.metro)
+        malolos = Local.objects.create(lcode='MAL01', name='Malolos', district=self.bulacan)
+
+        Building.objects.create(code='A', name='KAPILYA', local=quezon, year_covered=2024,
+                                current_total_cost=Decimal('1000.00'))
+        Building.objects.create(code='A', name='KAPILYA', local=pasig, year_covered=2024,
+                                current_total_cost=Decimal('2000.00'))
+        Building.objects.create(code='A', name='KAPILYA', local=malolos, year_covered=2023,
+                                current_total_cost=Decimal('500.00'))
+        Item.objects.create(item_name='Chair', local=malolos, year_reported=2024, total_price=Decimal('30.00'))
+        # Not linked to a local yet: national only
+        Vehicle.objects.create(item_name='Van', acquisition_cost=Decimal('900.00'))
+
+        self.this_year = timezone.now().year
+        refresh_summaries()
+
+    def test_district_rollup(self):
+        row = DistrictAssetSummary.objects.get(district=self.metro, year=2024, asset_type='building')
+        self.assertEqual(row.local_count, 2)
+        self.assertEqual(row.asset_count, 2)
+        self.assertEqual(row.total_value, Decimal('3000.00'))
+        self.assertFalse(DistrictAssetSummary.objects.filter(asset_type='vehicle').exists())
+
+    def test_national_rollup(self):
+        row = NationalAssetSummary.objects.get(year=2024, asset_type='building')
+        self.assertEqual((row.district_count, row.asset_count), (1, 2))
+        vehicle = NationalAssetSummary.objects.get(year=self.this_year, asset_type='vehicle')
+        self.assertEqual(vehicle.total_value, Decimal('900.00'))
+
+    def test_refresh_picks_up_writes(self):
+        Building.objects.filter(local__district=self.metro).update(current_total_cost=Decimal('10.00'))
+        refresh_summaries(concurrently=False)
+        row = DistrictAssetSummary.objects.get(district=self.metro, year=2024, asset_type='building')
+        self.assertEqual(row.total_value, Decimal('20.00'))
+
+    def test_summary_table(self):
+        rows = {
+            row['key']: row
+            for row in summary_table(DistrictAssetSummary.objects.filter(year=2024), 'district')
+        }
+        self.assertEqual(rows[self.metro.pk]['total'], Decimal('3000.00'))
+        # Columns follow ASSET_TYPES: building, item, ...
+        self.assertEqual(rows[self.bulacan.pk]['values'][:2], [0, Decimal('30.00')])
+
+    def test_national_summary_view(self):
+        response = self.client.get(reverse('properties:national_summary'), {'year': '2024'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [row['district'].name for row in response.context['district_rows']],
+            ['Bulacan', 'Metro Manila'],
+        )
+        self.assertContains(response, '₱3030.00')
@@ -0,0 +1,282 @@
+import threading
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import HousingUnit, HousingUnitInventory, ItemTransfer, Pamayanan
+from .transfers import transfer_items, unit_lines
+
+
+def add_unit(pamayanan, number):
+    return HousingUnit.objects.create(pamayanan=pamayanan, unit_number=number, housing_unit_name=f'Unit {number}',
+                                      occupant_name='Juan Cruz', date_reported=date(2024, 1, 1))
+
+
+def add_item(unit, name, quantity):
+    return HousingUnitInventory.objects.create(housing_unit=unit, item_name=name, quantity=quantity,
+                                               brand='Uratex', date_acquired=date(2024, 1, 1))
+
+
+def item_ids(unit):
+    return list(HousingUnitInventory.objects.filter(housing_unit=unit).values_list('pk', flat=True))
+
+
+def quantities(unit):
+    return dict(HousingUnitInventory.objects.filter(housing_unit=unit).values_list('item_name', 'quantity'))
+
+
+class TransferCreateTests(TestCase):
+    """Test transfer_create and the transfer service"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.client.login(username='testuser', password='password123')
+
+        pamayanan = Pamayanan.objects.create(name='Central', address='Quezon City')
+        self.unit1 = add_unit(pamayanan, '101')
+        self.unit2 = add_unit(pamayanan, '102')
+        self.chairs = add_item(self.unit1, 'Chair', 5)
+        self.fan = add_item(self.unit1, 'Electric Fan', 2)
+        add_item(self.unit2, 'Chair', 1)
+
+    def post(self, items, **data):
+        return self.client.post(reverse('properties:transfer_create'), {
+            'inventory_item': [pk for pk, _ in items],
+            'quantity': [quantity for _, quantity in items],
+            'transfer_type': 'unit_to_unit',
+            'from_unit': self.unit1.pk,
+            'to_unit': self.unit2.pk,
+            'transferred_by': 'Juan Cruz',
+            'receiver_name': 'Pedro Santos',
+            'status': 'good',
+            'reason': 'Reassignment',
+            'remarks': '',
+            **data,
+        })
+
+    def test_single_item(self):
+        response = self.post([(self.chairs.pk, 2)])
+
+        transfer = ItemTransfer.objects.get()
+        self.assertRedirects(response, reverse('properties:transfer_detail', args=[transfer.pk]))
+        self.assertEqual((transfer.from_unit, transfer.to_unit, transfer.quantity), (self.unit1, self.unit2, 2))
+        self.assertEqual(quantities(self.unit1), {'Chair': 3, 'Electric Fan': 2})
+        self.assertEqual(quantities(self.unit2), {'Chair': 3})
+
+    def test_batch(self):
+        response = self.post([(self.chairs.pk, 5), (self.fan.pk, 1), ('', 1)])
+
+        self.assertRedirects(response, reverse('properties:transfer_list'))
+        self.assertEqual(ItemTransfer.objects.count(), 2)
+        self.assertEqual(quantities(self.unit1), {'Chair': 0, 'Electric Fan': 1})
+        # Added to the existing row; the new item is copied over
+        self.assertEqual(quantities(self.unit2), {'Chair': 6, 'Electric Fan': 1})
+        self.assertEqual(HousingUnitInventory.objects.get(housing_unit=self.unit2, item_name='Electric Fan').brand, 'Uratex')
+
+    def test_failed_line_rolls_back_batch(self):
+        response = self.post([(self.chairs.pk, 2), (self.fan.pk, 3)])
+
+        self.assertRedirects(response, reverse('properties:transfer_create'))
+        messages = [str(m) for m in response.wsgi_request._messages]
+        self.assertIn('Cannot transfer 3 units of Electric Fan. Only 2 available.', messages)
+        self.assertFalse(ItemTransfer.objects.exists())
+        self.assertEqual(quantities(self.unit1), {'Chair': 5, 'Electric Fan': 2})
+        self.assertEqual(quantities(self.unit2), {'Chair': 1})
+
+    def test_to_storage(self):
+        self.post([(self.fan.pk, 2)], transfer_type='unit_to_storage', to_unit='', to_storage='on')
+
+        self.assertTrue(ItemTransfer.objects.get().to_storage)
+        self.assertEqual(quantities(self.unit1)['Electric Fan'], 0)
+        self.assertEqual(quantities(self.unit2), {'Chair': 1})
+
+    def test_rejected_input(self):
+        for items, data in [
+            ([(self.chairs.pk, 0)], {}),
+            ([(self.chairs.pk, 1)], {'to_unit': self.unit1.pk}),
+            ([(self.chairs.pk, 1)], {'from_unit': self.unit2.pk}),
+            ([(self.chairs.pk, 1)], {'reason': ''}),
+            ([(999999, 1)], {}),
+        ]:
+            self.assertRedirects(self.post(items, **data), reverse('properties:transfer_create'))
+        self.assertFalse(ItemTransfer.objects.exists())
+        self.assertEqual(quantities(self.unit1), {'Chair': 5, 'Electric Fan': 2})
+
+
+class UnitMoveOutTests(TestCase):
+    """Test moving a unit's inventory out in one request"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.client.login(username='testuser', password='password123')
+
+        pamayanan = Pamayanan.objects.create(name='Central', address='Quezon City')
+        self.unit1 = add_unit(pamayanan, '101')
+        self.unit2 = add_unit(pamayanan, '102')
+        self.chairs = add_item(self.unit1, 'Chair', 5)
+        self.fan = add_item(self.unit1, 'Electric Fan', 2)
+        self.bed = add_item(self.unit1, 'Bed', 1)
+        add_item(self.unit1, 'Cabinet', 0)
+        self.unit2_chairs = add_item(self.unit2, 'Chair', 1)
+        self.url = reverse('properties:unit_move_out', args=[self.unit1.pk])
+
+    def post(self, **data):
+        return self.client.post(self.url, {
+            'transferred_by': 'Juan Cruz',
+            'receiver_name': 'Pedro Santos',
+            'status': 'good',
+            'reason': 'Occupant moved out',
+            'remarks': '',
+            **data,
+        })
+
+    def test_form_lists_items_with_stock(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(list(response.context['inventory_items']), [self.bed, self.chairs, self.fan])
+        self.assertEqual(list(response.context['housing_units']), [self.unit2])
+
+    def test_whole_unit_to_storage(self):
+        response = self.post(destination='storage', item=[self.chairs.pk, self.fan.pk, self.bed.pk])
+
+        self.assertRedirects(response, reverse('properties:housing_unit_detail', args=[self.unit1.pk]))
+        transfers = ItemTransfer.objects.all()
+        self.assertEqual(len(transfers), 3)
+        self.assertTrue(all(t.to_storage and t.transfer_type == 'unit_to_storage' for t in transfers))
+        self.assertEqual(quantities(self.unit1), {'Chair': 0, 'Electric Fan': 0, 'Bed': 0, 'Cabinet': 0})
+        self.assertEqual(quantities(self.unit2), {'Chair': 1})
+
+    def test_selected_items_to_unit(self):
+        # A second Chair row (another brand): the merge adds to the first
+        HousingUnitInventory.objects.create(housing_unit=self.unit2, item_name='Chair', quantity=4,
+                                            brand='Monobloc', date_acquired=date(2024, 1, 1))
+        self.post(destination='unit', to_unit=self.unit2.pk, item=[self.chairs.pk, self.fan.pk])
+
+        self.assertEqual(ItemTransfer.objects.filter(to_unit=self.unit2).count(), 2)
+        self.assertEqual(quantities(self.unit1), {'Chair': 0, 'Electric Fan': 0, 'Bed': 1, 'Cabinet': 0})
+        self.unit2_chairs.refresh_from_db()
+        self.assertEqual(self.unit2_chairs.quantity, 6)
+        fan = HousingUnitInventory.objects.get(housing_unit=self.unit2, item_name='Electric Fan')
+        self.assertEqual((fan.quantity, fan.brand, fan.acquisition_cost), (2, 'Uratex', 0))
+
+    def test_query_count_does_not_grow_with_items(self):
+        def queries(unit, destination):
+            with CaptureQueriesContext(connection) as context:
+                transfer_items(unit_lines(unit.pk), from_unit_id=unit.pk, to_unit_id=destination.pk,
+                               transferred_by='Juan', receiver_name='Pedro', reason='Moved out')
+            return len(context)
+
+        pamayanan = self.unit1.pamayanan
+        small, large = add_unit(pamayanan, '201'), add_unit(pamayanan, '202')
+        add_item(small, 'Chair', 1)
+        for name in ['Chair', 'Bed', 'Table', 'Cabinet', 'Stove', 'Sofa', 'Mirror', 'Lamp']:
+            add_item(large, name, 3)
+
+        self.assertEqual(queries(small, self.unit2), queries(large, self.unit2))
+        self.assertEqual(quantities(self.unit2)['Chair'], 5)
+        self.assertEqual(quantities(self.unit2)['Lamp'], 3)
+
+    def test_rejected_input(self):
+        elsewhere = add_unit(Pamayanan.objects.create(name='North', address='Caloocan'), '301')
+        for data in [
+            {'destination': 'unit', 'to_unit': elsewhere.pk, 'item': [self.chairs.pk]},
+            {'destination': 'unit', 'to_unit': self.unit1.pk, 'item': [self.chairs.pk]},
+            {'destination': 'storage'},
+            {'destination': 'unit', 'item': [self.chairs.pk]},
+            {'destination': 'storage', 'item': [self.unit2_chairs.pk]},
+            {'destination': 'storage', 'item': [self.chairs.pk], 'reason': ''},
+        ]:
+            self.assertRedirects(self.post(**data), self.url)
+        self.assertFalse(ItemTransfer.objects.exists())
+        self.assertEqual(quantities(self.unit1), {'Chair': 5, 'Electric Fan': 2, 'Bed': 1, 'Cabinet': 0})
+        self.assertEqual(self.client.put(self.url).status_code, 405)
+
+
+class ConcurrentTransferTests(TransactionTestCase):
+    """Test that concurrent transfers neither oversell nor deadlock"""
+
+    def setUp(self):
+        pamayanan = Pamayanan.objects.create(name='Central', address='Quezon City')
+        self.unit1 = add_unit(pamayanan, '101')
+        self.unit2 = add_unit(pamayanan, '102')
+
+    def run_concurrently(self, *calls):
+        barrier = threading.Barrier(len(calls))
+        outcomes = []
+
+        def run(lines, from_unit, to_unit):
+            try:
+                barrier.wait()
+                transfer_items(lines, from_unit_id=from_unit.pk, to_unit_id=to_unit.pk, transferred_by='Juan',
+                               receiver_name='Pedro', reason='Reassignment')
+                outcomes.append('ok')
+            except ValidationError:
+                outcomes.append('rejected')
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=run, args=call) for call in calls]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return sorted(outcomes)
+
+    def test_no_oversell(self):
+        chairs = add_item(self.unit1, 'Chair', 4)
+        outcomes = self.run_concurrently(([(chairs.pk, 3)], self.unit1, self.unit2),
+                                        ([(chairs.pk, 3)], self.unit1, self.unit2))
+
+        self.assertEqual(outcomes, ['ok', 'rejected'])
+        self.assertEqual(quantities(self.unit1), {'Chair': 1})
+        self.assertEqual(quantities(self.unit2), {'Chair': 3})
+
+    def test_crossing_transfers(self):
+        # Each transfer locks the other's source row as its destination
+        chairs1 = add_item(self.unit1, 'Chair', 10)
+        chairs2 = add_item(self.unit2, 'Chair', 10)
+        for _ in range(5):
+            outcomes = self.run_concurrently(([(chairs1.pk, 1)], self.unit1, self.unit2),
+                                            ([(chairs2.pk, 1)], self.unit2, self.unit1))
+            self.assertEqual(outcomes, ['ok', 'ok'])
+
+        self.assertEqual(quantities(self.unit1), {'Chair': 10})
+        self.assertEqual(quantities(self.unit2), {'Chair': 10})
+        self.assertEqual(ItemTransfer.objects.count(), 10)
+
+    def test_crossing_move_outs(self):
+        user = User.objects.create_user(username='testuser', password='password123')
+        add_item(self.unit1, 'Chair', 3)
+        add_item(self.unit2, 'Bed', 2)
+        barrier = threading.Barrier(2)
+        redirects = []
+
+        def move_out(from_unit, to_unit):
+            client = Client()
+            client.force_login(user)
+            data = {'destination': 'unit', 'to_unit': to_unit.pk, 'item': item_ids(from_unit),
+                    'transferred_by': 'Juan', 'receiver_name': 'Pedro', 'reason': 'Swap'}
+            try:
+                barrier.wait()
+                response = client.post(reverse('properties:unit_move_out', args=[from_unit.pk]), data)
+                redirects.append(response.url)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=move_out, args=units)
+                   for units in [(self.unit1, self.unit2), (self.unit2, self.unit1)]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(redirects), sorted(
+            reverse('properties:housing_unit_detail', args=[unit.pk]) for unit in (self.unit1, self.unit2)
+        ))
+        self.assertEqual(quantities(self.unit1), {'Chair': 0, 'Bed': 2})
+        self.assertEqual(quantities(self.unit2), {'Chair': 3, 'Bed': 0})
@@ -0,0 +1,281 @@
+"""
+Stock transfers between housing units and storage.
+
+transfer_items() moves one or more inventory lines from their unit to
+another unit (or to storage) in a single transaction:
+
+    1. lock the destination HousingUnit (FOR NO KEY UPDATE), then every
+       inventory row involved (the sources, and the destination's rows
+       of the same items) with SELECT ... FOR UPDATE in ascending id
+       order
+    2. check each quantity against the locked row
+    3. take the quantities off the sources in one UPDATE, as
+       F("quantity") - n
+    4. merge them into the destination with one set-based upsert keyed
+       on (housing_unit, item_name): add to the unit's first row of each
+       item, or insert a row copied from the source
+    5. create the ItemTransfer records, and their inventory ledger
+       entries (properties.ledger), with bulk_create
+
+The query count does not grow with the number of lines, so moving a
+whole unit out (unit_lines) costs the same handful of statements as
+moving one item.
+
+Every transfer takes its locks in the same order (unit, then inventory
+rows by id), so two clerks moving stock between the same units wait for
+each other instead of deadlocking, and neither can move stock the other
+has already taken. The unit lock is FOR NO KEY UPDATE, not FOR UPDATE:
+the ItemTransfer rows reference the source unit, and the FOR KEY SHARE
+that their foreign key check takes on it must not wait for a crossing
+transfer holding that unit as its destination. The destination unit lock also serializes step 4, so
+two transfers of a new item into a unit do not both create its row.
+(Units may hold several rows with the same item name, e.g. two brands
+of chair, so there is no unique index for INSERT ... ON CONFLICT.)
+
+Bad input or insufficient stock raises ValidationError and the whole
+batch is rolled back. update() and bulk_create() skip signals, so the
+dashboard counters are invalidated here.
+"""
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.utils import timezone
+
+from . import ledger
+from .models import HousingUnit, HousingUnitInventory, ItemTransfer
+from .stats import dashboard_stats
+
+
+# Copied from the source row when the destination does not have the item yet
+COPIED_FIELDS = (
+    "item_code", "date_acquired", "item_name", "brand", "model", "make", "color", "size",
+    "serial_number", "remarks",
+)
+
+
+def parse_lines(item_ids, quantities):
+    """
+    [(inventory item id, quantity)] from the form's parallel
+    inventory_item / quantity lists. Blank rows are skipped and repeated
+    items are added up.
+    """
+    lines = {}
+    for item_id, quantity in zip(item_ids, quantities):
+        if not str(item_id).strip():
+            continue
+        try:
+            item_id, quantity = int(item_id), int(quantity)
+        except (TypeError, ValueError):
+            raise ValidationError("Invalid quantity entered")
+        if quantity < 1:
+            raise ValidationError("Quantities must be at least 1")
+        lines[item_id] = lines.get(item_id, 0) + quantity
+
+    if not lines:
+        raise ValidationError("Select at least one item to transfer")
+    return list(lines.items())
+
+
+def unit_lines(unit_id, item_ids=None):
+    """
+    [(inventory item id, quantity)] moving the whole stock of unit
+    `unit_id`, or only of the items `item_ids` (an empty selection moves
+    nothing). Rows with nothing left are skipped.
+    """
+    if item_ids is not None:
+        try:
+            item_ids = {int(item_id) for item_id in item_ids}
+        except (TypeError, ValueError):
+            raise ValidationError("Invalid item selected")
+        rows = HousingUnitInventory.objects.filter(pk__in=item_ids)
+    else:
+        rows = HousingUnitInventory.objects.filter(housing_unit_id=unit_id)
+    rows = list(rows.order_by("pk").values_list("pk", "quantity"))
+
+    if item_ids is not None and len(rows) != len(item_ids):
+        raise ValidationError("Inventory item not found")
+    lines = [(pk, quantity) for pk, quantity in rows if quantity > 0]
+    if not lines:
+        raise ValidationError("There is nothing to move: no items with stock were selected")
+    return lines
+
+
+def _optional_id(value, label):
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValidationError(f"Invalid {label}")
+
+
+def _by_pk(amounts):
+    """CASE pk WHEN ... THEN amount: one UPDATE for many rows"""
+    return Case(
+        *[When(pk=pk, then=Value(amount)) for pk, amount in amounts.items()],
+        output_field=IntegerField(),
+    )
+
+
+def _merge_into_unit(unit_id, incoming, now):
+    """
+    Add `incoming` ({item_name: (quantity, source row id)}) to unit
+    `unit_id` in one statement: an UPDATE of the unit's first row of each
+    item, and an INSERT, copied from the source row, of the items no row
+    was updated for.
+    """
+    quote = connection.ops.quote_name
+    table = quote(HousingUnitInventory._meta.db_table)
+
+    columns, selected, params = [], [], []
+    for field in HousingUnitInventory._meta.concrete_fields:
+        if field.name == "id":
+            continue
+        columns.append(quote(field.column))
+        if field.name == "housing_unit":
+            selected.append("%s")
+            params.append(unit_id)
+        elif field.name == "quantity":
+            selected.append("incoming.quantity")
+        elif field.name in ("created_at", "updated_at"):
+            selected.append("%s")
+            params.append(now)
+        elif field.name in COPIED_FIELDS:
+            selected.append(f"src.{quote(field.column)}")
+        else:
+            selected.append("%s")
+            params.append(field.get_db_prep_save(field.get_default(), connection))
+
+    values = ", ".join(["(%s::varchar, %s::integer, %s::bigint)"] * len(incoming))
+    sql = f"""
+        WITH incoming (item_name, quantity, source_id) AS (VALUES {values}),
+        merged AS (
+            UPDATE {table} AS inv
+               SET quantity = inv.quantity + incoming.quantity, updated_at = %s
+              FROM incoming
+             WHERE inv.id = (
+                   SELECT min(d.id) FROM {table} AS d
+                    WHERE d.housing_unit_id = %s AND d.item_name = incoming.item_name
+                   )
+            RETURNING inv.item_name, inv.id
+        ),
+        inserted AS (
+            INSERT INTO {table} ({", ".join(columns)})
+            SELECT {", ".join(selected)}
+              FROM incoming JOIN {table} AS src ON src.id = incoming.source_id
+             WHERE incoming.item_name NOT IN (SELECT item_name FROM merged)
+            RETURNING item_name, id
+        )
+        SELECT item_name, id FROM merged
+        UNION ALL
+        SELECT item_name, id FROM inserted
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [
+            *(value for name, (quantity, source_id) in incoming.items() for value in (name, quantity, source_id)),
+            now, unit_id, *params,
+        ])
+        return dict(cursor.fetchall())
+
+
+def transfer_items(lines, *, transferred_by, receiver_name, reason, transfer_type="unit_to_unit",
+                   from_unit_id=None, to_unit_id=None, to_storage=False, status="good", remarks="",
+                   received_date=None):
+    """
+    Move `lines` ([(inventory item id, quantity)]) to unit `to_unit_id`,
+    or to storage. Returns the new ItemTransfer rows; raises
+    ValidationError, changing nothing, if any line cannot be moved.
+    """
+    if transfer_type not in dict(ItemTransfer.TRANSFER_TYPE_CHOICES):
+        raise ValidationError("Invalid transfer type")
+    if status not in dict(ItemTransfer.STATUS_CHOICES):
+        raise ValidationError("Invalid item condition")
+    if not (transferred_by and receiver_name and reason):
+        raise ValidationError("Giver, receiver and reason are required")
+
+    from_unit_id = _optional_id(from_unit_id, "source unit")
+    to_unit_id = None if to_storage else _optional_id(to_unit_id, "destination unit")
+    if not to_storage and to_unit_id is None:
+        raise ValidationError("Choose a destination unit or storage")
+
+    quantities = dict(lines)
+
+    with transaction.atomic():
+        if to_unit_id is not None:
+            locked_unit = (
+                HousingUnit.objects.select_for_update(no_key=True).filter(pk=to_unit_id).values_list("pk", flat=True)
+            )
+            if not list(locked_unit):
+                raise ValidationError("Destination unit not found")
+
+        names = set(
+            HousingUnitInventory.objects.filter(pk__in=quantities).values_list("item_name", flat=True)
+        )
+        involved = Q(pk__in=quantities)
+        if to_unit_id is not None:
+            involved |= Q(housing_unit_id=to_unit_id, item_name__in=names)
+        rows = {
+            row.pk: row
+            for row in HousingUnitInventory.objects.select_for_update().filter(involved).order_by("pk")
+        }
+
+        # Checks against the locked (current) rows
+        incoming = {}
+        for pk, quantity in quantities.items():
+            row = rows.get(pk)
+            if row is None:
+                raise ValidationError("Inventory item not found")
+            if row.item_name not in names:
+                raise ValidationError(f"{row.item_name} changed while transferring; try again")
+            if from_unit_id is not None and row.housing_unit_id != from_unit_id:
+                raise ValidationError(f"{row.item_name} is not in the selected source unit")
+            if row.housing_unit_id == to_unit_id:
+                raise ValidationError(f"{row.item_name} is already in the destination unit")
+            if quantity > row.quantity:
+                raise ValidationError(
+                    f"Cannot transfer {quantity} units of {row.item_name}. Only {row.quantity} available."
+                )
+            amount, source_id = incoming.get(row.item_name, (0, pk))
+            incoming[row.item_name] = (amount + quantity, source_id)
+
+        now = timezone.now()
+        HousingUnitInventory.objects.filter(pk__in=quantities).update(
+            quantity=F("quantity") - _by_pk(quantities), updated_at=now
+        )
+
+        destination = {}
+        if to_unit_id is not None:
+            destination = _merge_into_unit(to_unit_id, incoming, now)
+
+        transfers = ItemTransfer.objects.bulk_create([
+            ItemTransfer(
+                inventory_item_id=pk,
+                transfer_type=transfer_type,
+                from_unit_id=from_unit_id,
+                to_unit_id=to_unit_id,
+                to_storage=bool(to_storage),
+                transferred_by=transferred_by,
+                receiver_name=receiver_name,
+                received_date=received_date or None,
+                status=status,
+                reason=reason,
+                remarks=remarks or "",
+                quantity=quantity,
+            )
+            for pk, quantity in quantities.items()
+        ])
+
+        entries = []
+        for transfer in transfers:
+            source = rows[transfer.inventory_item_id]
+            entries.append(ledger.entry(source.pk, source.housing_unit_id, source.item_name, -transfer.quantity,
+                                        "transfer_out", transfer.pk, now))
+            if to_unit_id is not None:
+                entries.append(ledger.entry(destination[source.item_name], to_unit_id, source.item_name,
+                                            transfer.quantity, "transfer_in", transfer.pk, now))
+        ledger.record(entries)
+
+        dashboard_stats.invalidate()
+
+    return transfers
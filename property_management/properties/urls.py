@@ -15,12 +15,15 @@ urlpatterns = [
     # Property management URLs
     path('properties/', views.property_list, name='property_list'),
     path('inventory/', views.inventory_list, name='inventory_list'),
+    path('inventory/export/', views.inventory_export, name='inventory_export'),
     path('upload/', views.upload_file, name='upload_file'),
     path('import-history/', views.import_history, name='import_history'),
     path('housing-unit/<int:pk>/', views.housing_unit_detail, name='housing_unit_detail'),
     path('housing-unit/create/', views.housing_unit_create, name='housing_unit_create'),
     path('housing-unit/<int:pk>/update/', views.housing_unit_update, name='housing_unit_update'),
     path('housing-unit/<int:pk>/delete/', views.housing_unit_delete, name='housing_unit_delete'),
+    path('housing-unit/<int:pk>/move-out/', views.unit_move_out, name='unit_move_out'),
+    path('housing-unit/<int:pk>/ledger/', views.unit_inventory_ledger, name='unit_inventory_ledger'),
     path('building/<int:property_id>/', views.building_occupants, name='building_occupants'),
     path('building/<int:pk>/map/', views.building_map, name='building_map'),
     
@@ -34,7 +37,11 @@ urlpatterns = [
     path('search/district/', views.district_search, name='district_search'),
     path('district/<str:dcode>/', views.district_detail, name='district_detail'),
     path('local/<str:lcode>/summary/', views.local_summary, name='local_summary'),
+    path('national/summary/', views.national_summary, name='national_summary'),
+    path('reports/p7/', views.p7_reports, name='p7_reports'),
     path('search/housing/', views.housing_search, name='housing_search'),
+    path('internal/db-pool/', views.db_pool_metrics, name='db_pool_metrics'),
+    path('internal/slow-queries/', views.slow_queries, name='slow_queries'),
     path("districts/", views.district_list, name="district_list"),
     path("districts/add/", views.district_create, name="district_create"),
     path("districts/<str:dcode>/edit/",views.district_update,name="district_update"),
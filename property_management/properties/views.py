@@ -1,21 +1,51 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import authenticate, login, logout
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.views.decorators.http import require_http_methods
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+from django.core.exceptions import ValidationError
 from django.db import IntegrityError
 from django.contrib import messages
-from django.utils.timezone import now
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+from django.utils.dateparse import parse_date
+from django.utils.timezone import make_aware, now
 import qrcode
 from io import BytesIO
 import base64
+from datetime import datetime, time
+from itertools import groupby
+from operator import attrgetter
 
 from admin_core.models import Worker
 from admin_core.services.sync import run_admin_core_sync
 from gusali.models import Building
-from .models import Pamayanan, HousingUnit, HousingUnitInventory, UserProfile, ImportedFile, ItemTransfer, District, Local
-from django.db.models import Sum, Q, Count
+from .models import Pamayanan, HousingUnit, HousingUnitInventory, UserProfile, ImportedFile, ItemTransfer, District, Local, LocalAssetRollup, DistrictAssetSummary, NationalAssetSummary, SlowQuery
+from django.db.models import Sum, Q, Count, Value
+from django.db.models.functions import Coalesce, NullIf
+from .occupancy import unit_stats, with_occupancy
+from .conditional import conditional_page, queryset_version
+from .dbpool import connection_metrics
+from .exports import export_response
+from .ledger import unit_contents, unit_history
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, exposition
+from .p7 import select_locals, stream_p7_zip
+from .pagination import keyset_paginate
+from .routers import replica_reads
+from .rollups import grand_total_expression, rollup_totals
+from .search import (
+    DISTRICT_SEARCH_FIELDS,
+    HOUSING_UNIT_SEARCH_FIELDS,
+    LOCAL_SEARCH_FIELDS,
+    PAMAYANAN_SEARCH_FIELDS,
+    ranked_search,
+)
+from .stats import dashboard_stats
+from .summaries import ASSET_TYPES, refresh_if_stale, summary_table
+from .transfers import parse_lines, transfer_items, unit_lines
 from django.core.management import call_command
 import os
 from io import StringIO
@@ -27,6 +57,17 @@ from django.shortcuts import render, redirect, get_object_or_404
 from .models import District, Local
 from .forms import DistrictForm, LocalForm
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+def get_page(request, object_list, per_page):
+    """Paginate object_list by the ?page= parameter, clamped to valid pages."""
+    paginator = Paginator(object_list, per_page)
+    try:
+        return paginator.page(request.GET.get('page'))
+    except PageNotAnInteger:
+        return paginator.page(1)
+    except EmptyPage:
+        return paginator.page(paginator.num_pages)
+
+
 def get_client_ip(request):
     """Get client IP address from request"""
     x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -127,25 +168,19 @@ def dashboard(request):
     except UserProfile.DoesNotExist:
         profile = UserProfile.objects.create(user=request.user)
     
-    # Get statistics
-    housing_units = HousingUnit.objects.count()
-    inventory_items = HousingUnitInventory.objects.count()
-    imported_files = ImportedFile.objects.count()
-    properties = Pamayanan.objects.count()
-    
-    # Get transfer statistics
-    transfers = ItemTransfer.objects.count()
+    # Get statistics (cached snapshot, see properties.stats)
+    stats = dashboard_stats.get()
     
     # Get recent imports
     recent_imports = ImportedFile.objects.all()[:5]
     
     context = {
         'profile': profile,
-        'housing_units': housing_units,
-        'inventory_items': inventory_items,
-        'imported_files': imported_files,
-        'properties': properties,
-        'transfers': transfers,
+        'housing_units': stats['housing_units'],
+        'inventory_items': stats['inventory_items'],
+        'imported_files': stats['imported_files'],
+        'properties': stats['properties'],
+        'transfers': stats['transfers'],
         'recent_imports': recent_imports,
     }
     return render(request, 'properties/dashboard.html', context)
@@ -231,52 +266,84 @@ def view_backup_codes(request):
 @login_required(login_url='properties:login')
 def property_list(request):
     """Display list of properties and housing units."""
-    properties = Pamayanan.objects.all()
-    housing_units = HousingUnit.objects.all()
-    
-    # Get properties with their occupant counts
-    property_info = []
-    for prop in properties:
-        count = HousingUnit.objects.filter(property=prop).count()
-        property_info.append({
-            'id': prop.id,
-            'name': prop.name,
-            'owner': prop.owner,
-            'occupant_count': count
-        })
-    
+    # Occupancy counts come from one annotated query (or the rollup table)
+    properties = with_occupancy(Pamayanan.objects.all())
+    totals = unit_stats(HousingUnit.objects.all())
+
+    housing_units = get_page(
+        request,
+        HousingUnit.objects.select_related('pamayanan')
+        .annotate(item_count=Count('inventories'))
+        .order_by('pamayanan__name', 'housing_unit_name', 'id'),
+        50,
+    )
+
     context = {
         'properties': properties,
         'housing_units': housing_units,
-        'property_info': property_info,
+        'totals': totals,
     }
     return render(request, 'properties/property_list.html', context)
 
 
-@login_required(login_url='properties:login')
-def inventory_list(request):
-    inventory_items = HousingUnitInventory.objects.select_related('housing_unit').all()
-
+INVENTORY_EXPORT_COLUMNS = [
+    ('Housing Unit', 'housing_unit__housing_unit_name'),
+    ('Item Code', 'item_code'),
+    ('Date Acquired', 'date_acquired'),
+    ('Quantity', 'quantity'),
+    ('Item Name', 'item_name'),
+    ('Brand', 'brand'),
+    ('Model', 'model'),
+    ('Make', 'make'),
+    ('Color', 'color'),
+    ('Size', 'size'),
+    ('Serial Number', 'serial_number'),
+    ('Acquisition Cost', 'acquisition_cost'),
+    ('Useful Life', 'useful_life'),
+    ('Net Book Value', 'net_book_value'),
+    ('Amount', 'amount'),
+    ('Remarks', 'remarks'),
+]
+
+
+def filter_inventory(request, inventory_items):
+    """Apply the ?housing_unit= filter; returns (items, selected unit id)"""
     housing_unit_id = request.GET.get('housing_unit')
-
-    selected_unit = None
     if housing_unit_id:
         try:
             selected_unit = int(housing_unit_id)
-            inventory_items = inventory_items.filter(housing_unit_id=selected_unit)
         except ValueError:
-            selected_unit = None
+            return inventory_items, None
+        return inventory_items.filter(housing_unit_id=selected_unit), selected_unit
+    return inventory_items, None
+
+
+@login_required(login_url='properties:login')
+def inventory_list(request):
+    inventory_items, selected_unit = filter_inventory(
+        request, HousingUnitInventory.objects.select_related('housing_unit').all()
+    )
 
     housing_units = HousingUnit.objects.all()
 
     context = {
-        'inventory_items': inventory_items,
+        'inventory_items': keyset_paginate(request, inventory_items),
+        # One unit's rows are counted; the whole table's count comes from the dashboard snapshot
+        'total_items': inventory_items.count() if selected_unit else dashboard_stats.get()['inventory_items'],
         'housing_units': housing_units,
         'selected_unit': selected_unit,
     }
     return render(request, 'properties/inventory_list.html', context)
 
 
+@login_required(login_url='properties:login')
+@replica_reads
+def inventory_export(request):
+    """Stream the (optionally per-unit) inventory as CSV or XLSX"""
+    inventory_items, _ = filter_inventory(request, HousingUnitInventory.objects.all())
+    return export_response(request, inventory_items, INVENTORY_EXPORT_COLUMNS, 'inventory')
+
+
 @login_required(login_url="properties:login")
 def upload_file(request):
     """
@@ -459,24 +526,34 @@ def housing_unit_detail(request, pk):
 @login_required(login_url='properties:login')
 def building_occupants(request, property_id):
     """Display all occupants in a specific property/building"""
-    # Get the property
-    property_obj = get_object_or_404(Pamayanan, id=property_id)
-    
-    # Get all housing units in the property
-    housing_units = HousingUnit.objects.filter(property=property_obj).order_by('housing_unit_name')
-    
-    # Get statistics
-    total_occupants = housing_units.count()
-    departments = housing_units.values_list('department', flat=True).distinct()
-    total_departments = len(departments)
-    
+    # Get the property together with its occupancy counts
+    property_obj = get_object_or_404(
+        with_occupancy(Pamayanan.objects.all()), id=property_id
+    )
+
+    housing_units = HousingUnit.objects.filter(pamayanan=property_obj)
+
+    departments = (
+        housing_units.exclude(department='')
+        .order_by('department')
+        .values_list('department', flat=True)
+        .distinct()
+    )
+
+    selected_dept = request.GET.get('dept', '')
+    if selected_dept:
+        housing_units = housing_units.filter(department=selected_dept)
+
+    page = get_page(request, housing_units.order_by('housing_unit_name', 'id'), 50)
+
     context = {
         'property': property_obj,
         'building_name': property_obj.name,
-        'housing_units': housing_units,
-        'total_occupants': total_occupants,
-        'total_departments': total_departments,
+        'housing_units': page,
+        'total_occupants': property_obj.occupant_count,
+        'total_departments': property_obj.department_count,
         'departments': departments,
+        'selected_dept': selected_dept,
     }
     return render(request, 'properties/building_occupants.html', context)
 
@@ -503,7 +580,7 @@ def transfer_list(request):
     damaged_items = ItemTransfer.objects.filter(status__in=['damaged', 'broken']).count()
     
     context = {
-        'transfers': transfers,
+        'transfers': keyset_paginate(request, transfers),
         'total_transfers': total_transfers,
         'pending_received': pending_received,
         'good_condition': good_condition,
@@ -517,103 +594,33 @@ def transfer_list(request):
 @login_required(login_url='properties:login')
 @require_http_methods(["GET", "POST"])
 def transfer_create(request):
-    """Create a new item transfer with inventory adjustment"""
+    """Create item transfers (one or many items) with inventory adjustment"""
     if request.method == 'POST':
         try:
-            inventory_item_id = request.POST.get('inventory_item')
-            transfer_type = request.POST.get('transfer_type')
-            from_unit_id = request.POST.get('from_unit')
-            to_unit_id = request.POST.get('to_unit')
-            to_storage = request.POST.get('to_storage') == 'on'
-            transferred_by = request.POST.get('transferred_by')
-            receiver_name = request.POST.get('receiver_name')
-            received_date = request.POST.get('received_date')
-            status = request.POST.get('status', 'good')
-            reason = request.POST.get('reason')
-            remarks = request.POST.get('remarks')
-            quantity = int(request.POST.get('quantity', 1))
-            
-            # Get the inventory item from source unit
-            inventory_item = HousingUnitInventory.objects.get(id=inventory_item_id)
-            
-            # Validate quantity
-            if quantity > inventory_item.quantity:
-                messages.error(request, f'Cannot transfer {quantity} units. Only {inventory_item.quantity} available.')
-                return redirect('properties:transfer_create')
-            
-            # STEP 1: Reduce quantity from source unit
-            inventory_item.quantity -= quantity
-            inventory_item.save()
-            
-            # STEP 2: Handle destination - either add to destination unit or to storage
-            if to_storage:
-                # Item goes to storage/bodega - don't create new inventory record
-                # Just track the transfer
-                pass
-            elif to_unit_id:
-                # Item goes to another unit
-                to_unit = HousingUnit.objects.get(id=to_unit_id)
-                
-                # Check if this item already exists in the destination unit
-                existing_item = HousingUnitInventory.objects.filter(
-                    housing_unit=to_unit,
-                    item_name=inventory_item.item_name
-                ).first()
-                
-                if existing_item:
-                    # Add to existing item
-                    existing_item.quantity += quantity
-                    existing_item.save()
-                else:
-                    # Create new inventory record in destination unit
-                    # Copy the item details but with new unit and quantity
-                    new_item = HousingUnitInventory(
-                        housing_unit=to_unit,
-                        item_code=inventory_item.item_code,
-                        date_acquired=inventory_item.date_acquired,
-                        quantity=quantity,
-                        item_name=inventory_item.item_name,
-                        brand=inventory_item.brand,
-                        model=inventory_item.model,
-                        make=inventory_item.make,
-                        color=inventory_item.color,
-                        size=inventory_item.size,
-                        serial_number=inventory_item.serial_number,
-                        remarks=inventory_item.remarks,
-                    )
-                    new_item.save()
-            
-            # STEP 3: Create the transfer record
-            transfer = ItemTransfer(
-                inventory_item=inventory_item,
-                transfer_type=transfer_type,
-                from_unit_id=from_unit_id if from_unit_id else None,
-                to_unit_id=to_unit_id if to_unit_id else None,
-                to_storage=to_storage,
-                transferred_by=transferred_by,
-                receiver_name=receiver_name,
-                received_date=received_date if received_date else None,
-                status=status,
-                reason=reason,
-                remarks=remarks,
-                quantity=quantity,
+            lines = parse_lines(request.POST.getlist('inventory_item'), request.POST.getlist('quantity'))
+            transfers = transfer_items(
+                lines,
+                transfer_type=request.POST.get('transfer_type') or 'unit_to_unit',
+                from_unit_id=request.POST.get('from_unit'),
+                to_unit_id=request.POST.get('to_unit'),
+                to_storage=request.POST.get('to_storage') == 'on',
+                transferred_by=request.POST.get('transferred_by', ''),
+                receiver_name=request.POST.get('receiver_name', ''),
+                received_date=request.POST.get('received_date') or None,
+                status=request.POST.get('status', 'good'),
+                reason=request.POST.get('reason', ''),
+                remarks=request.POST.get('remarks', ''),
             )
-            transfer.save()
-            
-            messages.success(request, f'Item transfer created successfully! Inventory updated.')
-            return redirect('properties:transfer_detail', pk=transfer.id)
-        except HousingUnitInventory.DoesNotExist:
-            messages.error(request, 'Inventory item not found')
-            return redirect('properties:transfer_create')
-        except HousingUnit.DoesNotExist:
-            messages.error(request, 'Destination unit not found')
-            return redirect('properties:transfer_create')
-        except ValueError:
-            messages.error(request, 'Invalid quantity entered')
-            return redirect('properties:transfer_create')
-        except Exception as e:
-            messages.error(request, f'Error creating transfer: {str(e)}')
+        except ValidationError as e:
+            for message in e.messages:
+                messages.error(request, message)
             return redirect('properties:transfer_create')
+
+        if len(transfers) == 1:
+            messages.success(request, 'Item transfer created successfully! Inventory updated.')
+            return redirect('properties:transfer_detail', pk=transfers[0].pk)
+        messages.success(request, f'{len(transfers)} item transfers created successfully! Inventory updated.')
+        return redirect('properties:transfer_list')
     
     # GET request - show form
     inventory_items = HousingUnitInventory.objects.select_related('housing_unit').all()
@@ -626,6 +633,72 @@ def transfer_create(request):
     return render(request, 'properties/transfer_create.html', context)
 
 
+@login_required(login_url='properties:login')
+@require_http_methods(["GET", "POST"])
+def unit_move_out(request, pk):
+    """Move a unit's inventory (all of it or the checked items) to another unit or storage in one transfer"""
+    housing_unit = get_object_or_404(HousingUnit, pk=pk)
+    # Destinations are the other units of the same Pamayanan
+    housing_units = HousingUnit.objects.filter(pamayanan_id=housing_unit.pamayanan_id).exclude(pk=housing_unit.pk)
+
+    if request.method == 'POST':
+        to_storage = request.POST.get('destination') == 'storage'
+        to_unit = request.POST.get('to_unit', '')
+        try:
+            if not to_storage and to_unit.isdigit() and not housing_units.filter(pk=to_unit).exists():
+                raise ValidationError('Choose another unit of the same Pamayanan')
+            transfers = transfer_items(
+                unit_lines(housing_unit.pk, request.POST.getlist('item')),
+                transfer_type='unit_to_storage' if to_storage else 'unit_to_unit',
+                from_unit_id=housing_unit.pk,
+                to_unit_id=to_unit,
+                to_storage=to_storage,
+                transferred_by=request.POST.get('transferred_by', ''),
+                receiver_name=request.POST.get('receiver_name', ''),
+                received_date=request.POST.get('received_date') or None,
+                status=request.POST.get('status', 'good'),
+                reason=request.POST.get('reason', ''),
+                remarks=request.POST.get('remarks', ''),
+            )
+        except ValidationError as e:
+            for message in e.messages:
+                messages.error(request, message)
+            return redirect('properties:unit_move_out', pk=housing_unit.pk)
+
+        messages.success(request, f'{len(transfers)} items moved out of {housing_unit.housing_unit_name}.')
+        return redirect('properties:housing_unit_detail', pk=housing_unit.pk)
+
+    # GET request - show form
+    inventory_items = HousingUnitInventory.objects.filter(housing_unit=housing_unit, quantity__gt=0).order_by('item_name', 'id')
+
+    context = {
+        'housing_unit': housing_unit,
+        'inventory_items': inventory_items,
+        'housing_units': housing_units.only('id', 'housing_unit_name', 'occupant_name').order_by('housing_unit_name', 'id'),
+    }
+    return render(request, 'properties/unit_move_out.html', context)
+
+
+@login_required(login_url='properties:login')
+def unit_inventory_ledger(request, pk):
+    """A unit's inventory as of a date (?date=YYYY-MM-DD, default today) and its movement ledger"""
+    housing_unit = get_object_or_404(HousingUnit, pk=pk)
+
+    try:
+        as_of = parse_date(request.GET.get('date', ''))
+    except ValueError:
+        as_of = None
+    at = make_aware(datetime.combine(as_of, time.max)) if as_of else None
+
+    context = {
+        'housing_unit': housing_unit,
+        'as_of': as_of,
+        'contents': unit_contents(housing_unit.pk, at),
+        'movements': keyset_paginate(request, unit_history(housing_unit.pk)),
+    }
+    return render(request, 'properties/inventory_ledger.html', context)
+
+
 @login_required(login_url='properties:login')
 def transfer_detail(request, pk):
     """Display details of a specific transfer"""
@@ -651,11 +724,13 @@ def transfer_history(request):
     if inventory_item_id:
         transfers = transfers.filter(inventory_item_id=inventory_item_id)
     
-    # Get all inventory items for filter dropdown
-    inventory_items = HousingUnitInventory.objects.all()
+    # Get all inventory items for filter dropdown (options show the unit name)
+    inventory_items = HousingUnitInventory.objects.select_related('housing_unit').only(
+        'id', 'item_name', 'housing_unit__housing_unit_name'
+    )
     
     context = {
-        'transfers': transfers,
+        'transfers': keyset_paginate(request, transfers),
         'inventory_items': inventory_items,
         'selected_item': inventory_item_id,
     }
@@ -666,51 +741,177 @@ def district_search(request):
     """Search engine for Districts"""
     query = request.GET.get('q', '').strip()
     districts = District.objects.all()
+    locals_found = []
     if query:
-        districts = districts.filter(Q(name__icontains=query) | Q(dcode__icontains=query))
+        # Ranked full-text prefix match (GIN index, see properties.search)
+        districts = ranked_search(districts, DISTRICT_SEARCH_FIELDS, query)[:50]
+        locals_found = ranked_search(
+            Local.objects.select_related('district'), LOCAL_SEARCH_FIELDS, query
+        )[:50]
     
-    context = {'districts': districts, 'query': query}
+    context = {'districts': districts, 'locals': locals_found, 'query': query}
     return render(request, 'properties/district_search.html', context)
 
+def district_detail_version(request, dcode):
+    return [
+        queryset_version(District.objects.filter(dcode=dcode)),
+        queryset_version(Local.objects.filter(district__dcode=dcode)),
+        queryset_version(LocalAssetRollup.objects.filter(local__district__dcode=dcode), 'refreshed_at'),
+    ]
+
 @login_required
+@replica_reads
+@conditional_page(district_detail_version)
 def district_detail(request, dcode):
     """View locals within a district"""
     district = get_object_or_404(District, dcode=dcode)
-    locals_list = Local.objects.filter(district=district).order_by('name')
+
+    # Asset values come from the LocalAssetRollup rows (one GROUP BY)
+    locals_list = (
+        Local.objects.filter(district=district)
+        .annotate(asset_total=grand_total_expression('asset_rollups__'))
+        .order_by('name')
+    )
+    district_total = rollup_totals(
+        LocalAssetRollup.objects.filter(local__district=district)
+    )['grand_total']
+
     context = {
         'district': district,
-        'locals': locals_list
+        'locals': locals_list,
+        'district_total': district_total,
     }
     return render(request, 'properties/district_detail.html', context)
 
+def local_summary_version(request, lcode):
+    return [
+        queryset_version(Local.objects.filter(lcode=lcode)),
+        queryset_version(LocalAssetRollup.objects.filter(local__lcode=lcode), 'refreshed_at'),
+    ]
+
 @login_required
+@replica_reads
+@conditional_page(local_summary_version)
 def local_summary(request, lcode):
     """Aggregate summary for a specific Local across all National apps"""
-    from gusali.models import Building
-    from kagamitan.models import Item
-    from lupa.models import Land
-    from plants.models import Plant
-    
-    local = get_object_or_404(Local, lcode=lcode)
-    
-    # Cost Summaries
-    gusali_cost = Building.objects.filter(local=local).aggregate(total=Sum('current_total_cost'))['total'] or 0
-    kagamitan_cost = Item.objects.filter(local=local).aggregate(total=Sum('total_price'))['total'] or 0
-    lupa_cost = Land.objects.filter(local=local).aggregate(total=Sum('market_value'))['total'] or 0
-    plants_cost = Plant.objects.filter(local=local).aggregate(total=Sum('total_value'))['total'] or 0
-    
-    total_local_cost = gusali_cost + kagamitan_cost + lupa_cost + plants_cost
-    
+    local = get_object_or_404(Local.objects.select_related('district'), lcode=lcode)
+
+    # Cost Summaries (one aggregate over the local's rollup rows)
+    rollups = LocalAssetRollup.objects.filter(local=local)
+    years = list(rollups.values_list('year', flat=True))
+
+    year = request.GET.get('year', '').strip()
+    if year.isdigit():
+        rollups = rollups.filter(year=int(year))
+    totals = rollup_totals(rollups)
+
     context = {
         'local': local,
-        'gusali_cost': gusali_cost,
-        'kagamitan_cost': kagamitan_cost,
-        'lupa_cost': lupa_cost,
-        'plants_cost': plants_cost,
-        'total_local_cost': total_local_cost,
+        'gusali_cost': totals['building_total'],
+        'kagamitan_cost': totals['item_total'],
+        'lupa_cost': totals['land_total'],
+        'plants_cost': totals['plant_total'],
+        'vehicles_cost': totals['vehicle_total'],
+        'property_cost': totals['property_total'],
+        'total_local_cost': totals['grand_total'],
+        'totals': totals,
+        'years': years,
+        'current_year': year,
     }
     return render(request, 'properties/local_summary.html', context)
 
+@login_required
+@replica_reads
+def national_summary(request):
+    """National asset values by year and asset type, and per district for one year"""
+    refreshed_at = refresh_if_stale()
+
+    national_rows = summary_table(NationalAssetSummary.objects.all(), 'year')
+    national_rows.reverse()  # latest year first
+    years = [row['key'] for row in national_rows]
+
+    year = request.GET.get('year', '').strip()
+    if not year.isdigit():
+        year = str(years[0]) if years else ''
+
+    district_rows = []
+    if year:
+        district_rows = summary_table(DistrictAssetSummary.objects.filter(year=int(year)), 'district')
+        districts = District.objects.in_bulk([row['key'] for row in district_rows])
+        for row in district_rows:
+            row['district'] = districts.get(row['key'])
+        district_rows.sort(key=lambda row: row['district'].name if row['district'] else '')
+
+    context = {
+        'asset_types': ASSET_TYPES.values(),
+        'national_rows': national_rows,
+        'district_rows': district_rows,
+        'years': years,
+        'current_year': year,
+        'refreshed_at': refreshed_at,
+    }
+    return render(request, 'properties/national_summary.html', context)
+
+@staff_member_required
+@replica_reads
+def p7_reports(request):
+    """
+    Form for, and streamed ZIP of, the P7 annual report workbooks of
+    the chosen districts / locals (?district=, ?local=, ?year=), or of
+    every local with ?all=1. Staff only: rendering runs in a process
+    pool started by the request.
+    """
+    dcodes = request.GET.getlist('district')
+    lcodes = request.GET.getlist('local')
+    generate_all = request.GET.get('all') == '1'
+    year = request.GET.get('year', '').strip()
+
+    if year.isdigit() and (dcodes or lcodes or generate_all):
+        local_ids = select_locals(dcodes, lcodes)
+        if local_ids:
+            response = StreamingHttpResponse(stream_p7_zip(local_ids, int(year)), content_type='application/zip')
+            response['Content-Disposition'] = f'attachment; filename="P7 {year}.zip"'
+            return response
+        messages.warning(request, 'No locals match the selected districts.')
+
+    context = {
+        'districts': District.objects.order_by('name'),
+        'current_year': year or str(now().year),
+    }
+    return render(request, 'properties/p7_reports.html', context)
+
+@staff_member_required
+def db_pool_metrics(request):
+    """Connection reuse counters of this worker process (properties.dbpool)"""
+    return JsonResponse(connection_metrics())
+
+@staff_member_required
+def slow_queries(request):
+    """Slowest statements by total time (properties.slowqueries)"""
+    if request.method == 'POST':
+        SlowQuery.objects.all().delete()
+        messages.success(request, 'Slow query log cleared.')
+        return redirect('properties:slow_queries')
+
+    context = {
+        'slow_queries': SlowQuery.objects.order_by('-total_ms')[:50],
+        'threshold_ms': getattr(settings, 'SLOW_QUERY_MS', None),
+    }
+    return render(request, 'properties/slow_queries.html', context)
+
+def prometheus_metrics(request):
+    """Prometheus scrape endpoint (properties.metrics): staff, bearer token or allowed IPs"""
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    authorization = request.headers.get('Authorization', '')
+    allowed = (
+        request.user.is_staff
+        or (token and constant_time_compare(authorization, f'Bearer {token}'))
+        or request.META.get('REMOTE_ADDR') in getattr(settings, 'METRICS_ALLOWED_IPS', ())
+    )
+    if not allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(exposition(), content_type=METRICS_CONTENT_TYPE)
+
 @login_required
 def housing_search(request):
     query = request.GET.get('q', '').strip()
@@ -719,12 +920,16 @@ def housing_search(request):
     units = []
 
     if query:
-        # Search buildings by name only
-        buildings = Pamayanan.objects.filter(name__icontains=query)
+        # Ranked full-text prefix match (GIN index, see properties.search)
+        buildings = ranked_search(
+            Pamayanan.objects.all(), PAMAYANAN_SEARCH_FIELDS, query
+        )[:50]
 
-        # Search workers / occupants by name only
-        units = HousingUnit.objects.select_related('property') \
-            .filter(occupant_name__icontains=query)
+        units = ranked_search(
+            HousingUnit.objects.select_related('pamayanan'),
+            HOUSING_UNIT_SEARCH_FIELDS,
+            query,
+        )[:100]
 
     return render(request, 'properties/housing_search.html', {
         'query': query,
@@ -735,23 +940,22 @@ def housing_search(request):
 def building_map(request, pk):
     """Visualizes housing units in a grid layout (Map-like table)"""
     building = get_object_or_404(Pamayanan, pk=pk)
-    # Get units and group by Floor/Unit Number
-    units_list = HousingUnit.objects.filter(property=building).order_by('floor', 'housing_unit_name')
-    
-    # Organize into a grid dictionary {floor: [units]}
-    grid = {}
-    for unit in units_list:
-        floor = unit.floor or "Other"
-        if floor not in grid:
-            grid[floor] = []
-        grid[floor].append(unit)
-    
-    # Prepare sorted list of tuples [(floor, [units])] for template
-    sorted_floors = sorted(grid.keys(), reverse=True)
-    floor_data = []
-    for floor in sorted_floors:
-        floor_data.append((floor, grid[floor]))
-    
+
+    # Floor label and ordering are computed in SQL, so units arrive
+    # already grouped by floor and a single pass builds the grid
+    units_list = (
+        HousingUnit.objects.filter(pamayanan=building)
+        .annotate(floor_label=Coalesce(NullIf('floor', Value('')), Value('Other')))
+        .order_by('-floor_label', 'housing_unit_name')
+        .only('id', 'housing_unit_name', 'occupant_name', 'floor')
+    )
+
+    # Only queried when the template's cached grid fragment misses
+    floor_data = SimpleLazyObject(lambda: [
+        (floor, list(floor_units))
+        for floor, floor_units in groupby(units_list, key=attrgetter('floor_label'))
+    ])
+
     context = {
         'building': building,
         'floor_data': floor_data,
@@ -34,6 +34,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'properties',
     'gusali',
     'kagamitan',
@@ -46,12 +47,15 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'properties.slowqueries.SlowQueryMiddleware',
+    'properties.instrumentation.RequestMetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'properties.routers.ReplicaPinMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -59,7 +63,8 @@ ROOT_URLCONF = 'property_management.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates, timing each render for Server-Timing
+        'BACKEND': 'properties.instrumentation.TimedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -68,6 +73,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'properties.cache.cache_versions',
             ],
         },
     },
@@ -77,17 +83,50 @@ WSGI_APPLICATION = 'property_management.wsgi.application'
 
 
 # Database Configuration - PostgreSQL
+# Connection reuse (properties.dbpool): "persistent" keeps each worker
+# thread's connection for DB_CONN_MAX_AGE seconds, health-checked at the
+# start of every request; "pool" borrows from a psycopg_pool pool of
+# DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE connections per gunicorn worker
+# (needs psycopg[pool]); "off" reconnects on every request.
+DB_CONNECTIONS = os.getenv('DB_CONNECTIONS', 'persistent')
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'properties.dbpool',
         'NAME': os.environ['DB_NAME'],
         'USER': os.environ['DB_USER'],
         'PASSWORD': os.environ['DB_PASSWORD'],
         'HOST': os.environ['DB_HOST'],
         'PORT': os.environ['DB_PORT'],
+        # Pooled connections go back to the pool after each request
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')) if DB_CONNECTIONS == 'persistent' else 0,
+        'CONN_HEALTH_CHECKS': DB_CONNECTIONS == 'persistent',
+        'POOL': {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '4')),
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+        } if DB_CONNECTIONS == 'pool' else None,
     }
 }
 
+# Optional read replica for reports and exports (properties.routers).
+# Test runs use it as a mirror of the test database instead of creating
+# a database of its own.
+if os.getenv('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.environ['DB_REPLICA_HOST'],
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'USER': os.getenv('DB_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.getenv('DB_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['properties.routers.ReplicaRouter']
+
+# Seconds a browser keeps reading from the primary after a POST
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '10'))
+
 
 # Password validation
 
@@ -134,3 +173,109 @@ MEDIA_URL = '/media/'
 # Default primary key field type
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Performance
+
+# Cache (properties.cache): "file" by default, shared by the workers and
+# management commands of one host, or a shared "redis" / "memcached"
+# server at CACHE_LOCATION. "locmem" (the default with DEBUG) is per
+# process: namespace bumps from commands and other workers never reach
+# it, so it is for single-process development only (`check --deploy`
+# warns). Backends count hits / misses per namespace for
+# `manage.py cache_stats` (CACHE_STATS).
+CACHE_BACKENDS = {
+    "locmem": "properties.cache_backends.LocMemCache",
+    "file": "properties.cache_backends.FileBasedCache",
+    "redis": "properties.cache_backends.RedisCache",
+    "memcached": "properties.cache_backends.PyMemcacheCache",
+}
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem" if DEBUG else "file")
+CACHE_DEFAULT_LOCATIONS = {
+    "locmem": "property-management",
+    "file": str(BASE_DIR / "cache"),
+    "redis": "redis://127.0.0.1:6379/1",
+    "memcached": "127.0.0.1:11211",
+}
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND],
+        "LOCATION": os.getenv("CACHE_LOCATION", CACHE_DEFAULT_LOCATIONS[CACHE_BACKEND]),
+        "TIMEOUT": int(os.getenv("CACHE_TIMEOUT", "300")),
+        "KEY_PREFIX": os.getenv("CACHE_KEY_PREFIX", "pms"),
+    }
+}
+CACHE_STATS = os.getenv("CACHE_STATS", "True").lower() == "true"
+
+# Rows fetched per round trip by server-side cursors (properties.streaming)
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "2000"))
+
+# Read Pamayanan occupancy counts from cached rollup rows (properties.occupancy)
+OCCUPANCY_ROLLUPS = os.getenv("OCCUPANCY_ROLLUPS", "True").lower() == "true"
+
+# Dashboard statistics snapshots (properties.stats)
+STATS_CACHE_TIMEOUT = int(os.getenv("STATS_CACHE_TIMEOUT", "900"))
+STATS_REFRESH_INTERVAL = int(os.getenv("STATS_REFRESH_INTERVAL", "60"))
+
+# District / national summary materialized views (properties.summaries)
+SUMMARY_REFRESH_INTERVAL = int(os.getenv("SUMMARY_REFRESH_INTERVAL", "900"))
+
+# P7 report generation (properties.p7): process pool size (unset = CPU count,
+# 0 = render in-process) and locals fetched per batch
+P7_REPORT_WORKERS = int(os.environ["P7_REPORT_WORKERS"]) if os.getenv("P7_REPORT_WORKERS") else None
+P7_BATCH_SIZE = int(os.getenv("P7_BATCH_SIZE", "25"))
+
+# Per-request query counts and timings (properties.instrumentation).
+# Budgets are the most queries a page may run (session and user lookups
+# included); None disables the default budget.
+QUERY_BUDGET_DEFAULT = int(os.getenv("QUERY_BUDGET_DEFAULT", "40"))
+QUERY_BUDGETS = {
+    "properties:dashboard": 8,
+    "properties:property_list": 8,
+    "properties:inventory_list": 8,
+    "properties:transfer_list": 8,
+    "properties:transfer_history": 6,
+    "properties:district_list": 8,
+    "properties:local_list": 5,
+    "properties:district_detail": 10,
+    "properties:local_summary": 10,
+    "properties:national_summary": 6,
+    "properties:building_map": 6,
+    "gusali:building_list": 12,
+    "gusali:building_report": 12,
+    "kagamitan:item_list": 5,
+    "kagamitan:item_create": 5,
+    "plants:plant_list": 5,
+    "vehicles:vehicle_list": 5,
+}
+REQUEST_METRICS_WINDOW = int(os.getenv("REQUEST_METRICS_WINDOW", "200"))
+REQUEST_METRICS_LOG_INTERVAL = int(os.getenv("REQUEST_METRICS_LOG_INTERVAL", "300"))
+
+# Slow-query capture (properties.slowqueries). Statements taking at least
+# SLOW_QUERY_MS are stored with an EXPLAIN plan; empty turns it off.
+# SLOW_QUERY_EXPLAIN_ANALYZE runs slow SELECTs again for actual timings.
+SLOW_QUERY_MS = os.getenv("SLOW_QUERY_MS", "200")
+SLOW_QUERY_MS = int(SLOW_QUERY_MS) if SLOW_QUERY_MS else None
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "True").lower() == "true"
+SLOW_QUERY_EXPLAIN_ANALYZE = os.getenv("SLOW_QUERY_EXPLAIN_ANALYZE", "False").lower() == "true"
+
+# Prometheus /metrics (properties.metrics). Under gunicorn set METRICS_DIR
+# to a directory shared by the workers (fresh per deployment) so a scrape
+# sees the totals of every process.
+METRICS_DIR = os.getenv("METRICS_DIR") or None
+METRICS_FLUSH_SECONDS = int(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_ALLOWED_IPS = os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "properties.metrics": {
+            "handlers": ["console"],
+            "level": os.getenv("METRICS_LOG_LEVEL", "INFO"),
+        },
+    },
+}
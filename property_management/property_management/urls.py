@@ -8,6 +8,8 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic import RedirectView
 
+from properties.views import prometheus_metrics
+
 urlpatterns = [
    
     path('', RedirectView.as_view(url='properties/', permanent=False)),
@@ -19,6 +21,8 @@ urlpatterns = [
     path('plants/', include('plants.urls')),
     path('vehicles/', include('vehicles.urls')),
     path('admin_core/',include('admin_core.urls')),
+    path('api/v1/', include('properties.api')),
+    path('metrics', prometheus_metrics, name='metrics'),
     
     
 ]
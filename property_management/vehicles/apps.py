@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class VehiclesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'vehicles'
+
+    def ready(self):
+        from properties.rollups import connect_rollup
+
+        connect_rollup("vehicle")
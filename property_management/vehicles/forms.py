@@ -1,8 +1,9 @@
 
 from django import forms
+from properties.forms import LocalChoicesMixin
 from .models import Vehicle
 
-class VehicleForm(forms.ModelForm):
+class VehicleForm(LocalChoicesMixin, forms.ModelForm):
     class Meta:
         model = Vehicle
         fields = '__all__'
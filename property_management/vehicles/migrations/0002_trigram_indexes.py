@@ -0,0 +1,22 @@
+# Generated by Django 4.2.8 on 2026-10-19 00:00
+
+from django.db import migrations
+
+from properties.filters import trigram_index_sql
+
+
+# Substring search indexes for the list filters (skipped without pg_trgm)
+CREATE_TRIGRAM_INDEXES, DROP_TRIGRAM_INDEXES = trigram_index_sql(
+    'vehicles_vehicle', ('item_name', 'brand', 'plate_number', 'lcode', 'dcode')
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vehicles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRIGRAM_INDEXES, DROP_TRIGRAM_INDEXES),
+    ]
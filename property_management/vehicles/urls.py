@@ -5,6 +5,7 @@ app_name = 'vehicles'
 
 urlpatterns = [
     path('', views.vehicle_list, name='vehicle_list'),
+    path('export/', views.vehicle_export, name='vehicle_export'),
     path('create/', views.vehicle_create, name='vehicle_create'),
     path('<int:pk>/', views.vehicle_detail, name='vehicle_detail'),
     path('<int:pk>/update/', views.vehicle_update, name='vehicle_update'),
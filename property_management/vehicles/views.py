@@ -1,71 +1,55 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 from .models import Vehicle
-from properties.models import District, Local
+from properties.exports import export_response
+from properties.filters import AssetFilter
+from properties.pagination import keyset_paginate
+from properties.routers import replica_reads
+
+VEHICLE_EXPORT_COLUMNS = [
+    ('District Code', 'dcode'),
+    ('Local Code', 'lcode'),
+    ('Local', 'local__name'),
+    ('Item Name', 'item_name'),
+    ('Brand', 'brand'),
+    ('Model', 'model'),
+    ('Plate Number', 'plate_number'),
+    ('Conduction Sticker', 'conduction_sticker'),
+    ('Engine Number', 'engine_number'),
+    ('Chassis Number', 'chassis_number'),
+    ('Year Model', 'year_model'),
+    ('Color', 'color'),
+    ('Acquisition Cost', 'acquisition_cost'),
+    ('Date Acquired', 'date_acquired'),
+    ('Remarks', 'remarks'),
+]
+
+def vehicle_filter(request):
+    """Filters shared by the vehicle list and its export"""
+    return AssetFilter(
+        request.GET,
+        search_fields=('item_name', 'brand', 'plate_number', 'lcode', 'dcode'),
+    )
 
 @login_required
 def vehicle_list(request):
     """Display list of vehicles with filtering"""
-    vehicles = Vehicle.objects.select_related('local', 'local__district').all()
-    
-    # Search query
-    search_query = request.GET.get('q', '').strip()
-    if search_query:
-        # Create separate querysets for each search field
-        search_results = Vehicle.objects.none()
-        search_results = search_results | vehicles.filter(item_name__icontains=search_query)
-        search_results = search_results | vehicles.filter(brand__icontains=search_query)
-        search_results = search_results | vehicles.filter(plate_number__icontains=search_query)
-        search_results = search_results | vehicles.filter(local__name__icontains=search_query)
-        search_results = search_results | vehicles.filter(local__district__name__icontains=search_query)
-        search_results = search_results | vehicles.filter(lcode__icontains=search_query)
-        search_results = search_results | vehicles.filter(dcode__icontains=search_query)
-        vehicles = search_results.distinct()
-    
-    # Filter by district
-    district_filter = request.GET.get('district', '').strip()
-    if district_filter:
-        district_results = vehicles.filter(local__district__dcode__iexact=district_filter)
-        if not district_results.exists():
-            district_results = vehicles.filter(local__district__name__icontains=district_filter)
-        district_results = district_results | vehicles.filter(dcode__iexact=district_filter)
-        vehicles = district_results.distinct()
-        
-    # Filter by local
-    local_filter = request.GET.get('local', '').strip()
-    if local_filter:
-        local_results = vehicles.filter(local__lcode__iexact=local_filter)
-        if not local_results.exists():
-            local_results = vehicles.filter(local__name__icontains=local_filter)
-        local_results = local_results | vehicles.filter(lcode__iexact=local_filter)
-        vehicles = local_results.distinct()
-        
-    # Get filter options
-    districts = District.objects.all().order_by('name')
-    locals_list = Local.objects.select_related('district').all().order_by('district__name', 'name')
-    
-    # Filter locals by district if selected (for dependent dropdown)
-    current_district_obj = None
-    if district_filter:
-        current_district_obj = District.objects.filter(dcode=district_filter).first()
-        locals_list = locals_list.filter(district__dcode=district_filter)
-        
-    current_local_obj = None
-    if local_filter:
-        current_local_obj = Local.objects.filter(lcode=local_filter).first()
-        
+    asset_filter = vehicle_filter(request)
+    vehicles = asset_filter.apply(Vehicle.objects.all())
+
     context = {
-        'vehicles': vehicles,
-        'districts': districts,
-        'locals': locals_list,
-        'search_query': search_query,
-        'current_district': district_filter,
-        'current_district_name': current_district_obj.name if current_district_obj else '',
-        'current_local': local_filter,
-        'current_local_name': current_local_obj.name if current_local_obj else '',
+        'vehicles': keyset_paginate(request, vehicles),
+        **asset_filter.context(),
     }
     return render(request, 'vehicles/vehicle_list.html', context)
 
+@login_required
+@replica_reads
+def vehicle_export(request):
+    """Stream the filtered vehicle list as CSV or XLSX"""
+    vehicles = vehicle_filter(request).apply(Vehicle.objects.all())
+    return export_response(request, vehicles, VEHICLE_EXPORT_COLUMNS, 'vehicles')
+
 @login_required
 def vehicle_detail(request, pk):
     vehicle = get_object_or_404(Vehicle, pk=pk)